@@ -34,6 +34,16 @@ class _EnforceCsrf(CsrfViewMiddleware):
 
 
 class CookieTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        # Served from api.services.auth_cache (a token -> user snapshot with a short TTL,
+        # dropped on logout / token rotation / user changes) instead of a
+        # Token-join-User query on every request.
+        from api.services import auth_cache
+        authenticated = auth_cache.lookup(key)
+        if authenticated is None:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        return authenticated
+
     def authenticate(self, request):
         # Prefer the standard header path (no CSRF needed for non-browser clients).
         if get_authorization_header(request):
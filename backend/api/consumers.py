@@ -2,33 +2,20 @@ import json
 from urllib.parse import parse_qs
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from channels.db import database_sync_to_async
-from rest_framework.authtoken.models import Token
 
 @database_sync_to_async
 def get_user_from_token(token_key):
-    try:
-        token = Token.objects.select_related('user').get(key=token_key)
-        return token.user
-    except Token.DoesNotExist:
-        return None
+    # Same cached lookup as CookieTokenAuthentication (api.services.auth_cache).
+    from api.services import auth_cache
+    authenticated = auth_cache.lookup(token_key)
+    return authenticated[0] if authenticated else None
 
 @database_sync_to_async
 def get_unread_counts(user):
-    from api.models import Message, Notification
-    unread_messages = Message.objects.filter(
-        conversation__participants=user,
-        is_read=False
-    ).exclude(sender=user).count()
-
-    unread_notifications = Notification.objects.filter(
-        recipient=user,
-        is_read=False
-    ).count()
-
-    return {
-        "messages": unread_messages,
-        "notifications": unread_notifications
-    }
+    # Served from the cached per-user counters (api.services.unread_counters); only kinds
+    # that aren't cached yet are counted in the DB.
+    from api.services.unread_counters import get_counts
+    return get_counts(user.id)
 
 class NotificationConsumer(AsyncJsonWebsocketConsumer):
     async def connect(self):
@@ -59,12 +46,8 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
         await self.accept()
 
         # Send initial counts on connection
-        counts = await get_unread_counts(self.user)
-        await self.send_json({
-            "type": "counts",
-            "messages": counts["messages"],
-            "notifications": counts["notifications"]
-        })
+        self.counts = await get_unread_counts(self.user)
+        await self.send_counts()
 
     async def disconnect(self, close_code):
         if hasattr(self, 'group_name'):
@@ -78,24 +61,34 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
         # Handle messages sent from client if needed (e.g. client wants to force-refresh counts)
         action = content.get('action')
         if action == 'refresh_counts':
-            counts = await get_unread_counts(self.user)
-            await self.send_json({
-                "type": "counts",
-                "messages": counts["messages"],
-                "notifications": counts["notifications"]
-            })
+            self.counts = await get_unread_counts(self.user)
+            await self.send_counts()
 
-    async def update_counts(self, event):
-        # Receive update_counts event from group (triggered by signals)
-        # Fetch current counts from database and push them to WebSocket client
-        counts = await get_unread_counts(self.user)
+    async def send_counts(self):
         await self.send_json({
             "type": "counts",
-            "messages": counts["messages"],
-            "notifications": counts["notifications"]
+            "messages": self.counts["messages"],
+            "notifications": self.counts["notifications"]
         })
 
-def send_user_update(user_id):
+    async def update_counts(self, event):
+        # Receive update_counts event from group (triggered by signals). The event carries the
+        # new counter values (or at least the deltas), so applying it needs no query; only a
+        # bare event — or a kind we have no value for — falls back to the counters.
+        counts = event.get("counts") or {}
+        deltas = event.get("deltas") or {}
+        current = getattr(self, "counts", None)
+        if current is None or not (counts or deltas):
+            self.counts = await get_unread_counts(self.user)
+        else:
+            for kind in ("messages", "notifications"):
+                if counts.get(kind) is not None:
+                    current[kind] = counts[kind]
+                elif kind in deltas:
+                    current[kind] = max(0, current[kind] + deltas[kind])
+        await self.send_counts()
+
+def send_user_update(user_id, deltas=None, counts=None):
     from channels.layers import get_channel_layer
     from asgiref.sync import async_to_sync
     channel_layer = get_channel_layer()
@@ -103,7 +96,104 @@ def send_user_update(user_id):
         async_to_sync(channel_layer.group_send)(
             f"user_{user_id}",
             {
-                "type": "update_counts"
+                "type": "update_counts",
+                "deltas": deltas or {},
+                "counts": counts or {},
             }
         )
 
+
+@database_sync_to_async
+def is_chat_member(user, conversation_id):
+    from api.services.chat_events import is_member
+    return is_member(user, conversation_id)
+
+@database_sync_to_async
+def get_messages_since(conversation_id, last_id, base_url):
+    from api.services.chat_events import messages_since
+    return messages_since(conversation_id, last_id, base_url)
+
+@database_sync_to_async
+def mark_chat_read(conversation_id, user_id):
+    from api.services.chat_events import mark_read
+    mark_read(conversation_id, user_id)
+
+def _base_url(scope):
+    headers = dict(scope.get('headers') or [])
+    host = headers.get(b'host', b'localhost').decode('latin-1')
+    secure = scope.get('scheme') in ('wss', 'https') or headers.get(b'x-forwarded-proto') == b'https'
+    return f"{'https' if secure else 'http'}://{host}/"
+
+class ChatConsumer(AsyncJsonWebsocketConsumer):
+    """Live updates for one open chat — ws/chat/<conversation_id>/?token=…[&last_id=…].
+    See api.services.chat_events for the events pushed."""
+
+    # Keystrokes can fire "typing" far more often than anyone needs to see it.
+    TYPING_INTERVAL = 2.0
+
+    async def connect(self):
+        query_params = parse_qs(self.scope.get('query_string', b'').decode('utf-8'))
+        token_list = query_params.get('token')
+        self.user = await get_user_from_token(token_list[0]) if token_list else None
+        self.conversation_id = int(self.scope['url_route']['kwargs']['conversation_id'])
+        if not self.user or not self.user.is_authenticated or not await is_chat_member(self.user, self.conversation_id):
+            await self.close(code=4003)
+            return
+
+        from api.services.chat_events import group_name
+        self.group_name = group_name(self.conversation_id)
+        self.base_url = _base_url(self.scope)
+        self.last_typing = 0.0
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        last_id = query_params.get('last_id')
+        if last_id and last_id[0].isdigit():
+            await self.resume(int(last_id[0]))
+
+    async def disconnect(self, close_code):
+        if hasattr(self, 'group_name'):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def resume(self, last_id):
+        messages, complete = await get_messages_since(self.conversation_id, last_id, self.base_url)
+        for message in messages:
+            message['is_me'] = message['sender']['id'] == self.user.id
+        await self.send_json({
+            'type': 'resume', 'conversation_id': self.conversation_id, 'messages': messages, 'complete': complete,
+        })
+
+    async def receive_json(self, content):
+        action = content.get('action')
+        if action == 'typing':
+            import time
+            is_typing = bool(content.get('is_typing', True))
+            now = time.monotonic()
+            if is_typing and now - self.last_typing < self.TYPING_INTERVAL:
+                return
+            self.last_typing = now if is_typing else 0.0
+            await self.channel_layer.group_send(self.group_name, {
+                'type': 'chat.event', 'event': 'typing', 'sender_channel': self.channel_name,
+                'conversation_id': self.conversation_id, 'user_id': self.user.id,
+                'username': self.user.username, 'is_typing': is_typing,
+            })
+        elif action == 'resume' and str(content.get('last_id', '')).isdigit():
+            await self.resume(int(content['last_id']))
+
+    async def chat_event(self, event):
+        kind = event['event']
+        if kind == 'membership_revoked':
+            if self.user.id in event['user_ids']:
+                await self.close(code=4003)
+            return
+        if event.get('sender_channel') == self.channel_name:
+            return
+        payload = {key: value for key, value in event.items() if key not in ('type', 'event', 'sender_channel')}
+        payload['type'] = kind
+        if 'message' in payload:
+            message = payload['message'] = dict(payload['message'])
+            message['is_me'] = message['sender']['id'] == self.user.id
+            if kind == 'message_new' and not message['is_me']:
+                # Seen live in an open chat — what the polling fetch used to do on each poll.
+                await mark_chat_read(self.conversation_id, self.user.id)
+        await self.send_json(payload)
@@ -0,0 +1,73 @@
+import logging
+
+from django.db.models import Case, IntegerField, When
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+
+class IndexedSearchFilter(filters.SearchFilter):
+    """`?search=` served from the in-process trigram index (api.services.search_index) for
+    views that set `search_index_kind`: prefix and typo-tolerant matches, ranked best first
+    unless the request asks for an explicit `?ordering=`. Views without a kind, terms matching
+    more than `max_matches` rows (too broad to rank usefully, and too many ids to filter by),
+    an index that isn't built yet, or any index failure fall back to the stock `icontains`
+    SearchFilter over `search_fields`.
+
+    Every match is returned, so pagination counts are exact; the best `ranked_results` come
+    first in rank order and the rest follow by id.
+
+    List it after OrderingFilter so the rank order isn't replaced by the default ordering."""
+    ranked_results = 500
+    max_matches = 10000
+
+    def filter_queryset(self, request, queryset, view):
+        kind = getattr(view, 'search_index_kind', None)
+        terms = self.get_search_terms(request)
+        if not kind or not terms:
+            return super().filter_queryset(request, queryset, view)
+
+        from api.services import search_index
+        try:
+            ranked = search_index.search_ids(kind, ' '.join(terms), limit=None, fill=self.ranked_results)
+        except search_index.IndexUnavailable:
+            return super().filter_queryset(request, queryset, view)
+        except Exception:
+            logger.exception("Search index lookup failed for %s; falling back to icontains", kind)
+            return super().filter_queryset(request, queryset, view)
+        if len(ranked) > self.max_matches:
+            return super().filter_queryset(request, queryset, view)
+
+        queryset = queryset.filter(pk__in=ranked)
+        if not ranked or request.query_params.get(api_settings.ORDERING_PARAM):
+            return queryset
+        top = ranked[:self.ranked_results]
+        rank = Case(
+            *[When(pk=pk, then=position) for position, pk in enumerate(top)],
+            default=len(top), output_field=IntegerField(),
+        )
+        return queryset.order_by(rank, 'pk')
+
+
+class GenreFilter(filters.BaseFilterBackend):
+    """`?genre=` on the game catalogue: one or more comma-separated genre names, in any
+    spelling api.services.genre_index folds to the same canonical genre ("RPG", "rpg",
+    "Ролевая игра"). Games must have every listed genre; an unknown genre matches nothing.
+    Served from the indexed GameGenre links rather than a JSON `icontains` scan."""
+    genre_param = 'genre'
+
+    def filter_queryset(self, request, queryset, view):
+        raw = request.query_params.get(self.genre_param, '')
+        names = [name.strip() for name in raw.split(',') if name.strip()]
+        if not names:
+            return queryset
+
+        from api.services.genre_index import genre_ids_for
+        resolved = genre_ids_for(names, create=False)
+        if len(resolved) < len(set(names)):
+            return queryset.none()
+        genre_ids = set(resolved.values())
+        for genre_id in genre_ids:
+            queryset = queryset.filter(genre_links__genre_id=genre_id)
+        return queryset
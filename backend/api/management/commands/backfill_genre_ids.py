@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.services import genre_index
+from core.models import Game, Genre
+
+
+class Command(BaseCommand):
+    help = (
+        'Maps every game\'s raw genre names onto canonical Genre rows and writes the GameGenre '
+        'links that recommendations, Game DNA and the ?genre= filter read. Safe to re-run: '
+        'games whose links already match are left alone.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk', type=int, default=genre_index.SYNC_CHUNK_SIZE,
+                            help='Games synced per transaction')
+
+    def handle(self, *args, **options):
+        chunk = options['chunk']
+        game_ids = list(Game.objects.order_by('pk').values_list('pk', flat=True))
+        changed = 0
+        for start in range(0, len(game_ids), chunk):
+            with transaction.atomic():
+                games = Game.objects.filter(pk__in=game_ids[start:start + chunk]).only('pk', 'genres')
+                changed += genre_index.sync_game_genres(games)
+            self.stdout.write(f'  {min(start + chunk, len(game_ids))}/{len(game_ids)}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Synced {len(game_ids)} game(s): {changed} link(s) added or removed, '
+            f'{Genre.objects.count()} canonical genre(s).'
+        ))
@@ -0,0 +1,80 @@
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+SAMPLE_TEXTS = [
+    'Just finished the main quest, the skill tree in this RPG is incredibly deep',
+    'Ranked grind tonight, aiming is finally clicking in this shooter',
+    'rol yapma oyunu seviyorum, hikaye harika',
+    'Ce jeu de course est incroyable, les circuits sont magnifiques',
+    'Retro night: playing old school console classics with friends',
+    'The jump scares in this survival horror game got me every time',
+    'Patch notes are out, new release date announced for the expansion',
+    'Couch co-op with my brother, best party game of the year',
+]
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the embedding inference backends (EMBEDDING_BACKEND torch vs onnx): load time, '
+        'texts/sec and peak RSS. Each backend runs in its own subprocess so peak memory is not '
+        'shared between them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backends', default='torch,onnx')
+        parser.add_argument('--texts', type=int, default=256, help='Texts encoded per timed run')
+        parser.add_argument('--batch-size', type=int, default=32)
+        parser.add_argument('--child', default=None, help='internal: run one backend and print JSON')
+
+    def _run_child(self, name, n_texts, batch_size):
+        from api.services.embedding_backends import load_backend
+
+        started = time.perf_counter()
+        backend = load_backend(name)
+        backend.encode(SAMPLE_TEXTS[:2])  # warm-up
+        load_seconds = time.perf_counter() - started
+
+        texts = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] + f' #{i}' for i in range(n_texts)]
+        started = time.perf_counter()
+        for i in range(0, n_texts, batch_size):
+            backend.encode(texts[i:i + batch_size])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(json.dumps({
+            'backend': name,
+            'load_seconds': load_seconds,
+            'texts_per_second': n_texts / elapsed if elapsed else 0.0,
+            'peak_rss_mb': _peak_rss_mb(),
+        }))
+
+    def handle(self, *args, **options):
+        if options['child']:
+            self._run_child(options['child'], options['texts'], options['batch_size'])
+            return
+
+        self.stdout.write(f'{"backend":>8}  {"load s":>7}  {"texts/s":>9}  {"peak RSS MB":>12}')
+        for name in [b.strip() for b in options['backends'].split(',') if b.strip()]:
+            proc = subprocess.run(
+                [sys.executable, sys.argv[0], 'benchmark_embedding_backends', '--child', name,
+                 '--texts', str(options['texts']), '--batch-size', str(options['batch_size'])],
+                capture_output=True, text=True,
+            )
+            lines = [line for line in proc.stdout.splitlines() if line.startswith('{')]
+            if proc.returncode != 0 or not lines:
+                error = (proc.stderr.strip().splitlines() or ['unknown error'])[-1]
+                self.stdout.write(self.style.ERROR(f'{name:>8}  failed: {error}'))
+                continue
+            result = json.loads(lines[-1])
+            self.stdout.write(
+                f'{name:>8}  {result["load_seconds"]:>7.2f}  {result["texts_per_second"]:>9.1f}  '
+                f'{result["peak_rss_mb"]:>12.1f}'
+            )
@@ -0,0 +1,100 @@
+import random
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import Interest, User
+from api.services import categorize
+from core.models import Game, Post, Review
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the vectorized For You scorer (score_items_for_user) against the per-item '
+        'score_post_for_user/score_review_for_user path on synthetic, in-memory candidate sets, '
+        'and checks both produce identical scores. Touches no database rows.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='200,2000,20000', help='Comma-separated candidate counts')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per size; the best time is reported')
+        parser.add_argument('--seed', type=int, default=7)
+
+    def _build_candidates(self, size, rng, now, interests, games):
+        items = []
+        for i in range(size):
+            kwargs = dict(
+                id=i + 1, user_id=rng.randint(1, max(2, size // 10)),
+                content=rng.choice(['great rpg', 'retro classic', 'just a post', 'horror night', '']),
+            )
+            if rng.random() < 0.5:
+                item = Post(**kwargs)
+            else:
+                game = rng.choice(games)
+                item = Review(game=game, rating=rng.randint(0, 10), **kwargs)
+            item.timestamp = now - timedelta(seconds=rng.randint(0, 60 * 86400), microseconds=rng.randint(0, 999999))
+            item.likes_count_ann = rng.randint(0, 500)
+            item.replies_count_ann = rng.randint(0, 80)
+            tagged = rng.sample(interests, rng.randint(0, 3))
+            item._prefetched_objects_cache = {'interests': Interest.objects.none()}
+            item._prefetched_objects_cache['interests']._result_cache = tagged
+            items.append(item)
+        return items
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        sizes = [int(s) for s in options['sizes'].split(',') if s.strip()]
+        now = timezone.now()
+
+        interests = [Interest(id=i + 1, name=name) for i, name in enumerate(categorize.INTEREST_KEYWORDS)]
+        games = [Game(id=i + 1, title=f'Game {i}') for i in range(50)]
+        user = User(id=1, username='benchmark')
+        followed_ids = set(rng.sample(range(1, 2000), 200))
+        user_interest_ids = {i.id for i in rng.sample(interests, 4)}
+        interest_keywords = categorize.expand_interest_keywords([i.name for i in interests if i.id in user_interest_ids])
+        library_playtimes = {g.id: rng.choice([0, 0, 120]) for g in rng.sample(games, 15)}
+
+        def per_item(items):
+            scores = []
+            for item in items:
+                if isinstance(item, Review):
+                    scores.append(categorize.score_review_for_user(
+                        item, user, followed_ids, user_interest_ids, interest_keywords, library_playtimes,
+                    ))
+                else:
+                    scores.append(categorize.score_post_for_user(item, user, followed_ids, user_interest_ids))
+            return scores
+
+        def batch(items):
+            return categorize.score_items_for_user(
+                items, user, followed_ids, user_interest_ids,
+                interest_keywords=interest_keywords, library_playtimes=library_playtimes,
+            )
+
+        def best_of(fn, items):
+            best = None
+            result = None
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                result = fn(items)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            return best, result
+
+        self.stdout.write(f'{"candidates":>10}  {"per-item ms":>12}  {"batch ms":>10}  {"speedup":>8}  identical')
+        # Freeze "now" so both paths see the same clock — the per-item path reads it once per item.
+        with mock.patch.object(categorize.timezone, 'now', return_value=now):
+            for size in sizes:
+                items = self._build_candidates(size, rng, now, interests, games)
+                per_item_time, expected = best_of(per_item, items)
+                batch_time, actual = best_of(batch, items)
+                identical = expected == actual
+                self.stdout.write(
+                    f'{size:>10}  {per_item_time * 1000:>12.2f}  {batch_time * 1000:>10.2f}  '
+                    f'{per_item_time / batch_time:>7.1f}x  {identical}'
+                )
+                if not identical:
+                    self.stdout.write(self.style.ERROR('Batch scores diverged from the per-item formula.'))
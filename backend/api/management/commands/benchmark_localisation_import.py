@@ -0,0 +1,115 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from api.services.localisation_formats.canonical import (
+    ImportResult,
+    ParsedEntry,
+    _commit_translations,
+    _validate_import_value,
+)
+
+
+def _per_row_commit(project, entries, by_key, *, language, locale, user, result):
+    """The translation commit as it was before the bulk path: a lookup, a save or create and an
+    approval (with its own row locks) per entry. Kept here only as the baseline."""
+    from api.views import _approve_community_translation
+    from core.models import CommunityTranslation
+
+    for parsed_entry in entries:
+        catalog_entry = by_key.get(parsed_entry.key)
+        if catalog_entry is None:
+            result.warnings.append(f'Skipped translation for unknown key "{parsed_entry.key}".')
+            result.skipped += 1
+            continue
+        value = parsed_entry.translations.get(language)
+        if value is None:
+            continue
+        field_values, warning = _validate_import_value(parsed_entry.key, catalog_entry, value, locale)
+        if warning:
+            result.warnings.append(warning)
+            result.skipped += 1
+        if field_values is None:
+            continue
+        existing = (
+            CommunityTranslation.objects
+            .filter(project=project, key=parsed_entry.key, language=language, author=user)
+            .exclude(status='rejected')
+            .first()
+        )
+        if existing is not None:
+            for field, val in field_values.items():
+                setattr(existing, field, val)
+            existing.save(update_fields=list(field_values.keys()) + ['updated_at'])
+            obj = existing
+            result.translations_updated += 1
+        else:
+            obj = CommunityTranslation.objects.create(
+                project=project, key=parsed_entry.key, language=language, author=user, **field_values,
+            )
+            result.translations_created += 1
+        _approve_community_translation(obj, user)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the translation half of a localisation import commit (canonical.apply_import): '
+        'the bulk path against the previous per-row path, at each --sizes entry count, for a '
+        'first import (every row created) and a re-import of changed text (every row updated). '
+        'Rows are written in a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,50000', help='Comma-separated entry counts')
+        parser.add_argument(
+            '--per-row-max', type=int, default=10000,
+            help='Skip the (slow) per-row baseline above this many entries',
+        )
+
+    def _run(self, commit, project, user, entries, locale):
+        by_key = {entry.key: {'key': entry.key} for entry in entries}
+        queries = [0]
+
+        def count(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        result = ImportResult(mode='commit', format='', language=locale.code)
+        with connection.execute_wrapper(count):
+            started = time.perf_counter()
+            commit(project, entries, by_key, language=locale.code, locale=locale, user=user, result=result)
+            seconds = time.perf_counter() - started
+        return seconds, queries[0], result
+
+    def handle(self, *args, **options):
+        from api.locale_registry import get as get_locale
+        from api.models import User
+        from core.models import Project
+
+        locale = get_locale('tr')
+        sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        rows = []
+        with transaction.atomic():
+            user = User.objects.create_user(username='l10n_import_bench', email='l10n_import_bench@example.invalid')
+            for size in sizes:
+                modes = [('bulk', _commit_translations)]
+                if size <= options['per_row_max']:
+                    modes.append(('per-row', _per_row_commit))
+                for mode, commit in modes:
+                    project = Project.objects.create(owner=user, title=f'Import bench {mode} {size}')
+                    for phase, text in (('create', 'metin'), ('update', 'yeni metin')):
+                        entries = [
+                            ParsedEntry(key=f'bench.key{i}', translations={locale.code: {'text': f'{text} {i}'}})
+                            for i in range(size)
+                        ]
+                        seconds, queries, result = self._run(commit, project, user, entries, locale)
+                        rows.append((size, mode, phase, seconds, queries, result))
+            transaction.set_rollback(True)
+
+        self.stdout.write('Translation commit, one language:')
+        for size, mode, phase, seconds, queries, result in rows:
+            self.stdout.write(
+                f'  {size:>7,} entries  {mode:<8} {phase:<6} {seconds:8.2f} s  {queries:>7,} queries  '
+                f'(created {result.translations_created:,}, updated {result.translations_updated:,})'
+            )
@@ -0,0 +1,80 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.pagination import encode_cursor, keyset_ordering, keyset_page
+from core.models import Post
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks page-number (OFFSET + COUNT) against keyset (cursor) pagination on the '
+        'Explore "newest" query: median latency of page 1 and of --deep-page for both, on '
+        '--posts synthetic root posts inserted in a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=20000, help='Synthetic posts to insert')
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--deep-page', type=int, default=500)
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per measurement')
+
+    def handle(self, *args, **options):
+        from api.models import User
+
+        page_size, deep = options['page_size'], options['deep_page']
+        posts = max(options['posts'], page_size * deep + 1)
+        with transaction.atomic():
+            author = User.objects.create_user(username='pagination_bench', email='pagination_bench@example.invalid')
+            created = Post.objects.bulk_create(
+                [Post(user=author, content=f'post {i}') for i in range(posts)], batch_size=5000,
+            )
+            # Spread the timestamps out (bulk_create stamps every row with the same instant).
+            now = timezone.now()
+            for i, post in enumerate(created):
+                post.timestamp = now - timedelta(seconds=i)
+            Post.objects.bulk_update(created, ['timestamp'], batch_size=5000)
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(f'ANALYZE {Post._meta.db_table}')
+
+            newest = Post.objects.filter(
+                parent__isnull=True, review_parent__isnull=True, news_parent__isnull=True,
+            ).order_by('-timestamp')
+
+            def offset_page(number):
+                start = (number - 1) * page_size
+                # What StandardResultsSetPagination does per page: a COUNT and an OFFSET slice.
+                newest.count()
+                return list(newest[start:start + page_size])
+
+            ordering = keyset_ordering(newest)
+            before = newest.order_by('-timestamp', '-pk').values_list('timestamp', 'pk')[(deep - 1) * page_size - 1]
+            deep_cursor = encode_cursor(ordering, list(before))
+            assert [p.pk for p in offset_page(deep)] == [p.pk for p in keyset_page(newest, deep_cursor, page_size)[0]]
+
+            repeat = options['repeat']
+            results = [
+                ('page-number', 1, _median_ms(lambda: offset_page(1), repeat)),
+                ('page-number', deep, _median_ms(lambda: offset_page(deep), repeat)),
+                ('keyset', 1, _median_ms(lambda: keyset_page(newest, None, page_size), repeat)),
+                ('keyset', deep, _median_ms(lambda: keyset_page(newest, deep_cursor, page_size), repeat)),
+            ]
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'Explore "newest" over {posts:,} posts, {page_size} per page (median of {repeat}):')
+        for mode, number, ms in results:
+            self.stdout.write(f'  {mode:<12} page {number:>4}: {ms:8.2f} ms')
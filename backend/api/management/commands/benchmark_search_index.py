@@ -0,0 +1,125 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.services.trigram_index import TrigramIndex
+from core.models import Game
+
+ONSETS = ['', 'b', 'c', 'd', 'f', 'g', 'h', 'k', 'l', 'm', 'n', 'p', 'r', 's', 't', 'v', 'z',
+          'br', 'dr', 'gr', 'kr', 'st', 'th', 'sh', 'ch', 'bl', 'fl', 'tr', 'qu', 'x', 'w', 'y']
+VOWELS = ['a', 'e', 'i', 'o', 'u', 'ai', 'ea', 'io', 'ou', 'y']
+CODAS = ['', '', 'n', 'r', 'l', 's', 'x', 'th', 'rk', 'nd', 'ck', 'm']
+COMMON = ['the', 'of', 'legend', 'dark', 'souls', 'wars', 'star', 'final', 'quest', 'city', 'night', 'king']
+
+
+def _titles(n, rng):
+    syllables = [o + v + c for o in ONSETS for v in VOWELS for c in CODAS]
+    words = sorted({''.join(rng.choice(syllables) for _ in range(rng.randint(1, 3))) for _ in range(40000)})
+    for _ in range(n):
+        parts = [rng.choice(COMMON) if rng.random() < 0.3 else rng.choice(words) for _ in range(rng.randint(1, 4))]
+        if rng.random() < 0.2:
+            parts.append(str(rng.randint(2, 5)))
+        yield ' '.join(parts).title()
+
+
+def _typo(title, rng):
+    """The title with two adjacent letters swapped inside one of its longer words."""
+    words = title.split()
+    long_words = [i for i, word in enumerate(words) if len(word) >= 5]
+    if not long_words:
+        return title
+    w = rng.choice(long_words)
+    word = words[w]
+    i = rng.randrange(1, len(word) - 2)
+    words[w] = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return ' '.join(words)
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1], samples[-1]
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the trigram search index (api.services.trigram_index) on synthetic game '
+        'titles: build time and per-query latency for exact, prefix and misspelled queries at '
+        '--games rows, then a head-to-head against the `title__icontains` query the API used '
+        'to run, on --db-games rows inserted in a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--games', type=int, default=1_000_000, help='Titles in the in-memory index run')
+        parser.add_argument('--db-games', type=int, default=100_000, help='Titles for the icontains comparison (0 to skip)')
+        parser.add_argument('--queries', type=int, default=300, help='Queries per kind')
+        parser.add_argument('--seed', type=int, default=7)
+
+    def _queries(self, titles, count, rng):
+        picks = [rng.randrange(len(titles)) for _ in range(count)]
+        exact = [(titles[i], i) for i in picks]
+        prefix = [(titles[i][:rng.randint(3, 6)], i) for i in picks]
+        typo = [(_typo(titles[i], rng), i) for i in picks]
+        return {'exact': exact, 'prefix': prefix, 'typo': typo}
+
+    def _run_index(self, index, queries, titles, first_id):
+        results = {}
+        for name, batch in queries.items():
+            times, found = [], 0
+            for query, target in batch:
+                started = time.perf_counter()
+                hits = index.search(query, limit=10)
+                times.append((time.perf_counter() - started) * 1000)
+                found += any(titles[object_id - first_id] == titles[target] for object_id, _ in hits)
+            results[name] = (_percentiles(times), found / len(batch))
+        return results
+
+    def _report(self, label, results):
+        for name, ((p50, p95, worst), recall) in results.items():
+            self.stdout.write(
+                f'  {label:<10}{name:<8} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  max {worst:7.2f} ms  '
+                f'intended title in top 10: {recall:6.1%}'
+            )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+
+        titles = list(_titles(options['games'], rng))
+        started = time.perf_counter()
+        index = TrigramIndex.build((i + 1, 1.0, title) for i, title in enumerate(titles))
+        build_seconds = time.perf_counter() - started
+        self.stdout.write(
+            f'Index over {len(titles):,} titles: built in {build_seconds:.1f}s, {len(index.vocab):,} trigrams, '
+            f'{index.postings.nbytes / 2**20:.0f} MiB of postings'
+        )
+        queries = self._queries(titles, options['queries'], rng)
+        self._report('index', self._run_index(index, queries, titles, 1))
+        # A 3-6 letter prefix has many equally good completions, so its "recall" is low for
+        # both paths; it's reported for the latency. Misspelled queries are where icontains
+        # finds nothing at all.
+
+        if not options['db_games']:
+            return
+        titles = titles[:options['db_games']]
+        queries = self._queries(titles, options['queries'], rng)
+        with transaction.atomic():
+            created = Game.objects.bulk_create([Game(title=t) for t in titles], batch_size=5000)
+            # bulk_create on PostgreSQL returns consecutive ids in insertion order.
+            first_id = created[0].pk
+            index = TrigramIndex.build((g.pk, 1.0, g.title) for g in created)
+            self.stdout.write(f'Head-to-head on {len(titles):,} games in the database:')
+            self._report('index', self._run_index(index, queries, titles, first_id))
+
+            results = {}
+            for name, batch in queries.items():
+                times, found = [], 0
+                for query, target in batch:
+                    started = time.perf_counter()
+                    hits = list(Game.objects.filter(title__icontains=query).values_list('title', flat=True)[:10])
+                    times.append((time.perf_counter() - started) * 1000)
+                    found += titles[target] in hits
+                results[name] = (_percentiles(times), found / len(batch))
+            self._report('icontains', results)
+            transaction.set_rollback(True)
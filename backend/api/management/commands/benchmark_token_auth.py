@@ -0,0 +1,65 @@
+import time
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+
+from api.services import auth_cache
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks token authentication: requests/sec on a cheap authenticated endpoint '
+        '(--path, default the unread-counts badge) through the full middleware stack, with the '
+        'token -> user cache (api.services.auth_cache) and with it bypassed, i.e. a '
+        'Token-join-User query per request. Uses a throwaway user created in a transaction '
+        'that is rolled back; throttling is disabled for the run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per mode')
+        parser.add_argument('--path', default='/api/users/counts/')
+
+    def _run(self, client, path, count, headers):
+        auth_queries = [0]
+
+        def count_token_queries(execute, sql, params, many, context):
+            auth_queries[0] += 'authtoken_token' in sql
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_token_queries):
+            started = time.perf_counter()
+            for _ in range(count):
+                response = client.get(path, **headers)
+                if response.status_code != 200:
+                    raise RuntimeError(f'{path} returned {response.status_code}')
+            seconds = time.perf_counter() - started
+        return count / seconds, auth_queries[0] / count
+
+    def handle(self, *args, **options):
+        from rest_framework.authtoken.models import Token
+        from api.models import User
+
+        count, path = options['requests'], options['path']
+        client = Client()
+        with transaction.atomic(), mock.patch(
+            'rest_framework.throttling.SimpleRateThrottle.allow_request', return_value=True,
+        ):
+            user = User.objects.create_user(username='token_auth_bench', email='token_auth_bench@example.invalid')
+            token = Token.objects.create(user=user)
+            headers = {'HTTP_AUTHORIZATION': f'Token {token.key}', 'HTTP_HOST': 'localhost'}
+            try:
+                self._run(client, path, 50, headers)  # warm-up (fills the cache)
+                cached = self._run(client, path, count, headers)
+                with mock.patch.object(auth_cache, 'get', return_value=None), \
+                        mock.patch.object(auth_cache, 'store'):
+                    uncached = self._run(client, path, count, headers)
+            finally:
+                auth_cache.invalidate_token(token.key)
+                transaction.set_rollback(True)
+
+        self.stdout.write(f'GET {path}, {count} requests per mode:')
+        for label, (rate, per_request) in (('uncached', uncached), ('cached', cached)):
+            self.stdout.write(f'  {label:<9} {rate:8,.0f} req/s  {per_request:.2f} token queries/request')
+        self.stdout.write(self.style.SUCCESS(f'Speed-up: {cached[0] / uncached[0]:.2f}x'))
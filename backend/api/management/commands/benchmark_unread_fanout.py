@@ -0,0 +1,146 @@
+import random
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from channels.layers import InMemoryChannelLayer
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api import consumers
+from api.services import unread_counters
+
+# Synthetic user ids start here so the benchmark never touches a real user's counters.
+USER_ID_BASE = 1_000_000_000
+
+
+class _WorkerLayers:
+    """Spreads sockets over one InMemoryChannelLayer per simulated ASGI worker (as each process
+    holds only its own connections). A single in-memory layer rescans every channel on each
+    send/receive, which would make the benchmark measure that instead of the counters."""
+
+    def __init__(self, sockets_per_worker, capacity):
+        self.sockets_per_worker = sockets_per_worker
+        self.capacity = capacity
+        self.workers = []
+        self.by_group = {}
+
+    def layer_for_new_socket(self):
+        if not self.workers or self.workers[-1][1] >= self.sockets_per_worker:
+            self.workers.append([InMemoryChannelLayer(capacity=self.capacity), 0])
+        self.workers[-1][1] += 1
+        return self.workers[-1][0]
+
+    async def group_add(self, layer, group, channel):
+        self.by_group.setdefault(group, set()).add(layer)
+        await layer.group_add(group, channel)
+
+    async def group_send(self, group, message):
+        for layer in self.by_group.get(group, ()):
+            await layer.group_send(group, message)
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-tests the unread-counter fan-out: seeds counters for synthetic users, opens '
+        '--sockets NotificationConsumer instances on an in-memory channel layer, fires a burst '
+        'of likes at them through unread_counters.adjust() (what the Notification signal does), '
+        'and delivers every group event to the consumers. Reports timings and checks that '
+        'neither side queried the database. Touches no database rows.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sockets', type=int, default=10000, help='Open consumers to simulate')
+        parser.add_argument('--sockets-per-user', type=int, default=1, help='Tabs/devices per user')
+        parser.add_argument('--sockets-per-worker', type=int, default=500, help='Sockets held by each simulated ASGI worker')
+        parser.add_argument('--likes', type=int, default=3, help='Average likes per user in the burst')
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        per_user = max(1, options['sockets_per_user'])
+        users = max(1, options['sockets'] // per_user)
+        user_ids = [USER_ID_BASE + i for i in range(users)]
+        likes = {user_id: rng.randint(1, 2 * options['likes'] - 1) for user_id in user_ids}
+        total_likes = sum(likes.values())
+        initial = {user_id: {'messages': 0, 'notifications': rng.randint(0, 20)} for user_id in user_ids}
+
+        layer = _WorkerLayers(max(1, options['sockets_per_worker']), capacity=max(100, 2 * options['likes']))
+        cache.set_many({
+            unread_counters.COUNTER_KEY.format(user_id=user_id, kind=kind): value
+            for user_id, counts in initial.items() for kind, value in counts.items()
+        }, unread_counters.COUNTER_TTL)
+
+        sent = [0]
+
+        async def send_json(content, close=False):
+            sent[0] += 1
+
+        async def open_sockets():
+            sockets = []
+            for user_id in user_ids:
+                for _ in range(per_user):
+                    consumer = consumers.NotificationConsumer()
+                    consumer.user = SimpleNamespace(id=user_id, is_authenticated=True)
+                    consumer.counts = dict(initial[user_id])
+                    consumer.send_json = send_json
+                    consumer.channel_layer = layer.layer_for_new_socket()
+                    consumer.channel_name = await consumer.channel_layer.new_channel()
+                    await layer.group_add(consumer.channel_layer, f'user_{user_id}', consumer.channel_name)
+                    sockets.append(consumer)
+            return sockets
+
+        async def deliver(sockets):
+            delivered = 0
+            for consumer in sockets:
+                for _ in range(likes[consumer.user.id]):
+                    await consumer.update_counts(await consumer.channel_layer.receive(consumer.channel_name))
+                    delivered += 1
+            return delivered
+
+        try:
+            sockets = async_to_sync(open_sockets)()
+            self.stdout.write(
+                f'{len(sockets)} socket(s) for {users} user(s) on {len(layer.workers)} worker(s); '
+                f'{total_likes} like(s) in the burst'
+            )
+
+            with mock.patch('channels.layers.get_channel_layer', return_value=layer), \
+                    CaptureQueriesContext(connection) as produce_queries:
+                started = time.perf_counter()
+                for user_id, n in likes.items():
+                    for _ in range(n):
+                        unread_counters.adjust(user_id, 'notifications', 1)
+                produce_seconds = time.perf_counter() - started
+
+            with mock.patch.object(consumers, 'get_unread_counts', side_effect=AssertionError('consumer queried')) as fallback:
+                started = time.perf_counter()
+                delivered = async_to_sync(deliver)(sockets)
+                deliver_seconds = time.perf_counter() - started
+
+            wrong = sum(
+                1 for consumer in sockets
+                if consumer.counts['notifications'] != initial[consumer.user.id]['notifications'] + likes[consumer.user.id]
+            )
+        finally:
+            cache.delete_many([
+                unread_counters.COUNTER_KEY.format(user_id=user_id, kind=kind)
+                for user_id in user_ids for kind in unread_counters.KINDS
+            ])
+
+        self.stdout.write(
+            f'produce: {total_likes} counter updates in {produce_seconds * 1000:.1f} ms '
+            f'({total_likes / produce_seconds:,.0f}/s), {len(produce_queries)} DB queries'
+        )
+        self.stdout.write(
+            f'deliver: {delivered} events to consumers in {deliver_seconds * 1000:.1f} ms '
+            f'({delivered / deliver_seconds:,.0f}/s), {fallback.call_count} count fallbacks, '
+            f'{sent[0]} frames sent'
+        )
+        if wrong or len(produce_queries) or fallback.call_count:
+            self.stdout.write(self.style.ERROR(f'{wrong} socket(s) ended with the wrong count'))
+        else:
+            self.stdout.write(self.style.SUCCESS('All sockets converged on the right count without a query.'))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from api.services.embedding_store import (
+    ITEM_TYPES, build_index, embed_items, text_for_game, text_for_post, text_for_review,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Embeds every post/review/game whose text has no stored (or a stale) embedding, then '
+        'rebuilds and persists the nearest-neighbour index for each type. Unchanged text is '
+        'never re-embedded, so this is cheap to re-run on a schedule.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--types', default=','.join(ITEM_TYPES), help='Comma-separated subset of post,review,game')
+        parser.add_argument('--batch-size', type=int, default=64)
+        parser.add_argument('--skip-embed', action='store_true', help='Only rebuild the indexes from stored vectors')
+
+    def _sources(self):
+        from core.models import Game, Post, Review
+        return {
+            'post': (Post.objects.only('id', 'content'), text_for_post),
+            'review': (Review.objects.only('id', 'content'), text_for_review),
+            'game': (Game.objects.only('id', 'title', 'summary', 'description', 'genres'), text_for_game),
+        }
+
+    def handle(self, *args, **options):
+        types = [t.strip() for t in options['types'].split(',') if t.strip()]
+        sources = self._sources()
+        for item_type in types:
+            if item_type not in sources:
+                self.stdout.write(self.style.WARNING(f'Skipping unknown type {item_type!r}'))
+                continue
+            if not options['skip_embed']:
+                queryset, text_for = sources[item_type]
+                seen = 0
+                batch = []
+                for item in queryset.order_by('id').iterator(chunk_size=options['batch_size'] * 4):
+                    batch.append((item_type, item.id, text_for(item)))
+                    if len(batch) >= options['batch_size']:
+                        embed_items(batch)
+                        seen += len(batch)
+                        batch = []
+                if batch:
+                    embed_items(batch)
+                    seen += len(batch)
+                self.stdout.write(f'{item_type}: checked {seen} item(s)')
+            index = build_index(item_type)
+            self.stdout.write(f'{item_type}: indexed {len(index)} vector(s) in {index.n_lists} list(s)')
+        self.stdout.write(self.style.SUCCESS('Embedding indexes rebuilt.'))
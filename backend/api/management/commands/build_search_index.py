@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.services import search_index
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuilds the trigram name-search index for games, users, projects and organisations '
+        'from the database and writes the snapshot every process loads on startup. Run after '
+        'bulk imports (which bypass the save signals that keep the indexes current).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kinds', default=','.join(search_index.KINDS),
+                            help=f"Comma-separated subset of {','.join(search_index.KINDS)}")
+
+    def handle(self, *args, **options):
+        kinds = [k.strip() for k in options['kinds'].split(',') if k.strip()]
+        for kind in kinds:
+            if kind not in search_index.SOURCES:
+                self.stdout.write(self.style.WARNING(f'Skipping unknown kind {kind!r}'))
+                continue
+            started = time.perf_counter()
+            index = search_index.build_index(kind)
+            self.stdout.write(
+                f'{kind}: {index.base_rows} row(s), {len(index.vocab)} trigram(s) '
+                f'in {time.perf_counter() - started:.1f}s'
+            )
+        search_index.reset()
+        self.stdout.write(self.style.SUCCESS('Search indexes rebuilt.'))
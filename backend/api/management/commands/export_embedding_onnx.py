@@ -0,0 +1,56 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.services.embeddings import MODEL_NAME
+
+
+class Command(BaseCommand):
+    help = (
+        'Exports the classifier model to ONNX (model.onnx) plus an int8 dynamically-quantized '
+        'copy (model_quantized.onnx) and tokenizer.json, for EMBEDDING_BACKEND=onnx. Needs torch, '
+        'sentence-transformers and onnxruntime — run it at build time, not on the web workers.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.EMBEDDING_ONNX_DIR)
+        parser.add_argument('--model', default=MODEL_NAME, help='Model name or local path to export')
+        parser.add_argument('--no-quantize', action='store_true', help='Only write the fp32 model.onnx')
+        parser.add_argument('--opset', type=int, default=14)
+
+    def handle(self, *args, **options):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        output = options['output']
+        os.makedirs(output, exist_ok=True)
+
+        st_model = SentenceTransformer(options['model'], device='cpu')
+        transformer = st_model[0].auto_model.eval()
+        tokenizer = st_model[0].tokenizer
+        # The fast tokenizer's tokenizer.json is all OnnxBackend needs (no transformers import).
+        tokenizer.save_pretrained(output)
+
+        sample = tokenizer(['an example sentence', 'another one'], return_tensors='pt', padding=True)
+        fp32_path = os.path.join(output, 'model.onnx')
+        dynamic = {0: 'batch', 1: 'sequence'}
+        with torch.no_grad():
+            torch.onnx.export(
+                transformer,
+                (sample['input_ids'], sample['attention_mask']),
+                fp32_path,
+                input_names=['input_ids', 'attention_mask'],
+                output_names=['last_hidden_state'],
+                dynamic_axes={'input_ids': dynamic, 'attention_mask': dynamic, 'last_hidden_state': dynamic},
+                opset_version=options['opset'],
+            )
+        self.stdout.write(f'Wrote {fp32_path}')
+
+        if not options['no_quantize']:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            int8_path = os.path.join(output, 'model_quantized.onnx')
+            quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+            self.stdout.write(f'Wrote {int8_path}')
+
+        self.stdout.write(self.style.SUCCESS(f'ONNX export of {options["model"]} written to {output}'))
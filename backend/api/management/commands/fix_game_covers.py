@@ -4,9 +4,9 @@ Replaces local file paths (games/20900.jpg) with Steam CDN URLs.
 
 Usage: python manage.py fix_game_covers
 """
-import requests
 from django.core.management.base import BaseCommand
 from core.models import Game
+from api.services import http_client
 
 
 class Command(BaseCommand):
@@ -77,7 +77,7 @@ class Command(BaseCommand):
         
         for url in urls:
             try:
-                resp = requests.head(url, timeout=5)
+                resp = http_client.head('steam_cdn', url, timeout=5)
                 if resp.status_code == 200:
                     return url
             except Exception:
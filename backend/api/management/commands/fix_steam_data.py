@@ -1,8 +1,8 @@
 import requests
-import time
 from django.core.management.base import BaseCommand
 from django.core.files.base import ContentFile
 from core.models import Game
+from api.services import http_client
 
 
 class Command(BaseCommand):
@@ -27,7 +27,7 @@ class Command(BaseCommand):
         """Search the Steam Store for a game by title, return appid if found."""
         try:
             url = f"https://store.steampowered.com/api/storesearch/?term={requests.utils.quote(title)}&l=english&cc=US"
-            resp = requests.get(url, timeout=10)
+            resp = http_client.get('steam_store', url, timeout=10)
             resp.raise_for_status()
             data = resp.json()
             
@@ -56,7 +56,7 @@ class Command(BaseCommand):
         
         for url in urls:
             try:
-                resp = requests.get(url, timeout=8)
+                resp = http_client.get('steam_cdn', url, timeout=8)
                 if resp.status_code == 200 and len(resp.content) > 1000:
                     content_type = resp.headers.get('Content-Type', '')
                     if 'image' in content_type or content_type == '':
@@ -91,7 +91,6 @@ class Command(BaseCommand):
             else:
                 self.stdout.write(f'  [{i+1}/{total}] NOT FOUND on Steam: "{game.title}"')
             
-            time.sleep(0.3)  # Rate limit
         
         self.stdout.write(self.style.SUCCESS(f'AppID backfill: {fixed}/{total} games updated'))
 
@@ -132,7 +131,5 @@ class Command(BaseCommand):
                 fixed += 1
             else:
                 self.stdout.write(f'  [{i+1}/{total}] No cover found for "{game.title}" (appid: {game.steam_appid})')
-            
-            time.sleep(0.2)
         
         self.stdout.write(self.style.SUCCESS(f'Cover fix: {fixed}/{total} covers downloaded'))
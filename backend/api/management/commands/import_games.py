@@ -1,11 +1,11 @@
 import os
-import requests
 import time
 from datetime import datetime
 from django.core.management.base import BaseCommand
 from django.core.files.base import ContentFile
 from django.db.models import Q, Count
 from core.models import Game
+from api.services import http_client
 
 
 class Command(BaseCommand):
@@ -111,7 +111,6 @@ class Command(BaseCommand):
                 )
 
                 query_offset += batch_size
-                time.sleep(0.25)  # IGDB rate limit: 4 req/sec
 
                 # If we got fewer results than batch_size, we've exhausted this query
                 if len(games_data) < batch_size:
@@ -143,7 +142,7 @@ class Command(BaseCommand):
     def _authenticate(self, client_id, client_secret):
         self.stdout.write('Authenticating with Twitch...')
         try:
-            auth_response = requests.post(
+            auth_response = http_client.post('twitch_auth',
                 'https://id.twitch.tv/oauth2/token',
                 params={
                     'client_id': client_id,
@@ -161,7 +160,7 @@ class Command(BaseCommand):
 
     def _fetch_games(self, headers, query):
         try:
-            response = requests.post(
+            response = http_client.post('igdb',
                 'https://api.igdb.com/v4/games',
                 headers=headers,
                 data=query,
@@ -245,7 +244,7 @@ class Command(BaseCommand):
                         image_url = image_url.replace('t_thumb', 't_cover_big')
 
                         try:
-                            img_response = requests.get(image_url, timeout=8)
+                            img_response = http_client.get('igdb_images', image_url, timeout=8)
                             if img_response.status_code == 200 and len(img_response.content) > 500:
                                 game.cover_image.save(
                                     f"igdb_{igdb_id}.jpg",
@@ -1,8 +1,7 @@
-import time
-import requests
 from django.core.management.base import BaseCommand
 from core.models import Game
 from api.services.steam import fetch_steam_genres
+from api.services import http_client
 
 class Command(BaseCommand):
     help = 'Fetches top games from SteamSpy and adds them to the database'
@@ -17,7 +16,7 @@ class Command(BaseCommand):
         
         try:
             # SteamSpy API to get top games in the last 2 weeks
-            response = requests.get('https://steamspy.com/api.php?request=top100in2weeks')
+            response = http_client.get('steamspy', 'https://steamspy.com/api.php?request=top100in2weeks')
             
             if response.status_code != 200:
                 self.stdout.write(self.style.ERROR(f"SteamSpy API returned status {response.status_code}"))
@@ -41,7 +40,6 @@ class Command(BaseCommand):
                     continue
                     
                 # We need genres. Let's fetch them using our existing service
-                time.sleep(1) # Be nice to Steam API
                 genres = fetch_steam_genres(appid)
                 
                 # We also need a cover image. We'll use the standard Steam capsule URL
@@ -55,7 +53,7 @@ class Command(BaseCommand):
                 
                 from django.core.files.base import ContentFile
                 try:
-                    img_response = requests.get(cover_url, timeout=5)
+                    img_response = http_client.get('steam_cdn', cover_url, timeout=5)
                     if img_response.status_code == 200:
                         image_file = ContentFile(img_response.content, name=f"{appid}.jpg")
                     else:
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from api.services.feed_candidates import rebuild_candidates
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuilds the FeedCandidate store behind the For You feed from the Post/Review/Like '
+        'tables with exact engagement counts. Run once to backfill rows created before the store '
+        'existed, and periodically to correct drift from writes that bypass signals '
+        '(bulk_create, queryset.update/delete).'
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding feed candidates...')
+        count = rebuild_candidates()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} feed candidates.'))
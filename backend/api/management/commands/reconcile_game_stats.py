@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from api.services import game_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Recounts the GameStats rollup (ratings, review/library counts, histograms, recent '
+        'activity) for every game from the Review and LibraryEntry tables, creating missing rows '
+        'and correcting drift from writes that bypass signals. Run once to backfill, then '
+        'periodically (e.g. daily from cron) so recent activity ages out.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk', type=int, default=game_stats.RECONCILE_CHUNK_SIZE,
+                            help='Games recounted per transaction')
+
+    def handle(self, *args, **options):
+        def progress(done, total):
+            self.stdout.write(f'  {done}/{total}')
+
+        corrected = game_stats.reconcile(chunk_size=options['chunk'], on_progress=progress)
+        self.stdout.write(self.style.SUCCESS(f'Created or corrected {corrected} game stats row(s).'))
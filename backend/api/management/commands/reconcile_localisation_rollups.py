@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from api.services import localisation_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Recounts the localisation rollups (per-language approved/pending key counts and '
+        'per-contributor approved characters) for every project from the CommunityTranslation '
+        'table, creating missing rows and correcting drift from writes that bypass signals. '
+        'Projects are otherwise counted on first touch, so this is optional as a backfill.'
+    )
+
+    def handle(self, *args, **options):
+        def progress(done, total):
+            self.stdout.write(f'  {done}/{total}')
+
+        corrected = localisation_rollups.reconcile(on_progress=progress)
+        self.stdout.write(self.style.SUCCESS(f'Created or corrected rollups for {corrected} project(s).'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from api.models import User
+from api.services import unread_counters
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the cached per-user unread message/notification counters with the database '
+        'and repairs any that drifted (pushing the corrected value to open sockets). Users '
+        'without cached counters are skipped. Meant to run periodically, e.g. from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk', type=int, default=500, help='Users checked per cache read / grouped query')
+
+    def handle(self, *args, **options):
+        user_ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+        corrected = 0
+        for start in range(0, len(user_ids), options['chunk']):
+            corrected += unread_counters.reconcile(user_ids[start:start + options['chunk']])
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {len(user_ids)} user(s); corrected {corrected} counter(s).'
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from api.services.embedding_store import retag_interests
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes post/review interest tags from stored embeddings (no model inference) — '
+        'run after changing INTEREST_MATCH_THRESHOLD or the interest descriptions.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--types', default='post,review')
+        parser.add_argument('--threshold', type=float, default=None,
+                            help='Override INTEREST_MATCH_THRESHOLD (e.g. to preview a new value with --dry-run)')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        for item_type in [t.strip() for t in options['types'].split(',') if t.strip()]:
+            examined, changed = retag_interests(item_type, threshold=options['threshold'], dry_run=options['dry_run'])
+            verb = 'would change' if options['dry_run'] else 'changed'
+            self.stdout.write(f'{item_type}: examined {examined}, {verb} {changed}')
+        self.stdout.write(self.style.SUCCESS('Re-tagging complete.'))
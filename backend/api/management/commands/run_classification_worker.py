@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.services.classification_worker import (
+    BATCH_SIZE, BATCH_WAIT_SECONDS, POLL_INTERVAL_SECONDS, PendingTableWorker,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs the post/review embedding classification worker as its own process, draining '
+        'PendingClassification in micro-batches (one encode() call per batch). Pair with '
+        'CLASSIFICATION_WORKER_MODE=external on the web processes so they only enqueue.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--batch-wait', type=float, default=BATCH_WAIT_SECONDS,
+                            help='Seconds to let a partial batch fill before encoding it')
+        parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL_SECONDS)
+        parser.add_argument('--metrics-interval', type=float, default=60.0,
+                            help='Seconds between queue-depth/batch-latency reports')
+        parser.add_argument('--once', action='store_true', help='Drain the pending queue, then exit')
+
+    def _report(self, worker):
+        m = worker.metrics()
+        fmt = lambda seconds: '-' if seconds is None else f'{seconds:.2f}s'
+        self.stdout.write(
+            f"queue_depth={m['queue_depth']} batches={m['batches']} items={m['items']} "
+            f"avg_batch={m['avg_batch_size']:.1f} failed={m['failed_batches']} "
+            f"last={fmt(m['last_batch_seconds'])} p50={fmt(m['p50_batch_seconds'])} "
+            f"p95={fmt(m['p95_batch_seconds'])} max={fmt(m['max_batch_seconds'])}"
+        )
+
+    def handle(self, *args, **options):
+        worker = PendingTableWorker(
+            batch_size=options['batch_size'],
+            batch_wait=options['batch_wait'],
+            poll_interval=options['poll_interval'],
+        )
+
+        if options['once']:
+            worker.run(stop_when_idle=True, idle_timeout=0)
+            self._report(worker)
+            self.stdout.write(self.style.SUCCESS(f"Classified {worker.items} item(s) in {worker.batches} batch(es)."))
+            return
+
+        self.stdout.write(f"Classification worker started (batch size {worker.batch_size}).")
+        last_report = time.monotonic()
+        while True:
+            batch = worker.next_batch()
+            if batch:
+                worker.run_batch(batch)
+            if time.monotonic() - last_report >= options['metrics_interval']:
+                self._report(worker)
+                last_report = time.monotonic()
@@ -1,10 +1,29 @@
 from django.core.management.base import BaseCommand
-from api.services.categorize import update_all_trending_scores
+from api.services import trending
 
 class Command(BaseCommand):
-    help = 'Update trending scores for all recent posts'
+    help = (
+        'Update trending scores for all recent posts. With --incremental, only posts liked, '
+        'bookmarked, replied to or reposted since the last run are recomputed (falling back to '
+        'all of them if that can\'t be determined); the full pass should still run regularly '
+        'since scores decay with age.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--incremental', action='store_true',
+                            help='Recompute only posts marked dirty since the last pass')
+        parser.add_argument('--chunk', type=int, default=trending.CHUNK_SIZE,
+                            help='Posts scored per batch of grouped queries')
 
     def handle(self, *args, **options):
         self.stdout.write('Updating trending scores...')
-        update_all_trending_scores()
-        self.stdout.write(self.style.SUCCESS('Trending scores updated successfully.'))
+        if options['incremental']:
+            stats = trending.recompute_dirty(chunk_size=options['chunk'])
+        else:
+            stats = trending.recompute_all(chunk_size=options['chunk'])
+        rate = stats['posts'] / stats['seconds'] if stats['seconds'] else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Trending scores updated successfully ({'full' if stats['full'] else 'incremental'} pass): "
+            f"{stats['posts']} post(s) scored, {stats['updated']} changed, "
+            f"{stats['seconds']:.2f}s ({rate:,.0f} posts/sec)."
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from api.services import http_client
+
+
+class Command(BaseCommand):
+    help = (
+        'Prints the shared per-upstream HTTP counters (requests, errors, retries, 429s, limiter '
+        'waits and wait time, latency) that api.services.http_client aggregates in the cache across processes.'
+    )
+
+    def handle(self, *args, **options):
+        stats = http_client.shared_upstream_metrics()
+        header = f"{'upstream':<16}{'requests':>10}{'errors':>8}{'retries':>9}{'429s':>7}{'waits':>8}{'wait s':>9}{'avg ms':>9}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for upstream, row in sorted(stats.items()):
+            self.stdout.write(
+                f"{upstream:<16}{row['requests']:>10}{row['errors']:>8}{row['retries']:>9}"
+                f"{row['rate_limited']:>7}{row['limiter_waits']:>8}"
+                f"{row['limiter_wait_ms'] / 1000:>9.1f}{row['avg_latency_ms']:>9.1f}"
+            )
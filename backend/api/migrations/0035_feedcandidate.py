@@ -0,0 +1,73 @@
+# Generated by Django 5.2.12 on 2026-10-18 01:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+# Seeds the store from existing rows so the For You feed isn't empty between deploy and the first
+# `rebuild_feed_candidates` run. Same logic as api.services.feed_candidates.rebuild_candidates,
+# restated against the historical models (migrations can't import the live ones).
+def _count(model, fk_name):
+    sub = model.objects.filter(**{fk_name: OuterRef('pk')}).order_by().values(fk_name).annotate(c=Count('*')).values('c')
+    return Coalesce(Subquery(sub, output_field=IntegerField()), 0)
+
+
+def backfill_feed_candidates(apps, schema_editor):
+    FeedCandidate = apps.get_model('api', 'FeedCandidate')
+    Post = apps.get_model('core', 'Post')
+    Review = apps.get_model('core', 'Review')
+    Like = apps.get_model('core', 'Like')
+
+    posts = Post.objects.filter(
+        parent__isnull=True, review_parent__isnull=True, news_parent__isnull=True,
+    ).annotate(likes_total=_count(Like, 'post'), replies_total=_count(Post, 'parent'))
+    reviews = Review.objects.annotate(likes_total=_count(Like, 'review'), replies_total=_count(Post, 'review_parent'))
+
+    batch = []
+    for post in posts.values('id', 'user_id', 'timestamp', 'likes_total', 'replies_total').iterator():
+        batch.append(FeedCandidate(
+            item_type='post', post_id=post['id'], author_id=post['user_id'], timestamp=post['timestamp'],
+            likes_count=post['likes_total'], replies_count=post['replies_total'],
+            engagement_score=post['likes_total'] * 0.5 + post['replies_total'] * 0.8,
+        ))
+    for review in reviews.values('id', 'user_id', 'game_id', 'timestamp', 'likes_total', 'replies_total').iterator():
+        batch.append(FeedCandidate(
+            item_type='review', review_id=review['id'], author_id=review['user_id'], game_id=review['game_id'],
+            timestamp=review['timestamp'], likes_count=review['likes_total'], replies_count=review['replies_total'],
+            engagement_score=review['likes_total'] * 0.5 + review['replies_total'] * 0.8,
+        ))
+    FeedCandidate.objects.bulk_create(batch, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0034_posthashtag'),
+        ('core', '0071_post_poll_expires_at_pollvote'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_type', models.CharField(choices=[('post', 'Post'), ('review', 'Review')], max_length=10)),
+                ('timestamp', models.DateTimeField()),
+                ('likes_count', models.PositiveIntegerField(default=0)),
+                ('replies_count', models.PositiveIntegerField(default=0)),
+                ('engagement_score', models.FloatField(default=0.0)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('game', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.game')),
+                ('post', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='feed_candidate', to='core.post')),
+                ('review', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='feed_candidate', to='core.review')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-timestamp'], name='feedcand_recent_idx'), models.Index(fields=['-engagement_score', '-timestamp'], name='feedcand_engaged_idx'), models.Index(fields=['author', '-timestamp'], name='feedcand_author_recent_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(models.Q(('post__isnull', False), ('review__isnull', True)), models.Q(('post__isnull', True), ('review__isnull', False)), _connector='OR'), name='feedcandidate_exactly_one_target')],
+            },
+        ),
+        migrations.RunPython(backfill_feed_candidates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.12 on 2026-10-18 01:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0035_feedcandidate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingClassification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_type', models.CharField(choices=[('post', 'Post'), ('review', 'Review')], max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('overwrite_category', models.BooleanField(default=False)),
+                ('enqueued_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('item_type', 'object_id'), name='unique_pending_classification')],
+            },
+        ),
+    ]
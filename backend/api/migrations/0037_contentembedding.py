@@ -0,0 +1,28 @@
+# Generated by Django 5.2.12 on 2026-10-18 01:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0036_pendingclassification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentEmbedding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_type', models.CharField(choices=[('post', 'Post'), ('review', 'Review'), ('game', 'Game')], max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('content_hash', models.CharField(max_length=64)),
+                ('dim', models.PositiveSmallIntegerField()),
+                ('vector', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('item_type', 'object_id'), name='unique_content_embedding')],
+            },
+        ),
+    ]
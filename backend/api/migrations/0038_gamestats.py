@@ -0,0 +1,35 @@
+# Generated by Django 5.2.12 on 2026-10-18 02:46
+
+import api.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0037_contentembedding'),
+        ('core', '0072_genre_gamegenre'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameStats',
+            fields=[
+                ('game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='core.game')),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.DecimalField(decimal_places=1, default=0, max_digits=12)),
+                ('avg_rating', models.FloatField(blank=True, null=True)),
+                ('rating_histogram', models.JSONField(blank=True, default=dict)),
+                ('log_count', models.PositiveIntegerField(default=0)),
+                ('status_counts', models.JSONField(blank=True, default=dict)),
+                ('recent_activity_count', models.PositiveIntegerField(default=0)),
+                ('random_key', models.FloatField(db_index=True, default=api.models.random_sample_key)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'game stats',
+                'indexes': [models.Index(fields=['-log_count'], name='gamestats_log_count_idx'), models.Index(condition=models.Q(('avg_rating__gte', 7), ('review_count__gte', 1), ('review_count__lte', 5)), fields=['random_key'], name='gamestats_gem_random_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+from django.db import migrations
+
+# Full-text index behind api.services.message_search. Database-specific, so raw SQL per
+# vendor rather than a models.Index:
+# - PostgreSQL: GIN over the exact expression Django's SearchVector('content', config='simple')
+#   compiles to, so the planner can use it for the `@@` filter;
+# - SQLite: an FTS5 external-content table (no second copy of the text) kept in step with
+#   api_message by triggers. Skipped when SQLite was built without FTS5 — the service then
+#   falls back to scanning the conversation in Python.
+
+PG_INDEX = 'msg_content_fts_idx'
+FTS_TABLE = 'api_message_fts'
+
+
+def _sqlite_has_fts5(cursor):
+    try:
+        cursor.execute('CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)')
+        cursor.execute('DROP TABLE temp.fts5_probe')
+        return True
+    except Exception:
+        return False
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON api_message "
+                f"USING gin (to_tsvector('simple'::regconfig, COALESCE(content, '')))"
+            )
+        elif connection.vendor == 'sqlite' and _sqlite_has_fts5(cursor):
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"content, content='api_message', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON api_message BEGIN "
+                f"INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON api_message BEGIN "
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF content ON api_message BEGIN "
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content); "
+                f"INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content); END"
+            )
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def drop_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'DROP INDEX IF EXISTS {PG_INDEX}')
+        elif connection.vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0038_gamestats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
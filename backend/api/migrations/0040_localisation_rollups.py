@@ -0,0 +1,45 @@
+# Generated by Django 5.2.12 on 2026-10-18 04:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0039_message_fulltext_index'),
+        ('core', '0073_workspace_sections'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocalisationContribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(blank=True, max_length=35)),
+                ('characters', models.PositiveBigIntegerField(default=0)),
+                ('translations', models.PositiveIntegerField(default=0)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='localisation_contributions', to='core.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project', 'language', '-characters'], name='l10n_contrib_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('project', 'author', 'language'), name='uniq_l10n_contrib_author_lang')],
+            },
+        ),
+        migrations.CreateModel(
+            name='LocalisationProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(blank=True, max_length=35)),
+                ('approved_keys', models.PositiveIntegerField(default=0)),
+                ('pending_keys', models.PositiveIntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='localisation_progress', to='core.project')),
+            ],
+            options={
+                'verbose_name_plural': 'localisation progress',
+                'constraints': [models.UniqueConstraint(fields=('project', 'language'), name='uniq_l10n_progress_lang')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.12 on 2026-10-18 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0040_localisation_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='localisationprogress',
+            name='change_seq',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='CommunityTranslationTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_id', models.PositiveBigIntegerField()),
+                ('translation_id', models.PositiveBigIntegerField()),
+                ('sync_seq', models.PositiveBigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project_id', 'sync_seq', 'translation_id'], name='ct_tombstone_sync_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import Floor
+from django.utils import timezone
+
+CHUNK_SIZE = 1000
+RECENT_ACTIVITY_DAYS = 7
+
+
+# 0038 created GameStats empty, so trending and hidden gems had nothing to read until someone
+# ran `reconcile_game_stats`. Counts every existing game the way
+# api.services.game_stats.compute does, restated against the historical models (migrations
+# can't import the live ones).
+def backfill_game_stats(apps, schema_editor):
+    Game = apps.get_model('core', 'Game')
+    Review = apps.get_model('core', 'Review')
+    LibraryEntry = apps.get_model('api', 'LibraryEntry')
+    GameStats = apps.get_model('api', 'GameStats')
+
+    since = timezone.now() - timedelta(days=RECENT_ACTIVITY_DAYS)
+    game_ids = list(Game.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(game_ids), CHUNK_SIZE):
+        chunk = game_ids[start:start + CHUNK_SIZE]
+        rows = {
+            game_id: {
+                'review_count': 0, 'rating_sum': Decimal('0'), 'rating_histogram': {}, 'log_count': 0,
+                'status_counts': {}, 'recent_activity_count': 0,
+            }
+            for game_id in chunk
+        }
+        reviews = Review.objects.filter(game_id__in=chunk)
+        for game_id, n, total in reviews.values('game_id').annotate(n=Count('id'), total=Sum('rating')).values_list('game_id', 'n', 'total'):
+            rows[game_id]['review_count'] = n
+            rows[game_id]['rating_sum'] = Decimal(str(total or 0))
+        buckets = reviews.annotate(bucket=Floor('rating')).values('game_id', 'bucket').annotate(n=Count('id'))
+        for game_id, bucket, n in buckets.values_list('game_id', 'bucket', 'n'):
+            rows[game_id]['rating_histogram'][str(int(bucket))] = n
+        entries = LibraryEntry.objects.filter(game_id__in=chunk)
+        for game_id, entry_status, n in entries.values('game_id', 'status').annotate(n=Count('id')).values_list('game_id', 'status', 'n'):
+            rows[game_id]['status_counts'][entry_status] = n
+            rows[game_id]['log_count'] += n
+        for queryset in (reviews.filter(timestamp__gte=since), entries.filter(added_at__gte=since)):
+            for game_id, n in queryset.values('game_id').annotate(n=Count('id')).values_list('game_id', 'n'):
+                rows[game_id]['recent_activity_count'] += n
+
+        GameStats.objects.bulk_create(
+            [
+                GameStats(
+                    game_id=game_id,
+                    avg_rating=float(values['rating_sum'] / values['review_count']) if values['review_count'] else None,
+                    **values,
+                )
+                for game_id, values in rows.items()
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0041_community_translation_changes'),
+        ('core', '0074_communitytranslation_sync_seq'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_game_stats, migrations.RunPython.noop),
+    ]
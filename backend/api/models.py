@@ -1,6 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save, m2m_changed
 from django.dispatch import receiver
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
@@ -45,6 +45,202 @@ class PostHashtag(models.Model):
         return f"#{self.tag} on post {self.post_id}"
 
 
+class FeedCandidate(models.Model):
+    """One narrow row per root Post/Review eligible for the For You feed, holding just the
+    columns candidate ranking needs (author, game, timestamp, engagement counts). Kept in sync
+    incrementally by the Post/Review/Like signals below (see api.services.feed_candidates), so
+    FeedViewSet.for_you can rank a pre-built window off a few indexed reads instead of running
+    four annotated Post/Review scans on every page load. `rebuild_feed_candidates` backfills and
+    reconciles it."""
+    ITEM_TYPES = [('post', 'Post'), ('review', 'Review')]
+
+    item_type = models.CharField(max_length=10, choices=ITEM_TYPES)
+    post = models.OneToOneField('core.Post', on_delete=models.CASCADE, null=True, blank=True, related_name='feed_candidate')
+    review = models.OneToOneField('core.Review', on_delete=models.CASCADE, null=True, blank=True, related_name='feed_candidate')
+    author = models.ForeignKey(django_settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    game = models.ForeignKey('core.Game', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    timestamp = models.DateTimeField()
+    likes_count = models.PositiveIntegerField(default=0)
+    replies_count = models.PositiveIntegerField(default=0)
+    # likes * 0.5 + replies * 0.8 — the non-personal engagement term of the For You score
+    # (api.services.categorize.score_post_for_user), stored so "most engaged" is an index scan.
+    engagement_score = models.FloatField(default=0.0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-timestamp'], name='feedcand_recent_idx'),
+            models.Index(fields=['-engagement_score', '-timestamp'], name='feedcand_engaged_idx'),
+            models.Index(fields=['author', '-timestamp'], name='feedcand_author_recent_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    models.Q(post__isnull=False, review__isnull=True)
+                    | models.Q(post__isnull=True, review__isnull=False)
+                ),
+                name='feedcandidate_exactly_one_target',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Feed candidate {self.item_type} {self.post_id or self.review_id}"
+
+
+def random_sample_key():
+    return random.random()
+
+
+class GameStats(models.Model):
+    """Per-game review/library rollup, kept in step by the Review/LibraryEntry signals below
+    (see api.services.game_stats) so the game page, trending and hidden gems read one row
+    instead of aggregating the Review and LibraryEntry tables on every request.
+    `reconcile_game_stats` recomputes it exactly and corrects drift."""
+    game = models.OneToOneField('core.Game', on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.DecimalField(max_digits=12, decimal_places=1, default=0)
+    avg_rating = models.FloatField(null=True, blank=True)
+    # {"0".."10": n} — reviews by whole-number rating (7.5 counts under "7").
+    rating_histogram = models.JSONField(default=dict, blank=True)
+    log_count = models.PositiveIntegerField(default=0)
+    # {status: n} over LibraryEntry.STATUS_CHOICES.
+    status_counts = models.JSONField(default=dict, blank=True)
+    # Reviews + library adds in the last RECENT_ACTIVITY_DAYS. Only ever incremented between
+    # reconciliations, which drop what has aged out of the window.
+    recent_activity_count = models.PositiveIntegerField(default=0)
+    # Uniform random per row, so "a random sample of games matching X" is an index range scan
+    # from a random point instead of ORDER BY RANDOM() over every match.
+    random_key = models.FloatField(default=random_sample_key, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'game stats'
+        indexes = [
+            models.Index(fields=['-log_count'], name='gamestats_log_count_idx'),
+            # Hidden-gem candidates only (few reviews, highly rated), in random-key order.
+            models.Index(
+                fields=['random_key'], name='gamestats_gem_random_idx',
+                condition=models.Q(review_count__gte=1, review_count__lte=5, avg_rating__gte=7),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Stats for game {self.game_id}"
+
+
+# LocalisationProgress/LocalisationContribution.language value for the all-languages row.
+ALL_LANGUAGES = ''
+
+
+class LocalisationProgress(models.Model):
+    """Per (project, language) CommunityTranslation counts: keys with an approved translation
+    and keys with at least one suggestion awaiting review. Kept in step with the
+    CommunityTranslation signals below and the bulk import path (see
+    api.services.localisation_rollups), so the progress endpoint reads a few rows instead of
+    the client paging through every suggestion. The ALL_LANGUAGES row sums the others and marks
+    the project as tracked; `reconcile_localisation_rollups` recounts exactly."""
+    project = models.ForeignKey('core.Project', on_delete=models.CASCADE, related_name='localisation_progress')
+    language = models.CharField(max_length=35, blank=True)
+    approved_keys = models.PositiveIntegerField(default=0)
+    pending_keys = models.PositiveIntegerField(default=0)
+    # ALL_LANGUAGES row only: the last CommunityTranslation change number handed out for the
+    # project (see api.services.translation_sync).
+    change_seq = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'localisation progress'
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'language'], name='uniq_l10n_progress_lang'),
+        ]
+
+    def __str__(self):
+        return f"Localisation progress {self.language or 'all'} for project {self.project_id}"
+
+
+class LocalisationContribution(models.Model):
+    """Per (project, author, language) characters of approved CommunityTranslation text (a
+    plural row counts every category's text), plus an ALL_LANGUAGES row per author with the
+    totals — the contributors leaderboard is an index scan on (project, language, -characters).
+    Maintained alongside LocalisationProgress."""
+    project = models.ForeignKey('core.Project', on_delete=models.CASCADE, related_name='localisation_contributions')
+    author = models.ForeignKey(django_settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    language = models.CharField(max_length=35, blank=True)
+    characters = models.PositiveBigIntegerField(default=0)
+    translations = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'language', '-characters'], name='l10n_contrib_rank_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'author', 'language'], name='uniq_l10n_contrib_author_lang'),
+        ]
+
+    def __str__(self):
+        return f"{self.author_id}: {self.characters} {self.language or 'all'} characters on project {self.project_id}"
+
+
+class CommunityTranslationTombstone(models.Model):
+    """A deleted CommunityTranslation, for the change feed (api.services.translation_sync): the
+    row is gone, so its id and the change number of its deletion are kept here. Plain ids rather
+    than FKs, since tombstones are written from inside a project's own cascade delete (the
+    project's post_delete signal below clears them)."""
+    project_id = models.PositiveBigIntegerField()
+    translation_id = models.PositiveBigIntegerField()
+    sync_seq = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project_id', 'sync_seq', 'translation_id'], name='ct_tombstone_sync_idx'),
+        ]
+
+    def __str__(self):
+        return f"Deleted translation {self.translation_id} on project {self.project_id}"
+
+
+class PendingClassification(models.Model):
+    """A Post/Review waiting for embedding classification when the classifier runs as its own
+    process (CLASSIFICATION_WORKER_MODE='external', see api.services.classification_worker and
+    the `run_classification_worker` command). Plain ids rather than FKs: the worker just skips
+    anything deleted in the meantime, and one row per item dedupes repeat edits."""
+    ITEM_TYPES = [('post', 'Post'), ('review', 'Review')]
+
+    item_type = models.CharField(max_length=10, choices=ITEM_TYPES)
+    object_id = models.PositiveIntegerField()
+    overwrite_category = models.BooleanField(default=False)
+    enqueued_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['item_type', 'object_id'], name='unique_pending_classification'),
+        ]
+
+    def __str__(self):
+        return f"Pending classification {self.item_type} {self.object_id}"
+
+
+class ContentEmbedding(models.Model):
+    """The sentence-embedding vector of a Post/Review/Game's text, stored float16 and keyed by
+    a hash of the text it was computed from (api.services.embedding_store), so unchanged text
+    is never re-embedded and nearest-neighbour indexes / re-tagging can run off stored vectors."""
+    ITEM_TYPES = [('post', 'Post'), ('review', 'Review'), ('game', 'Game')]
+
+    item_type = models.CharField(max_length=10, choices=ITEM_TYPES)
+    object_id = models.PositiveIntegerField()
+    content_hash = models.CharField(max_length=64)
+    dim = models.PositiveSmallIntegerField()
+    vector = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['item_type', 'object_id'], name='unique_content_embedding'),
+        ]
+
+    def __str__(self):
+        return f"Embedding {self.item_type} {self.object_id}"
+
+
 def default_user_settings():
     return {
         "privateProfile": False,
@@ -160,6 +356,13 @@ class LibraryEntry(models.Model):
     class Meta:
         unique_together = ('user', 'game')
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so the GameStats signal can move a status count (see api.services.game_stats).
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
     def __str__(self):
         return f"{self.user} owns {self.game}"
 
@@ -248,6 +451,14 @@ class Notification(models.Model):
             models.Index(fields=['recipient', '-created_at'], name='notif_recip_created_idx'),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so the unread-counter signal can tell a read<->unread flip from a save
+        # that left is_read alone (see update_notification_unread_counter).
+        instance._loaded_is_read = instance.__dict__.get('is_read')
+        return instance
+
     def __str__(self):
         return f"Notification for {self.recipient}: {self.actor} {self.verb}"
 
@@ -357,7 +568,7 @@ def create_comment_notification(sender, instance, created, **kwargs):
             ).values_list('muter_id', flat=True))
 
             content_type = ContentType.objects.get_for_model(instance)
-            Notification.objects.bulk_create([
+            created_notifications = Notification.objects.bulk_create([
                 Notification(
                     recipient=u,
                     actor=instance.user,
@@ -369,6 +580,10 @@ def create_comment_notification(sender, instance, created, **kwargs):
                 )
                 for u in mentioned_users if u.id not in muted_by_ids
             ])
+            # bulk_create skips post_save, so update_notification_unread_counter never saw these.
+            from api.services import unread_counters
+            for notification in created_notifications:
+                unread_counters.adjust(notification.recipient_id, 'notifications', 1)
 
 @receiver(post_save, sender='core.Post')
 def sync_post_hashtags(sender, instance, created, **kwargs):
@@ -386,6 +601,99 @@ def sync_post_hashtags(sender, instance, created, **kwargs):
     if tags:
         PostHashtag.objects.bulk_create([PostHashtag(post=instance, tag=t) for t in tags])
 
+@receiver(post_save, sender='core.Post')
+def sync_post_feed_candidate(sender, instance, created, **kwargs):
+    if created:
+        from api.services.feed_candidates import on_post_created
+        on_post_created(instance)
+
+@receiver(post_delete, sender='core.Post')
+def release_post_feed_candidate(sender, instance, **kwargs):
+    from api.services.feed_candidates import on_post_deleted
+    on_post_deleted(instance)
+
+@receiver(post_save, sender='core.Review')
+def sync_review_feed_candidate(sender, instance, created, **kwargs):
+    if created:
+        from api.services.feed_candidates import add_review_candidate
+        add_review_candidate(instance)
+
+@receiver(post_save, sender='core.Like')
+def bump_like_feed_candidate(sender, instance, created, **kwargs):
+    if created:
+        from api.services.feed_candidates import on_like_changed
+        on_like_changed(instance, 1)
+
+@receiver(post_delete, sender='core.Like')
+def release_like_feed_candidate(sender, instance, **kwargs):
+    from api.services.feed_candidates import on_like_changed
+    on_like_changed(instance, -1)
+
+# Trending (api.services.trending): a post's score moves with its likes, bookmarks, replies
+# and reposts — queue it for the next incremental pass.
+@receiver(post_save, sender='core.Like')
+@receiver(post_delete, sender='core.Like')
+@receiver(post_save, sender='core.Bookmark')
+@receiver(post_delete, sender='core.Bookmark')
+def mark_engaged_post_trending_dirty(sender, instance, created=True, **kwargs):
+    if created and instance.post_id:
+        from api.services.trending import mark_dirty
+        mark_dirty(instance.post_id)
+
+@receiver(post_save, sender='core.Post')
+@receiver(post_delete, sender='core.Post')
+def mark_parent_post_trending_dirty(sender, instance, created=True, **kwargs):
+    if created and (instance.parent_id or instance.repost_parent_id):
+        from api.services.trending import mark_dirty
+        mark_dirty(instance.parent_id or instance.repost_parent_id)
+
+# ContentEmbedding rows are keyed by plain ids (one table for three models), so nothing
+# cascades — drop a deleted item's vector here. The ANN indexes notice via table_signature().
+@receiver(post_delete, sender='core.Post')
+@receiver(post_delete, sender='core.Review')
+@receiver(post_delete, sender='core.Game')
+def forget_content_embedding(sender, instance, **kwargs):
+    from api.services.embedding_store import forget
+    forget(sender._meta.model_name, instance.pk)
+
+# Name search (api.services.search_index): journal saved/deleted rows once the transaction
+# commits, so every process's in-memory index re-reads them before its next search. Saves
+# that only touched non-indexed fields are skipped. Bulk writes bypass this — re-run
+# `build_search_index` after large imports.
+@receiver(post_save, sender='core.Game')
+@receiver(post_save, sender='core.Project')
+@receiver(post_save, sender='core.Organisation')
+@receiver(post_save, sender=django_settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender='core.Game')
+@receiver(post_delete, sender='core.Project')
+@receiver(post_delete, sender='core.Organisation')
+@receiver(post_delete, sender=django_settings.AUTH_USER_MODEL)
+def journal_search_index_change(sender, instance, update_fields=None, **kwargs):
+    from django.db import transaction
+    from api.services import search_index
+    kind = search_index.kind_for_model(sender)
+    if kind is None:
+        return
+    if update_fields is not None and not set(update_fields) & {f for f, _ in search_index.SOURCES[kind][1]}:
+        return
+    object_id = instance.pk
+    transaction.on_commit(lambda: search_index.record_change(kind, object_id))
+
+# Canonical genre links (api.services.genre_index) follow Game.genres. Deletes cascade to
+# GameGenre; the bitmaps just need telling.
+@receiver(post_save, sender='core.Game')
+def sync_game_genre_links(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'genres' not in update_fields:
+        return
+    from api.services.genre_index import sync_game_genres
+    sync_game_genres([instance])
+
+@receiver(post_delete, sender='core.Game')
+def forget_game_genre_links(sender, instance, **kwargs):
+    from django.db import transaction
+    from api.services.genre_index import mark_changed
+    transaction.on_commit(mark_changed)
+
 @receiver(post_save, sender='core.Like')
 def create_like_notification(sender, instance, created, **kwargs):
     if created:
@@ -408,6 +716,127 @@ def create_like_notification(sender, instance, created, **kwargs):
                 notification_type='like',
             )
 
+# The cached per-user For You inputs (api.services.feed_candidates.get_feed_profile) go stale
+# the moment the user follows/unfollows someone, edits their library or changes their interests.
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_follow_feed_profile(sender, instance, **kwargs):
+    from api.services.feed_candidates import invalidate_feed_profile
+    invalidate_feed_profile(instance.follower_id)
+
+# The serializers' cached follow/request/block/mute sets (api.services.user_relations) — each
+# row appears in both users' sets (following_ids on one side, *_me_ids on the other).
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_follow_relations(sender, instance, **kwargs):
+    from api.services.user_relations import invalidate_social_relations
+    invalidate_social_relations(instance.follower_id, instance.following_id)
+
+@receiver(post_save, sender=FollowRequest)
+@receiver(post_delete, sender=FollowRequest)
+def invalidate_follow_request_relations(sender, instance, **kwargs):
+    from api.services.user_relations import invalidate_social_relations
+    invalidate_social_relations(instance.sender_id, instance.receiver_id)
+
+@receiver(post_save, sender=LibraryEntry)
+@receiver(post_delete, sender=LibraryEntry)
+def invalidate_library_feed_profile(sender, instance, **kwargs):
+    from api.services.feed_candidates import invalidate_feed_profile
+    invalidate_feed_profile(instance.user_id)
+
+# GameStats rollup (api.services.game_stats): move the counts a review/library change
+# affects. Saves that leave rating/status alone are ignored.
+@receiver(post_save, sender='core.Game')
+def create_game_stats(sender, instance, created, **kwargs):
+    if created:
+        from api.services.game_stats import ensure_row
+        ensure_row(instance)
+
+@receiver(post_save, sender='core.Review')
+def update_review_game_stats(sender, instance, created, update_fields=None, **kwargs):
+    from api.services import game_stats
+    if created:
+        game_stats.on_review_created(instance)
+    elif update_fields is None or 'rating' in update_fields:
+        before = getattr(instance, '_loaded_rating', None)
+        if before is not None and before != instance.rating:
+            game_stats.on_review_rating_changed(instance, before)
+    instance._loaded_rating = instance.rating
+
+@receiver(post_delete, sender='core.Review')
+def release_review_game_stats(sender, instance, **kwargs):
+    from api.services.game_stats import on_review_deleted
+    on_review_deleted(instance)
+
+@receiver(post_save, sender=LibraryEntry)
+def update_library_game_stats(sender, instance, created, update_fields=None, **kwargs):
+    from api.services import game_stats
+    if created:
+        game_stats.on_entry_created(instance)
+    elif update_fields is None or 'status' in update_fields:
+        before = getattr(instance, '_loaded_status', None)
+        if before is not None and before != instance.status:
+            game_stats.on_entry_status_changed(instance, before)
+    instance._loaded_status = instance.status
+
+@receiver(post_delete, sender=LibraryEntry)
+def release_library_game_stats(sender, instance, **kwargs):
+    from api.services.game_stats import on_entry_deleted
+    on_entry_deleted(instance)
+
+# Localisation rollups (api.services.localisation_rollups): approving, unapproving, rejecting,
+# editing or deleting a suggestion moves its project's progress counts and author's characters.
+@receiver(post_save, sender='core.CommunityTranslation')
+def update_localisation_rollups(sender, instance, created, **kwargs):
+    from api.services.localisation_rollups import on_saved
+    on_saved(instance, created)
+
+@receiver(post_delete, sender='core.CommunityTranslation')
+def release_localisation_rollups(sender, instance, origin=None, **kwargs):
+    from api.services.localisation_rollups import on_deleted
+    on_deleted(instance, origin)
+
+# CommunityTranslation change feed (api.services.translation_sync): number every write under
+# the project's lock, re-number a row when its votes change, leave a tombstone on delete.
+@receiver(pre_save, sender='core.CommunityTranslation')
+def stamp_community_translation_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from api.services.translation_sync import stamp
+    stamp(instance)
+
+@receiver(post_delete, sender='core.CommunityTranslation')
+def record_community_translation_deletion(sender, instance, origin=None, **kwargs):
+    from api.services.translation_sync import on_deleted
+    on_deleted(instance, origin)
+
+@receiver(post_save, sender='core.Like')
+def stamp_community_translation_vote(sender, instance, created, **kwargs):
+    if created and instance.community_translation_id:
+        from api.services.translation_sync import on_voted
+        on_voted(instance.community_translation_id)
+
+@receiver(post_delete, sender='core.Like')
+def stamp_community_translation_unvote(sender, instance, origin=None, **kwargs):
+    if instance.community_translation_id:
+        from api.services.translation_sync import on_voted
+        on_voted(instance.community_translation_id, origin)
+
+@receiver(post_delete, sender='core.Project')
+def forget_community_translation_tombstones(sender, instance, **kwargs):
+    CommunityTranslationTombstone.objects.filter(project_id=instance.pk).delete()
+
+@receiver(m2m_changed, sender=User.interests.through)
+def invalidate_interests_feed_profile(sender, instance, action, reverse, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    from api.services.feed_candidates import invalidate_feed_profile
+    if not reverse:
+        invalidate_feed_profile(instance.pk)
+    else:
+        for user_id in kwargs.get('pk_set') or ():
+            invalidate_feed_profile(user_id)
+
 class Conversation(models.Model):
     participants = models.ManyToManyField(django_settings.AUTH_USER_MODEL, related_name='conversations')
     is_group = models.BooleanField(default=False)
@@ -636,6 +1065,19 @@ class Mute(models.Model):
         return f"{self.muter} muted {self.muted}"
 
 
+@receiver(post_save, sender=Block)
+@receiver(post_delete, sender=Block)
+def invalidate_block_relations(sender, instance, **kwargs):
+    from api.services.user_relations import invalidate_social_relations
+    invalidate_social_relations(instance.blocker_id, instance.blocked_id)
+
+@receiver(post_save, sender=Mute)
+@receiver(post_delete, sender=Mute)
+def invalidate_mute_relations(sender, instance, **kwargs):
+    from api.services.user_relations import invalidate_social_relations
+    invalidate_social_relations(instance.muter_id, instance.muted_id)
+
+
 class Report(models.Model):
     """
     Generic report against any content type (post, review, user, conversation, ...). Uses a
@@ -681,24 +1123,137 @@ class Report(models.Model):
         return f"Report by {self.reporter} on {self.target_type}:{self.target_id} ({self.reason})"
 
 
+# Unread badge counters (api.services.unread_counters): each signal moves the cached counter
+# by exactly what changed and pushes the new value to the user's sockets — no recount.
 @receiver(post_save, sender=Notification)
-def trigger_notification_websocket_update(sender, instance, created, **kwargs):
-    from api.consumers import send_user_update
-    send_user_update(instance.recipient_id)
-
-@receiver(post_delete, sender=Notification)
-def trigger_notification_websocket_delete(sender, instance, **kwargs):
-    from api.consumers import send_user_update
-    send_user_update(instance.recipient_id)
-
-@receiver(post_save, sender=Message)
-def trigger_message_websocket_update(sender, instance, created, **kwargs):
+def update_notification_unread_counter(sender, instance, created, **kwargs):
+    from api.services import unread_counters
     if created:
+        if not instance.is_read:
+            unread_counters.adjust(instance.recipient_id, 'notifications', 1)
+        instance._loaded_is_read = instance.is_read
+        return
+    before = getattr(instance, '_loaded_is_read', None)
+    if before is None:
+        # Not loaded from the DB here, so we can't tell whether is_read flipped.
+        unread_counters.invalidate(instance.recipient_id, kind='notifications')
+    elif before != instance.is_read:
+        unread_counters.adjust(instance.recipient_id, 'notifications', -1 if instance.is_read else 1)
+    else:
+        # Content-only change (e.g. grouping an already-unread like) — still refresh the list.
         from api.consumers import send_user_update
-        # Notify all participants in the conversation except the sender
-        for participant in instance.conversation.participants.all():
-            if participant.id != instance.sender_id:
-                send_user_update(participant.id)
-
+        send_user_update(instance.recipient_id)
+    instance._loaded_is_read = instance.is_read
 
+@receiver(post_delete, sender=Notification)
+def release_notification_unread_counter(sender, instance, **kwargs):
+    from api.services import unread_counters
+    if not instance.is_read:
+        unread_counters.adjust(instance.recipient_id, 'notifications', -1)
+    else:
+        from api.consumers import send_user_update
+        send_user_update(instance.recipient_id)
 
+@receiver(post_save, sender=Message)
+def update_message_unread_counters(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        from api.services import unread_counters
+        # Every participant but the sender gains one unread message.
+        for participant_id in instance.conversation.participants.values_list('id', flat=True):
+            if participant_id != instance.sender_id:
+                unread_counters.adjust(participant_id, 'messages', 1)
+
+@receiver(post_delete, sender=Message)
+def release_message_unread_counters(sender, instance, **kwargs):
+    if not instance.is_read:
+        from api.services import unread_counters
+        for participant_id in Conversation.participants.through.objects.filter(
+            conversation_id=instance.conversation_id,
+        ).values_list('user_id', flat=True):
+            if participant_id != instance.sender_id:
+                unread_counters.adjust(participant_id, 'messages', -1)
+
+@receiver(m2m_changed, sender=Conversation.participants.through)
+def invalidate_membership_unread_counters(sender, instance, action, reverse, pk_set, **kwargs):
+    # Joining/leaving changes which messages count for that user; recount rather than diff.
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    from api.services import unread_counters
+    if action == 'pre_clear':
+        user_ids = [instance.pk] if reverse else list(instance.participants.values_list('id', flat=True))
+    else:
+        user_ids = list(pk_set or ()) if not reverse else [instance.pk]
+    unread_counters.invalidate(*user_ids, kind='messages')
+
+@receiver(m2m_changed, sender=Conversation.participants.through)
+def close_revoked_chat_sockets(sender, instance, action, reverse, pk_set, **kwargs):
+    # Open chat sockets joined the conversation's group after a membership check; someone
+    # removed from the conversation must stop receiving its pushes.
+    if action != 'post_remove' or not pk_set:
+        return
+    from api.services import chat_events
+    if reverse:
+        for conversation_id in pk_set:
+            chat_events.publish_membership_revoked(conversation_id, [instance.pk])
+    else:
+        chat_events.publish_membership_revoked(instance.pk, pk_set)
+
+@receiver(pre_delete, sender=Conversation)
+def invalidate_conversation_unread_counters(sender, instance, **kwargs):
+    # The cascade removes the participant rows before the messages' post_delete runs, so
+    # those can't find who to decrement — drop everyone's message counter up front instead.
+    from api.services import unread_counters
+    unread_counters.invalidate(*instance.participants.values_list('id', flat=True), kind='messages')
+
+
+
+
+# Cached token authentication (api.services.auth_cache): drop a token's cached user snapshot
+# as soon as the token or the user changes.
+@receiver(post_delete, sender='authtoken.Token')
+def forget_deleted_auth_token(sender, instance, **kwargs):
+    from api.services import auth_cache
+    auth_cache.invalidate_token(instance.key)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_auth_user(sender, instance, **kwargs):
+    from api.services import auth_cache
+    auth_cache.invalidate_user(instance.pk)
+
+# Compiled effective permissions (api.permissions_service): bump the version counter of the
+# scope a role/membership/ownership change affects, so its cached entries stop being read.
+@receiver(post_save, sender='core.Role')
+@receiver(post_delete, sender='core.Role')
+def invalidate_role_permissions(sender, instance, **kwargs):
+    from api import permissions_service
+    if instance.project_id:
+        permissions_service.invalidate_project(instance.project_id)
+    else:
+        permissions_service.invalidate_organisation(instance.organisation_id)
+
+@receiver(post_save, sender='core.OrganisationMember')
+@receiver(post_delete, sender='core.OrganisationMember')
+def invalidate_org_member_permissions(sender, instance, **kwargs):
+    from api import permissions_service
+    permissions_service.invalidate_organisation(instance.organisation_id)
+
+@receiver(post_save, sender='core.ProjectMember')
+@receiver(post_delete, sender='core.ProjectMember')
+def invalidate_project_member_permissions(sender, instance, **kwargs):
+    from api import permissions_service
+    permissions_service.invalidate_project(instance.project_id)
+
+# Owner or organisation changes — any save, as that's cheap: it only re-resolves this project.
+@receiver(post_save, sender='core.Project')
+@receiver(post_delete, sender='core.Project')
+def invalidate_project_permissions(sender, instance, **kwargs):
+    from api import permissions_service
+    permissions_service.invalidate_project(instance.pk)
+
+# Sectioned board storage (api.services.workspace_sections): a model-level save that put
+# section fields straight into the blob has them moved into their WorkspaceSection rows.
+@receiver(post_save, sender='core.WorkspaceState')
+def absorb_workspace_blob_fields(sender, instance, **kwargs):
+    from api.services.workspace_sections import absorb_blob_fields
+    absorb_blob_fields(instance)
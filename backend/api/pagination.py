@@ -1,12 +1,182 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from operator import attrgetter
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# --- Keyset ("cursor") pages ---------------------------------------------------------------
+#
+# Page-number pages cost a COUNT(*) plus an OFFSET that grows with the page number, and
+# rows inserted while someone scrolls shift every later page (duplicates / skipped rows).
+# A keyset page instead asks for "the next N rows after the last one I saw" in the
+# queryset's own ordering — WHERE (sort key, id) < (last sort key, last id) — so page 500
+# costs the same index range scan as page 1 and new rows can't shift it. The cursor is
+# opaque to clients: base64 JSON of the ordering plus the last row's sort-key values.
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def keyset_ordering(queryset):
+    """[(field, descending)] for the queryset's ordering, ending in the pk as a tiebreak.
+    Raises InvalidCursor for an ordering that isn't plain field names (expressions, '?')."""
+    names = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+    ordering = []
+    for name in names:
+        if not isinstance(name, str) or name == '?':
+            raise InvalidCursor(f'Cannot keyset-paginate on {name!r}')
+        descending = name.startswith('-')
+        name = name.lstrip('-')
+        ordering.append(('pk' if name == queryset.model._meta.pk.name else name, descending))
+        if ordering[-1][0] == 'pk':
+            return ordering
+    ordering.append(('pk', ordering[-1][1] if ordering else True))
+    return ordering
+
+
+def _field(model, path):
+    """The model field at the end of a `a__b` lookup path, or None (annotations)."""
+    if path == 'pk':
+        return model._meta.pk
+    field = None
+    for part in path.split('__'):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        model = field.related_model or model
+    return field
+
+
+def _dump(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(ordering, values):
+    payload = {'o': [('-' if desc else '') + name for name, desc in ordering], 'v': [_dump(v) for v in values]}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
 
+def decode_cursor(token, ordering, model):
+    """The sort-key values in `token`, converted back to their fields' Python types. Raises
+    InvalidCursor for garbage, or for a cursor taken under a different ordering."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        keys, values = payload['o'], payload['v']
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor('Malformed cursor')
+    if keys != [('-' if desc else '') + name for name, desc in ordering] or len(values) != len(ordering):
+        raise InvalidCursor('Cursor does not match this ordering')
+    converted = []
+    for (name, _), value in zip(ordering, values):
+        field = _field(model, name)
+        try:
+            converted.append(field.to_python(value) if field is not None and value is not None else value)
+        except Exception:
+            raise InvalidCursor('Malformed cursor')
+    return converted
 
-class StandardResultsSetPagination(PageNumberPagination):
+
+def after(ordering, values):
+    """Rows strictly after `values` in `ordering`: the row-value comparison spelled as
+    `k1 <= v1 AND (k1 < v1 OR (k1 = v1 AND k2 < v2) OR ...)` (per-key direction); the
+    redundant leading bound lets the planner range-scan an index on the first key."""
+    condition, equal = None, {}
+    for (name, descending), value in zip(ordering, values):
+        step = Q(**equal, **{f'{name}__{"lt" if descending else "gt"}': value})
+        condition = step if condition is None else condition | step
+        equal[name] = value
+    first, descending = ordering[0]
+    return Q(**{f'{first}__{"lte" if descending else "gte"}': values[0]}) & condition
+
+
+def keyset_page(queryset, cursor, page_size):
+    """(rows, next_cursor) — the page of `queryset` after `cursor` (None: the first page),
+    in the queryset's ordering plus a pk tiebreak. next_cursor is None on the last page.
+    Sort keys must be non-null."""
+    ordering = keyset_ordering(queryset)
+    queryset = queryset.order_by(*[('-' if desc else '') + name for name, desc in ordering])
+    if cursor:
+        queryset = queryset.filter(after(ordering, decode_cursor(cursor, ordering, queryset.model)))
+    rows = list(queryset[:page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    values = [attrgetter(name.replace('__', '.'))(last) for name, _ in ordering]
+    return rows, encode_cursor(ordering, values)
+
+
+class KeysetOrPageNumberPagination(PageNumberPagination):
+    """Page-number pagination that switches to keyset pages when the request carries
+    `?cursor=` (empty for the first page). Keyset responses are
+    {'next', 'next_cursor', 'has_more', 'results'} — forward-only, for infinite scroll.
+
+    With `opt_in = True` a request with neither `page` nor `cursor` is left unpaginated, for
+    endpoints whose existing clients expect the bare list."""
+    cursor_query_param = 'cursor'
+    opt_in = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.next_cursor = None
+        # Plain lists (e.g. computed leaderboards) have no ordering to key on: page numbers.
+        self.keyset_mode = self.cursor_query_param in request.query_params and isinstance(queryset, QuerySet)
+        if self.keyset_mode:
+            self.request = request
+            try:
+                rows, self.next_cursor = keyset_page(
+                    queryset, request.query_params.get(self.cursor_query_param), self.get_page_size(request),
+                )
+            except InvalidCursor:
+                raise NotFound('Invalid cursor')
+            return rows
+        if self.opt_in and self.page_query_param not in request.query_params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_next_link(self):
+        if not self.keyset_mode:
+            return super().get_next_link()
+        if self.next_cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        if not self.keyset_mode:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'next_cursor': self.next_cursor,
+            'has_more': self.next_cursor is not None,
+            'results': data,
+        })
+
+
+class StandardResultsSetPagination(KeysetOrPageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
 
 
+class OptInResultsSetPagination(StandardResultsSetPagination):
+    """For list endpoints that predate pagination (notifications, library): unpaginated
+    unless the client asks for `?page=` or `?cursor=`."""
+    opt_in = True
+
+
 class LargeResultsSetPagination(PageNumberPagination):
     """For endpoints whose consumers legitimately need the whole set client-side (e.g. the
     localisation surfaces filter contributions by key/language in the browser) but must not
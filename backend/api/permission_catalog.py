@@ -138,6 +138,8 @@ TOOL_WRITE_PERMISSIONS = {
     # public community-translation feature (api.views.CommunityTranslationViewSet) deliberately
     # never goes through this coarse path — it writes to a real model, with the one blob write
     # it does perform being moderator-gated, single-key, and version-checked.
+    # The per-section write path (WorkspaceStateViewSet.sections) is field-scoped: each section
+    # is authorised against its own tool's keys (api.services.workspace_sections.SECTION_TOOLS).
     "localisation": ["localisation.key.create", "localisation.suggestion.create", "localisation.language.manage"],
     "members": ["team.invite", "team.role.assign", "team.role.manage", "team.remove"],
     "settings": ["settings.edit"],
@@ -11,7 +11,27 @@ Resolution order for a given (user, organisation, project) scope:
   3. Org-wide scope: OrganisationMember's custom_role, falling back to their
      legacy flat `role`.
 No access at all (not a member, no ownership) -> None.
+
+A resolved scope is compiled once into an immutable frozenset of keys and cached at two
+levels, since a single request often checks the same scope several times (and the shared
+board endpoints check it on every save):
+- per request, on the user object (`_permission_memo`) — no cache round trip at all;
+- across requests, in the Django cache as a bitmask over ALL_PERMISSION_KEYS (plus any keys
+  a role carries that the catalog doesn't know), under a key that embeds the scope's version
+  counters: `perms:org:{id}:version` and `perms:project:{id}:version`. Role, OrganisationMember,
+  ProjectMember and Project saves/deletes bump them (signals in api.models), so an edit makes
+  every entry it could affect unreachable instead of having to find and delete them. A
+  project-scope entry embeds both counters, as org roles and org membership feed into it.
+`queryset.update()` bypasses the signals — call invalidate_organisation/invalidate_project
+after one. PERMS_TTL bounds anything else.
+
+resolve_for_users / resolve_for_projects resolve many scopes at once with one membership
+query per kind instead of one per scope.
 """
+from functools import lru_cache
+
+from django.core.cache import cache
+from django.db import transaction
 
 from core.models import OrganisationMember, ProjectMember
 from .permission_catalog import (
@@ -22,61 +42,270 @@ from .permission_catalog import (
     map_legacy_role,
 )
 
+PERMS_TTL = 10 * 60
+ORG_VERSION_KEY = 'perms:org:{id}:version'
+PROJECT_VERSION_KEY = 'perms:project:{id}:version'
+ENTRY_KEY = 'perms:{user_id}:{scope}:{versions}'
+# Cached in place of a bitmask for "no access to this scope".
+_NO_ACCESS = -1
+
+_BITS = {key: 1 << index for index, key in enumerate(ALL_PERMISSION_KEYS)}
+ALL_PERMISSIONS = frozenset(ALL_PERMISSION_KEYS)
+
+# Bumped by every invalidation in this process; per-request memos older than it are ignored,
+# so a request that changes a membership and then re-checks sees the change.
+_generation = 0
+
+
+# --- Compiled permission sets ------------------------------------------------------------
+
+def _encode(keys):
+    """(bitmask over ALL_PERMISSION_KEYS, sorted tuple of unknown keys) for a key list, or
+    _NO_ACCESS for None."""
+    if keys is None:
+        return _NO_ACCESS
+    mask, extras = 0, set()
+    for key in keys:
+        bit = _BITS.get(key)
+        if bit is None:
+            extras.add(key)
+        else:
+            mask |= bit
+    return (mask, tuple(sorted(extras))) if extras else mask
+
+
+@lru_cache(maxsize=512)
+def _decode(value):
+    if value == _NO_ACCESS:
+        return None
+    mask, extras = value if isinstance(value, tuple) else (value, ())
+    return frozenset([key for key, bit in _BITS.items() if mask & bit] + list(extras))
+
+
+# --- Versions ----------------------------------------------------------------------------
+
+def _bump(key):
+    global _generation
+    _generation += 1
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:  # evicted between add and incr
+        cache.add(key, 1, None)
+
+
+def _invalidate(key):
+    """Bumps now and again after the current transaction commits (so a request racing the
+    write can't cache the old rows under the new version)."""
+    _bump(key)
+    transaction.on_commit(lambda: _bump(key))
+
+
+def invalidate_organisation(organisation_id):
+    if organisation_id:
+        _invalidate(ORG_VERSION_KEY.format(id=organisation_id))
+
+
+def invalidate_project(project_id):
+    if project_id:
+        _invalidate(PROJECT_VERSION_KEY.format(id=project_id))
+
+
+def _version_keys(scope):
+    kind, scope_id, organisation_id = scope
+    keys = [ORG_VERSION_KEY.format(id=organisation_id)] if organisation_id else []
+    if kind == 'project':
+        keys.append(PROJECT_VERSION_KEY.format(id=scope_id))
+    return keys
+
+
+def _scope(organisation, project):
+    """('project' | 'organisation', id, organisation_id), or None for the solo workspace."""
+    if project is not None:
+        return ('project', project.id, project.organisation_id)
+    if organisation is not None:
+        return ('organisation', organisation.id, organisation.id)
+    return None
+
+
+def _entry_keys(user_ids, scopes):
+    """{(user_id, scope): cache key} for every pair, reading each version counter once."""
+    version_keys = {key for scope in scopes for key in _version_keys(scope)}
+    versions = cache.get_many(version_keys) if version_keys else {}
+    keys = {}
+    for user_id, scope in zip(user_ids, scopes):
+        stamp = '.'.join(str(versions.get(key, 0)) for key in _version_keys(scope))
+        keys[(user_id, scope)] = ENTRY_KEY.format(user_id=user_id, scope=f'{scope[0][0]}{scope[1]}', versions=stamp)
+    return keys
+
+
+# --- Resolution from the DB --------------------------------------------------------------
 
-def _resolve_org_member_permissions(organisation, org_member):
+def _resolve_org_member_permissions(organisation, org_member, default_roles):
     if org_member.custom_role_id:
         return list(org_member.custom_role.permissions)
-    roles = create_default_roles(organisation)
-    return list(roles[map_legacy_role(org_member.role)].permissions)
+    return list(default_roles(organisation)[map_legacy_role(org_member.role)].permissions)
 
 
-def get_effective_permissions(user, organisation=None, project=None):
-    """Returns list[str] of permission keys, or None if the user has no access to this scope."""
-    if project is not None:
-        if project.owner_id == user.id:
-            if project.organisation_id:
-                roles = create_default_roles(project.organisation)
-                return list(roles["owner"].permissions)
-            return list(ALL_PERMISSION_KEYS)
+def _compute(pairs):
+    """{(user_id, scope): key list or None} for (user_id, organisation, project) triples, with
+    one ProjectMember and one OrganisationMember query for the whole batch."""
+    org_roles, project_roles = {}, {}
 
-        member = ProjectMember.objects.filter(project=project, user=user, status="active").select_related("custom_role").first()
+    def default_roles(organisation):
+        if organisation.id not in org_roles:
+            org_roles[organisation.id] = create_default_roles(organisation)
+        return org_roles[organisation.id]
+
+    def default_project_roles(project):
+        if project.id not in project_roles:
+            project_roles[project.id] = create_default_project_roles(project)
+        return project_roles[project.id]
+
+    results, needs_org_member = {}, []
+    project_pairs = [(user_id, project) for user_id, _, project in pairs if project is not None]
+    members = {}
+    candidates = [(user_id, project) for user_id, project in project_pairs if project.owner_id != user_id]
+    if candidates:
+        rows = ProjectMember.objects.filter(
+            project_id__in={project.id for _, project in candidates},
+            user_id__in={user_id for user_id, _ in candidates},
+            status="active",
+        ).select_related("custom_role")
+        members = {(row.user_id, row.project_id): row for row in rows}
+
+    for user_id, organisation, project in pairs:
+        scope = _scope(organisation, project)
+        if project is None:
+            needs_org_member.append((user_id, organisation, scope))
+            continue
+        if project.owner_id == user_id:
+            if project.organisation_id:
+                results[(user_id, scope)] = list(default_roles(project.organisation)["owner"].permissions)
+            else:
+                results[(user_id, scope)] = list(ALL_PERMISSION_KEYS)
+            continue
+        member = members.get((user_id, project.id))
         if member:
             if member.custom_role_id:
-                return list(member.custom_role.permissions)
-            if project.organisation_id:
-                roles = create_default_project_roles(project)
-                return list(roles[map_legacy_role(member.role)].permissions)
-            return legacy_role_permissions(member.role)
-
+                results[(user_id, scope)] = list(member.custom_role.permissions)
+            elif project.organisation_id:
+                results[(user_id, scope)] = list(default_project_roles(project)[map_legacy_role(member.role)].permissions)
+            else:
+                results[(user_id, scope)] = legacy_role_permissions(member.role)
+            continue
         # Not a direct project member: org owner/admin get implicit access to
         # every project in their org (mirrors ProjectViewSet's manageable filter).
         if project.organisation_id:
-            org_member = OrganisationMember.objects.filter(
-                organisation=project.organisation, user=user
-            ).select_related("custom_role").first()
-            if org_member and org_member.role in ("owner", "admin"):
-                return _resolve_org_member_permissions(project.organisation, org_member)
+            needs_org_member.append((user_id, project.organisation, scope))
+        else:
+            results[(user_id, scope)] = None
+
+    org_members = {}
+    if needs_org_member:
+        rows = OrganisationMember.objects.filter(
+            organisation_id__in={organisation.id for _, organisation, _ in needs_org_member},
+            user_id__in={user_id for user_id, _, _ in needs_org_member},
+        ).select_related("custom_role")
+        org_members = {(row.user_id, row.organisation_id): row for row in rows}
+
+    for user_id, organisation, scope in needs_org_member:
+        org_member = org_members.get((user_id, organisation.id))
+        if not org_member or (scope[0] == 'project' and org_member.role not in ("owner", "admin")):
+            results[(user_id, scope)] = None
+        else:
+            results[(user_id, scope)] = _resolve_org_member_permissions(organisation, org_member, default_roles)
+    return results
+
+
+def _resolve_many(pairs):
+    """{(user_id, scope): frozenset or None} for (user_id, organisation, project) triples with
+    a real scope: cache hits, the rest resolved in one batch and cached."""
+    scopes = [_scope(organisation, project) for _, organisation, project in pairs]
+    keys = _entry_keys([user_id for user_id, _, _ in pairs], scopes)
+    cached = cache.get_many(set(keys.values()))
+    results, misses = {}, []
+    for (user_id, organisation, project), scope in zip(pairs, scopes):
+        value = cached.get(keys[(user_id, scope)])
+        if value is None:
+            misses.append((user_id, organisation, project))
+        else:
+            results[(user_id, scope)] = _decode(value)
+    if misses:
+        computed = {pair: _encode(perms) for pair, perms in _compute(misses).items()}
+        cache.set_many({keys[pair]: value for pair, value in computed.items()}, PERMS_TTL)
+        results.update((pair, _decode(value)) for pair, value in computed.items())
+    return results
+
+
+# --- Public API --------------------------------------------------------------------------
+
+def resolve(user, organisation=None, project=None):
+    """frozenset of the user's permission keys in this scope, or None if they have no access
+    to it. Memoized on `user` for the rest of the request."""
+    scope = _scope(organisation, project)
+    if scope is None:
+        # Pure solo workspace — no org, no project.
+        return ALL_PERMISSIONS
+    if user.pk is None:
         return None
+    memo = user.__dict__.setdefault('_permission_memo', {})
+    hit = memo.get(scope)
+    if hit is not None and hit[0] == _generation:
+        return hit[1]
+    generation = _generation
+    perms = _resolve_many([(user.pk, organisation, project)])[(user.pk, scope)]
+    memo[scope] = (generation, perms)
+    return perms
 
-    if organisation is not None:
-        org_member = OrganisationMember.objects.filter(
-            organisation=organisation, user=user
-        ).select_related("custom_role").first()
-        if not org_member:
-            return None
-        return _resolve_org_member_permissions(organisation, org_member)
 
-    # Pure solo workspace — no org, no project.
-    return list(ALL_PERMISSION_KEYS)
+def resolve_for_users(users, organisation=None, project=None):
+    """{user_id: frozenset or None} for many users (instances or ids) in one scope — e.g. a
+    team listing that shows what each member can do."""
+    user_ids = [getattr(user, 'pk', user) for user in users]
+    scope = _scope(organisation, project)
+    if scope is None:
+        return {user_id: ALL_PERMISSIONS for user_id in user_ids}
+    results = _resolve_many([(user_id, organisation, project) for user_id in user_ids])
+    return {user_id: results[(user_id, scope)] for user_id in user_ids}
+
+
+def resolve_for_projects(user, projects):
+    """{project_id: frozenset or None} for one user across many projects."""
+    results = _resolve_many([(user.pk, None, project) for project in projects])
+    return {project.id: results[(user.pk, _scope(None, project))] for project in projects}
+
+
+def users_with_permission(users, permission_key, organisation=None, project=None):
+    """Ids of the users (instances or ids) holding `permission_key` in this scope."""
+    return {
+        user_id for user_id, perms in resolve_for_users(users, organisation, project).items()
+        if perms is not None and permission_key in perms
+    }
+
+
+def projects_with_permission(user, permission_key, projects):
+    """The projects in which `user` holds `permission_key`, in the given order."""
+    projects = list(projects)
+    perms = resolve_for_projects(user, projects)
+    return [project for project in projects if perms[project.id] is not None and permission_key in perms[project.id]]
+
+
+def get_effective_permissions(user, organisation=None, project=None):
+    """Returns list[str] of permission keys, or None if the user has no access to this scope."""
+    perms = resolve(user, organisation=organisation, project=project)
+    if perms is None:
+        return None
+    return [key for key in ALL_PERMISSION_KEYS if key in perms] + sorted(perms - ALL_PERMISSIONS)
 
 
 def user_has_permission(user, permission_key, organisation=None, project=None):
-    perms = get_effective_permissions(user, organisation=organisation, project=project)
+    perms = resolve(user, organisation=organisation, project=project)
     return perms is not None and permission_key in perms
 
 
 def user_has_any_permission(user, permission_keys, organisation=None, project=None):
-    perms = get_effective_permissions(user, organisation=organisation, project=project)
+    perms = resolve(user, organisation=organisation, project=project)
     if perms is None:
         return False
     return any(key in perms for key in permission_keys)
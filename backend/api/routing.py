@@ -1,6 +1,7 @@
 from django.urls import re_path
-from api.consumers import NotificationConsumer
+from api.consumers import ChatConsumer, NotificationConsumer
 
 websocket_urlpatterns = [
     re_path(r'^ws/updates/$', NotificationConsumer.as_asgi()),
+    re_path(r'^ws/chat/(?P<conversation_id>\d+)/$', ChatConsumer.as_asgi()),
 ]
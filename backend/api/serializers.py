@@ -80,48 +80,156 @@ def validate_extra_links_value(value):
         cleaned.append({'label': label[:100], 'url': url})
     return cleaned
 
+class ScopedRelation:
+    """The current user's rows in one relation (likes on posts, bookmarks on reviews, ...),
+    loaded only for the object ids a response actually renders.
+
+    `loader(ids)` returns (id, value) pairs for the ids that match. Ids are queued with want()
+    (RelationPrimingListSerializer / prime_request_cache do this for a whole page up front),
+    and the first lookup of anything unresolved runs a single IN query for everything queued.
+    An id nobody primed still works — it just costs its own query.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        self._values = {}
+        self._pending = set()
+
+    def want(self, ids):
+        self._pending.update(i for i in ids if i is not None and i not in self._values)
+
+    def get(self, object_id, default=None):
+        if object_id is None:
+            return default
+        if object_id not in self._values:
+            ids = self._pending | {object_id}
+            self._pending = set()
+            found = dict(self.loader(ids))
+            for i in ids:
+                self._values[i] = found.get(i)
+        value = self._values[object_id]
+        return default if value is None else value
+
+    def __contains__(self, object_id):
+        return self.get(object_id) is not None
+
+
+class _EmptyRelation:
+    def want(self, ids):
+        pass
+
+    def get(self, object_id, default=None):
+        return default
+
+    def __contains__(self, object_id):
+        return False
+
+
+def _scoped_loaders(user):
+    from core.models import PollVote
+
+    def marked(qs, field):
+        return lambda ids: ((i, True) for i in qs.filter(**{f'{field}__in': ids}).values_list(field, flat=True))
+
+    return {
+        'liked_post_ids': marked(Like.objects.filter(user=user), 'post_id'),
+        'bookmarked_post_ids': marked(Bookmark.objects.filter(user=user), 'post_id'),
+        'reposted_post_ids': marked(Post.objects.filter(DIRECT_REPOST_Q, user=user), 'repost_parent_id'),
+        'liked_review_ids': marked(Like.objects.filter(user=user), 'review_id'),
+        'bookmarked_review_ids': marked(Bookmark.objects.filter(user=user), 'review_id'),
+        'liked_news_ids': marked(Like.objects.filter(user=user), 'news_id'),
+        'bookmarked_news_ids': marked(Bookmark.objects.filter(user=user), 'news_id'),
+        'poll_vote_by_post_id': lambda ids: PollVote.objects.filter(user=user, post_id__in=ids).values_list('post_id', 'option_index'),
+    }
+
+
+class RequestRelationCache:
+    """
+    What the current user has to do with the objects being serialized, keyed like the old
+    eagerly-built dict (`obj.id in cache['liked_post_ids']`, cache['poll_vote_by_post_id'].get()).
+    Nothing is loaded until a field asks: the follow/request/block/mute sets come whole from
+    api.services.user_relations (cached across requests), every like/bookmark/repost/poll-vote
+    relation is a ScopedRelation bounded by the ids on the page.
+    """
+
+    def __init__(self, user):
+        self.user = user if user.is_authenticated else None
+        self._social = None
+        self._scoped = {}
+
+    def __bool__(self):
+        return True
+
+    def __getitem__(self, key):
+        from api.services.user_relations import SOCIAL_RELATIONS, get_social_relations
+        if key in SOCIAL_RELATIONS:
+            if self.user is None:
+                return frozenset()
+            if self._social is None:
+                self._social = get_social_relations(self.user.id)
+            return self._social[key]
+        relation = self._scoped.get(key)
+        if relation is None:
+            if self.user is None:
+                relation = _EmptyRelation()
+            else:
+                relation = ScopedRelation(_scoped_loaders(self.user)[key])
+            self._scoped[key] = relation
+        return relation
+
+
 def get_request_cache(request):
     if not request:
         return None
     if not hasattr(request, '_user_relations_cache'):
-        cache = {
-            'following_ids': set(),
-            'requested_ids': set(),
-            'requested_me_ids': set(),
-            'blocked_ids': set(),
-            'blocked_me_ids': set(),
-            'muted_ids': set(),
-            'liked_post_ids': set(),
-            'bookmarked_post_ids': set(),
-            'reposted_post_ids': set(),
-            'liked_review_ids': set(),
-            'bookmarked_review_ids': set(),
-            'liked_news_ids': set(),
-            'bookmarked_news_ids': set(),
-            'poll_vote_by_post_id': {},
-        }
-        if request.user.is_authenticated:
-            from api.models import Follow, FollowRequest, Block, Mute
-            from core.models import Like, Bookmark, Post, PollVote
-            cache['following_ids'] = set(Follow.objects.filter(follower=request.user).values_list('following_id', flat=True))
-            cache['requested_ids'] = set(FollowRequest.objects.filter(sender=request.user).values_list('receiver_id', flat=True))
-            cache['requested_me_ids'] = set(FollowRequest.objects.filter(receiver=request.user).values_list('sender_id', flat=True))
-            cache['blocked_ids'] = set(Block.objects.filter(blocker=request.user).values_list('blocked_id', flat=True))
-            cache['blocked_me_ids'] = set(Block.objects.filter(blocked=request.user).values_list('blocker_id', flat=True))
-            cache['muted_ids'] = set(Mute.objects.filter(muter=request.user).values_list('muted_id', flat=True))
-
-            cache['liked_post_ids'] = set(Like.objects.filter(user=request.user, post__isnull=False).values_list('post_id', flat=True))
-            cache['bookmarked_post_ids'] = set(Bookmark.objects.filter(user=request.user, post__isnull=False).values_list('post_id', flat=True))
-            cache['reposted_post_ids'] = set(Post.objects.filter(DIRECT_REPOST_Q, user=request.user, repost_parent__isnull=False).values_list('repost_parent_id', flat=True))
-            cache['liked_review_ids'] = set(Like.objects.filter(user=request.user, review__isnull=False).values_list('review_id', flat=True))
-            cache['bookmarked_review_ids'] = set(Bookmark.objects.filter(user=request.user, review__isnull=False).values_list('review_id', flat=True))
-            cache['liked_news_ids'] = set(Like.objects.filter(user=request.user, news__isnull=False).values_list('news_id', flat=True))
-            cache['bookmarked_news_ids'] = set(Bookmark.objects.filter(user=request.user, news__isnull=False).values_list('news_id', flat=True))
-            cache['poll_vote_by_post_id'] = dict(PollVote.objects.filter(user=request.user).values_list('post_id', 'option_index'))
-        request._user_relations_cache = cache
+        request._user_relations_cache = RequestRelationCache(request.user)
     return request._user_relations_cache
 
 
+def prime_request_cache(request, posts=(), reviews=(), news=()):
+    """Queues the ids a page of posts/reviews/news will look up — including the repost/parent/
+    review embeds each post renders — so each relation resolves in one IN query."""
+    cache = get_request_cache(request)
+    if cache is None:
+        return
+    post_ids, review_ids = set(), set()
+    for post in posts:
+        post_ids.update((post.id, post.repost_parent_id, post.parent_id))
+        review_ids.update((post.review_parent_id, post.repost_parent_review_id))
+    for review in reviews:
+        review_ids.add(review.id)
+    post_ids.discard(None)
+    review_ids.discard(None)
+    if post_ids:
+        for key in ('liked_post_ids', 'bookmarked_post_ids', 'reposted_post_ids', 'poll_vote_by_post_id'):
+            cache[key].want(post_ids)
+    if review_ids:
+        for key in ('liked_review_ids', 'bookmarked_review_ids'):
+            cache[key].want(review_ids)
+    news_ids = {item.id for item in news}
+    if news_ids:
+        for key in ('liked_news_ids', 'bookmarked_news_ids'):
+            cache[key].want(news_ids)
+
+
+class RelationPrimingListSerializer(serializers.ListSerializer):
+    """many=True for Post/Review/News serializers: primes the request relation cache with the
+    whole page before the children render."""
+
+    def to_representation(self, data):
+        from django.db.models.manager import BaseManager
+        items = list(data.all() if isinstance(data, BaseManager) else data)
+        model = self.child.Meta.model
+        request = self.context.get('request')
+        if model is Post:
+            prime_request_cache(request, posts=items)
+        elif model is Review:
+            prime_request_cache(request, reviews=items)
+        elif model is News:
+            prime_request_cache(request, news=items)
+        return super().to_representation(items)
+
+
 def _compute_poll_results(obj, context):
     """
     Shared by PostSerializer and SimplePostSerializer so both surfaces (full posts and
@@ -515,14 +623,19 @@ class GameDetailSerializer(serializers.ModelSerializer):
     average_rating = serializers.FloatField(read_only=True)
     review_count = serializers.IntegerField(read_only=True)
     log_count = serializers.IntegerField(read_only=True)
+    # From the GameStats rollup: reviews per whole-number rating, library entries per status.
+    rating_histogram = serializers.DictField(read_only=True)
+    status_counts = serializers.DictField(read_only=True)
 
     class Meta:
         model = Game
         fields = [
             'id', 'title', 'cover_image', 'release_date', 'igdb_id', 'steam_appid', 'genres',
             'summary', 'description', 'developer', 'publisher', 'screenshots', 'platforms', 'igdb_url',
-            'average_rating', 'review_count', 'log_count',
-            'metacritic_score', 'hltb_main', 'hltb_main_extra', 'hltb_completionist'
+            'average_rating', 'review_count', 'log_count', 'rating_histogram', 'status_counts',
+            'metacritic_score', 'hltb_main', 'hltb_main_extra', 'hltb_completionist',
+            # False while IGDB details are still being hydrated in the background.
+            'details_fetched',
         ]
         read_only_fields = ['id']
 
@@ -576,6 +689,7 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
+        list_serializer_class = RelationPrimingListSerializer
         fields = [
             'id', 'user', 'game', 'game_id', 'rating', 'content', 'is_liked', 'is_bookmarked',
             'bookmarks_count', 'is_completed', 'contains_spoilers', 'timestamp', 'type',
@@ -670,6 +784,7 @@ class SimplePostSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Post
+        list_serializer_class = RelationPrimingListSerializer
         fields = ['id', 'user', 'title', 'content', 'image', 'media_file', 'media_type', 'media', 'gif_url', 'poll_options', 'poll_expires_at', 'poll_results', 'timestamp', 'parent', 'review_parent', 'news_parent', 'repost_parent', 'replies_count', 'type', 'reply_to_username', 'news_details', 'category', 'trending_score', 'is_liked', 'likes_count', 'is_bookmarked', 'bookmarks_count', 'is_reposted', 'reposts_count']
 
     def get_poll_results(self, obj):
@@ -798,6 +913,7 @@ class PostSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Post
+        list_serializer_class = RelationPrimingListSerializer
         fields = [
             'id', 'user', 'author_identity', 'author_details', 'title', 'content', 'image', 'parent', 'review_parent', 'news_parent', 'project_parent',
             'timestamp', 'replies_count', 'likes_count', 'is_liked', 'is_bookmarked', 'bookmarks_count',
@@ -1200,6 +1316,7 @@ class NewsSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = News
+        list_serializer_class = RelationPrimingListSerializer
         fields = ['id', 'title', 'link', 'image_url', 'description', 'pub_date', 'category', 'source_name', 'source_icon', 'is_liked', 'is_bookmarked', 'like_count', 'comment_count', 'bookmarks_count']
 
     def get_is_liked(self, obj):
@@ -1485,6 +1602,7 @@ class CommunityTranslationSerializer(serializers.ModelSerializer):
 
     def validate(self, attrs):
         from .locale_registry import get as get_locale, resolve_project_locales
+        from .services import workspace_sections
         from .views import _project_workspace_state_readonly
 
         project = attrs.get('project') if self.instance is None else self.instance.project
@@ -1492,7 +1610,7 @@ class CommunityTranslationSerializer(serializers.ModelSerializer):
         language = attrs.get('language') if self.instance is None else self.instance.language
 
         state = _project_workspace_state_readonly(project) if project else None
-        entries = (state.data or {}).get('translationKeys', []) if state else []
+        entries = workspace_sections.read_data(state, 'translationKeys', [])
         entry = next((e for e in entries if e.get('key') == key), None)
 
         # Key/language identity and the duplicate-suggestion check are create-only — on update,
@@ -1743,3 +1861,11 @@ class WorkspaceStateSerializer(serializers.ModelSerializer):
         model = WorkspaceState
         fields = ['key', 'data', 'version', 'updated_at']
 
+    def to_representation(self, instance):
+        # `data` is the whole board, reassembled from its sections (api.services.workspace_sections),
+        # plus each section's version for clients that write sections individually.
+        from api.services.workspace_sections import snapshot
+        representation = super().to_representation(instance)
+        representation['data'], representation['section_versions'] = snapshot(instance)
+        return representation
+
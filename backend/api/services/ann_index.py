@@ -0,0 +1,144 @@
+"""
+Pure-NumPy approximate-nearest-neighbour index (IVF, "inverted file") over unit-length
+embedding vectors — no external vector service.
+
+Vectors are clustered with a few rounds of spherical k-means into ~sqrt(n) lists. A query
+is compared against the list centroids first, and only the `n_probe` closest lists are
+scanned exactly, so a search touches a small fraction of the vectors instead of all of them.
+Vectors are stored float16 and grouped by list, so each probed list is one contiguous slice;
+save()/load() persist the index as plain .npy files that load memory-mapped, published as
+one atomic snapshot (api.services.index_snapshots).
+"""
+import json
+import os
+
+import numpy as np
+
+from api.services import index_snapshots
+
+# Below this many vectors a single list (i.e. exact search) is as fast as probing.
+MIN_VECTORS_FOR_CLUSTERING = 2048
+DEFAULT_N_PROBE = 8
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE = 50000
+_CHUNK = 8192
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _assign(vectors, centroids):
+    """Index of the nearest (highest cosine) centroid for each row, computed in chunks so a
+    large build never materializes the full n x lists similarity matrix."""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), _CHUNK):
+        chunk = np.asarray(vectors[start:start + _CHUNK], dtype=np.float32)
+        out[start:start + _CHUNK] = np.argmax(chunk @ centroids.T, axis=1)
+    return out
+
+
+class IVFIndex:
+    def __init__(self, centroids, offsets, ids, vectors, meta=None):
+        self.centroids = centroids      # (lists, dim) float32, unit length
+        self.offsets = offsets          # (lists + 1,) int64 — list i is rows offsets[i]:offsets[i+1]
+        self.ids = ids                  # (n,) int64, grouped by list
+        self.vectors = vectors          # (n, dim) float16, grouped by list
+        self.meta = meta or {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, ids, vectors, n_lists=None, iterations=KMEANS_ITERATIONS, seed=0, meta=None):
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = _normalize(vectors)
+        n = len(ids)
+        if n == 0:
+            dim = vectors.shape[1] if vectors.ndim == 2 else 0
+            return cls(np.zeros((1, dim), np.float32), np.zeros(2, np.int64), ids, np.zeros((0, dim), np.float16), meta)
+
+        if n_lists is None:
+            n_lists = 1 if n < MIN_VECTORS_FOR_CLUSTERING else int(np.sqrt(n))
+        n_lists = max(1, min(n_lists, n))
+
+        if n_lists == 1:
+            centroids = _normalize(vectors.mean(axis=0, keepdims=True))
+            assignment = np.zeros(n, dtype=np.int32)
+        else:
+            rng = np.random.default_rng(seed)
+            sample = vectors[rng.choice(n, size=min(n, KMEANS_SAMPLE), replace=False)]
+            centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+            for _ in range(iterations):
+                labels = _assign(sample, centroids)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                counts = np.bincount(labels, minlength=n_lists)
+                empty = counts == 0
+                # Re-seed empty lists from random sample points rather than leaving them dead.
+                sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+                centroids = _normalize(sums)
+            assignment = _assign(vectors, centroids)
+
+        order = np.argsort(assignment, kind='stable')
+        counts = np.bincount(assignment, minlength=n_lists)
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return cls(centroids.astype(np.float32), offsets, ids[order], vectors[order].astype(np.float16), meta)
+
+    def search(self, query, k=10, n_probe=DEFAULT_N_PROBE, exclude_ids=()):
+        """Returns up to k (id, cosine similarity) pairs, best first."""
+        if len(self) == 0 or k <= 0:
+            return []
+        query = _normalize(query).reshape(-1)
+        n_probe = max(1, min(n_probe, self.n_lists))
+        if n_probe >= self.n_lists:
+            lists = range(self.n_lists)
+        else:
+            centroid_sims = self.centroids @ query
+            lists = np.argpartition(-centroid_sims, n_probe - 1)[:n_probe]
+
+        slices = [slice(self.offsets[i], self.offsets[i + 1]) for i in lists if self.offsets[i + 1] > self.offsets[i]]
+        if not slices:
+            return []
+        cand_ids = np.concatenate([self.ids[s] for s in slices])
+        sims = np.concatenate([np.asarray(self.vectors[s], dtype=np.float32) @ query for s in slices])
+
+        if exclude_ids:
+            keep = ~np.isin(cand_ids, np.fromiter(exclude_ids, dtype=np.int64))
+            cand_ids, sims = cand_ids[keep], sims[keep]
+        if len(sims) == 0:
+            return []
+        k = min(k, len(sims))
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top], kind='stable')]
+        return [(int(cand_ids[i]), float(sims[i])) for i in top]
+
+    def save(self, directory):
+        def write_files(path):
+            for name in ('centroids', 'offsets', 'ids', 'vectors'):
+                np.save(os.path.join(path, f'{name}.npy'), getattr(self, name))
+            with open(os.path.join(path, 'meta.json'), 'w') as f:
+                json.dump(self.meta, f)
+
+        return index_snapshots.write(directory, write_files)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """The snapshot currently published in `directory`; raises OSError if there is none."""
+        mode = 'r' if mmap else None
+        path = index_snapshots.current(directory)
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        return cls(
+            np.load(os.path.join(path, 'centroids.npy')),
+            np.load(os.path.join(path, 'offsets.npy')),
+            np.load(os.path.join(path, 'ids.npy'), mmap_mode=mode),
+            np.load(os.path.join(path, 'vectors.npy'), mmap_mode=mode),
+            meta,
+        )
@@ -0,0 +1,114 @@
+"""
+Token → user cache for CookieTokenAuthentication and the WebSocket consumers.
+
+DRF's TokenAuthentication runs `Token.objects.select_related('user').get(key=...)` on every
+authenticated request (and every socket connect). Instead the result is kept in the Django
+cache (Redis in prod) for AUTH_TTL seconds under `auth:token:{key}`, as a compact snapshot:
+the user's concrete field values minus the password hash, which is rebuilt with
+Model.from_db() — `password` comes back as a deferred field, loaded on first access
+(check_password), so no credential material sits in the cache.
+
+Entries are dropped explicitly rather than left to expire:
+- a deleted token (password change rotates it, account deletion cascades to it) — Token
+  post_delete signal;
+- any change to the user row (profile edit, deactivation) — User post_save/post_delete,
+  through `auth:user:{user_id}` → the key cached for that user, so no query is needed;
+- LogoutView, for the cookie's token.
+The TTL only bounds how long anything the signals can't see (raw SQL, queryset.update())
+stays stale.
+"""
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+AUTH_TTL = 5 * 60
+TOKEN_KEY = 'auth:token:{key}'
+USER_KEY = 'auth:user:{user_id}'
+# Never cached, even as a deferred-load stub.
+EXCLUDED_FIELDS = ('password',)
+
+
+def _token_key(key):
+    return TOKEN_KEY.format(key=key)
+
+
+def snapshot(user):
+    return {
+        field.attname: getattr(user, field.attname)
+        for field in user._meta.concrete_fields if field.attname not in EXCLUDED_FIELDS
+    }
+
+
+def restore(model, values):
+    """A model instance from a snapshot, as if loaded from the DB with the missing fields
+    deferred (fields added since the snapshot was taken are deferred too)."""
+    from django.db import DEFAULT_DB_ALIAS
+    fields = [f.attname for f in model._meta.concrete_fields if f.attname in values]
+    return model.from_db(DEFAULT_DB_ALIAS, fields, [values[name] for name in fields])
+
+
+def get(key):
+    """(user, token) for a cached token key, or None."""
+    from django.contrib.auth import get_user_model
+    from rest_framework.authtoken.models import Token
+    entry = cache.get(_token_key(key))
+    if entry is None:
+        return None
+    try:
+        user = restore(get_user_model(), entry['user'])
+        token = restore(Token, entry['token'])
+    except Exception:
+        logger.warning('Discarding unreadable auth cache entry', exc_info=True)
+        cache.delete(_token_key(key))
+        return None
+    token.user = user
+    return user, token
+
+
+def store(token):
+    """Caches an authenticated token (with its user already loaded)."""
+    cache.set_many({
+        _token_key(token.key): {'user': snapshot(token.user), 'token': snapshot(token)},
+        USER_KEY.format(user_id=token.user_id): token.key,
+    }, AUTH_TTL)
+
+
+def lookup(key):
+    """(user, token) for an active user's token key — cached, else from the DB — or None."""
+    from rest_framework.authtoken.models import Token
+    cached = get(key)
+    if cached is not None:
+        return cached if cached[0].is_active else None
+    try:
+        token = Token.objects.select_related('user').get(key=key)
+    except Token.DoesNotExist:
+        return None
+    if not token.user.is_active:
+        return None
+    store(token)
+    return token.user, token
+
+
+def _drop_token(key):
+    cache.delete(_token_key(key))
+
+
+def invalidate_token(key):
+    """Drops a token's entry now and again after the current transaction commits (so a
+    request racing the write can't re-cache the old row for a whole TTL)."""
+    from django.db import transaction
+    _drop_token(key)
+    transaction.on_commit(lambda: _drop_token(key))
+
+
+def invalidate_user(user_id):
+    from django.db import transaction
+
+    def drop():
+        key = cache.get(USER_KEY.format(user_id=user_id))
+        if key:
+            cache.delete_many([_token_key(key), USER_KEY.format(user_id=user_id)])
+    drop()
+    transaction.on_commit(drop)
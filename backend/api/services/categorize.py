@@ -1,5 +1,6 @@
 from django.utils import timezone
-from datetime import timedelta
+
+import numpy as np
 
 POST_CATEGORY_KEYWORDS = {
     'reviews': ['review', 'rating', 'score', '/10', 'recommend', 'worth', 'rated', 'stars'],
@@ -45,67 +46,6 @@ def auto_categorize_post(post):
     return 'general'
 
 
-def calculate_trending_score(post):
-    """
-    Advanced social feed ranking algorithm inspired by Instagram, Twitter, and LinkedIn.
-    Designed to maximize session length, user retention, and viral loop engagement.
-    """
-    now = timezone.now()
-    age_hours = (now - post.timestamp).total_seconds() / 3600
-    
-    # 1. Base Engagement Metrics
-    likes_count = post.likes.count() if hasattr(post, 'likes') else 0
-    replies_count = post.replies.count() if hasattr(post, 'replies') else 0
-    reposts_count = post.reposts.count() if hasattr(post, 'reposts') else 0
-    bookmarks_count = post.bookmarks.count() if hasattr(post, 'bookmarks') else 0
-    
-    # 2. Rich Media Boost (Instagram/Twitter: visual content gets 35% boost for higher dwell time)
-    media_boost = 1.0
-    if post.image or post.gif_url or (hasattr(post, 'media_file') and post.media_file):
-        media_boost = 1.35
-    elif len(post.content or '') > 280:
-        # LinkedIn Dwell Time: long high-quality text posts get 15% boost
-        media_boost = 1.15
-        
-    # 3. Conversation Thread Boost (Twitter/LinkedIn: rewarding active discussion threads)
-    thread_boost = 1.0
-    if replies_count > 0:
-        # Check if multiple distinct users are replying
-        distinct_reply_users = post.replies.values('user').distinct().count()
-        if distinct_reply_users > 1:
-            thread_boost = 1.25
-        
-        # Check if the post creator is active in their own thread (encourages community building)
-        creator_replied = post.replies.filter(user=post.user).exists()
-        if creator_replied:
-            thread_boost *= 1.15
-
-    # 4. External Link Penalty (Twitter/LinkedIn: penalty for posts driving users out of Gamelogd)
-    link_penalty = 1.0
-    if 'http' in (post.content or '') and not (post.image or post.gif_url):
-        link_penalty = 0.85
-
-    # 5. Weighted Engagement Score
-    # - Reposts: 4.5 (highest viral value, creates new distribution nodes)
-    # - Bookmarks: 3.5 (high utility value, indicates content users want to return to)
-    # - Replies: 2.5 (conversational value, drives dwell time)
-    # - Likes: 1.0 (low-friction positive feedback)
-    weighted_engagement = (
-        likes_count * 1.0 +
-        replies_count * 2.5 +
-        reposts_count * 4.5 +
-        bookmarks_count * 3.5
-    )
-    
-    # 6. Gravity Decay Formula (HackerNews/Reddit style decay)
-    # Gravity constant determines how fast posts drop off. 1.5 is standard for active social feeds.
-    gravity = 1.5
-    raw_score = (weighted_engagement + 1.0) * media_boost * thread_boost * link_penalty
-    decayed_score = raw_score / ((age_hours + 2.0) ** gravity)
-    
-    return round(decayed_score, 4)
-
-
 # Registration "Taste Profile" interests (see frontend/src/app/register/page.tsx) are
 # broad genre/topic tags, not literal words people use in posts — matching a post's
 # content against just the bare tag name ("RPG", "Strategy", ...) misses almost
@@ -142,10 +82,10 @@ def expand_interest_keywords(interest_names):
 
 def score_post_for_user(post, user, followed_users_ids, user_interest_ids):
     """
-    Per-user relevance score for a root Post — the Explore "For You" pill's scoring,
-    factored out so it stays identical to FeedViewSet.for_you's own scoring loop
-    (recency decay + engagement + follow affinity + interest-tag overlap) instead
-    of drifting into a second, slightly-different implementation.
+    Per-user relevance score for a root Post — the reference per-item form of the For You
+    formula (recency decay + engagement + follow affinity + interest-tag overlap) shared by
+    FeedViewSet.for_you and the Explore "For You" pill. Both views now score through the
+    vectorized score_items_for_user below, which must stay bit-for-bit identical to this.
 
     `user_interest_ids` is the set of Interest PKs the user picked at registration;
     matched against `post.interests` (auto-assigned via embedding classification at
@@ -173,6 +113,193 @@ def score_post_for_user(post, user, followed_users_ids, user_interest_ids):
     return score
 
 
+def score_review_for_user(review, user, followed_users_ids, user_interest_ids, interest_keywords, library_playtimes):
+    """
+    Per-user relevance score for a Review — FeedViewSet.for_you's review-scoring loop, moved
+    here next to score_post_for_user so both per-item formulas live in one place. Same terms as
+    the post score, plus the untagged-review keyword fallback and the library/playtime boost.
+    `library_playtimes` maps game id -> playtime_forever for the user's library.
+    """
+    now = timezone.now()
+    score = 10.0
+
+    age_in_days = (now - review.timestamp).total_seconds() / 86400.0
+    score *= 1.0 / (1.0 + age_in_days * 0.5)
+
+    likes = getattr(review, 'likes_count_ann', 0) or 0
+    replies = getattr(review, 'replies_count_ann', 0) or 0
+    score += likes * 0.5
+    score += replies * 0.8
+
+    if user.is_authenticated:
+        if review.user_id in followed_users_ids:
+            score += 5.0
+
+        review_interest_ids = {i.id for i in review.interests.all()}
+        if review_interest_ids:
+            matched_interests = len(review_interest_ids & user_interest_ids)
+            score += min(matched_interests * 3.0, 6.0)
+        else:
+            # Untagged (pre-migration) review — fall back to keyword matching.
+            text_to_search_lower = ((review.content or "") + " " + (review.game.title or "")).lower()
+            keyword_matches = sum(1 for kw in interest_keywords if kw in text_to_search_lower)
+            score += min(keyword_matches * 2.0, 6.0)
+
+        if review.game_id in library_playtimes:
+            score += 4.0
+            if library_playtimes[review.game_id] > 0:
+                score += 2.0
+
+    return score
+
+
+def _popcount(words):
+    """Set-bit count per row of a (n, words) uint64 array."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    bits = np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis=1)
+    return bits.sum(axis=1, dtype=np.int64)
+
+
+def _interest_bitmasks(interest_id_lists, user_interest_ids):
+    """Packs each item's interest ids, and the user's, into (n, words) / (words,) uint64 masks
+    over a bit position per distinct interest id seen on the page. Bits are accumulated in
+    Python ints and converted once per 64-bit word, which is far cheaper than per-bit NumPy
+    item assignment."""
+    positions = {}
+    packed = []
+    for ids in interest_id_lists:
+        mask = 0
+        for interest_id in ids:
+            mask |= 1 << positions.setdefault(interest_id, len(positions))
+        packed.append(mask)
+    user_packed = 0
+    for interest_id in user_interest_ids:
+        bit = positions.get(interest_id)
+        if bit is not None:
+            user_packed |= 1 << bit
+
+    words = max(1, (len(positions) + 63) // 64)
+    word_mask = (1 << 64) - 1
+    item_masks = np.empty((len(packed), words), dtype=np.uint64)
+    user_mask = np.empty(words, dtype=np.uint64)
+    for word in range(words):
+        shift = 64 * word
+        item_masks[:, word] = np.fromiter(((mask >> shift) & word_mask for mask in packed), dtype=np.uint64, count=len(packed))
+        user_mask[word] = (user_packed >> shift) & word_mask
+    return item_masks, user_mask
+
+
+def _interest_ids(item):
+    """The item's interest ids, read straight from the prefetch cache when `interests` was
+    prefetched — building a related manager + QuerySet clone per item via .all() costs more than
+    the rest of the batch scorer combined."""
+    prefetched = getattr(item, '_prefetched_objects_cache', {}).get('interests')
+    interests = prefetched if prefetched is not None else item.interests.all()
+    return [i.id for i in interests]
+
+
+def score_candidates(age_microseconds, likes, replies, author_ids, item_interest_masks,
+                     user_interest_mask, *, is_authenticated, followed_users_ids=(),
+                     has_interests=None, keyword_matches=None, game_ids=None, library_playtimes=None):
+    """
+    Batch form of score_post_for_user / score_review_for_user: takes the candidate set as
+    columnar arrays and scores all of it in one NumPy pass. Each term is evaluated in the same
+    order, in the same float64 arithmetic, as the per-item functions, so results are bit-for-bit
+    identical (a term that doesn't apply adds 0.0, which is exact).
+
+    `age_microseconds` is an int64 array of (now - timestamp) in whole microseconds — the same
+    integer timedelta.total_seconds() divides, so the recency term matches exactly.
+    `item_interest_masks`/`user_interest_mask` come from _interest_bitmasks. The review-only
+    columns are optional: `has_interests`/`keyword_matches` drive the untagged-review keyword
+    fallback, and `game_ids` (-1 for none) drives the library boost.
+    """
+    age_in_days = (age_microseconds / 1e6) / 86400.0
+    scores = 10.0 * (1.0 / (1.0 + age_in_days * 0.5))
+    scores = scores + likes * 0.5
+    scores = scores + replies * 0.8
+
+    if not is_authenticated:
+        return scores
+
+    followed = np.isin(author_ids, np.fromiter(followed_users_ids, dtype=np.int64))
+    scores = scores + np.where(followed, 5.0, 0.0)
+
+    matched = _popcount(item_interest_masks & user_interest_mask)
+    interest_term = np.minimum(matched * 3.0, 6.0)
+    if has_interests is not None and keyword_matches is not None:
+        interest_term = np.where(has_interests, interest_term, np.minimum(keyword_matches * 2.0, 6.0))
+    scores = scores + interest_term
+
+    if game_ids is not None and library_playtimes:
+        library_ids = np.fromiter(library_playtimes, dtype=np.int64)
+        played_ids = np.fromiter((gid for gid, playtime in library_playtimes.items() if playtime > 0), dtype=np.int64)
+        scores = scores + np.where(np.isin(game_ids, library_ids), 4.0, 0.0)
+        scores = scores + np.where(np.isin(game_ids, played_ids), 2.0, 0.0)
+    return scores
+
+
+def score_items_for_user(items, user, followed_users_ids, user_interest_ids, interest_keywords=(), library_playtimes=None):
+    """
+    Scores a mixed list of hydrated Posts and Reviews (annotated with likes_count_ann/
+    replies_count_ann, `interests` prefetched, reviews with `game` selected) with
+    score_candidates and returns the scores as a list aligned with `items`. This is what
+    FeedViewSet.for_you and ExplorePostsViewSet's mode=for_you call; the per-item functions
+    above stay as the reference formula.
+    """
+    from core.models import Review
+
+    if not items:
+        return []
+    now = timezone.now()
+    library_playtimes = library_playtimes or {}
+    n = len(items)
+
+    # Gather columns into plain lists and convert once — per-element NumPy writes cost more
+    # than the arithmetic they feed.
+    age_microseconds = []
+    likes = []
+    replies = []
+    author_ids = []
+    game_ids = [-1] * n
+    has_interests = [True] * n
+    keyword_matches = [0] * n
+    interest_id_lists = []
+
+    is_authenticated = user.is_authenticated
+    for row, item in enumerate(items):
+        delta = now - item.timestamp
+        age_microseconds.append((delta.days * 86400 + delta.seconds) * 10**6 + delta.microseconds)
+        likes.append(getattr(item, 'likes_count_ann', 0) or 0)
+        replies.append(getattr(item, 'replies_count_ann', 0) or 0)
+        author_ids.append(item.user_id)
+        if not is_authenticated:
+            interest_id_lists.append(())
+            continue
+        ids = _interest_ids(item)
+        interest_id_lists.append(ids)
+        if isinstance(item, Review):
+            game_ids[row] = item.game_id
+            if not ids:
+                has_interests[row] = False
+                text_to_search_lower = ((item.content or "") + " " + (item.game.title or "")).lower()
+                keyword_matches[row] = sum(1 for kw in interest_keywords if kw in text_to_search_lower)
+
+    item_masks, user_mask = _interest_bitmasks(interest_id_lists, user_interest_ids)
+    scores = score_candidates(
+        np.array(age_microseconds, dtype=np.int64),
+        np.array(likes, dtype=np.float64),
+        np.array(replies, dtype=np.float64),
+        np.array(author_ids, dtype=np.int64),
+        item_masks, user_mask,
+        is_authenticated=is_authenticated, followed_users_ids=followed_users_ids,
+        has_interests=np.array(has_interests, dtype=bool),
+        keyword_matches=np.array(keyword_matches, dtype=np.float64),
+        game_ids=np.array(game_ids, dtype=np.int64), library_playtimes=library_playtimes,
+    )
+    return scores.tolist()
+
+
 def interleave_by_author(scored_entries, get_item=lambda entry: entry[-1]):
     """Re-orders a score-descending list of scored (..., item) tuples so consecutive items
     rarely share an author — a cheap author-diversity pass (a well-known real feed-ranking
@@ -203,21 +330,3 @@ def interleave_by_author(scored_entries, get_item=lambda entry: entry[-1]):
             if bucket:
                 interleaved.append(bucket.pop(0))
     return interleaved
-
-
-def update_all_trending_scores():
-    """Update trending scores for all recent posts."""
-    from core.models import Post
-    
-    cutoff = timezone.now() - timedelta(days=7)
-    posts = Post.objects.filter(
-        timestamp__gte=cutoff,
-        parent__isnull=True,
-        review_parent__isnull=True,
-        news_parent__isnull=True
-    )
-    
-    for post in posts.iterator():
-        new_score = calculate_trending_score(post)
-        if post.trending_score != new_score:
-            Post.objects.filter(id=post.id).update(trending_score=new_score)
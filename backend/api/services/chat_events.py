@@ -0,0 +1,117 @@
+"""
+Push delivery for open chats (api.consumers.ChatConsumer, ws/chat/<conversation_id>/).
+
+Each open chat used to poll `/messages/?after_id=` every 3 seconds. Now every socket on a
+chat joins the `conversation_<id>` group after its membership check, and the message write
+paths (MessageViewSet create/edit/delete/react/pin) publish an event there once their
+transaction commits:
+
+    {'type': 'message_new' | 'message_edited' | 'message_deleted' | 'message_reaction'
+             | 'message_pinned', 'conversation_id', 'message': {...}}
+    {'type': 'typing', 'conversation_id', 'user_id', 'username', 'is_typing'}
+
+A reconnecting socket passes `?last_id=` and first receives
+{'type': 'resume', 'messages': [...], 'complete'}; with complete=False (it was away too
+long) the client reloads through the REST endpoint. Polling stays as the fallback for
+clients whose socket is down.
+
+Payloads are serialized once per event, for no particular viewer: a message rendered under
+the sender's request would carry the sender's own email/phone/settings (UserSerializer shows
+those to the owner) to every member. ChatConsumer fills in `is_me` per socket.
+"""
+import json
+import logging
+from urllib.parse import urljoin
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+GROUP = 'conversation_{conversation_id}'
+RESUME_LIMIT = 200
+MESSAGE_EVENTS = ('message_new', 'message_edited', 'message_deleted', 'message_reaction', 'message_pinned')
+
+
+def group_name(conversation_id):
+    return GROUP.format(conversation_id=conversation_id)
+
+
+class ViewerNeutralRequest:
+    """The parts of a request MessageSerializer uses, with no viewer: media URLs are made
+    absolute against `base_url`, every viewer-relative field renders as for a stranger."""
+
+    def __init__(self, base_url):
+        from django.contrib.auth.models import AnonymousUser
+        self.user = AnonymousUser()
+        self.base_url = base_url
+
+    def build_absolute_uri(self, location=None):
+        return urljoin(self.base_url, location or '/')
+
+
+def serialize_messages(messages, base_url):
+    from api.serializers import MessageSerializer
+    data = MessageSerializer(messages, many=True, context={'request': ViewerNeutralRequest(base_url)}).data
+    # Through JSON so the channel layer (msgpack on Redis) only ever sees plain types.
+    return json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+
+
+def _with_relations(queryset):
+    return queryset.select_related(
+        'sender', 'reply_to__sender', 'shared_post__user', 'shared_review__user', 'shared_review__game', 'shared_news',
+    ).prefetch_related('reactions')
+
+
+def _send(conversation_id, event):
+    from asgiref.sync import async_to_sync
+    from channels.layers import get_channel_layer
+    channel_layer = get_channel_layer()
+    if channel_layer:
+        async_to_sync(channel_layer.group_send)(group_name(conversation_id), {'type': 'chat.event', **event})
+
+
+def publish_message(message, event, request):
+    """Pushes `message` (as it is once the current transaction commits) to its chat."""
+    from django.db import transaction
+    from api.models import Message
+    assert event in MESSAGE_EVENTS, event
+    base_url = request.build_absolute_uri('/')
+
+    def send():
+        current = _with_relations(Message.objects.filter(pk=message.pk)).first()
+        if current is None:
+            return
+        try:
+            _send(current.conversation_id, {
+                'event': event,
+                'conversation_id': current.conversation_id,
+                'message': serialize_messages([current], base_url)[0],
+            })
+        except Exception:
+            # Push is best-effort — polling clients still pick the change up.
+            logger.exception('Could not publish %s for message %s', event, message.pk)
+    transaction.on_commit(send)
+
+
+def publish_membership_revoked(conversation_id, user_ids):
+    """Tells the chat's sockets that these users are no longer members (their sockets close)."""
+    _send(conversation_id, {'event': 'membership_revoked', 'user_ids': list(user_ids)})
+
+
+def is_member(user, conversation_id):
+    """Same rule as the REST message list: participants only."""
+    from api.models import Conversation
+    return Conversation.objects.filter(id=conversation_id, participants=user).exists()
+
+
+def messages_since(conversation_id, last_id, base_url, limit=RESUME_LIMIT):
+    """(payloads, complete): messages after `last_id`, oldest first, at most `limit`."""
+    from api.models import Message
+    queryset = _with_relations(Message.objects.filter(conversation_id=conversation_id, id__gt=last_id)).order_by('id')
+    rows = list(queryset[:limit + 1])
+    return serialize_messages(rows[:limit], base_url), len(rows) <= limit
+
+
+def mark_read(conversation_id, user_id):
+    from api.services import unread_counters
+    unread_counters.mark_conversation_read(conversation_id, user_id)
@@ -0,0 +1,235 @@
+"""
+Background embedding classification for new/edited posts and reviews.
+
+classify_post_async/classify_review_async used to start a fresh thread per item, and every
+one of those threads then queued on embeddings._lock to run a 5-10s single-text encode() —
+under a burst of posts that meant hundreds of parked threads, each holding a DB connection.
+Instead there is one long-lived worker per deployment shape (settings.CLASSIFICATION_WORKER_MODE):
+
+- 'thread' (default): each web process owns one daemon worker thread fed by a bounded
+  in-memory queue. When the queue is full new items are dropped (and counted) rather than
+  blocking the request that committed them.
+- 'external': web processes only write PendingClassification rows, and
+  `python manage.py run_classification_worker` drains them in its own process.
+
+Either way the worker pulls pending ids into micro-batches (up to BATCH_SIZE, waiting at most
+BATCH_WAIT_SECONDS for a batch to fill) and hands each batch to
+embeddings.classify_batch, which makes one encode() call for the whole batch. metrics()
+reports queue depth and recent batch latency; each batch is also logged.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+QUEUE_MAXSIZE = 1000
+BATCH_SIZE = 32
+BATCH_WAIT_SECONDS = 0.5
+POLL_INTERVAL_SECONDS = 2.0
+# How many recent batch timings metrics() summarizes.
+LATENCY_WINDOW = 200
+
+
+def _classify_and_release(batch):
+    from django.db import connection
+    from api.services import embedding_store
+    from api.services.embeddings import classify_batch
+    try:
+        classify_batch(batch)
+        # The similarity indexes are rebuilt here, never on a request (see
+        # embedding_store.get_index); refresh_index rate-limits itself.
+        for item_type in sorted({item_type for item_type, _, _ in batch}):
+            try:
+                embedding_store.refresh_index(item_type)
+            except Exception:
+                logger.exception("Rebuilding the %s embedding index failed", item_type)
+    finally:
+        # The worker thread's connection is never closed by Django's request_finished
+        # cleanup; close it between batches so an idle worker doesn't pin one open.
+        connection.close()
+
+
+class ClassificationWorker:
+    """Micro-batching consumer over a bounded in-memory queue of
+    (item_type, object_id, overwrite_category) jobs."""
+
+    def __init__(self, process_batch=_classify_and_release, maxsize=QUEUE_MAXSIZE,
+                 batch_size=BATCH_SIZE, batch_wait=BATCH_WAIT_SECONDS, name='classification'):
+        self.process_batch = process_batch
+        self.name = name
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.batches = 0
+        self.items = 0
+        self.dropped = 0
+        self.failed_batches = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._stats_lock = threading.Lock()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, item_type, object_id, overwrite_category=False):
+        try:
+            self.queue.put_nowait((item_type, object_id, overwrite_category))
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+            logger.warning("%s queue full (%d); dropped %s %s", self.name, self.maxsize, item_type, object_id)
+            return False
+        self.ensure_started()
+        return True
+
+    def ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self.run, name=f'{self.name}-worker', daemon=True)
+                self._thread.start()
+
+    def queue_depth(self):
+        return self.queue.qsize()
+
+    def next_batch(self, timeout=None):
+        """Blocks up to `timeout` (forever if None) for the first job, then keeps taking jobs
+        until the batch is full or batch_wait has passed since the first one arrived."""
+        try:
+            batch = [self.queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def run_batch(self, batch):
+        started = time.monotonic()
+        failed = False
+        try:
+            self.process_batch(batch)
+        except Exception:
+            failed = True
+            logger.exception("%s batch of %d item(s) failed", self.name, len(batch))
+        elapsed = time.monotonic() - started
+        with self._stats_lock:
+            self.batches += 1
+            self.items += len(batch)
+            self.failed_batches += failed
+            self._latencies.append(elapsed)
+        logger.info("%s: processed %d item(s) in %.2fs (queue depth %d)", self.name, len(batch), elapsed, self.queue_depth())
+        return elapsed
+
+    def run(self, stop_when_idle=False, idle_timeout=None):
+        """Worker loop. With stop_when_idle, returns once next_batch() comes back empty (used by
+        `run_classification_worker --once` to drain and exit)."""
+        while True:
+            batch = self.next_batch(timeout=idle_timeout if stop_when_idle else None)
+            if batch:
+                self.run_batch(batch)
+            elif stop_when_idle:
+                return
+
+    def metrics(self):
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            snapshot = {
+                'queue_depth': self.queue_depth(),
+                'queue_capacity': self.maxsize,
+                'batches': self.batches,
+                'items': self.items,
+                'dropped': self.dropped,
+                'failed_batches': self.failed_batches,
+            }
+        snapshot['avg_batch_size'] = snapshot['items'] / snapshot['batches'] if snapshot['batches'] else 0.0
+        snapshot['last_batch_seconds'] = self._latencies[-1] if self._latencies else None
+        snapshot['p50_batch_seconds'] = latencies[len(latencies) // 2] if latencies else None
+        snapshot['p95_batch_seconds'] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None
+        snapshot['max_batch_seconds'] = latencies[-1] if latencies else None
+        return snapshot
+
+
+class PendingTableWorker(ClassificationWorker):
+    """The 'external' mode worker: same batching and metrics, but jobs come from the
+    PendingClassification table instead of an in-memory queue."""
+
+    def __init__(self, process_batch=_classify_and_release, batch_size=BATCH_SIZE,
+                 batch_wait=BATCH_WAIT_SECONDS, poll_interval=POLL_INTERVAL_SECONDS):
+        super().__init__(process_batch=process_batch, maxsize=0, batch_size=batch_size, batch_wait=batch_wait)
+        self.poll_interval = poll_interval
+
+    def submit(self, item_type, object_id, overwrite_category=False):
+        enqueue_pending(item_type, object_id, overwrite_category)
+        return True
+
+    def queue_depth(self):
+        from api.models import PendingClassification
+        return PendingClassification.objects.count()
+
+    def next_batch(self, timeout=None):
+        batch = claim_pending(self.batch_size)
+        if batch and len(batch) < self.batch_size:
+            # Give a burst a moment to land so it's encoded as one batch, not several.
+            time.sleep(self.batch_wait)
+            batch += claim_pending(self.batch_size - len(batch))
+        if not batch:
+            time.sleep(self.poll_interval if timeout is None else min(timeout, self.poll_interval))
+        return batch
+
+
+def enqueue_pending(item_type, object_id, overwrite_category=False):
+    from api.models import PendingClassification
+    pending, created = PendingClassification.objects.get_or_create(
+        item_type=item_type, object_id=object_id,
+        defaults={'overwrite_category': overwrite_category},
+    )
+    if not created and overwrite_category and not pending.overwrite_category:
+        PendingClassification.objects.filter(pk=pending.pk).update(overwrite_category=True)
+
+
+def claim_pending(limit):
+    """Takes up to `limit` of the oldest pending jobs off the table. Rows are deleted as they're
+    claimed (SKIP LOCKED lets several workers share the table), so a worker that dies mid-batch
+    loses at most that batch — the same guarantee the in-memory queue gives."""
+    from django.db import transaction
+    from api.models import PendingClassification
+    with transaction.atomic():
+        rows = list(
+            PendingClassification.objects.select_for_update(skip_locked=True)
+            .order_by('enqueued_at')[:limit]
+        )
+        if rows:
+            PendingClassification.objects.filter(pk__in=[row.pk for row in rows]).delete()
+    return [(row.item_type, row.object_id, row.overwrite_category) for row in rows]
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker():
+    """This process's in-memory worker ('thread' mode), created on first use."""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = ClassificationWorker()
+    return _worker
+
+
+def enqueue(item_type, object_id, overwrite_category=False):
+    from django.conf import settings
+    if getattr(settings, 'CLASSIFICATION_WORKER_MODE', 'thread') == 'external':
+        enqueue_pending(item_type, object_id, overwrite_category)
+    else:
+        get_worker().submit(item_type, object_id, overwrite_category)
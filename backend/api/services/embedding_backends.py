@@ -0,0 +1,88 @@
+"""
+Inference backends for api.services.embeddings, selected by settings.EMBEDDING_BACKEND.
+
+- 'torch' (default): the full sentence-transformers/PyTorch model, as before.
+- 'onnx': an exported ONNX copy of the same model (optionally int8-quantized — see the
+  `export_embedding_onnx` command) run with onnxruntime and the standalone `tokenizers`
+  library. It never imports torch or sentence_transformers, which is where most of a web
+  worker's cold-start time and resident memory went.
+
+Both expose encode(texts) -> L2-normalized float32 embeddings (a single row for a str, an
+(n, dim) array for a list), so callers can't tell them apart. Whichever is configured is
+loaded lazily, once per process, by embeddings._get_model().
+"""
+import os
+
+import numpy as np
+
+# paraphrase-multilingual-MiniLM-L12-v2's own max_seq_length; longer text is truncated
+# exactly as sentence-transformers would.
+MAX_SEQ_LENGTH = 128
+ONNX_BATCH_SIZE = 32
+
+
+class TorchBackend:
+    name = 'torch'
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts):
+        return self.model.encode(texts, normalize_embeddings=True)
+
+
+class OnnxBackend:
+    """Runs the exported transformer with onnxruntime and reproduces the sentence-transformers
+    head in NumPy: mean pooling over the attention mask, then L2 normalization."""
+    name = 'onnx'
+
+    def __init__(self, model_dir, file_name, threads=None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, file_name), options, providers=['CPUExecutionProvider'],
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, 'tokenizer.json'))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+
+    def _encode_chunk(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {'input_ids': input_ids, 'attention_mask': attention_mask}
+        if 'token_type_ids' in self.input_names:
+            feeds['token_type_ids'] = np.zeros_like(input_ids)
+        hidden = self.session.run(None, feeds)[0]
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def encode(self, texts):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        chunks = [self._encode_chunk(texts[i:i + ONNX_BATCH_SIZE]) for i in range(0, len(texts), ONNX_BATCH_SIZE)]
+        embeddings = np.concatenate(chunks).astype(np.float32) if chunks else np.zeros((0, 0), np.float32)
+        return embeddings[0] if single else embeddings
+
+
+def load_backend(name=None):
+    """Builds the configured backend (or `name`, for benchmarks and the parity test)."""
+    from django.conf import settings
+    from api.services.embeddings import MODEL_NAME
+
+    name = name or getattr(settings, 'EMBEDDING_BACKEND', 'torch')
+    if name == 'torch':
+        return TorchBackend(MODEL_NAME)
+    if name == 'onnx':
+        return OnnxBackend(
+            settings.EMBEDDING_ONNX_DIR, settings.EMBEDDING_ONNX_FILE,
+            threads=getattr(settings, 'EMBEDDING_ONNX_THREADS', None),
+        )
+    raise ValueError(f'Unknown EMBEDDING_BACKEND {name!r}; expected "torch" or "onnx"')
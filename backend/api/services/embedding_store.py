@@ -0,0 +1,295 @@
+"""
+Persistent embedding cache for posts, reviews and games, plus the ANN indexes built on it.
+
+Embeddings used to be computed in embeddings._encode and thrown away, keeping only the
+derived interest tags. Now every vector the model produces is kept in ContentEmbedding —
+float16, keyed by (item_type, object_id) and the sha256 of the text it was computed from — so:
+
+- re-classifying an unchanged post/review (an edit that didn't touch the text, a retry)
+  skips the model entirely; only changed text is re-embedded;
+- re-tagging after an INTEREST_MATCH_THRESHOLD change is one matrix multiply over stored
+  vectors (see retag_interests / the `retag_interests` command);
+- "more like this" on posts and semantic game search are nearest-neighbour lookups in a
+  per-type IVF index (api.services.ann_index) built from the table, persisted under
+  settings.EMBEDDING_INDEX_DIR. Indexes are rebuilt off the request path (refresh_index, by
+  the classification worker and `build_embedding_index`); requests serve the last one built.
+
+Posts and reviews are embedded as a by-product of classification (embeddings.classify_batch);
+games, and any backlog, by the `build_embedding_index` command.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from api.services.ann_index import IVFIndex
+
+logger = logging.getLogger(__name__)
+
+ITEM_TYPES = ('post', 'review', 'game')
+# How long a process trusts its in-memory index before re-checking the table's signature.
+INDEX_REFRESH_SECONDS = 300
+
+
+def content_hash(text):
+    """sha256 of the model name + text, so switching models invalidates every stored vector."""
+    from api.services.embeddings import MODEL_NAME
+    return hashlib.sha256(f'{MODEL_NAME}\0{text}'.encode('utf-8')).hexdigest()
+
+
+def text_for_post(post):
+    return (post.content or '').strip()
+
+
+def text_for_review(review):
+    return (review.content or '').strip()
+
+
+def text_for_game(game):
+    genres = ', '.join(g for g in (game.genres or []) if isinstance(g, str))
+    parts = [game.title or '', game.summary or game.description or '', genres]
+    return '. '.join(part.strip() for part in parts if part and part.strip())
+
+
+def _from_blob(blob, dim):
+    return np.frombuffer(bytes(blob), dtype=np.float16, count=dim).astype(np.float32)
+
+
+def embed_items(entries, compute_missing=True):
+    """
+    `entries` is an iterable of (item_type, object_id, text). Returns {(item_type, object_id):
+    float32 vector} for every entry with non-empty text, reusing stored vectors whose content
+    hash still matches and encoding the rest in a single encode() call (then storing them).
+    Every returned vector has been through the float16 round-trip, so results are the same
+    whether a vector came from the cache or was just computed.
+    With compute_missing=False, only cached vectors are returned.
+    """
+    from api.models import ContentEmbedding
+
+    wanted = {}
+    for item_type, object_id, text in entries:
+        if text:
+            wanted[(item_type, object_id)] = (text, content_hash(text))
+    if not wanted:
+        return {}
+
+    vectors = {}
+    by_type = {}
+    for item_type, object_id in wanted:
+        by_type.setdefault(item_type, []).append(object_id)
+    for item_type, ids in by_type.items():
+        rows = ContentEmbedding.objects.filter(item_type=item_type, object_id__in=ids).values_list(
+            'object_id', 'content_hash', 'dim', 'vector',
+        )
+        for object_id, stored_hash, dim, blob in rows:
+            if wanted[(item_type, object_id)][1] == stored_hash:
+                vectors[(item_type, object_id)] = _from_blob(blob, dim)
+
+    missing = [key for key in wanted if key not in vectors]
+    if missing and compute_missing:
+        from api.services.embeddings import _encode_batch
+        encoded = np.asarray(_encode_batch([wanted[key][0] for key in missing]), dtype=np.float16)
+        now = timezone.now()
+        ContentEmbedding.objects.bulk_create(
+            [
+                ContentEmbedding(
+                    item_type=item_type, object_id=object_id, content_hash=wanted[(item_type, object_id)][1],
+                    dim=vector.shape[0], vector=vector.tobytes(), updated_at=now,
+                )
+                for (item_type, object_id), vector in zip(missing, encoded)
+            ],
+            update_conflicts=True,
+            unique_fields=['item_type', 'object_id'],
+            update_fields=['content_hash', 'dim', 'vector', 'updated_at'],
+        )
+        for key, vector in zip(missing, encoded):
+            vectors[key] = vector.astype(np.float32)
+    return vectors
+
+
+def forget(item_type, object_id):
+    from api.models import ContentEmbedding
+    ContentEmbedding.objects.filter(item_type=item_type, object_id=object_id).delete()
+
+
+def stored_vectors(item_type, chunk_size=5000):
+    """Yields (object_ids, content_hashes, (n, dim) float32 matrix) chunks of the stored vectors."""
+    from api.models import ContentEmbedding
+    qs = ContentEmbedding.objects.filter(item_type=item_type).order_by('object_id')
+    last_id = -1
+    while True:
+        rows = list(qs.filter(object_id__gt=last_id).values_list('object_id', 'content_hash', 'dim', 'vector')[:chunk_size])
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        ids = [row[0] for row in rows]
+        hashes = [row[1] for row in rows]
+        matrix = np.stack([_from_blob(row[3], row[2]) for row in rows])
+        yield ids, hashes, matrix
+
+
+# --- ANN indexes --------------------------------------------------------------------------
+
+_indexes = {}
+_index_lock = threading.Lock()
+# Held while a process builds an index, so concurrent refreshes don't build it twice.
+_build_lock = threading.Lock()
+
+
+def _index_dir(item_type):
+    return os.path.join(settings.EMBEDDING_INDEX_DIR, item_type)
+
+
+def table_signature(item_type):
+    """Cheap fingerprint of a type's stored vectors; the index is rebuilt when it changes."""
+    from api.models import ContentEmbedding
+    agg = ContentEmbedding.objects.filter(item_type=item_type).aggregate(n=Count('id'), latest=Max('updated_at'))
+    latest = agg['latest'].isoformat() if agg['latest'] else ''
+    return f"{agg['n']}:{latest}"
+
+
+def build_index(item_type, save=True):
+    signature = table_signature(item_type)
+    ids, chunks = [], []
+    for chunk_ids, _, matrix in stored_vectors(item_type):
+        ids.extend(chunk_ids)
+        chunks.append(matrix)
+    vectors = np.concatenate(chunks) if chunks else np.zeros((0, 0), dtype=np.float32)
+    index = IVFIndex.build(ids, vectors, meta={'item_type': item_type, 'signature': signature})
+    if save:
+        try:
+            index.save(_index_dir(item_type))
+        except OSError:
+            logger.warning("Could not persist %s embedding index to %s", item_type, _index_dir(item_type), exc_info=True)
+    with _index_lock:
+        _indexes[item_type] = (index, time.monotonic())
+    return index
+
+
+def refresh_index(item_type, min_interval=INDEX_REFRESH_SECONDS):
+    """
+    Rebuilds this process's index for `item_type` if the table has changed since it was
+    built, at most once per `min_interval`. Called off the request path — by the
+    classification worker after each batch, and (unconditionally) by `build_embedding_index`.
+    Returns the index if it was rebuilt, else None.
+    """
+    cached = _indexes.get(item_type)
+    if cached and time.monotonic() - cached[1] < min_interval:
+        return None
+    with _build_lock:
+        cached = _indexes.get(item_type)
+        if cached and time.monotonic() - cached[1] < min_interval:
+            return None
+        if cached and cached[0].meta.get('signature') == table_signature(item_type):
+            with _index_lock:
+                _indexes[item_type] = (cached[0], time.monotonic())
+            return None
+        return build_index(item_type)
+
+
+def _empty_index(item_type):
+    return IVFIndex.build([], np.zeros((0, 0), dtype=np.float32), meta={'item_type': item_type, 'signature': ''})
+
+
+def get_index(item_type):
+    """
+    The last built index for `item_type`, for request paths: never builds one. A process
+    serves its in-memory index and, every INDEX_REFRESH_SECONDS, swaps in the persisted shard
+    if another process (the classification worker, `build_embedding_index`) has written a
+    different one since. Until an index has been built anywhere, it is empty. Results can lag
+    the table by up to a refresh interval plus a worker batch.
+    """
+    now = time.monotonic()
+    cached = _indexes.get(item_type)
+    if cached and now - cached[1] < INDEX_REFRESH_SECONDS:
+        return cached[0]
+    with _index_lock:
+        cached = _indexes.get(item_type)
+        if cached and now - cached[1] < INDEX_REFRESH_SECONDS:
+            return cached[0]
+        index = cached[0] if cached else None
+        try:
+            on_disk = IVFIndex.load(_index_dir(item_type))
+            if index is None or on_disk.meta.get('signature') != index.meta.get('signature'):
+                index = on_disk
+        except (OSError, ValueError):
+            pass
+        if index is None:
+            index = _empty_index(item_type)
+        _indexes[item_type] = (index, now)
+        return index
+
+
+def similar_items(item_type, object_id, text, k=10):
+    """Nearest neighbours of one stored item. An item without a current stored vector (not
+    classified yet) has none: the model is never run on the request path."""
+    vector = embed_items([(item_type, object_id, text)], compute_missing=False).get((item_type, object_id))
+    if vector is None:
+        return []
+    return get_index(item_type).search(vector, k=k, exclude_ids={object_id})
+
+
+def semantic_search(item_type, query, k=10):
+    """Nearest neighbours of free text. The query itself is encoded but never stored."""
+    query = (query or '').strip()
+    if not query:
+        return []
+    from api.services.embeddings import _encode_batch
+    vector = np.asarray(_encode_batch([query])[0], dtype=np.float32)
+    return get_index(item_type).search(vector, k=k)
+
+
+# --- Re-tagging --------------------------------------------------------------------------
+
+def retag_interests(item_type, threshold=None, dry_run=False):
+    """
+    Recomputes interest tags for every post/review whose stored vector still matches its
+    current text, from stored vectors alone: (n x dim) @ (dim x interests) >= threshold.
+    Returns (examined, changed). Items with no stored (or a stale) vector are left alone —
+    run `build_embedding_index` first to embed them.
+    """
+    from django.utils.text import slugify
+    from api.models import Interest
+    from api.services import embeddings
+    from core.models import Post, Review
+
+    if item_type not in ('post', 'review'):
+        raise ValueError(f'Interest tags only exist on posts and reviews, not {item_type!r}')
+    model = Post if item_type == 'post' else Review
+    text_for = text_for_post if item_type == 'post' else text_for_review
+    threshold = embeddings.INTEREST_MATCH_THRESHOLD if threshold is None else threshold
+    names = list(embeddings.INTEREST_DESCRIPTIONS)
+    interest_matrix = np.asarray(embeddings._get_interest_matrix(), dtype=np.float32)
+    interests_by_name = {}
+
+    examined = changed = 0
+    for ids, hashes, matrix in stored_vectors(item_type):
+        matches = (matrix @ interest_matrix.T) >= threshold
+        items = model.objects.in_bulk(ids)
+        current = {}
+        for object_id, interest_name in model.interests.through.objects.filter(
+            **{f'{item_type}_id__in': ids}
+        ).values_list(f'{item_type}_id', 'interest__name'):
+            current.setdefault(object_id, set()).add(interest_name)
+
+        for row, object_id in enumerate(ids):
+            item = items.get(object_id)
+            if item is None or content_hash(text_for(item)) != hashes[row]:
+                continue
+            examined += 1
+            new_names = {names[col] for col in np.flatnonzero(matches[row])}
+            if new_names == current.get(object_id, set()):
+                continue
+            changed += 1
+            if dry_run:
+                continue
+            for name in new_names - interests_by_name.keys():
+                interests_by_name[name] = Interest.objects.get_or_create(name=name, defaults={'slug': slugify(name)})[0]
+            item.interests.set([interests_by_name[name] for name in new_names])
+    return examined, changed
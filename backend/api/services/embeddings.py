@@ -74,27 +74,36 @@ INTEREST_MATCH_THRESHOLD = 0.55
 CATEGORY_MATCH_THRESHOLD = 0.32
 CATEGORY_FALLBACK = 'general'
 
+MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+
 _model = None
 _interest_matrix = None
 _category_matrix = None
 
-# classify_post_async runs classification on a background thread per post, so concurrent
-# posts mean concurrent threads reaching this module at the same time. Verified by testing
+# Classification used to run on a background thread per post, so concurrent posts meant
+# concurrent threads reaching this module at the same time. Verified by testing
 # two simultaneous posts directly against a running server: without this lock, one post's
 # result came back tagged with another post's interests (the shared SentenceTransformer
-# instance is not safe for concurrent .encode() calls) — silently wrong data, not just a
-# race on the lazy singleton init. Every encode() call funnels through _encode() below,
-# which holds this lock for its whole duration, so concurrent posts queue instead of
-# corrupting each other. Inference is already ~5-6s CPU-bound work, so serializing it adds
-# queuing delay under concurrent load but doesn't change single-post latency.
+# instance is not safe for concurrent .encode() calls; the ONNX backend is treated the
+# same) — silently wrong data, not just a race on the lazy singleton init. Every encode()
+# call funnels through _encode() below, which holds this lock for its whole duration, so
+# concurrent posts queue instead of corrupting each other. Background classification now
+# goes through the single batching worker in api.services.classification_worker, so the
+# lock is only ever contended by direct synchronous callers of classify_post/classify_review.
 _lock = threading.Lock()
+# Separate from _lock, which is already held by _encode/_encode_batch when they load the model.
+_load_lock = threading.Lock()
 
 
 def _get_model():
+    """The configured inference backend (settings.EMBEDDING_BACKEND — PyTorch or ONNX, see
+    api.services.embedding_backends), loaded once per process on first use."""
     global _model
     if _model is None:
-        from sentence_transformers import SentenceTransformer
-        _model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+        with _load_lock:
+            if _model is None:
+                from api.services.embedding_backends import load_backend
+                _model = load_backend()
     return _model
 
 
@@ -102,7 +111,7 @@ def _get_interest_matrix():
     global _interest_matrix
     if _interest_matrix is None:
         model = _get_model()
-        _interest_matrix = model.encode(list(INTEREST_DESCRIPTIONS.values()), normalize_embeddings=True)
+        _interest_matrix = model.encode(list(INTEREST_DESCRIPTIONS.values()))
     return _interest_matrix
 
 
@@ -110,7 +119,7 @@ def _get_category_matrix():
     global _category_matrix
     if _category_matrix is None:
         model = _get_model()
-        _category_matrix = model.encode(list(CATEGORY_DESCRIPTIONS.values()), normalize_embeddings=True)
+        _category_matrix = model.encode(list(CATEGORY_DESCRIPTIONS.values()))
     return _category_matrix
 
 
@@ -121,7 +130,7 @@ def _encode(text):
         model = _get_model()
         _get_interest_matrix()
         _get_category_matrix()
-        return model.encode(text, normalize_embeddings=True)
+        return model.encode(text)
 
 
 def _interests_from_embedding(text_emb):
@@ -170,41 +179,13 @@ def classify_review(review):
 
 def classify_review_async(review_id):
     """
-    Same rationale as classify_post_async: classify_review()'s model inference is
-    5-10s+ on constrained CPU, so it runs on a background thread instead of blocking the
-    review-creation/update response. Call via transaction.on_commit(...) so the thread
-    never queries the Review before the row is actually committed and visible.
+    Queues a review for background interest tagging — classify_review()'s model inference
+    is 5-10s+ on constrained CPU, so it never runs on the review-creation/update response.
+    Call via transaction.on_commit(...) so the worker never queries the Review before the
+    row is actually committed and visible. See api.services.classification_worker.
     """
-    def _run():
-        from django.db import connection
-        from django.utils.text import slugify
-        from core.models import Review
-        from api.models import Interest
-        try:
-            review = Review.objects.get(pk=review_id)
-            interest_names = classify_review(review)
-            if interest_names:
-                # get_or_create rather than filter — a tag may not have any Interest row
-                # yet if no user has ever picked it at registration.
-                matched = [
-                    Interest.objects.get_or_create(name=name, defaults={'slug': slugify(name)})[0]
-                    for name in interest_names
-                ]
-                review.interests.set(matched)
-            else:
-                # An edited review can legitimately end up with fewer/no matching tags —
-                # clear stale ones from a previous classification rather than leaving them.
-                review.interests.clear()
-        except Review.DoesNotExist:
-            pass
-        except Exception:
-            logger.exception("Background classification failed for review %s", review_id)
-        finally:
-            # Never closed by Django's normal request_finished cleanup (that only fires
-            # for the request thread) — without this, every review leaks one connection.
-            connection.close()
-
-    threading.Thread(target=_run, daemon=True).start()
+    from api.services.classification_worker import enqueue
+    enqueue('review', review_id)
 
 
 def classify_post(post):
@@ -215,16 +196,7 @@ def classify_post(post):
     and language-independent; embeddings only decide the ambiguous, organic-text case.
     Falls back to the keyword-based heuristics if the model isn't available.
     """
-    if post.review_parent_id:
-        category = 'reviews'
-    elif post.project_parent_id:
-        category = 'devlogs'
-    elif post.news_parent_id:
-        category = 'news'
-    elif post.gif_url and len(post.content or '') < 50:
-        category = 'memes'
-    else:
-        category = None
+    category = _structural_category(post)
 
     text = (post.content or '').strip()
 
@@ -251,47 +223,125 @@ def classify_post(post):
 
 def classify_post_async(post_id, overwrite_category):
     """
-    Runs classify_post() in a background thread instead of the request/response path —
-    model inference takes 5-10s+ on Railway's allocated CPU (see the "Batches" timing in
-    prod logs), which would otherwise make every single post creation wait that long.
-    The post is already saved (with its default/client-given category and no interest
-    tags) by the time this is called; this backfills category (only if the client didn't
-    explicitly set one) and interest tags a few seconds later.
-
-    Callers must invoke this via transaction.on_commit(...) so the background thread never
-    queries the Post before the row that created it is actually committed and visible —
-    it does its own fresh DB fetch/connection rather than reusing the request's.
+    Queues a post for background classification instead of running it on the
+    request/response path — model inference takes 5-10s+ on Railway's allocated CPU (see
+    the "Batches" timing in prod logs), which would otherwise make every single post
+    creation wait that long. The post is already saved (with its default/client-given
+    category and no interest tags) by the time this is called; the classification worker
+    backfills category (only if the client didn't explicitly set one) and interest tags a
+    few seconds later, batched with whatever else is pending.
+
+    Callers must invoke this via transaction.on_commit(...) so the worker never queries the
+    Post before the row that created it is actually committed and visible.
     """
-    def _run():
-        from django.db import connection
-        from django.utils.text import slugify
-        from core.models import Post
-        from api.models import Interest
+    from api.services.classification_worker import enqueue
+    enqueue('post', post_id, overwrite_category=overwrite_category)
+
+
+def _encode_batch(texts):
+    """One encode() call for a whole micro-batch of texts (rows aligned with `texts`). The
+    model batches internally, so a batch of N costs far less than N single-text calls."""
+    with _lock:
+        model = _get_model()
+        _get_interest_matrix()
+        _get_category_matrix()
+        return model.encode(texts)
+
+
+def _structural_category(post):
+    """classify_post's free, certain, language-independent category hints (None if none apply)."""
+    if post.review_parent_id:
+        return 'reviews'
+    if post.project_parent_id:
+        return 'devlogs'
+    if post.news_parent_id:
+        return 'news'
+    if post.gif_url and len(post.content or '') < 50:
+        return 'memes'
+    return None
+
+
+def classify_batch(jobs):
+    """
+    Classifies a micro-batch of queued items with at most one encode() call (items whose
+    text already has a stored embedding skip the model) and writes the results — the batch
+    form of classify_post/classify_review plus the write-back the old per-item background
+    threads did. `jobs` is an iterable of (item_type, object_id, overwrite_category) tuples
+    with item_type 'post' or 'review'; repeat ids are merged and rows deleted since they
+    were queued are skipped. Same fallbacks as the per-item path: if the model can't run,
+    posts get the keyword-heuristic category and no tags, reviews get no tags.
+    """
+    from django.utils.text import slugify
+    from core.models import Post, Review
+    from api.models import Interest
+    from api.services.categorize import auto_categorize_post
+
+    post_overwrite = {}
+    review_ids = set()
+    for item_type, object_id, overwrite_category in jobs:
+        if item_type == 'post':
+            post_overwrite[object_id] = post_overwrite.get(object_id, False) or overwrite_category
+        elif item_type == 'review':
+            review_ids.add(object_id)
+
+    posts = Post.objects.in_bulk(list(post_overwrite))
+    reviews = Review.objects.in_bulk(list(review_ids))
+
+    from api.services.embedding_store import embed_items, text_for_post, text_for_review
+    entries = [('post', pk, text_for_post(post)) for pk, post in posts.items()]
+    entries += [('review', pk, text_for_review(review)) for pk, review in reviews.items()]
+    try:
+        # Stored vectors are reused when the text hasn't changed since it was last embedded;
+        # everything else is encoded in one call and stored (api.services.embedding_store).
+        embeddings = embed_items(entries)
+    except Exception:
+        logger.exception("Embedding a batch of %d items failed; using fallbacks", len(entries))
+        embeddings = {}
+
+    interests_by_name = {}
+
+    def _interests(names):
+        # get_or_create rather than filter — a tag may not have any Interest row yet if no
+        # user has ever picked it at registration. Memoized across the batch.
+        for name in names:
+            if name not in interests_by_name:
+                interests_by_name[name] = Interest.objects.get_or_create(
+                    name=name, defaults={'slug': slugify(name)},
+                )[0]
+        return [interests_by_name[name] for name in names]
+
+    for pk, post in posts.items():
         try:
-            post = Post.objects.get(pk=post_id)
-            category, interest_names = classify_post(post)
-            update_fields = []
-            if overwrite_category:
+            category = _structural_category(post)
+            text_emb = embeddings.get(('post', pk))
+            if text_emb is not None:
+                if category is None:
+                    category = _category_from_embedding(text_emb)
+                interest_names = _interests_from_embedding(text_emb)
+            else:
+                if category is None:
+                    has_text = bool((post.content or '').strip())
+                    category = auto_categorize_post(post) if has_text else CATEGORY_FALLBACK
+                interest_names = []
+            if post_overwrite[pk]:
                 post.category = category
-                update_fields.append('category')
-            if update_fields:
-                post.save(update_fields=update_fields)
+                post.save(update_fields=['category'])
             if interest_names:
-                # get_or_create rather than filter — a tag may not have any Interest row
-                # yet if no user has ever picked it at registration.
-                matched = [
-                    Interest.objects.get_or_create(name=name, defaults={'slug': slugify(name)})[0]
-                    for name in interest_names
-                ]
-                post.interests.set(matched)
-        except Post.DoesNotExist:
-            pass
+                post.interests.set(_interests(interest_names))
         except Exception:
-            logger.exception("Background classification failed for post %s", post_id)
-        finally:
-            # This thread's DB connection is never closed by Django's normal
-            # request_finished cleanup (that only fires for the request thread) — without
-            # this, every post creation leaks one open connection.
-            connection.close()
-
-    threading.Thread(target=_run, daemon=True).start()
+            logger.exception("Background classification failed for post %s", pk)
+
+    for pk, review in reviews.items():
+        try:
+            text_emb = embeddings.get(('review', pk))
+            interest_names = _interests_from_embedding(text_emb) if text_emb is not None else []
+            if interest_names:
+                review.interests.set(_interests(interest_names))
+            else:
+                # An edited review can legitimately end up with fewer/no matching tags —
+                # clear stale ones from a previous classification rather than leaving them.
+                review.interests.clear()
+        except Exception:
+            logger.exception("Background classification failed for review %s", pk)
+
+    return len(posts) + len(reviews)
@@ -0,0 +1,238 @@
+"""
+Incrementally-maintained candidate store for FeedViewSet.for_you.
+
+The For You feed used to rebuild its candidate set from scratch on every request — up to four
+Post/Review scans (30-day window with an all-time fallback), each carrying four correlated COUNT
+subqueries, then Python scoring of up to 160 fully-hydrated objects. Almost all of that work was
+identical from one page load to the next. Instead:
+
+- api.models.FeedCandidate keeps one narrow row per root Post/Review with the engagement counts
+  the ranking formula needs, updated by the Post/Review/Like signals in api.models via the
+  on_* helpers below (single-row F() updates, no recounting).
+- The per-user half of the score (who you follow, what's in your library, your interests) is
+  cached per user by get_feed_profile() and invalidated by the Follow/LibraryEntry/interest
+  signals, instead of being re-queried on every request.
+- candidate_window() reads a pre-ranked window off the store's indexes (newest, most engaged,
+  and newest-from-followed-authors), ranks it with every score term except interest overlap
+  (which needs the M2M), and returns only the top slice for the view to hydrate and fully
+  re-score with the unchanged formula.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+# Mirrors FeedViewSet.for_you's window: 30 days, falling back to all-time when the recent pool
+# is too thin to fill a feed page (a quiet instance / fresh install).
+CANDIDATE_WINDOW_DAYS = 30
+MIN_RECENT_CANDIDATES = 80
+
+# How many store rows each index read contributes to the pre-ranked window, and how many of the
+# best-ranked ones the view then hydrates and re-scores.
+RECENT_LIMIT = 160
+ENGAGED_LIMIT = 80
+FOLLOWED_LIMIT = 40
+RESCORE_SLICE = 120
+
+LIKE_WEIGHT = 0.5
+REPLY_WEIGHT = 0.8
+
+FEED_PROFILE_CACHE_KEY = 'feed_profile:{user_id}'
+FEED_PROFILE_TTL = 300
+
+
+def engagement_score(likes_count, replies_count):
+    return likes_count * LIKE_WEIGHT + replies_count * REPLY_WEIGHT
+
+
+def is_feed_root_post(post):
+    """Same shape filter FeedViewSet.for_you has always used: not a reply or comment of any kind
+    (devlogs and reposts are still eligible)."""
+    return post.parent_id is None and post.review_parent_id is None and post.news_parent_id is None
+
+
+def add_post_candidate(post):
+    from api.models import FeedCandidate
+    FeedCandidate.objects.get_or_create(
+        post=post,
+        defaults={'item_type': 'post', 'author_id': post.user_id, 'timestamp': post.timestamp},
+    )
+
+
+def add_review_candidate(review):
+    from api.models import FeedCandidate
+    FeedCandidate.objects.get_or_create(
+        review=review,
+        defaults={
+            'item_type': 'review', 'author_id': review.user_id, 'game_id': review.game_id,
+            'timestamp': review.timestamp,
+        },
+    )
+
+
+def _bump(target_filter, likes_delta=0, replies_delta=0):
+    """Adjusts one candidate's counts and its engagement_score in a single UPDATE. In SQL every
+    SET expression reads the pre-update row, so the score is recomputed from the old counts plus
+    the delta rather than from the just-written columns."""
+    from api.models import FeedCandidate
+    qs = FeedCandidate.objects.filter(**target_filter)
+    # Never drive a counter negative (a delete racing a rebuild, or a row that predates the store).
+    if likes_delta < 0:
+        qs = qs.filter(likes_count__gte=-likes_delta)
+    if replies_delta < 0:
+        qs = qs.filter(replies_count__gte=-replies_delta)
+    qs.update(
+        likes_count=F('likes_count') + likes_delta,
+        replies_count=F('replies_count') + replies_delta,
+        engagement_score=(
+            (F('likes_count') + likes_delta) * LIKE_WEIGHT
+            + (F('replies_count') + replies_delta) * REPLY_WEIGHT
+        ),
+    )
+
+
+def on_post_created(post):
+    if is_feed_root_post(post):
+        add_post_candidate(post)
+    elif post.parent_id:
+        _bump({'post_id': post.parent_id}, replies_delta=1)
+    elif post.review_parent_id:
+        _bump({'review_id': post.review_parent_id}, replies_delta=1)
+
+
+def on_post_deleted(post):
+    # A deleted root post takes its FeedCandidate row with it via CASCADE; only replies need to
+    # give their count back to the parent.
+    if post.parent_id:
+        _bump({'post_id': post.parent_id}, replies_delta=-1)
+    elif post.review_parent_id:
+        _bump({'review_id': post.review_parent_id}, replies_delta=-1)
+
+
+def on_like_changed(like, delta):
+    if like.post_id:
+        _bump({'post_id': like.post_id}, likes_delta=delta)
+    elif like.review_id:
+        _bump({'review_id': like.review_id}, likes_delta=delta)
+
+
+def get_feed_profile(user):
+    """The per-user inputs to the For You score, cached per user. Each field used to be its own
+    query on every feed request; Follow/LibraryEntry/interest changes invalidate the entry (see
+    invalidate_feed_profile's callers in api.models), and the TTL bounds anything else."""
+    key = FEED_PROFILE_CACHE_KEY.format(user_id=user.id)
+    profile = cache.get(key)
+    if profile is None:
+        from api.services.categorize import expand_interest_keywords
+        interests = list(user.interests.values_list('id', 'name'))
+        profile = {
+            'followed_ids': set(user.following.values_list('following_id', flat=True)),
+            'library_playtimes': dict(user.library.values_list('game_id', 'playtime_forever')),
+            'interest_ids': {interest_id for interest_id, _ in interests},
+            'interest_keywords': expand_interest_keywords(name for _, name in interests),
+        }
+        cache.set(key, profile, FEED_PROFILE_TTL)
+    return profile
+
+
+def invalidate_feed_profile(user_id):
+    cache.delete(FEED_PROFILE_CACHE_KEY.format(user_id=user_id))
+
+
+def _prerank(row, now, followed_ids, library_playtimes):
+    """Every For You score term except interest overlap (unknown until the item's interests are
+    prefetched). Interest overlap is capped at +6 for every item, so this ordering only decides
+    which items are worth hydrating — the final order comes from the full re-score."""
+    age_in_days = (now - row['timestamp']).total_seconds() / 86400.0
+    score = 10.0 / (1.0 + age_in_days * 0.5)
+    score += row['likes_count'] * LIKE_WEIGHT + row['replies_count'] * REPLY_WEIGHT
+    if row['author_id'] in followed_ids:
+        score += 5.0
+    if row['game_id'] is not None and row['game_id'] in library_playtimes:
+        score += 4.0
+        if library_playtimes[row['game_id']] > 0:
+            score += 2.0
+    return score
+
+
+def candidate_window(exclude_user_ids=(), not_interested_post_ids=(), not_interested_review_ids=(),
+                     followed_ids=(), library_playtimes=None):
+    """Returns (post_ids, review_ids) — the top RESCORE_SLICE candidates by pre-rank score, drawn
+    from three index reads on the store: the newest rows, the most engaged rows, and the newest
+    rows by followed authors (so the +5 follow bonus can still surface a quiet post)."""
+    from api.models import FeedCandidate
+
+    library_playtimes = library_playtimes or {}
+    now = timezone.now()
+
+    pool = FeedCandidate.objects.all()
+    if exclude_user_ids:
+        pool = pool.exclude(author_id__in=exclude_user_ids)
+    if not_interested_post_ids:
+        pool = pool.exclude(post_id__in=not_interested_post_ids)
+    if not_interested_review_ids:
+        pool = pool.exclude(review_id__in=not_interested_review_ids)
+
+    fields = ('id', 'post_id', 'review_id', 'author_id', 'game_id', 'timestamp', 'likes_count', 'replies_count')
+    recent_pool = pool.filter(timestamp__gte=now - timedelta(days=CANDIDATE_WINDOW_DAYS))
+    recent = list(recent_pool.order_by('-timestamp').values(*fields)[:RECENT_LIMIT])
+    if len(recent) < MIN_RECENT_CANDIDATES:
+        recent_pool = pool
+        recent = list(pool.order_by('-timestamp').values(*fields)[:RECENT_LIMIT])
+
+    rows = {row['id']: row for row in recent}
+    for row in recent_pool.order_by('-engagement_score', '-timestamp').values(*fields)[:ENGAGED_LIMIT]:
+        rows.setdefault(row['id'], row)
+    if followed_ids:
+        followed = recent_pool.filter(author_id__in=followed_ids).order_by('-timestamp')
+        for row in followed.values(*fields)[:FOLLOWED_LIMIT]:
+            rows.setdefault(row['id'], row)
+
+    ranked = sorted(
+        rows.values(),
+        key=lambda row: _prerank(row, now, followed_ids, library_playtimes),
+        reverse=True,
+    )[:RESCORE_SLICE]
+    post_ids = [row['post_id'] for row in ranked if row['post_id'] is not None]
+    review_ids = [row['review_id'] for row in ranked if row['review_id'] is not None]
+    return post_ids, review_ids
+
+
+def rebuild_candidates(chunk_size=2000):
+    """Recreates every FeedCandidate row from the source tables with exact counts. Used to
+    backfill the store and to correct any drift from writes that bypass signals (bulk_create,
+    queryset.update/delete)."""
+    from django.db import transaction
+    from api.models import FeedCandidate
+    from api.serializers import count_subquery
+    from core.models import Like, Post, Review
+
+    posts = Post.objects.filter(
+        parent__isnull=True, review_parent__isnull=True, news_parent__isnull=True,
+    ).annotate(
+        likes_count_ann=count_subquery(Like, 'post'),
+        replies_count_ann=count_subquery(Post, 'parent'),
+    ).values_list('id', 'user_id', 'timestamp', 'likes_count_ann', 'replies_count_ann')
+    reviews = Review.objects.annotate(
+        likes_count_ann=count_subquery(Like, 'review'),
+        replies_count_ann=count_subquery(Post, 'review_parent'),
+    ).values_list('id', 'user_id', 'game_id', 'timestamp', 'likes_count_ann', 'replies_count_ann')
+
+    rows = []
+    for post_id, user_id, timestamp, likes, replies in posts.iterator(chunk_size=chunk_size):
+        rows.append(FeedCandidate(
+            item_type='post', post_id=post_id, author_id=user_id, timestamp=timestamp,
+            likes_count=likes, replies_count=replies, engagement_score=engagement_score(likes, replies),
+        ))
+    for review_id, user_id, game_id, timestamp, likes, replies in reviews.iterator(chunk_size=chunk_size):
+        rows.append(FeedCandidate(
+            item_type='review', review_id=review_id, author_id=user_id, game_id=game_id,
+            timestamp=timestamp, likes_count=likes, replies_count=replies,
+            engagement_score=engagement_score(likes, replies),
+        ))
+
+    with transaction.atomic():
+        FeedCandidate.objects.all().delete()
+        FeedCandidate.objects.bulk_create(rows, batch_size=chunk_size)
+    return len(rows)
@@ -0,0 +1,295 @@
+"""
+Bulk IGDB detail hydration for Game rows (summary, storyline, companies, platforms,
+screenshots, genres, Metacritic score, and optionally HowLongToBeat times).
+
+fetch_game_details used to do this one game at a time: an optional title search to resolve
+the igdb_id, a single-id details query and a save(), inline on GameViewSet.details while the
+user waited. hydrate_games() takes any iterable of Game ids instead:
+
+1. games without an igdb_id are resolved by title search (IGDB has no multi-title search, so
+   these fan out over the pool);
+2. details are fetched with `where id = (...)` queries of up to HYDRATION_BATCH_SIZE ids, run
+   with bounded concurrency — http_client's shared 'igdb' limiter keeps the pool under IGDB's
+   rate limit;
+3. HLTB lookups (per title, separate site) run on the same pool when requested;
+4. rows are written back with one bulk_update per batch. Ids IGDB doesn't know are still
+   marked details_fetched so they aren't retried forever.
+
+enqueue_hydration() is the request-path entry point: it hands one id to a background
+micro-batching worker (the same ClassificationWorker machinery the embedding classifier
+uses) and returns at once, so `details` can respond with the partial record.
+"""
+import datetime
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from api.services import http_client
+from api.services.genre_index import sync_game_genres
+
+logger = logging.getLogger(__name__)
+
+HYDRATION_BATCH_SIZE = 300  # IGDB caps `limit` at 500; 300 keeps responses a sane size
+HYDRATION_WORKERS = 4
+# The background worker gathers ids for this long so a burst of detail-page views becomes one
+# multi-id query.
+QUEUE_BATCH_WAIT_SECONDS = 1.0
+QUEUED_CACHE_KEY = 'igdb_hydration_queued:{game_id}'
+QUEUED_TTL = 10 * 60
+
+DETAILS_FIELDS = (
+    'id, summary, storyline, url, cover.url, first_release_date, aggregated_rating, '
+    'involved_companies.company.name, involved_companies.developer, involved_companies.publisher, '
+    'platforms.name, screenshots.url, genres.name'
+)
+UPDATE_FIELDS = [
+    'igdb_id', 'summary', 'description', 'igdb_url', 'release_date', 'cover_image', 'developer',
+    'publisher', 'platforms', 'screenshots', 'genres', 'metacritic_score', 'hltb_main',
+    'hltb_main_extra', 'hltb_completionist', 'details_fetched',
+]
+
+
+def _https(url):
+    return f'https:{url}' if url.startswith('//') else url
+
+
+def apply_igdb_details(game, igdb_data):
+    """Copies one IGDB /games record onto `game` (unsaved). Release date and cover are only
+    filled in when missing; everything else is replaced."""
+    game.summary = igdb_data.get('summary', '')
+    game.description = igdb_data.get('storyline', '')
+    game.igdb_url = igdb_data.get('url', '')
+
+    if 'first_release_date' in igdb_data and not game.release_date:
+        try:
+            game.release_date = datetime.datetime.fromtimestamp(igdb_data['first_release_date']).date()
+        except (TypeError, ValueError, OverflowError, OSError) as e:
+            logger.warning("Failed to parse release date for %s: %s", game.title, e)
+
+    cover = igdb_data.get('cover') or {}
+    if cover.get('url') and not game.cover_image:
+        game.cover_image = _https(cover['url']).replace('t_thumb', 't_cover_big')
+
+    developers, publishers = [], []
+    for c in igdb_data.get('involved_companies', []):
+        name = (c.get('company') or {}).get('name')
+        if not name:
+            continue
+        if c.get('developer'):
+            developers.append(name)
+        if c.get('publisher'):
+            publishers.append(name)
+    game.developer = ', '.join(developers)
+    game.publisher = ', '.join(publishers)
+
+    game.platforms = [p['name'] for p in igdb_data.get('platforms', []) if 'name' in p]
+    # 720p-class screenshots instead of thumbnails.
+    game.screenshots = [
+        _https(s['url']).replace('t_thumb', 't_screenshot_huge')
+        for s in igdb_data.get('screenshots', []) if 'url' in s
+    ]
+
+    if 'aggregated_rating' in igdb_data:
+        game.metacritic_score = int(round(igdb_data['aggregated_rating']))
+
+    genres = [g['name'] for g in igdb_data.get('genres', []) if 'name' in g]
+    if genres:
+        game.genres = genres
+    return game
+
+
+def _igdb_headers():
+    from api.services.igdb_service import IGDB_CLIENT_ID, get_igdb_token
+    token = get_igdb_token()
+    if not token:
+        return None
+    return {'Client-ID': IGDB_CLIENT_ID, 'Authorization': f'Bearer {token}'}
+
+
+def search_igdb_id(title, headers):
+    """Best IGDB id for a title: an exact-name main game if there is one, else the first hit.
+    Returns None when IGDB has no match; raises on transport/HTTP errors."""
+    from api.services.igdb_service import _sanitize_apicalypse
+    query = (f'search "{_sanitize_apicalypse(title)}"; '
+             'fields id, name, category, version_parent, parent_game; limit 10;')
+    resp = http_client.post('igdb', 'https://api.igdb.com/v4/games', headers=headers, data=query, timeout=10)
+    resp.raise_for_status()
+    results = resp.json()
+    if not results:
+        return None
+    for g in results:
+        if g.get('category', 0) in (0, 8, 9, 10, 11) and not g.get('version_parent') \
+                and g.get('name', '').lower() == title.lower():
+            return g['id']
+    return results[0]['id']
+
+
+def fetch_igdb_batch(igdb_ids, headers):
+    """One multi-id details query; returns {igdb_id: record}."""
+    query = f"fields {DETAILS_FIELDS}; where id = ({','.join(str(i) for i in igdb_ids)}); limit {len(igdb_ids)};"
+    resp = http_client.post('igdb', 'https://api.igdb.com/v4/games', headers=headers, data=query, timeout=30)
+    resp.raise_for_status()
+    return {record['id']: record for record in resp.json()}
+
+
+def _apply_hltb(game):
+    from api.services.hltb_service import fetch_hltb_times
+    times = fetch_hltb_times(game.title)
+    game.hltb_main = times.get('hltb_main')
+    game.hltb_main_extra = times.get('hltb_main_extra')
+    game.hltb_completionist = times.get('hltb_completionist')
+
+
+def hydrate_games(game_ids, batch_size=HYDRATION_BATCH_SIZE, max_workers=HYDRATION_WORKERS,
+                  with_hltb=True, force=False, dry_run=False, on_progress=None, update_fields=None):
+    """
+    Fetches IGDB details for the given Game ids and bulk-writes them. Games already marked
+    details_fetched are skipped unless `force`. With `dry_run` nothing is written (the
+    returned Game objects still carry the fetched values). `update_fields` limits the columns
+    written back (default: all of UPDATE_FIELDS, plus the igdb_id/details_fetched bookkeeping)
+    — a forced re-fetch for one column must not clobber the rest with IGDB's current values.
+    `on_progress(done, total)` is called after each batch.
+
+    Returns stats: {'requested', 'resolved', 'hydrated', 'not_found', 'errors', 'games'}.
+    """
+    from core.models import Game
+
+    stats = {'requested': 0, 'resolved': 0, 'hydrated': 0, 'not_found': 0, 'errors': 0, 'games': []}
+    games = Game.objects.filter(pk__in=list(game_ids))
+    if not force:
+        games = games.filter(details_fetched=False)
+    games = list(games.order_by('pk'))
+    stats['requested'] = len(games)
+    if not games:
+        return stats
+
+    headers = _igdb_headers()
+    if not headers:
+        logger.warning("IGDB credentials/token unavailable. Skipping detail fetch for %d game(s)", len(games))
+        return stats
+
+    allowed = set(UPDATE_FIELDS if update_fields is None else update_fields)
+
+    def write(rows, fields):
+        fields = [f for f in fields if f in allowed]
+        if rows and fields and not dry_run:
+            Game.objects.bulk_update(rows, fields, batch_size=batch_size)
+            if 'genres' in fields:
+                sync_game_genres(rows)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Stage 1: resolve igdb_ids for games synced without one (e.g. from Steam).
+        unresolved = [g for g in games if not g.igdb_id]
+        targets = {g.pk: g.igdb_id for g in games if g.igdb_id}
+
+        def search(game):
+            try:
+                return game, search_igdb_id(game.title, headers)
+            except Exception as e:
+                logger.warning("Failed to resolve IGDB ID for %s: %s", game.title, e)
+                return game, False
+
+        not_found, assigned = [], []
+        found = list(pool.map(search, unresolved))
+        taken = set(Game.objects.filter(igdb_id__in=[i for _, i in found if i]).values_list('igdb_id', flat=True))
+        for game, igdb_id in found:
+            if igdb_id is False:
+                stats['errors'] += 1
+                continue
+            if igdb_id is None:
+                game.details_fetched = True
+                not_found.append(game)
+                continue
+            targets[game.pk] = igdb_id
+            stats['resolved'] += 1
+            # igdb_id is unique — only claim it if no other row (or earlier game here) holds it.
+            if igdb_id not in taken:
+                game.igdb_id = igdb_id
+                taken.add(igdb_id)
+                assigned.append(game)
+        write(assigned, ['igdb_id'])
+        write(not_found, ['details_fetched'])
+        stats['not_found'] += len(not_found)
+
+        # Stage 2: multi-id detail queries, several in flight at once.
+        by_pk = {g.pk: g for g in games}
+        pending = [by_pk[pk] for pk in targets]
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+        def fetch(batch):
+            try:
+                return batch, fetch_igdb_batch(sorted({targets[g.pk] for g in batch}), headers)
+            except Exception as e:
+                logger.warning("IGDB batch of %d game(s) failed: %s", len(batch), e)
+                return batch, None
+
+        done = 0
+        for batch, records in pool.map(fetch, batches):
+            done += len(batch)
+            if records is None:
+                stats['errors'] += len(batch)
+            else:
+                hydrated = []
+                for game in batch:
+                    record = records.get(targets[game.pk])
+                    if record:
+                        apply_igdb_details(game, record)
+                        hydrated.append(game)
+                    else:
+                        stats['not_found'] += 1
+                    # Mark as fetched even if IGDB returned nothing so we don't keep trying.
+                    game.details_fetched = True
+                if with_hltb:
+                    list(pool.map(_apply_hltb, hydrated))
+                write(batch, UPDATE_FIELDS)
+                stats['hydrated'] += len(hydrated)
+                stats['games'].extend(hydrated)
+            if on_progress:
+                on_progress(done, len(pending))
+
+    logger.info("IGDB hydration: %d requested, %d hydrated, %d not found, %d errors",
+                stats['requested'], stats['hydrated'], stats['not_found'], stats['errors'])
+    return stats
+
+
+# --- Background queue --------------------------------------------------------------------
+
+def _hydrate_and_release(batch):
+    from django.core.cache import cache
+    from django.db import connection
+    game_ids = [object_id for _, object_id, _ in batch]
+    try:
+        hydrate_games(game_ids)
+    finally:
+        cache.delete_many([QUEUED_CACHE_KEY.format(game_id=i) for i in game_ids])
+        connection.close()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_hydration_worker():
+    """This process's background hydration worker, created on first use."""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                from api.services.classification_worker import ClassificationWorker
+                _worker = ClassificationWorker(
+                    process_batch=_hydrate_and_release, batch_size=HYDRATION_BATCH_SIZE,
+                    batch_wait=QUEUE_BATCH_WAIT_SECONDS, name='igdb-hydration',
+                )
+    return _worker
+
+
+def enqueue_hydration(game_id):
+    """Queues a game for background hydration unless it's already queued (by any process
+    sharing the cache). Returns True if it was queued by this call."""
+    from django.core.cache import cache
+    if not cache.add(QUEUED_CACHE_KEY.format(game_id=game_id), 1, QUEUED_TTL):
+        return False
+    if not get_hydration_worker().submit('game', game_id):
+        cache.delete(QUEUED_CACHE_KEY.format(game_id=game_id))
+        return False
+    return True
@@ -0,0 +1,241 @@
+"""
+Materialized per-game statistics (api.models.GameStats) for the game page, trending and
+hidden gems.
+
+Those endpoints used to aggregate the Review and LibraryEntry tables on every request
+(`Avg`/`Count` per game page view, `Count('library_entries')` over the whole Game table for
+trending, every game's reviews plus `ORDER BY RANDOM()` for hidden gems). Instead each game
+has one GameStats row:
+
+- the Review/LibraryEntry signals in api.models call the on_* helpers below, which lock the
+  row (SELECT ... FOR UPDATE) and apply the change — counts, rating sum/average, histogram
+  bucket, per-status count, recent activity — so concurrent writers serialize per game;
+- every game gets an empty row when it's created (the post_save signal, or ensure_rows()
+  after a bulk_create); migration 0042 counted the games that existed before the rollup. A
+  game still without one is counted exactly on first touch;
+- writers that bypass signals (Steam library sync) call refresh() for the games they wrote;
+- `reconcile_game_stats` recounts everything periodically: it corrects drift and ages
+  entries out of recent_activity_count, which the signals only ever increment.
+"""
+import logging
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+RECENT_ACTIVITY_DAYS = 7
+RECONCILE_CHUNK_SIZE = 1000
+STAT_FIELDS = (
+    'review_count', 'rating_sum', 'avg_rating', 'rating_histogram', 'log_count', 'status_counts',
+    'recent_activity_count',
+)
+
+
+def _decimal(rating):
+    return rating if isinstance(rating, Decimal) else Decimal(str(rating))
+
+
+def rating_bucket(rating):
+    return str(int(_decimal(rating)))
+
+
+def _bump(counts, key, delta):
+    value = counts.get(key, 0) + delta
+    if value > 0:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+def _finish(stats):
+    stats.avg_rating = float(stats.rating_sum / stats.review_count) if stats.review_count else None
+
+
+def _is_recent(timestamp):
+    return timestamp is not None and timestamp >= timezone.now() - timedelta(days=RECENT_ACTIVITY_DAYS)
+
+
+# --- Exact counts ------------------------------------------------------------------------
+
+def compute(game_ids):
+    """{game_id: {field: value}} counted from the Review/LibraryEntry tables (grouped queries,
+    independent of how many games)."""
+    from django.db.models import Count, Sum
+    from django.db.models.functions import Floor
+    from api.models import LibraryEntry
+    from core.models import Review
+
+    game_ids = list(game_ids)
+    rows = {
+        game_id: {
+            'review_count': 0, 'rating_sum': Decimal('0'), 'rating_histogram': {}, 'log_count': 0,
+            'status_counts': {}, 'recent_activity_count': 0,
+        }
+        for game_id in game_ids
+    }
+    reviews = Review.objects.filter(game_id__in=game_ids)
+    for game_id, n, total in reviews.values('game_id').annotate(n=Count('id'), total=Sum('rating')).values_list('game_id', 'n', 'total'):
+        rows[game_id]['review_count'] = n
+        rows[game_id]['rating_sum'] = _decimal(total or 0)
+    buckets = reviews.annotate(bucket=Floor('rating')).values('game_id', 'bucket').annotate(n=Count('id'))
+    for game_id, bucket, n in buckets.values_list('game_id', 'bucket', 'n'):
+        rows[game_id]['rating_histogram'][rating_bucket(bucket)] = n
+
+    entries = LibraryEntry.objects.filter(game_id__in=game_ids)
+    for game_id, entry_status, n in entries.values('game_id', 'status').annotate(n=Count('id')).values_list('game_id', 'status', 'n'):
+        rows[game_id]['status_counts'][entry_status] = n
+        rows[game_id]['log_count'] += n
+
+    since = timezone.now() - timedelta(days=RECENT_ACTIVITY_DAYS)
+    for queryset in (reviews.filter(timestamp__gte=since), entries.filter(added_at__gte=since)):
+        for game_id, n in queryset.values('game_id').annotate(n=Count('id')).values_list('game_id', 'n'):
+            rows[game_id]['recent_activity_count'] += n
+
+    for values in rows.values():
+        count = values['review_count']
+        values['avg_rating'] = float(values['rating_sum'] / count) if count else None
+    return rows
+
+
+def refresh(game_ids):
+    """Recounts the given games exactly and writes their rows (creating missing ones).
+    Returns the number of rows that were created or changed."""
+    from api.models import GameStats
+    from core.models import Game
+
+    game_ids = set(Game.objects.filter(pk__in=list(game_ids)).values_list('pk', flat=True))
+    if not game_ids:
+        return 0
+    with transaction.atomic():
+        existing = {stats.game_id: stats for stats in GameStats.objects.select_for_update().filter(game_id__in=game_ids)}
+        exact = compute(game_ids)
+        changed, missing = [], []
+        for game_id, values in exact.items():
+            stats = existing.get(game_id)
+            if stats is None:
+                missing.append(GameStats(game_id=game_id, **values))
+                continue
+            if any(getattr(stats, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(stats, field, value)
+                changed.append(stats)
+        if changed:
+            GameStats.objects.bulk_update(changed, STAT_FIELDS)
+        if missing:
+            GameStats.objects.bulk_create(missing, ignore_conflicts=True)
+    return len(changed) + len(missing)
+
+
+def get_stats(game_id):
+    """The GameStats row for one game, counted on the spot if it doesn't exist yet."""
+    from api.models import GameStats
+    stats = GameStats.objects.filter(game_id=game_id).first()
+    if stats is None:
+        refresh([game_id])
+        stats = GameStats.objects.get(game_id=game_id)
+    return stats
+
+
+def reconcile(chunk_size=RECONCILE_CHUNK_SIZE, on_progress=None):
+    """Recounts every game's row. Returns the number of rows created or corrected."""
+    from core.models import Game
+    game_ids = list(Game.objects.order_by('pk').values_list('pk', flat=True))
+    corrected = 0
+    for start in range(0, len(game_ids), chunk_size):
+        corrected += refresh(game_ids[start:start + chunk_size])
+        if on_progress:
+            on_progress(min(start + chunk_size, len(game_ids)), len(game_ids))
+    return corrected
+
+
+# --- Incremental updates (called from api.models signals) --------------------------------
+
+def _apply(game_id, change, create_missing=True):
+    from api.models import GameStats
+    with transaction.atomic():
+        stats = GameStats.objects.select_for_update().filter(game_id=game_id).first()
+        if stats is None:
+            # First touch: count exactly — the count already includes this change. Skipped
+            # for deletes, which may be part of the game's own cascade.
+            if create_missing:
+                refresh([game_id])
+            return
+        change(stats)
+        _finish(stats)
+        stats.save(update_fields=[*STAT_FIELDS, 'updated_at'])
+
+
+def ensure_row(game):
+    from api.models import GameStats
+    GameStats.objects.get_or_create(game_id=game.pk)
+
+
+def ensure_rows(games):
+    """ensure_row for games written with bulk_create, which skips the post_save signal."""
+    from api.models import GameStats
+    GameStats.objects.bulk_create([GameStats(game_id=game.pk) for game in games], ignore_conflicts=True)
+
+
+def on_review_created(review):
+    def change(stats):
+        stats.review_count += 1
+        stats.rating_sum += _decimal(review.rating)
+        _bump(stats.rating_histogram, rating_bucket(review.rating), 1)
+        if _is_recent(review.timestamp):
+            stats.recent_activity_count += 1
+    _apply(review.game_id, change)
+
+
+def on_review_rating_changed(review, old_rating):
+    def change(stats):
+        stats.rating_sum += _decimal(review.rating) - _decimal(old_rating)
+        _bump(stats.rating_histogram, rating_bucket(old_rating), -1)
+        _bump(stats.rating_histogram, rating_bucket(review.rating), 1)
+    _apply(review.game_id, change)
+
+
+def on_review_deleted(review):
+    def change(stats):
+        stats.review_count = max(stats.review_count - 1, 0)
+        stats.rating_sum = stats.rating_sum - _decimal(review.rating) if stats.review_count else Decimal('0')
+        _bump(stats.rating_histogram, rating_bucket(review.rating), -1)
+    _apply(review.game_id, change, create_missing=False)
+
+
+def on_entry_created(entry):
+    def change(stats):
+        stats.log_count += 1
+        _bump(stats.status_counts, entry.status, 1)
+        if _is_recent(entry.added_at):
+            stats.recent_activity_count += 1
+    _apply(entry.game_id, change)
+
+
+def on_entry_status_changed(entry, old_status):
+    def change(stats):
+        _bump(stats.status_counts, old_status, -1)
+        _bump(stats.status_counts, entry.status, 1)
+    _apply(entry.game_id, change)
+
+
+def on_entry_deleted(entry):
+    def change(stats):
+        stats.log_count = max(stats.log_count - 1, 0)
+        _bump(stats.status_counts, entry.status, -1)
+    _apply(entry.game_id, change, create_missing=False)
+
+
+# --- Reads -------------------------------------------------------------------------------
+
+def random_sample(queryset, limit):
+    """Up to `limit` rows of a GameStats queryset in random order, read off the random_key
+    index from a random pivot (wrapping around) instead of ORDER BY RANDOM()."""
+    pivot = random.random()
+    rows = list(queryset.filter(random_key__gte=pivot).order_by('random_key')[:limit])
+    if len(rows) < limit:
+        rows += list(queryset.filter(random_key__lt=pivot).order_by('random_key')[:limit - len(rows)])
+    return rows
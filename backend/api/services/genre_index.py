@@ -0,0 +1,225 @@
+"""
+Canonical genre ids for games, and an in-memory genre -> game-id bitmap index over them.
+
+Game.genres holds whatever names the source gave us ("Action", "Экшен", "Aksiyon",
+"Role-playing (RPG)", ...). Instead of normalizing those strings on every request,
+sync_game_genres() maps them to core.Genre rows once, when a game's genres are written, and
+stores the links in core.GameGenre (indexed both ways). The Game post_save signal in
+api.models keeps ordinary saves in step; bulk writers (Steam library sync, IGDB hydration)
+call sync_game_genres() themselves, and `backfill_genre_ids` converts existing rows.
+
+On top of the join table every process keeps one bit per game id per genre (numpy, packed),
+so "unplayed games in any of these genres" is a handful of bitwise ops rather than a
+`genres__icontains` scan. The bitmaps are rebuilt from GameGenre when a link changes (a
+version counter in the shared cache), at most once per REFRESH_INTERVAL — callers always
+fetch the chosen ids through the ORM, so a briefly stale bitmap only means a game that was
+just retagged is or isn't offered for a few seconds.
+"""
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+from django.core.cache import cache
+from django.utils.text import slugify
+
+logger = logging.getLogger(__name__)
+
+# IGDB's names for genres Steam also has, mapped onto the Steam (canonical) name.
+GENRE_ALIASES = {
+    'role-playing (rpg)': 'RPG',
+    'simulator': 'Simulation',
+    'sport': 'Sports',
+    'platform': 'Platformer',
+    'turn-based strategy (tbs)': 'Turn-Based Strategy',
+    'massively multiplayer online (mmo)': 'Massively Multiplayer',
+}
+
+VERSION_KEY = 'genre_index:version'
+# Minimum seconds between rebuilds of a process's bitmaps after a change.
+REFRESH_INTERVAL = 30.0
+SYNC_CHUNK_SIZE = 2000
+
+
+# --- Canonical genres --------------------------------------------------------------------
+
+def canonical_name(raw):
+    """Display name of the canonical genre for one raw genre string ('' if there is none)."""
+    from api.services.steam import normalize_genre
+    name = normalize_genre(str(raw or '').strip())
+    return GENRE_ALIASES.get(name.casefold(), name)
+
+
+def genre_slug(raw):
+    return slugify(canonical_name(raw), allow_unicode=True)[:100]
+
+
+def genre_ids_for(names, create=True):
+    """{raw name: Genre id} for `names`. Unknown genres are created unless `create` is False,
+    in which case they're left out."""
+    from core.models import Genre
+    slugs = {}
+    for name in names:
+        slug = genre_slug(name)
+        if slug:
+            slugs[name] = slug
+    if not slugs:
+        return {}
+    found = dict(Genre.objects.filter(slug__in=set(slugs.values())).values_list('slug', 'id'))
+    new = set(slugs.values()) - set(found)
+    if new and create:
+        display = {slug: canonical_name(name) for name, slug in slugs.items()}
+        Genre.objects.bulk_create([Genre(slug=slug, name=display[slug][:100]) for slug in new], ignore_conflicts=True)
+        found.update(Genre.objects.filter(slug__in=new).values_list('slug', 'id'))
+    return {name: found[slug] for name, slug in slugs.items() if slug in found}
+
+
+def sync_game_genres(games):
+    """Makes each game's GameGenre links match its `genres` list. Takes saved Game objects
+    (only pk and genres are read); returns the number of links added plus removed."""
+    from django.db import transaction
+    from core.models import GameGenre
+
+    games = [game for game in games if game.pk is not None]
+    if not games:
+        return 0
+    ids = genre_ids_for({name for game in games for name in (game.genres or []) if isinstance(name, str)})
+    wanted = {
+        game.pk: {ids[name] for name in (game.genres or []) if isinstance(name, str) and name in ids}
+        for game in games
+    }
+    existing = defaultdict(set)
+    stale = []
+    for link_id, game_id, genre_id in GameGenre.objects.filter(game_id__in=wanted).values_list('id', 'game_id', 'genre_id'):
+        existing[game_id].add(genre_id)
+        if genre_id not in wanted[game_id]:
+            stale.append(link_id)
+    new = [
+        GameGenre(game_id=game_id, genre_id=genre_id)
+        for game_id, genre_ids in wanted.items()
+        for genre_id in genre_ids - existing[game_id]
+    ]
+    if stale:
+        GameGenre.objects.filter(id__in=stale).delete()
+    if new:
+        GameGenre.objects.bulk_create(new, ignore_conflicts=True)
+    if stale or new:
+        transaction.on_commit(mark_changed)
+    return len(stale) + len(new)
+
+
+# --- Bitmap index ------------------------------------------------------------------------
+
+def _seed_version():
+    # A counter restarted after a cache flush starts at a random value, so it never counts
+    # back up to the version an existing process's bitmaps were built at (as in
+    # search_index._start_journal).
+    cache.add(VERSION_KEY, random.randrange(2 ** 40), None)
+
+
+def current_version():
+    _seed_version()
+    return cache.get(VERSION_KEY) or 0
+
+
+def mark_changed():
+    """Tells every process its bitmaps are out of date."""
+    _seed_version()
+    cache.incr(VERSION_KEY)
+
+
+class GenreBitmaps:
+    """One packed bit array per genre; bit i is set when game i has the genre."""
+
+    def __init__(self, bitmaps, size, version=0):
+        self.bitmaps = bitmaps
+        self.size = size  # bits per bitmap (highest game id + 1, rounded up to whole bytes)
+        self.version = version
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def from_links(cls, genre_ids, game_ids, version=0):
+        genre_ids = np.asarray(genre_ids, dtype=np.int64)
+        game_ids = np.asarray(game_ids, dtype=np.int64)
+        size = int(game_ids.max()) + 1 if len(game_ids) else 0
+        size += -size % 8
+        bitmaps = {}
+        if len(game_ids):
+            order = np.argsort(genre_ids, kind='stable')
+            genre_ids, game_ids = genre_ids[order], game_ids[order]
+            bounds = np.flatnonzero(np.diff(genre_ids)) + 1
+            for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(genre_ids)]):
+                bits = np.zeros(size, dtype=bool)
+                bits[game_ids[start:end]] = True
+                bitmaps[int(genre_ids[start])] = np.packbits(bits)
+        return cls(bitmaps, size, version=version)
+
+    @classmethod
+    def build(cls, version=0):
+        from core.models import GameGenre
+        links = GameGenre.objects.values_list('genre_id', 'game_id')
+        genre_ids, game_ids = [], []
+        for genre_id, game_id in links.iterator(chunk_size=20000):
+            genre_ids.append(genre_id)
+            game_ids.append(game_id)
+        return cls.from_links(genre_ids, game_ids, version=version)
+
+    def _exclusion(self, ids):
+        ids = np.fromiter((i for i in ids if 0 <= i < self.size), dtype=np.int64)
+        bits = np.zeros(self.size, dtype=bool)
+        bits[ids] = True
+        return np.packbits(bits)
+
+    def match(self, genre_ids, exclude=(), require_all=False):
+        """Sorted game ids having any (or, with `require_all`, every) genre in `genre_ids`,
+        minus the ids in `exclude`."""
+        genre_ids = list(genre_ids)
+        if not genre_ids or not self.size:
+            return np.empty(0, dtype=np.int64)
+        empty = np.zeros(self.size // 8, dtype=np.uint8)
+        maps = [self.bitmaps.get(genre_id, empty) for genre_id in genre_ids]
+        combined = (np.bitwise_and if require_all else np.bitwise_or).reduce(maps)
+        if exclude:
+            combined = combined & ~self._exclusion(exclude)
+        return np.flatnonzero(np.unpackbits(combined))
+
+    def count(self, genre_id):
+        bitmap = self.bitmaps.get(genre_id)
+        return int(np.unpackbits(bitmap).sum()) if bitmap is not None else 0
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """This process's bitmaps, rebuilt if GameGenre changed more than REFRESH_INTERVAL ago."""
+    global _index
+    with _index_lock:
+        version = current_version()
+        stale = _index is None or (
+            _index.version != version and time.monotonic() - _index.built_at > REFRESH_INTERVAL
+        )
+        if stale:
+            started = time.monotonic()
+            _index = GenreBitmaps.build(version=version)
+            logger.info("Built genre index (%d genres, %d game ids) in %.2fs",
+                        len(_index.bitmaps), _index.size, time.monotonic() - started)
+        return _index
+
+
+def sample(genre_ids, limit, exclude=(), require_all=False):
+    """Up to `limit` random game ids from the games matching `genre_ids` (see
+    GenreBitmaps.match)."""
+    candidates = get_index().match(genre_ids, exclude=exclude, require_all=require_all)
+    if len(candidates) <= limit:
+        return [int(i) for i in candidates]
+    return [int(candidates[i]) for i in random.sample(range(len(candidates)), limit)]
+
+
+def reset():
+    """Drops this process's bitmaps (they're rebuilt on next use)."""
+    global _index
+    _index = None
@@ -0,0 +1,287 @@
+"""
+Shared outbound HTTP client for the third-party APIs we call (IGDB/Twitch, Steam, Xbox).
+
+Every call used to be a bare requests.get/post — a fresh TCP+TLS handshake each time, ad-hoc
+time.sleep() throttling, and no shared view of an upstream's rate limit across worker
+processes. Routing through request()/get()/post()/head() here instead gives:
+
+- one pooled requests.Session per upstream per process (keep-alive connection reuse);
+- retry with exponential backoff + jitter on connection errors, timeouts, 429 and 5xx,
+  honouring Retry-After — for GET/HEAD, and for POSTs only on upstreams whose POSTs are
+  read queries (`retry_posts`, e.g. IGDB's query API). Other POSTs (OAuth code and token
+  exchanges, which are single-use) are sent once unless the caller passes `retries`.
+  Retries stop once RETRY_BUDGET_SECONDS have gone by, so a call's worst case is about
+  RETRY_BUDGET_SECONDS plus one timeout rather than (retries + 1) x timeout;
+- a per-upstream token bucket in the Django cache (Redis in prod, so it is shared by every
+  process): it holds up to `burst` tokens and refills at `rate` per second, so no interval
+  of t seconds ever sees more than burst + rate x t requests — unlike a fixed window, which
+  lets a full burst through at the end of one window and another at the start of the next.
+  If the cache is unavailable it degrades to an in-process TokenBucket;
+- per-upstream counters (requests, errors, retries, 429s, limiter waits and time spent
+  waiting, latency), kept
+  in-process (upstream_metrics()) and aggregated in the cache (shared_upstream_metrics(),
+  shown by the `upstream_http_stats` command).
+
+Call sites name an upstream from UPSTREAMS; anything else raises KeyError.
+"""
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# rate = sustained requests/second across all processes; burst = bucket size, the most
+# requests allowed back to back.
+# retry_posts = its POSTs are idempotent reads, so they are retried like GETs.
+UPSTREAMS = {
+    # IGDB's documented limit is 4 requests/second per client id.
+    'igdb': {'rate': 4, 'burst': 4, 'retry_posts': True},
+    'igdb_images': {'rate': 20, 'burst': 20},
+    # client_credentials grant: no single-use input, a retry just mints another token.
+    'twitch_auth': {'rate': 1, 'burst': 5, 'retry_posts': True},
+    'steam_api': {'rate': 10, 'burst': 10},
+    # The Store's appdetails endpoint is the strictest Steam surface; this is the ~3 req/s the
+    # sync used to pace itself at with time.sleep(0.3).
+    'steam_store': {'rate': 3, 'burst': 3},
+    'steam_cdn': {'rate': 20, 'burst': 20},
+    'steam_community': {'rate': 5, 'burst': 5},
+    'steamspy': {'rate': 1, 'burst': 1},
+    'xbox_auth': {'rate': 5, 'burst': 5},
+    'xbox_live': {'rate': 5, 'burst': 5},
+    # Liveness checks against whatever host a stored cover URL points at.
+    'cover_check': {'rate': 10, 'burst': 10},
+}
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_RETRIES = 2
+RETRY_BUDGET_SECONDS = 15.0
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 8.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+POOL_MAXSIZE = 16
+METRICS_CACHE_KEY = 'http_client:metrics:{upstream}:{name}'
+METRICS_TTL = 7 * 24 * 60 * 60
+_COUNTERS = ('requests', 'errors', 'retries', 'rate_limited', 'limiter_waits', 'limiter_wait_ms', 'latency_ms')
+LIMITER_KEY = 'http_client:rl:{upstream}'
+LIMITER_LOCK_KEY = 'http_client:rl:{upstream}:lock'
+# Expiry of the bucket's update lock, should a holder die between add() and delete(); the
+# update itself is one get and one set.
+LIMITER_LOCK_SECONDS = 2
+LIMITER_LOCK_POLL = 0.005
+
+_sessions = {}
+_local_buckets = {}
+_state_lock = threading.Lock()
+_metrics = {}
+
+
+def get_session(upstream):
+    session = _sessions.get(upstream)
+    if session is None:
+        with _state_lock:
+            session = _sessions.get(upstream)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _sessions[upstream] = session
+    return session
+
+
+# --- Metrics -----------------------------------------------------------------------------
+
+def _record(upstream, **deltas):
+    with _state_lock:
+        stats = _metrics.setdefault(upstream, dict.fromkeys(_COUNTERS, 0) | {'max_latency_ms': 0})
+        for name, delta in deltas.items():
+            stats[name] += delta
+        if 'latency_ms' in deltas:
+            stats['max_latency_ms'] = max(stats['max_latency_ms'], deltas['latency_ms'])
+    from django.core.cache import cache
+    try:
+        for name, delta in deltas.items():
+            if not delta:
+                continue
+            key = METRICS_CACHE_KEY.format(upstream=upstream, name=name)
+            # One round trip once the key exists; add() only the first time.
+            try:
+                cache.incr(key, delta)
+            except ValueError:
+                if not cache.add(key, delta, METRICS_TTL):
+                    cache.incr(key, delta)
+    except Exception:
+        pass  # metrics must never break a request
+
+
+def upstream_metrics():
+    """This process's counters per upstream, plus average latency."""
+    with _state_lock:
+        snapshot = {upstream: dict(stats) for upstream, stats in _metrics.items()}
+    for stats in snapshot.values():
+        stats['avg_latency_ms'] = stats['latency_ms'] / stats['requests'] if stats['requests'] else 0.0
+    return snapshot
+
+
+def shared_upstream_metrics():
+    """The same counters summed across every process that shares the cache."""
+    from django.core.cache import cache
+    keys = {
+        (upstream, name): METRICS_CACHE_KEY.format(upstream=upstream, name=name)
+        for upstream in UPSTREAMS for name in _COUNTERS
+    }
+    values = cache.get_many(list(keys.values()))
+    result = {}
+    for (upstream, name), key in keys.items():
+        result.setdefault(upstream, {})[name] = values.get(key, 0)
+    for stats in result.values():
+        stats['avg_latency_ms'] = stats['latency_ms'] / stats['requests'] if stats['requests'] else 0.0
+    return result
+
+
+# --- Rate limiting -----------------------------------------------------------------------
+
+def _local_bucket(upstream):
+    from api.services.rate_limit import TokenBucket
+    bucket = _local_buckets.get(upstream)
+    if bucket is None:
+        with _state_lock:
+            bucket = _local_buckets.get(upstream)
+            if bucket is None:
+                config = UPSTREAMS[upstream]
+                bucket = _local_buckets[upstream] = TokenBucket(config['rate'], config['burst'])
+    return bucket
+
+
+def _reserve(upstream):
+    """
+    Takes the next token from `upstream`'s shared bucket and returns how long the caller must
+    wait for it (0.0: available now), or None if the bucket's lock couldn't be had.
+
+    The bucket is kept as one timestamp, the time at which it will next be full again counting
+    every token already handed out (GCRA's "theoretical arrival time"): taking a token moves it
+    1/rate later, and a token is free now while that stays within burst/rate of now — the same
+    as tracking a token count and its refill time, in one value. Every caller reserves its own
+    slot, so waiters queue in order instead of retrying against each other. The read-modify-write
+    runs under a cache.add() lock; timestamps are wall-clock, so processes on different hosts
+    are only as consistent as their clocks.
+    """
+    from django.core.cache import cache
+    config = UPSTREAMS[upstream]
+    interval = 1.0 / config['rate']
+    capacity = config['burst'] * interval
+    lock_key = LIMITER_LOCK_KEY.format(upstream=upstream)
+    deadline = time.monotonic() + LIMITER_LOCK_SECONDS + 1
+    while not cache.add(lock_key, 1, LIMITER_LOCK_SECONDS):
+        if time.monotonic() > deadline:
+            return None
+        time.sleep(random.uniform(LIMITER_LOCK_POLL, 2 * LIMITER_LOCK_POLL))
+    try:
+        now = time.time()
+        key = LIMITER_KEY.format(upstream=upstream)
+        full_at = max(cache.get(key) or 0.0, now) + interval
+        cache.set(key, full_at, int(capacity) + 2)
+    finally:
+        cache.delete(lock_key)
+    return max(0.0, full_at - capacity - now)
+
+
+def acquire(upstream):
+    """Blocks until `upstream`'s bucket has a token for one more request, across all processes
+    sharing the cache. Returns the seconds spent waiting."""
+    try:
+        wait = _reserve(upstream)
+    except Exception:
+        wait = None
+    if wait is None:
+        start = time.monotonic()
+        _local_bucket(upstream).acquire()
+        return time.monotonic() - start
+    if wait:
+        time.sleep(wait)
+    return wait
+
+
+# --- Requests ----------------------------------------------------------------------------
+
+def _retry_after(response):
+    value = response.headers.get('Retry-After') if response is not None else None
+    try:
+        return min(float(value), BACKOFF_MAX_SECONDS) if value else None
+    except ValueError:
+        return None
+
+
+def default_retries(upstream, method):
+    """DEFAULT_RETRIES for idempotent calls, 0 for anything a replay could break."""
+    if method.upper() in IDEMPOTENT_METHODS or UPSTREAMS[upstream].get('retry_posts'):
+        return DEFAULT_RETRIES
+    return 0
+
+
+def request(upstream, method, url, retries=None, **kwargs):
+    """requests.Session.request through the upstream's pooled session, limiter and retry policy
+    (`retries` defaults to default_retries()). Returns the final Response (possibly a 429/5xx
+    once retries are exhausted); raises the last connection error/timeout if every attempt
+    failed at the transport level."""
+    if upstream not in UPSTREAMS:
+        raise KeyError(f'Unknown upstream {upstream!r}')
+    if retries is None:
+        retries = default_retries(upstream, method)
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    session = get_session(upstream)
+    first_started = time.monotonic()
+
+    for attempt in range(retries + 1):
+        waited = acquire(upstream)
+        if waited:
+            _record(upstream, limiter_waits=1, limiter_wait_ms=int(waited * 1000))
+        started = time.monotonic()
+        response, error = None, None
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            error = exc
+        latency_ms = int((time.monotonic() - started) * 1000)
+        _record(
+            upstream, requests=1, latency_ms=latency_ms,
+            errors=int(error is not None or response.status_code >= 500),
+            rate_limited=int(response is not None and response.status_code == 429),
+        )
+
+        retryable = error is not None or response.status_code in RETRY_STATUSES
+        if not retryable or attempt == retries:
+            if error is not None:
+                raise error
+            return response
+
+        delay = _retry_after(response)
+        if delay is None:
+            delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)) * random.uniform(0.5, 1.0)
+        if time.monotonic() - first_started + delay > RETRY_BUDGET_SECONDS:
+            if error is not None:
+                raise error
+            return response
+        logger.info("Retrying %s %s (%s) in %.2fs", method, upstream,
+                    error or response.status_code, delay)
+        _record(upstream, retries=1)
+        time.sleep(delay)
+
+
+def get(upstream, url, **kwargs):
+    return request(upstream, 'GET', url, **kwargs)
+
+
+def post(upstream, url, **kwargs):
+    return request(upstream, 'POST', url, **kwargs)
+
+
+def head(upstream, url, **kwargs):
+    # Same default as requests.head(): report the redirect instead of following it.
+    kwargs.setdefault('allow_redirects', False)
+    return request(upstream, 'HEAD', url, **kwargs)
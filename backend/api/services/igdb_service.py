@@ -1,11 +1,10 @@
 import os
-import requests
 import time
 from core.models import Game
 from django.conf import settings
 from django.core.cache import cache
 from core.utils import is_unwanted_game
-from api.services.hltb_service import fetch_hltb_times
+from api.services import http_client
 
 # Credentials come only from the environment. Never hard-code the Twitch/IGDB
 # client_secret here — a committed secret must be treated as compromised and rotated.
@@ -37,7 +36,7 @@ def get_igdb_token():
         return _ACCESS_TOKEN
 
     try:
-        response = requests.post(
+        response = http_client.post('twitch_auth',
             'https://id.twitch.tv/oauth2/token',
             params={
                 'client_id': IGDB_CLIENT_ID,
@@ -59,8 +58,10 @@ def get_igdb_token():
 
 def fetch_game_details(game: Game) -> Game:
     """
-    Fetches missing details for a game from IGDB and saves them to the DB.
-    Returns the updated game object.
+    Fetches missing details for a single game from IGDB and saves them to the DB.
+    Returns the updated game object. Blocks on IGDB (and HLTB) — request handlers should use
+    api.services.game_hydration.enqueue_hydration instead; bulk jobs should call
+    hydrate_games with all their ids at once.
     """
     if game.details_fetched:
         return game
@@ -69,162 +70,9 @@ def fetch_game_details(game: Game) -> Game:
         print(f"IGDB credentials not configured. Skipping detail fetch for game {game.id} ({game.title})")
         return game
 
-    token = get_igdb_token()
-    if not token:
-        print(f"Failed to get IGDB token. Skipping detail fetch for game {game.id} ({game.title})")
-        return game # Failed to auth, just return what we have
-
-    headers = {
-        'Client-ID': IGDB_CLIENT_ID,
-        'Authorization': f'Bearer {token}'
-    }
-
-    target_igdb_id = game.igdb_id
-
-    # Resolve IGDB ID if missing (e.g. for games synced from Steam)
-    if not target_igdb_id:
-        try:
-            # Sanitize title for IGDB search
-            safe_title = game.title.replace('"', '').replace('\\', '')
-            search_query = f'search "{safe_title}"; fields id, name, category, version_parent, parent_game; limit 10;'
-            resp = requests.post('https://api.igdb.com/v4/games', headers=headers, data=search_query, timeout=10)
-            if resp.status_code == 200 and resp.json():
-                results = resp.json()
-                best_match = None
-                
-                # Look for exact match and main game
-                for g in results:
-                    cat = g.get('category', 0)
-                    if cat in (0, 8, 9, 10, 11) and not g.get('version_parent'):
-                        if g.get('name', '').lower() == game.title.lower():
-                            best_match = g
-                            break
-                            
-                # Fallback to first result if no exact main game match
-                if not best_match:
-                    best_match = results[0]
-                    
-                target_igdb_id = best_match['id']
-                
-                # Safely save igdb_id only if it's not already taken by a duplicate game
-                if not Game.objects.filter(igdb_id=target_igdb_id).exclude(id=game.id).exists():
-                    game.igdb_id = target_igdb_id
-                    game.save(update_fields=['igdb_id'])
-            else:
-                # Could not find game on IGDB
-                game.details_fetched = True
-                game.save()
-                return game
-        except Exception as e:
-            print(f"Failed to resolve IGDB ID for {game.title}: {e}")
-            return game
-    # The query asks for summary, storyline, companies, platforms, screenshots, url, and aggregated_rating
-    query = f"""
-        fields summary, storyline, url, cover.url, first_release_date, aggregated_rating,
-               involved_companies.company.name, involved_companies.developer, involved_companies.publisher,
-               platforms.name, screenshots.url, genres.name;
-        where id = {target_igdb_id};
-    """
-
-    try:
-        response = requests.post(
-            'https://api.igdb.com/v4/games',
-            headers=headers,
-            data=query,
-            timeout=15
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        if data:
-            igdb_data = data[0]
-
-            # Text fields
-            game.summary = igdb_data.get('summary', '')
-            game.description = igdb_data.get('storyline', '')
-            game.igdb_url = igdb_data.get('url', '')
-
-            # Release date
-            if 'first_release_date' in igdb_data and not game.release_date:
-                import datetime
-                try:
-                    game.release_date = datetime.datetime.fromtimestamp(igdb_data['first_release_date']).strftime('%Y-%m-%d')
-                except Exception as e:
-                    print(f"Failed to parse release date: {e}")
-
-            # Cover
-            if 'cover' in igdb_data and 'url' in igdb_data['cover'] and not game.cover_image:
-                cover_url = igdb_data['cover']['url']
-                if cover_url.startswith('//'):
-                    cover_url = f"https:{cover_url}"
-                game.cover_image = cover_url.replace('t_thumb', 't_cover_big')
-
-            # Involved companies (developer & publisher)
-            companies = igdb_data.get('involved_companies', [])
-            developers = []
-            publishers = []
-            for c in companies:
-                if 'company' in c and 'name' in c['company']:
-                    name = c['company']['name']
-                    if c.get('developer'):
-                        developers.append(name)
-                    if c.get('publisher'):
-                        publishers.append(name)
-            
-            game.developer = ', '.join(developers)
-            game.publisher = ', '.join(publishers)
-
-            # Platforms
-            platforms = igdb_data.get('platforms', [])
-            game.platforms = [p['name'] for p in platforms if 'name' in p]
-
-            # Screenshots
-            screenshots = igdb_data.get('screenshots', [])
-            screenshot_urls = []
-            for s in screenshots:
-                if 'url' in s:
-                    url = s['url']
-                    if url.startswith('//'):
-                        url = f"https:{url}"
-                    # Use 720p or 1080p images instead of thumbnails
-                    # IGDB supports: t_720p, t_1080p, t_screenshot_huge
-                    url = url.replace('t_thumb', 't_screenshot_huge')
-                    screenshot_urls.append(url)
-            
-            game.screenshots = screenshot_urls
-
-            # Metacritic Score (aggregated_rating)
-            if 'aggregated_rating' in igdb_data:
-                game.metacritic_score = int(round(igdb_data['aggregated_rating']))
-
-            # HowLongToBeat
-            hltb_data = fetch_hltb_times(game.title)
-            game.hltb_main = hltb_data.get('hltb_main')
-            game.hltb_main_extra = hltb_data.get('hltb_main_extra')
-            game.hltb_completionist = hltb_data.get('hltb_completionist')
-
-            # Update genres just in case they were missing
-            genres = igdb_data.get('genres', [])
-            if genres:
-                game.genres = [g['name'] for g in genres if 'name' in g]
-
-            print(f"IGDB details fetched for game {game.id} ({game.title}): "
-                  f"summary={bool(game.summary)}, screenshots={len(screenshot_urls)}, "
-                  f"developer={game.developer or 'N/A'}")
-        else:
-            print(f"IGDB returned empty data for game {game.id} (igdb_id={game.igdb_id})")
-
-        # Mark as fetched even if data is empty so we don't keep trying
-        game.details_fetched = True
-        game.save()
-
-    except requests.exceptions.Timeout:
-        print(f"IGDB request timed out for game {game.id} ({game.title}, igdb_id={game.igdb_id})")
-    except requests.exceptions.HTTPError as e:
-        print(f"IGDB HTTP error for game {game.id} ({game.title}): {e.response.status_code} {e.response.text[:200]}")
-    except Exception as e:
-        print(f"Error fetching IGDB details for game {game.id} ({game.title}): {e}")
-
+    from api.services.game_hydration import hydrate_games
+    hydrate_games([game.pk])
+    game.refresh_from_db()
     return game
 
 
@@ -329,7 +177,7 @@ def resolve_top_parent_dynamically(company_name: str, token: str) -> tuple[str,
     """
     
     try:
-        resp = requests.post('https://api.igdb.com/v4/companies', headers=headers, data=query, timeout=10)
+        resp = http_client.post('igdb', 'https://api.igdb.com/v4/companies', headers=headers, data=query, timeout=10)
         resp.raise_for_status()
         companies = resp.json()
         
@@ -391,7 +239,7 @@ def fetch_company_info(company_name: str) -> dict | None:
     """
 
     try:
-        response = requests.post(
+        response = http_client.post('igdb',
             'https://api.igdb.com/v4/companies',
             headers=headers,
             data=query,
@@ -408,7 +256,7 @@ def fetch_company_info(company_name: str) -> dict | None:
                 where name ~ *"{resolved_name}"*;
                 limit 15;
             """
-            response = requests.post('https://api.igdb.com/v4/companies', headers=headers, data=fallback_query, timeout=15)
+            response = http_client.post('igdb', 'https://api.igdb.com/v4/companies', headers=headers, data=fallback_query, timeout=15)
             data = response.json()
             if not data:
                 return None
@@ -519,14 +367,14 @@ def fetch_company_games(company_name: str, limit: int = 150) -> list:
     company_ids = []
     
     try:
-        r1 = requests.post('https://api.igdb.com/v4/companies', headers=headers, data=parent_query, timeout=10)
+        r1 = http_client.post('igdb', 'https://api.igdb.com/v4/companies', headers=headers, data=parent_query, timeout=10)
         if r1.status_code == 200:
             for c in r1.json():
                 company_ids.append(str(c['id']))
                 
         # 2. Get subsidiaries
         subs_query = f"fields id, name; where name ~ *\"{resolved_name}\"*; limit 50;"
-        r2 = requests.post('https://api.igdb.com/v4/companies', headers=headers, data=subs_query, timeout=10)
+        r2 = http_client.post('igdb', 'https://api.igdb.com/v4/companies', headers=headers, data=subs_query, timeout=10)
         if r2.status_code == 200:
             for c in r2.json():
                 cid = str(c['id'])
@@ -550,7 +398,7 @@ def fetch_company_games(company_name: str, limit: int = 150) -> list:
             limit 200;
         """
 
-        resp2 = requests.post(
+        resp2 = http_client.post('igdb',
             'https://api.igdb.com/v4/involved_companies',
             headers=headers,
             data=games_query,
@@ -654,7 +502,7 @@ def search_igdb_companies(query: str, limit: int = 5) -> list:
     '''
 
     try:
-        response = requests.post(
+        response = http_client.post('igdb',
             'https://api.igdb.com/v4/companies',
             headers=headers,
             data=igdb_query,
@@ -0,0 +1,88 @@
+"""
+Atomic on-disk snapshots for the in-process indexes (api.services.ann_index,
+api.services.trigram_index).
+
+An index is several files that only make sense together, so a snapshot is a directory.
+write() puts a complete copy into a uniquely named staging directory next to the published
+ones, renames it to a generation name, then flips a one-line CURRENT pointer with
+os.replace. A reader resolves CURRENT once and reads every file from that generation, so a
+load never pairs one build's files with another's, and concurrent writers (two
+`build_*_index` runs, or a command racing a worker) never share a path — the last flip wins,
+and whichever it is, it names a complete snapshot.
+
+After each publish, generations other than the newest KEEP_GENERATIONS and the current one
+are removed. A reader that resolved the pointer just before a flip is still covered, and
+files a process already has open or memory-mapped stay readable after the unlink.
+"""
+import os
+import shutil
+import tempfile
+import time
+
+POINTER = 'CURRENT'
+GENERATION_PREFIX = 'gen-'
+STAGING_PREFIX = '.staging-'
+KEEP_GENERATIONS = 2
+# Staging directories left behind by a writer that died mid-save.
+STALE_STAGING_SECONDS = 60 * 60
+
+
+def write(directory, write_files):
+    """Publishes a new snapshot in `directory`: `write_files(path)` writes the snapshot's files
+    into `path`. Returns the generation name."""
+    os.makedirs(directory, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=directory)
+    try:
+        write_files(staging)
+        # Time-ordered, and unique because the staging name is.
+        generation = f'{GENERATION_PREFIX}{time.time_ns():020d}-{os.path.basename(staging)[len(STAGING_PREFIX):]}'
+        os.rename(staging, os.path.join(directory, generation))
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    fd, tmp = tempfile.mkstemp(prefix='.pointer-', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(generation)
+        os.replace(tmp, os.path.join(directory, POINTER))
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    _prune(directory)
+    return generation
+
+
+def current(directory):
+    """The published snapshot's path. Raises FileNotFoundError when there is none."""
+    with open(os.path.join(directory, POINTER)) as f:
+        generation = f.read().strip()
+    if not generation.startswith(GENERATION_PREFIX):
+        raise FileNotFoundError(f'No published snapshot in {directory}')
+    return os.path.join(directory, generation)
+
+
+def generation(directory):
+    """The published generation's name, or None — a cheap check for a newer snapshot."""
+    try:
+        return os.path.basename(current(directory))
+    except OSError:
+        return None
+
+
+def _prune(directory):
+    live = generation(directory)
+    names = sorted(name for name in os.listdir(directory) if name.startswith(GENERATION_PREFIX))
+    for name in names[:-KEEP_GENERATIONS]:
+        if name != live:
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+    cutoff = time.time() - STALE_STAGING_SECONDS
+    for name in os.listdir(directory):
+        if name.startswith(STAGING_PREFIX):
+            path = os.path.join(directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                pass
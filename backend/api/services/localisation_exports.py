@@ -0,0 +1,124 @@
+"""
+Cached localisation export artifacts (ProjectViewSet.localisation_export).
+
+An export used to be rebuilt on every download: the whole board and every CommunityTranslation
+row loaded, the file (or a ZIP of every locale) rendered into memory. Popular projects are
+re-downloaded by every community translator fetching the latest PO, almost always for content
+that hasn't changed since the last download. Now each (project, format, language, scope,
+content version) is rendered once, to a file under settings.LOCALISATION_EXPORT_DIR, and served
+from there; the key doubles as the response's ETag, so a client that already has the current
+file gets a 304 without the file being opened at all.
+
+The content version is read from the database rather than kept as a counter, so it can't be
+lost or drift (a cache flush can't make a stale artifact look current):
+- the board's translationKeys section version (api.services.workspace_sections) — bumped by
+  every key edit, rename or import;
+- the count and latest `updated_at` of the CommunityTranslation rows in scope (the exported
+  languages and statuses) — any create, edit, approval, rejection or delete changes one of
+  them, while e.g. a new pending suggestion leaves the approved-only artifacts valid;
+- a digest of what the file's layout depends on: project title, source and target locales.
+That is three small queries (board row, section version, one aggregate) on a hit.
+
+Misses are written by localisation_formats.write_export(), chunk by chunk, to a temporary file
+that replaces the artifact atomically; concurrent misses for the same key both render and the
+last rename wins with identical content. Artifacts are per process host, like the search and
+embedding index snapshots: any host renders a missing one. Files untouched for EXPORT_TTL are
+pruned whenever a project renders a new artifact.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+EXPORT_TTL = 24 * 60 * 60
+
+
+@dataclass
+class Artifact:
+    project: object
+    fmt: str
+    language: str
+    statuses: tuple
+    locales: list
+    key: str
+    filename: str
+    content_type: str
+    path: str
+
+    @property
+    def etag(self):
+        return f'"{self.key}"'
+
+    def open(self):
+        """The artifact as an open binary file, rendering it first if it doesn't exist yet."""
+        try:
+            return open(self.path, 'rb')
+        except FileNotFoundError:
+            self._render()
+            return open(self.path, 'rb')
+
+    def _render(self):
+        from api.services.localisation_formats import write_export
+        from api.services.localisation_formats.canonical import build_bundle
+
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        _prune(directory)
+        bundle = build_bundle(self.project, self.locales, statuses=self.statuses)
+        # A unique temp file per render: threads of one worker share a pid, and two cold
+        # requests for the same export must not write into the same file.
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=f'{os.path.basename(self.path)}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                write_export(self.fmt, bundle, out, language=self.language)
+            os.replace(tmp, self.path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+def _prune(directory):
+    cutoff = time.time() - EXPORT_TTL
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+def content_version(project, state, source, locales, statuses):
+    """Changes whenever the export of `locales` x `statuses` could (see module docstring)."""
+    from api.services import workspace_sections
+    from core.models import CommunityTranslation
+
+    keys_version = workspace_sections.versions(state, ['translationKeys'])['translationKeys']
+    translations = CommunityTranslation.objects.filter(
+        project=project, language__in=[loc.code for loc in locales], status__in=list(statuses),
+    ).aggregate(count=Count('id'), latest=Max('updated_at'))
+    latest = translations['latest'].timestamp() if translations['latest'] else 0
+    layout = json.dumps([project.title, source.code, [(loc.code, loc.name) for loc in locales]])
+    digest = hashlib.sha1(layout.encode('utf-8')).hexdigest()[:12]
+    return f'{keys_version}.{translations["count"]}.{latest:.6f}.{digest}'
+
+
+def get_artifact(project, state, *, fmt, language, scope, statuses, source, locales):
+    """The Artifact for this export at the project's current content version. Raises
+    ValueError for an unknown format. Nothing is rendered until Artifact.open()."""
+    from api.services.localisation_formats import FORMATS, export_filename, is_zip_export
+
+    filename, content_type = export_filename(fmt, project.title, language=language)
+    version = content_version(project, state, source, locales, statuses)
+    key = hashlib.sha1(f'{project.id}:{fmt}:{language}:{scope}:{version}'.encode('utf-8')).hexdigest()
+    extension = 'zip' if is_zip_export(fmt, language) else FORMATS[fmt].EXTENSION
+    path = os.path.join(settings.LOCALISATION_EXPORT_DIR, str(project.id), f'{key}.{extension}')
+    return Artifact(
+        project=project, fmt=fmt, language=language, statuses=tuple(statuses), locales=locales,
+        key=key, filename=filename, content_type=content_type, path=path,
+    )
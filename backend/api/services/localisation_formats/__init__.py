@@ -1,8 +1,15 @@
 """
 Format registry + dispatch. Every format module exposes the same four module-level names:
-`LABEL`, `EXTENSION`, `CONTENT_TYPE`, `SUPPORTS_MULTI_LANGUAGE`, `SUPPORTS_PLURALS`, and two
-functions: `export(bundle, *, language) -> bytes` and
-`parse(raw: bytes, *, project_locales, source_locale) -> ParsedImport`.
+`LABEL`, `EXTENSION`, `CONTENT_TYPE`, `SUPPORTS_MULTI_LANGUAGE`, `SUPPORTS_PLURALS`, and three
+functions: `export(bundle, *, language) -> bytes`,
+`parse(raw: bytes, *, project_locales, source_locale) -> ParsedImport` and its incremental
+form `iter_parse(stream, *, project_locales, source_locale, warnings)`, a generator of
+ParsedEntry read from a binary file handle a line/member/<trans-unit> at a time (see _stream.py
+and _xliff.py), appending warnings to `warnings` as it goes. `parse` is just `iter_parse` over
+the whole buffer; imports go through iter_parse_file so memory doesn't grow with the upload. Formats whose output is
+a sequence of independent records (PO, CSV) also expose `iter_export(bundle, *, language)`,
+yielding the same bytes in per-entry chunks; write_export() prefers it, so an export artifact
+(api.services.localisation_exports) is written without the whole file ever sitting in memory.
 """
 
 import io
@@ -41,9 +48,35 @@ def _slugify(text: str) -> str:
     return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'project'
 
 
+def _chunks(module, bundle, language):
+    if hasattr(module, 'iter_export'):
+        return module.iter_export(bundle, language=language)
+    return [module.export(bundle, language=language)]
+
+
+def _module(fmt_slug):
+    if fmt_slug not in FORMATS:
+        raise ValueError(f'Unknown export format "{fmt_slug}".')
+    return FORMATS[fmt_slug]
+
+
+def is_zip_export(fmt_slug: str, language: str) -> bool:
+    return language == 'all' and not _module(fmt_slug).SUPPORTS_MULTI_LANGUAGE
+
+
+def export_filename(fmt_slug: str, project_title: str, *, language: str):
+    """(filename, content_type) of an export, without building it."""
+    module = _module(fmt_slug)
+    project_slug = _slugify(project_title)
+    if is_zip_export(fmt_slug, language):
+        return f'{project_slug}_all_{fmt_slug}.zip', 'application/zip'
+    suffix = 'all' if language == 'all' else language
+    return f'{project_slug}_{suffix}.{module.EXTENSION}', module.CONTENT_TYPE
+
+
 def export_bundle(fmt_slug: str, bundle, *, language: str):
     """
-    Returns (content_bytes, filename, content_type).
+    Returns (content_bytes, filename, content_type) — write_export() into memory.
 
     `language == 'all'`:
       - multi-language-capable formats (flat_json/flat_csv/unity_csv) export everything in one file.
@@ -54,30 +87,51 @@ def export_bundle(fmt_slug: str, bundle, *, language: str):
                      Dashboard directory convention)
         everything else -> <slug>.<code>.<ext>
     """
-    if fmt_slug not in FORMATS:
-        raise ValueError(f'Unknown export format "{fmt_slug}".')
-    module = FORMATS[fmt_slug]
-    project_slug = _slugify(bundle.project_title)
+    buf = io.BytesIO()
+    filename, content_type = write_export(fmt_slug, bundle, buf, language=language)
+    return buf.getvalue(), filename, content_type
+
 
-    if language != 'all' or module.SUPPORTS_MULTI_LANGUAGE:
-        content = module.export(bundle, language=language)
-        suffix = 'all' if language == 'all' else language
-        filename = f'{project_slug}_{suffix}.{module.EXTENSION}'
-        return content, filename, module.CONTENT_TYPE
+def write_export(fmt_slug: str, bundle, out, *, language: str):
+    """Writes an export (see export_bundle) to the binary file object `out`, chunk by chunk —
+    a ZIP member at a time, each member streamed into the archive. Returns (filename,
+    content_type)."""
+    module = _module(fmt_slug)
+    filename, content_type = export_filename(fmt_slug, bundle.project_title, language=language)
+
+    if not is_zip_export(fmt_slug, language):
+        for chunk in _chunks(module, bundle, language):
+            out.write(chunk)
+        return filename, content_type
 
     # ZIP one file per locale for single-locale formats.
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+    project_slug = _slugify(bundle.project_title)
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as zf:
         for loc in bundle.locales:
-            content = module.export(bundle, language=loc.code)
             if fmt_slug == 'gettext_po':
                 arcname = f'locale/{loc.code}/LC_MESSAGES/{project_slug}.po'
             elif fmt_slug == 'unreal_po':
                 arcname = f'{project_slug}/{loc.code}/{project_slug}.po'
             else:
                 arcname = f'{project_slug}.{loc.code}.{module.EXTENSION}'
-            zf.writestr(arcname, content)
-    return buf.getvalue(), f'{project_slug}_all_{fmt_slug}.zip', 'application/zip'
+            with zf.open(arcname, 'w') as member:
+                for chunk in _chunks(module, bundle, loc.code):
+                    member.write(chunk)
+    return filename, content_type
+
+
+# Upload limit for imports (ProjectViewSet.localisation_import). Parsing is incremental, so this
+# bounds request time and disk for the spooled upload, not memory.
+MAX_IMPORT_BYTES = 100 * 1024 * 1024
+
+
+def iter_parse_file(fmt_slug: str, stream, *, project_locales, source_locale, warnings):
+    """ParsedEntry objects read incrementally from a binary file handle; parser warnings are
+    appended to `warnings` as they occur. Raises ValueError for an unknown format immediately,
+    for a malformed file whenever iteration reaches the problem."""
+    if fmt_slug not in FORMATS:
+        raise ValueError(f'Unknown import format "{fmt_slug}".')
+    return FORMATS[fmt_slug].iter_parse(stream, project_locales=project_locales, source_locale=source_locale, warnings=warnings)
 
 
 def parse_file(fmt_slug: str, raw: bytes, *, project_locales, source_locale):
@@ -8,8 +8,11 @@ No third-party dependency (no `polib`) — this is ~150 lines because the format
 adding a dependency for it would cost more than it saves.
 """
 
+import io
 import re
 
+from . import _stream
+
 _FIELD_RE = re.compile(r'^(msgctxt|msgid_plural|msgid|msgstr(?:\[\d+\])?)\s+"(.*)"\s*$')
 _CONT_RE = re.compile(r'^"(.*)"\s*$')
 _MSGSTR_INDEX_RE = re.compile(r'^msgstr\[(\d+)\]$')
@@ -53,12 +56,14 @@ class PoEntry:
         self.comments = comments or []       # raw '#. ...'/'#: ...' lines, kept verbatim
 
 
-def write_po(header_fields: dict, entries: list) -> bytes:
+def iter_po(header_fields: dict, entries):
+    """The file as encoded chunks, one per entry — `entries` may be a generator, so an export
+    never holds more than one entry's text at a time."""
     # The header entry's own msgstr is a quoted-string-per-field-line gettext convention.
     lines = ['msgid ""', 'msgstr ""'] + [f'"{k}: {v}\\n"' for k, v in header_fields.items()] + ['']
+    yield ''.join(f'{line}\n' for line in lines).encode('utf-8')
     for entry in entries:
-        for c in entry.comments:
-            lines.append(c)
+        lines = list(entry.comments)
         if entry.msgctxt is not None:
             lines.append(_field('msgctxt', entry.msgctxt))
         lines.append(_field('msgid', entry.msgid))
@@ -69,34 +74,64 @@ def write_po(header_fields: dict, entries: list) -> bytes:
         else:
             lines.append(_field('msgstr', entry.msgstr or ''))
         lines.append('')
-    return ('\n'.join(lines) + '\n').encode('utf-8')
+        yield ''.join(f'{line}\n' for line in lines).encode('utf-8')
+
+
+def write_po(header_fields: dict, entries: list) -> bytes:
+    return b''.join(iter_po(header_fields, entries))
 
 
 def parse_po(raw: bytes):
     """Returns (header_fields: dict, entries: list[PoEntry])."""
-    try:
-        text = raw.decode('utf-8')
-    except UnicodeDecodeError as exc:
+    header_fields, entries = iter_parse_po(io.BytesIO(raw))
+    return header_fields, list(entries)
+
+
+def iter_parse_po(stream):
+    """(header_fields, iterator of PoEntry) for a binary file handle, read line by line: the
+    header is read up front (it is the file's first entry), the rest as it is iterated."""
+    raw_entries = _iter_raw_entries(_stream.iter_lines(
         # Same contract as the other parsers: a user uploading e.g. a latin-1 .po must get the
         # view's clean 400 (ValueError), not a 500.
-        raise ValueError('File is not valid UTF-8 — re-save the .po file with UTF-8 encoding.') from exc
-    lines = text.replace('\r\n', '\n').split('\n')
+        stream, encoding='utf-8', error='File is not valid UTF-8 — re-save the .po file with UTF-8 encoding.',
+    ))
+    header_entry = next(raw_entries, None)
+    if header_entry is None:
+        return {}, iter(())
+
+    header_fields = {}
+    for line in header_entry['fields'].get('msgstr', '').split('\n'):
+        if ':' in line:
+            k, _, v = line.partition(':')
+            header_fields[k.strip()] = v.strip()
+    return header_fields, (_po_entry(raw_entry) for raw_entry in raw_entries)
 
-    entries_raw = []
+
+def _po_entry(raw_entry):
+    f = raw_entry['fields']
+    plural_dict = f.get('msgstr_plural')
+    msgstr_plural = [plural_dict[i] for i in sorted(plural_dict.keys())] if plural_dict else None
+    return PoEntry(
+        msgctxt=f.get('msgctxt'),
+        msgid=f.get('msgid', ''),
+        msgid_plural=f.get('msgid_plural'),
+        msgstr=f.get('msgstr'),
+        msgstr_plural=msgstr_plural,
+        comments=raw_entry['comments'],
+    )
+
+
+def _iter_raw_entries(lines):
     current = {'comments': [], 'fields': {}}
     last_field = None
 
-    def flush():
-        nonlocal current, last_field
-        if current['fields'] or current['comments']:
-            entries_raw.append(current)
-        current = {'comments': [], 'fields': {}}
-        last_field = None
-
     for raw_line in lines:
         line = raw_line.strip()
         if not line:
-            flush()
+            if current['fields'] or current['comments']:
+                yield current
+            current = {'comments': [], 'fields': {}}
+            last_field = None
             continue
         if line.startswith('#'):
             current['comments'].append(line)
@@ -123,29 +158,5 @@ def parse_po(raw: bytes):
             continue
         # Anything else (stray text) is ignored rather than raising — real-world PO files
         # occasionally carry lines a strict parser would choke on unnecessarily.
-    flush()
-
-    if not entries_raw:
-        return {}, []
-
-    header_entry = entries_raw[0]
-    header_fields = {}
-    for line in header_entry['fields'].get('msgstr', '').split('\n'):
-        if ':' in line:
-            k, _, v = line.partition(':')
-            header_fields[k.strip()] = v.strip()
-
-    entries = []
-    for raw_entry in entries_raw[1:]:
-        f = raw_entry['fields']
-        plural_dict = f.get('msgstr_plural')
-        msgstr_plural = [plural_dict[i] for i in sorted(plural_dict.keys())] if plural_dict else None
-        entries.append(PoEntry(
-            msgctxt=f.get('msgctxt'),
-            msgid=f.get('msgid', ''),
-            msgid_plural=f.get('msgid_plural'),
-            msgstr=f.get('msgstr'),
-            msgstr_plural=msgstr_plural,
-            comments=raw_entry['comments'],
-        ))
-    return header_fields, entries
+    if current['fields'] or current['comments']:
+        yield current
@@ -0,0 +1,143 @@
+"""
+Incremental readers over an uploaded file handle, shared by the format parsers' `iter_parse`:
+decoded text in chunks, lines, and the members of a top-level JSON object one at a time — so
+a parser holds one chunk/line/member of the upload in memory, never the whole file.
+
+A decoding or syntax error surfaces as ValueError whenever the reader reaches it (possibly
+after entries have already been yielded), the same contract as the whole-buffer parsers.
+"""
+
+import codecs
+import json
+import re
+
+CHUNK_SIZE = 64 * 1024
+# A decode error further than this from the end of the buffered text can't be fixed by reading
+# more: a value cut at a chunk edge only fails inside its last, partial token (the longest
+# being a literal like '-Infinity' or a '\\uXXXX' escape).
+_TAIL = 32
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+
+
+def iter_text(stream, *, encoding, error):
+    """Decoded text chunks. `error` is the ValueError message for undecodable bytes (may use
+    `{exc}`)."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        while True:
+            raw = stream.read(CHUNK_SIZE)
+            text = decoder.decode(raw or b'', final=not raw)
+            if text:
+                yield text
+            if not raw:
+                return
+    except UnicodeDecodeError as exc:
+        raise ValueError(error.format(exc=exc)) from exc
+
+
+def iter_lines(stream, *, encoding, error):
+    """Lines split on '\\n' only, each keeping its terminator (the last one may lack it) —
+    what iterating io.StringIO(whole_text) yields, so csv.reader sees the same input."""
+    pending = ''
+    for text in iter_text(stream, encoding=encoding, error=error):
+        lines = (pending + text).split('\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line + '\n'
+    if pending:
+        yield pending
+
+
+class _Buffer:
+    def __init__(self, stream):
+        self.chunks = iter_text(stream, encoding='utf-8', error='Invalid JSON file: {exc}')
+        self.text, self.pos, self.eof = '', 0, False
+
+    def more(self, at_least=0):
+        """Appends the next chunk, or chunks until at least `at_least` characters have been
+        added (dropping what has been consumed); False at end of file."""
+        if self.eof:
+            return False
+        added = []
+        size = 0
+        while True:
+            try:
+                chunk = next(self.chunks)
+            except StopIteration:
+                self.eof = True
+                break
+            added.append(chunk)
+            size += len(chunk)
+            if size >= at_least:
+                break
+        if not added:
+            return False
+        self.text, self.pos = self.text[self.pos:] + ''.join(added), 0
+        return True
+
+    def peek(self):
+        """The next non-whitespace character, or '' at end of file."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text) or not self.more():
+                return self.text[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f'Invalid JSON file: expected "{char}" but found {found!r}.' if found else 'Invalid JSON file: unexpected end of file.')
+        self.pos += 1
+
+    def value(self, decoder):
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as exc:
+                # Retry with more text only when the value may just be cut off: an unterminated
+                # string (reported at its start) or an error in the buffer's last token. Each
+                # retry re-decodes from the value's start, so the buffered value is doubled
+                # rather than grown a chunk at a time — linear, not quadratic, in its size.
+                truncated = exc.msg.startswith('Unterminated string') or exc.pos >= len(self.text) - _TAIL
+                if truncated and self.more(len(self.text) - self.pos):
+                    continue
+                raise ValueError(f'Invalid JSON file: {exc}') from exc
+            # A number cut at the buffer edge decodes as a shorter one ('1.' reads as 1, with
+            # the '.' left over) and may continue in the next chunk.
+            if _NUMBER_TAIL.fullmatch(self.text, end) and self.more():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_object(stream, *, not_an_object):
+    """(key, value) for each member of the file's top-level JSON object, in file order
+    (duplicate keys are all yielded). Raises ValueError(not_an_object) if the document isn't
+    an object."""
+    decoder = json.JSONDecoder()
+    buf = _Buffer(stream)
+    first = buf.peek()
+    if first != '{':
+        if not first:
+            raise ValueError('Invalid JSON file: the file is empty.')
+        buf.value(decoder)  # a syntax error reads as one, not as "must be an object"
+        raise ValueError(not_an_object)
+    buf.pos += 1
+    if buf.peek() == '}':
+        buf.pos += 1
+    else:
+        while True:
+            key = buf.value(decoder)
+            if not isinstance(key, str):
+                raise ValueError('Invalid JSON file: object keys must be strings.')
+            buf.expect(':')
+            yield key, buf.value(decoder)
+            if buf.peek() == ',':
+                buf.pos += 1
+                continue
+            buf.expect('}')
+            break
+    if buf.peek():
+        raise ValueError('Invalid JSON file: unexpected data after the top-level object.')
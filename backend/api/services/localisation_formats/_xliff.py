@@ -0,0 +1,69 @@
+"""
+Incremental XLIFF reading shared by xliff12.py and unity_xliff.py — structure only, no
+semantics (same split as _po.py): defusedxml's iterparse over the upload, each <trans-unit>
+handed over as soon as it is complete and then discarded, so memory doesn't grow with the file.
+
+DTDs are rejected outright (forbid_dtd) rather than pre-scanning the whole buffer for
+`<!DOCTYPE`/`<!ENTITY` as the whole-buffer parsers did: the parser sees the prolog before any
+element, and nothing an XLIFF file legitimately contains needs one.
+"""
+
+import xml.etree.ElementTree as ET
+
+from defusedxml import ElementTree as SafeET
+from defusedxml.common import DefusedXmlException
+
+REFUSED = 'Refusing to parse an XML file containing a DOCTYPE/ENTITY declaration.'
+
+
+def local(tag):
+    return tag.split('}')[-1]
+
+
+def iter_units(stream):
+    """
+    Yields ('file', attributes) at each <file> start tag and ('unit', element) for each
+    complete <trans-unit>, in document order. The unit element is only valid until the next
+    item is requested. Raises ValueError for malformed XML or a DTD.
+    """
+    parents = []
+    units_open = 0
+    try:
+        for event, element in SafeET.iterparse(stream, events=('start', 'end'), forbid_dtd=True):
+            is_unit = local(element.tag) == 'trans-unit'
+            if event == 'start':
+                parents.append(element)
+                units_open += is_unit
+                if local(element.tag) == 'file':
+                    yield 'file', dict(element.attrib)
+                continue
+            parents.pop()
+            units_open -= is_unit
+            if is_unit:
+                yield 'unit', element
+            # Anything closed outside a unit (the unit itself, <group>s, notes...) is done with:
+            # drop it from the tree, so only the open ancestors stay in memory.
+            if not units_open:
+                element.clear()
+                if parents:
+                    parents[-1].remove(element)
+    except DefusedXmlException:
+        raise ValueError(REFUSED)
+    except ET.ParseError as exc:
+        raise ValueError(f'Invalid XLIFF/XML file: {exc}') from exc
+
+
+def read_unit(unit):
+    """(id, source text, target text or None, is_official) of a <trans-unit> element."""
+    unit_id = unit.get('resname') or unit.get('id') or ''
+    approved = unit.get('approved') == 'yes'
+    state = None
+    source_text = ''
+    target_text = None
+    for child in unit:
+        if local(child.tag) == 'source':
+            source_text = child.text or ''
+        elif local(child.tag) == 'target':
+            target_text = child.text
+            state = child.get('state')
+    return unit_id, source_text, target_text, approved or state in ('final', 'signed-off', 'reviewed')
@@ -4,8 +4,12 @@ converter ever touches the ORM or the WorkspaceState blob directly — build_bun
 once, and apply_import() is the only thing that writes back.
 """
 
+import copy
+import pickle
+import tempfile
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import islice
 from typing import Optional
 
 
@@ -51,7 +55,7 @@ class ParsedEntry:
 
 @dataclass
 class ParsedImport:
-    entries: list           # list[ParsedEntry]
+    entries: list           # list[ParsedEntry], or any iterable of them (see iter_parse_file)
     warnings: list = field(default_factory=list)
 
 
@@ -86,18 +90,18 @@ class ImportResult:
 def build_bundle(project, locales, statuses=('approved',)):
     """
     Builds a TranslationBundle for `project` scoped to `locales` (list[LocaleDef]) and `statuses`
-    (default: approved-only, i.e. the publicly-exportable set). Exactly 2 queries regardless of
-    key count: one WorkspaceState blob read (via the existing read-only helper, never mutates),
-    one CommunityTranslation fetch.
+    (default: approved-only, i.e. the publicly-exportable set). Exactly 3 queries regardless of
+    key count: the board row (via the existing read-only helper, never mutates), its
+    translationKeys section, one CommunityTranslation fetch.
     """
     from api.locale_registry import resolve_source_locale
+    from api.services import workspace_sections
     from api.views import _project_workspace_state_readonly
     from core.models import CommunityTranslation
 
     state = _project_workspace_state_readonly(project)
-    blob = (state.data or {}) if state else {}
-    key_entries = blob.get('translationKeys') or []
-    source = resolve_source_locale(blob)
+    key_entries = workspace_sections.read_data(state, 'translationKeys', [])
+    source = resolve_source_locale((state.data or {}) if state else {})
 
     locale_codes = [loc.code for loc in locales]
     rows = CommunityTranslation.objects.filter(
@@ -178,105 +182,239 @@ def apply_import(project, parsed, *, language, user, import_keys, import_transla
     """
     Applies a ParsedImport to `project`, either previewing (returned as an ImportResult with
     nothing written) or committing. Two write paths, matching how the data is actually stored:
-      - Keys (key/namespace/base_text/plural metadata) merge into the WorkspaceState blob via
-        the existing version-protected upsert helpers — identical concurrency semantics to every
-        other Devs write.
+      - Keys (key/namespace/base_text/plural metadata) merge into the board's translationKeys
+        section under the board row lock, checked against (and bumping) the board version —
+        identical concurrency semantics to every other Devs write.
       - Translation values become CommunityTranslation rows, updated in place when the author
         already has a non-rejected row for (project, key, language) — rejected rows are excluded
-        because uniq_ct_author_per_key_lang doesn't constrain them, so several can exist and a
-        plain update_or_create would raise MultipleObjectsReturned — and are immediately approved
-        via _approve_community_translation, since a bulk import is a moderation action, not a
-        suggestion (the caller must already have verified 'community_translation.approve' before
-        import_translations=True is honoured).
+        because uniq_ct_author_per_key_lang doesn't constrain them, so several can exist — and are
+        immediately approved, since a bulk import is a moderation action, not a suggestion (the
+        caller must already have verified 'community_translation.approve' before
+        import_translations=True is honoured). See _commit_translations: a fixed number of
+        queries per IMPORT_BATCH_SIZE rows, not several per row.
     The whole commit runs in one transaction: a mid-import failure must not leave the key
-    catalogue mutated with only a prefix of the translations applied.
+    catalogue mutated with only a prefix of the translations applied. `parsed.entries` is
+    consumed once, a chunk at a time, while the board row is locked — so it should be already
+    parsed (spool_entries), not a stream straight from the upload: parsing a large file under
+    the lock would stall every other write to the board for as long as the parse takes.
     Returns (ImportResult, conflict: bool). `conflict=True` means a stale base_version was
     supplied and NOTHING was written — the caller should surface this as a 409.
     """
     from django.db import transaction
 
     from api.locale_registry import get as get_locale
-    from api.views import (
-        _approve_community_translation, _project_board_key_and_identity,
-        _project_workspace_state, _versioned_workspace_upsert,
-    )
-    from core.models import CommunityTranslation
+    from api.services import workspace_sections
+    from api.views import _locked_project_workspace_state
 
     result = ImportResult(mode='commit', format='', language=language)
     locale = get_locale(language) if language else None
 
     with transaction.atomic():
-        state = _project_workspace_state(project)
+        state = _locked_project_workspace_state(project)
         if base_version is not None and base_version != state.version:
             return result, True
 
-        data = dict(state.data or {})
-        existing_entries = list(data.get('translationKeys') or [])
+        stored_entries = workspace_sections.read_data(state, 'translationKeys', [])
+        existing_entries = copy.deepcopy(stored_entries)
         by_key = {e.get('key'): e for e in existing_entries}
 
-        if import_keys:
-            for parsed_entry in parsed.entries:
-                current = by_key.get(parsed_entry.key)
-                if current is None:
-                    new_entry = {
-                        'id': f'lk-import-{parsed_entry.key}',
-                        'key': parsed_entry.key,
-                        'namespace': parsed_entry.namespace or (parsed_entry.key.split('.')[0] if '.' in parsed_entry.key else 'other'),
-                        'baseText': parsed_entry.base_text,
-                    }
-                    if parsed_entry.is_plural and parsed_entry.base_plural:
-                        new_entry['isPlural'] = True
-                        new_entry['basePlural'] = parsed_entry.base_plural
-                    existing_entries.append(new_entry)
-                    by_key[parsed_entry.key] = new_entry
-                    result.keys_added += 1
-                elif parsed_entry.base_text and parsed_entry.base_text != current.get('baseText'):
-                    current['baseText'] = parsed_entry.base_text
-                    result.keys_updated += 1
-            data['translationKeys'] = existing_entries
-
-        if data != (state.data or {}):
-            board_key, identity = _project_board_key_and_identity(project)
-            _, conflict = _versioned_workspace_upsert(key=board_key, data=data, base_version=state.version, **identity)
-            if conflict:
-                return result, True
-
-        if import_translations:
-            for parsed_entry in parsed.entries:
-                catalog_entry = by_key.get(parsed_entry.key)
-                if catalog_entry is None:
-                    result.warnings.append(f'Skipped translation for unknown key "{parsed_entry.key}".')
-                    result.skipped += 1
-                    continue
-                value = parsed_entry.translations.get(language)
-                if value is None:
-                    continue
-
-                field_values, warning = _validate_import_value(parsed_entry.key, catalog_entry, value, locale)
-                if warning:
-                    result.warnings.append(warning)
-                    result.skipped += 1
-                if field_values is None:
-                    continue
-
-                existing = (
-                    CommunityTranslation.objects
-                    .filter(project=project, key=parsed_entry.key, language=language, author=user)
-                    .exclude(status='rejected')
-                    .first()
-                )
-                if existing is not None:
-                    for field, val in field_values.items():
-                        setattr(existing, field, val)
-                    existing.save(update_fields=list(field_values.keys()) + ['updated_at'])
-                    obj = existing
-                    result.translations_updated += 1
-                else:
-                    obj = CommunityTranslation.objects.create(
-                        project=project, key=parsed_entry.key, language=language, author=user,
-                        **field_values,
-                    )
-                    result.translations_created += 1
-                _approve_community_translation(obj, user)
+        # One pass over the entries (which may be streaming in from the upload), a chunk at a
+        # time: each chunk's keys are merged before its translations are written, which is all
+        # a translation depends on (its own key's catalogue entry).
+        entries = iter(parsed.entries)
+        while chunk := list(islice(entries, IMPORT_BATCH_SIZE)):
+            if import_keys:
+                _merge_keys(chunk, existing_entries, by_key, result)
+            if import_translations:
+                _commit_translations(project, chunk, by_key, language=language, locale=locale, user=user, result=result)
+
+        if existing_entries != stored_entries:
+            workspace_sections.write(state, {'translationKeys': (existing_entries, None)})
 
     return result, False
+
+
+def _merge_keys(entries, existing_entries, by_key, result):
+    for parsed_entry in entries:
+        current = by_key.get(parsed_entry.key)
+        if current is None:
+            new_entry = {
+                'id': f'lk-import-{parsed_entry.key}',
+                'key': parsed_entry.key,
+                'namespace': parsed_entry.namespace or (parsed_entry.key.split('.')[0] if '.' in parsed_entry.key else 'other'),
+                'baseText': parsed_entry.base_text,
+            }
+            if parsed_entry.is_plural and parsed_entry.base_plural:
+                new_entry['isPlural'] = True
+                new_entry['basePlural'] = parsed_entry.base_plural
+            existing_entries.append(new_entry)
+            by_key[parsed_entry.key] = new_entry
+            result.keys_added += 1
+        elif parsed_entry.base_text and parsed_entry.base_text != current.get('baseText'):
+            current['baseText'] = parsed_entry.base_text
+            result.keys_updated += 1
+
+
+IMPORT_BATCH_SIZE = 500
+
+# Parsed entries stay in memory up to this size, then spill to a temporary file.
+SPOOL_MAX_MEMORY = 4 * 1024 * 1024
+
+
+class SpooledEntries:
+    """
+    Parsed entries drained out of a parser stream ahead of time, IMPORT_BATCH_SIZE at a time,
+    into a spooled temporary file — so apply_import can replay them under the board lock
+    without the parse itself (or its ValueError on a malformed file) happening there, and
+    without the whole file's entries sitting in memory at once.
+    """
+
+    def __init__(self, entries):
+        self._file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+        entries = iter(entries)
+        while chunk := list(islice(entries, IMPORT_BATCH_SIZE)):
+            pickle.dump(chunk, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __iter__(self):
+        self._file.seek(0)
+        while True:
+            try:
+                chunk = pickle.load(self._file)
+            except EOFError:
+                return
+            yield from chunk
+
+    def close(self):
+        self._file.close()
+
+
+def spool_entries(entries):
+    """Fully parses `entries` (e.g. from iter_parse_file) into a SpooledEntries. Raises the
+    parser's ValueError here, before the caller has taken any lock."""
+    return SpooledEntries(entries)
+
+
+def _commit_translations(project, entries, by_key, *, language, locale, user, result):
+    """
+    The translation half of apply_import for a list of entries, with the same counts and
+    warnings as applying them one by one (a key appearing twice counts as created then updated,
+    the last value wins) but a fixed number of queries: the author's existing rows for these
+    keys in one locked fetch, the new values diffed in memory, then — in IMPORT_BATCH_SIZE
+    chunks — other
+    authors' approved rows for the imported keys unapproved (first, so the partial unique index
+    uniq_approved_ct_per_key_lang is never violated, as in _approve_community_translation), the
+    author's rows updated and the new ones created, all already approved. None of these writes
+    send signals, so the batch takes its change-feed number and moves the localisation rollups
+    here.
+    """
+    from django.utils import timezone
+
+    from api.services import localisation_rollups, translation_sync
+    from core.models import CommunityTranslation
+
+    seq = translation_sync.next_seq(project.id)
+    own = {}
+    for row in (
+        CommunityTranslation.objects.select_for_update()
+        .filter(project=project, language=language, author=user, key__in={entry.key for entry in entries})
+        .exclude(status='rejected')
+    ):
+        own.setdefault(row.key, row)  # default ordering: the newest, as .first() would pick
+
+    now = timezone.now()
+    approval = {'status': 'approved', 'approved_by': user, 'approved_at': now, 'sync_seq': seq}
+    touched, created = {}, {}
+    for parsed_entry in entries:
+        catalog_entry = by_key.get(parsed_entry.key)
+        if catalog_entry is None:
+            result.warnings.append(f'Skipped translation for unknown key "{parsed_entry.key}".')
+            result.skipped += 1
+            continue
+        value = parsed_entry.translations.get(language)
+        if value is None:
+            continue
+
+        field_values, warning = _validate_import_value(parsed_entry.key, catalog_entry, value, locale)
+        if warning:
+            result.warnings.append(warning)
+            result.skipped += 1
+        if field_values is None:
+            continue
+
+        row = own.get(parsed_entry.key)
+        if row is not None:
+            result.translations_updated += 1
+        else:
+            row = CommunityTranslation(project=project, key=parsed_entry.key, language=language, author=user)
+            own[parsed_entry.key] = created[parsed_entry.key] = row
+            result.translations_created += 1
+        for field_name, val in {**field_values, **approval}.items():
+            setattr(row, field_name, val)
+        if row.pk is not None:
+            row.updated_at = now
+            touched[parsed_entry.key] = row
+
+    rows = list(touched.values())
+    changes = [(localisation_rollups.loaded_state(row), localisation_rollups.current_state(row)) for row in rows]
+    keys = list({**touched, **created})
+    for start in range(0, len(keys), IMPORT_BATCH_SIZE):
+        demoted = list(
+            CommunityTranslation.objects
+            .filter(project=project, language=language, key__in=keys[start:start + IMPORT_BATCH_SIZE], status='approved')
+            .exclude(author=user)
+        )
+        if not demoted:
+            continue
+        CommunityTranslation.objects.filter(pk__in=[row.pk for row in demoted]).update(
+            status='pending', approved_by=None, approved_at=None, sync_seq=seq,
+        )
+        for row in demoted:
+            row.status = 'pending'
+            changes.append((localisation_rollups.loaded_state(row), localisation_rollups.current_state(row)))
+    for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+        _update_translations(rows[start:start + IMPORT_BATCH_SIZE], now=now, user=user, seq=seq)
+    CommunityTranslation.objects.bulk_create(list(created.values()), batch_size=IMPORT_BATCH_SIZE)
+    changes += [(None, localisation_rollups.current_state(row)) for row in created.values()]
+    localisation_rollups.apply_changes(project.id, changes)
+
+
+def _update_translations(rows, *, now, user, seq):
+    """
+    Writes the imported text/plural_forms of `rows` and approves them (change-feed number
+    `seq`), in one statement.
+    QuerySet.bulk_update builds a CASE WHEN per row and field (most of its time is spent
+    constructing those expressions in Python), so on PostgreSQL the rows are joined against a
+    VALUES list instead; other backends take the ORM path.
+    """
+    import json
+
+    from django.db import connection
+
+    from core.models import CommunityTranslation
+
+    if connection.vendor != 'postgresql':
+        for row in rows:
+            row.updated_at = now
+        CommunityTranslation.objects.bulk_update(
+            rows, ['text', 'plural_forms', 'status', 'approved_by', 'approved_at', 'updated_at', 'sync_seq'],
+        )
+        return
+
+    meta = CommunityTranslation._meta
+    qn = connection.ops.quote_name
+    column = {name: qn(meta.get_field(name).column) for name in (
+        'id', 'text', 'plural_forms', 'status', 'approved_by', 'approved_at', 'updated_at', 'sync_seq',
+    )}
+    values, params = [], []
+    for row in rows:
+        values.append('(%s, %s, %s)')
+        params += [row.pk, row.text, None if row.plural_forms is None else json.dumps(row.plural_forms)]
+    sql = (
+        f'UPDATE {qn(meta.db_table)} AS t SET {column["text"]} = v.text, '
+        f'{column["plural_forms"]} = v.plural_forms::jsonb, {column["status"]} = %s, '
+        f'{column["approved_by"]} = %s, {column["approved_at"]} = %s, {column["updated_at"]} = %s, '
+        f'{column["sync_seq"]} = %s '
+        f'FROM (VALUES {", ".join(values)}) AS v(id, text, plural_forms) WHERE t.{column["id"]} = v.id'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, ['approved', user.pk, now, now, seq] + params)
@@ -6,6 +6,7 @@ with a warning, same rationale as flat_json.py).
 import csv
 import io
 
+from . import _stream
 from .canonical import ParsedEntry, ParsedImport
 
 LABEL = 'Flat CSV'
@@ -15,39 +16,63 @@ SUPPORTS_MULTI_LANGUAGE = True
 SUPPORTS_PLURALS = False
 
 
-def export(bundle, *, language):
+def iter_csv(rows):
+    """Encoded CSV chunks, one per row (also used by unity_csv.py)."""
     buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow(row)
+        yield buf.getvalue().encode('utf-8')
+        buf.seek(0)
+        buf.truncate()
+
+
+def export(bundle, *, language):
+    return b''.join(iter_export(bundle, language=language))
+
+
+def iter_export(bundle, *, language):
+    return iter_csv(_rows(bundle, language))
+
+
+def _rows(bundle, language):
     if language == 'all':
-        writer = csv.writer(buf)
-        writer.writerow(['key', bundle.source.code] + [loc.code for loc in bundle.locales])
+        yield ['key', bundle.source.code] + [loc.code for loc in bundle.locales]
         for entry in bundle.entries:
             row = [entry.key, entry.base_text]
             for loc in bundle.locales:
                 value = entry.translations.get(loc.code)
                 row.append(value.text if (value and value.text) else '')
-            writer.writerow(row)
-        return buf.getvalue().encode('utf-8')
+            yield row
+        return
 
-    writer = csv.writer(buf)
-    writer.writerow(['key', bundle.source.code, language])
+    yield ['key', bundle.source.code, language]
     for entry in bundle.entries:
         value = entry.translations.get(language)
-        writer.writerow([entry.key, entry.base_text, value.text if (value and value.text) else ''])
-    return buf.getvalue().encode('utf-8')
+        yield [entry.key, entry.base_text, value.text if (value and value.text) else '']
+
+
+def iter_rows(stream):
+    """The upload's non-blank CSV rows, read line by line (also used by unity_csv.py). Raises
+    ValueError if there are none."""
+    lines = _stream.iter_lines(stream, encoding='utf-8-sig', error='Could not decode file as UTF-8: {exc}')
+    rows = (r for r in csv.reader(lines) if any(cell.strip() for cell in r))
+    first = next(rows, None)
+    if first is None:
+        raise ValueError('CSV file is empty.')
+    yield first
+    yield from rows
 
 
 def parse(raw: bytes, *, project_locales, source_locale):
-    try:
-        text = raw.decode('utf-8-sig')
-    except UnicodeDecodeError as exc:
-        raise ValueError(f'Could not decode file as UTF-8: {exc}') from exc
+    warnings = []
+    entries = list(iter_parse(io.BytesIO(raw), project_locales=project_locales, source_locale=source_locale, warnings=warnings))
+    return ParsedImport(entries=entries, warnings=warnings)
 
-    rows = list(csv.reader(io.StringIO(text)))
-    rows = [r for r in rows if any(cell.strip() for cell in r)]
-    if not rows:
-        raise ValueError('CSV file is empty.')
 
-    header = [h.strip() for h in rows[0]]
+def iter_parse(stream, *, project_locales, source_locale, warnings):
+    rows = iter_rows(stream)
+    header = [h.strip() for h in next(rows)]
     try:
         key_idx = header.index('key')
     except ValueError:
@@ -64,9 +89,7 @@ def parse(raw: bytes, *, project_locales, source_locale):
         elif h in locale_codes:
             lang_cols.append((idx, h))
 
-    warnings = []
-    entries = []
-    for row_num, cols in enumerate(rows[1:], start=2):
+    for row_num, cols in enumerate(rows, start=2):
         key = (cols[key_idx] if key_idx < len(cols) else '').strip()
         if not key:
             warnings.append(f'Row {row_num}: skipped, empty key.')
@@ -77,6 +100,4 @@ def parse(raw: bytes, *, project_locales, source_locale):
             value = (cols[idx] if idx < len(cols) else '').strip()
             if value:
                 translations[code] = {'text': value}
-        entries.append(ParsedEntry(key=key, base_text=base_text, translations=translations))
-
-    return ParsedImport(entries=entries, warnings=warnings)
+        yield ParsedEntry(key=key, base_text=base_text, translations=translations)
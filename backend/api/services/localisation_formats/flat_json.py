@@ -7,8 +7,10 @@ no plural support (a plural entry's forms are dropped with a warning, same as ro
 mergeImportedRows discarding translation values it couldn't place structurally).
 """
 
+import io
 import json
 
+from . import _stream
 from .canonical import ParsedEntry, ParsedImport
 
 LABEL = 'Flat JSON'
@@ -38,22 +40,25 @@ def export(bundle, *, language):
 
 
 def parse(raw: bytes, *, project_locales, source_locale):
-    try:
-        data = json.loads(raw.decode('utf-8'))
-    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
-        raise ValueError(f'Invalid JSON file: {exc}') from exc
-    if not isinstance(data, dict):
-        raise ValueError('JSON file must be an object mapping keys to text or language objects.')
+    warnings = []
+    entries = list(iter_parse(io.BytesIO(raw), project_locales=project_locales, source_locale=source_locale, warnings=warnings))
+    return ParsedImport(entries=entries, warnings=warnings)
+
 
+def iter_parse(stream, *, project_locales, source_locale, warnings):
+    """Reads the top-level object one member at a time (_stream.iter_json_object). A key
+    repeated in the file is yielded each time (json.loads kept only its last value); applied
+    in order, the last one still wins."""
+    members = _stream.iter_json_object(
+        stream, not_an_object='JSON file must be an object mapping keys to text or language objects.',
+    )
     locale_codes = {loc.code for loc in project_locales}
-    warnings = []
-    entries = []
-    for key, value in data.items():
+    for key, value in members:
         if not key.strip():
             warnings.append('Skipped a row with an empty key.')
             continue
         if isinstance(value, str):
-            entries.append(ParsedEntry(key=key, base_text=value))
+            yield ParsedEntry(key=key, base_text=value)
             continue
         if isinstance(value, dict):
             base_text = value.get(source_locale.code, '')
@@ -65,8 +70,6 @@ def parse(raw: bytes, *, project_locales, source_locale):
                     translations[code] = {'text': text_value}
                 else:
                     warnings.append(f'Unknown language "{code}" for key "{key}" — skipped.')
-            entries.append(ParsedEntry(key=key, base_text=base_text, translations=translations))
+            yield ParsedEntry(key=key, base_text=base_text, translations=translations)
             continue
         warnings.append(f'Skipped "{key}": unsupported value type.')
-
-    return ParsedImport(entries=entries, warnings=warnings)
@@ -7,6 +7,8 @@ the file AND makes the round-trip lossless via msgctxt, rather than needing to m
 text alone).
 """
 
+import io
+
 from . import _po
 from .canonical import ParsedEntry, ParsedImport
 
@@ -18,6 +20,10 @@ SUPPORTS_PLURALS = True
 
 
 def export(bundle, *, language):
+    return b''.join(iter_export(bundle, language=language))
+
+
+def iter_export(bundle, *, language):
     loc = next((l for l in bundle.locales if l.code == language), None)
     if loc is None:
         raise ValueError(f'Project is not configured for language "{language}".')
@@ -31,43 +37,46 @@ def export(bundle, *, language):
         'Plural-Forms': f'nplurals={loc.gettext_nplurals}; plural={loc.gettext_plural_expr};',
     }
 
-    entries = []
-    for entry in bundle.entries:
-        value = entry.translations.get(loc.code)
-        comments = [f'#. Namespace: {entry.namespace}'] if entry.namespace else []
-        if entry.is_plural:
-            base_plural = entry.base_plural or {}
-            msgid = base_plural.get('one', entry.base_text)
-            msgid_plural = base_plural.get('other', entry.base_text)
-            forms = (value.plural_forms if value else None) or {}
-            msgstr_plural = [forms.get(cat, '') for cat in loc.gettext_category_order]
-            entries.append(_po.PoEntry(
-                msgctxt=entry.key, msgid=msgid, msgid_plural=msgid_plural,
-                msgstr_plural=msgstr_plural, comments=comments,
-            ))
-        else:
-            entries.append(_po.PoEntry(
-                msgctxt=entry.key, msgid=entry.base_text,
-                msgstr=(value.text if value else ''), comments=comments,
-            ))
+    return _po.iter_po(header_fields, (_po_entry(entry, loc) for entry in bundle.entries))
+
 
-    return _po.write_po(header_fields, entries)
+def _po_entry(entry, loc):
+    value = entry.translations.get(loc.code)
+    comments = [f'#. Namespace: {entry.namespace}'] if entry.namespace else []
+    if entry.is_plural:
+        base_plural = entry.base_plural or {}
+        msgid = base_plural.get('one', entry.base_text)
+        msgid_plural = base_plural.get('other', entry.base_text)
+        forms = (value.plural_forms if value else None) or {}
+        msgstr_plural = [forms.get(cat, '') for cat in loc.gettext_category_order]
+        return _po.PoEntry(
+            msgctxt=entry.key, msgid=msgid, msgid_plural=msgid_plural,
+            msgstr_plural=msgstr_plural, comments=comments,
+        )
+    return _po.PoEntry(
+        msgctxt=entry.key, msgid=entry.base_text,
+        msgstr=(value.text if value else ''), comments=comments,
+    )
 
 
 def parse(raw: bytes, *, project_locales, source_locale):
-    header_fields, po_entries = _po.parse_po(raw)
+    warnings = []
+    entries = list(iter_parse(io.BytesIO(raw), project_locales=project_locales, source_locale=source_locale, warnings=warnings))
+    return ParsedImport(entries=entries, warnings=warnings)
+
+
+def iter_parse(stream, *, project_locales, source_locale, warnings):
+    header_fields, po_entries = _po.iter_parse_po(stream)
     language = header_fields.get('Language')
     locale_codes = {loc.code for loc in project_locales}
     locales_by_code = {loc.code: loc for loc in project_locales}
     target_locale = locales_by_code.get(language)
 
-    warnings = []
     if language and language not in locale_codes:
         warnings.append(f'PO file declares Language "{language}", which is not configured for this project — translations were not imported, only the key catalogue.')
     elif not language:
         warnings.append('PO file has no Language header — translations were not imported, only the key catalogue.')
 
-    entries = []
     for po_entry in po_entries:
         key = po_entry.msgctxt or po_entry.msgid
         if po_entry.msgctxt is None:
@@ -85,14 +94,12 @@ def parse(raw: bytes, *, project_locales, source_locale):
                         forms[category] = po_entry.msgstr_plural[i]
                 if forms:
                     translations[target_locale.code] = {'plural_forms': forms}
-            entries.append(ParsedEntry(
+            yield ParsedEntry(
                 key=key, base_text=po_entry.msgid, is_plural=True,
                 base_plural=base_plural, translations=translations,
-            ))
+            )
         else:
             translations = {}
             if target_locale and po_entry.msgstr:
                 translations[target_locale.code] = {'text': po_entry.msgstr}
-            entries.append(ParsedEntry(key=key, base_text=po_entry.msgid, translations=translations))
-
-    return ParsedImport(entries=entries, warnings=warnings)
+            yield ParsedEntry(key=key, base_text=po_entry.msgid, translations=translations)
@@ -19,11 +19,11 @@ segmentation on the Unity side. Translators should avoid literal pipe characters
 strings destined for Unity.
 """
 
-import csv
 import io
 import re
 
 from .canonical import ParsedEntry, ParsedImport
+from .flat_csv import iter_csv, iter_rows
 
 LABEL = 'Unity CSV'
 EXTENSION = 'csv'
@@ -53,14 +53,19 @@ def _parse_smart_plural_cell(cell: str, categories):
 
 
 def export(bundle, *, language):
+    return b''.join(iter_export(bundle, language=language))
+
+
+def iter_export(bundle, *, language):
     targets = bundle.locales if language == 'all' else [next(l for l in bundle.locales if l.code == language)]
     # The source language is always its own column too, exactly like a real Unity String Table
     # Collection — translators need the source text alongside whatever they're translating.
     columns = [bundle.source] + targets
+    return iter_csv(_rows(bundle, columns))
+
 
-    buf = io.StringIO()
-    writer = csv.writer(buf)
-    writer.writerow(['Key', 'Id', 'Shared Comments'] + [f'{loc.name}({loc.code})' for loc in columns])
+def _rows(bundle, columns):
+    yield ['Key', 'Id', 'Shared Comments'] + [f'{loc.name}({loc.code})' for loc in columns]
 
     for entry in bundle.entries:
         row = [entry.key, '', f'namespace: {entry.namespace}' if entry.namespace else '']
@@ -75,23 +80,18 @@ def export(bundle, *, language):
                 else:
                     cell = value.text if (value and value.text) else entry.base_text
             row.append(cell)
-        writer.writerow(row)
-
-    return buf.getvalue().encode('utf-8')
+        yield row
 
 
 def parse(raw: bytes, *, project_locales, source_locale):
-    try:
-        text = raw.decode('utf-8-sig')
-    except UnicodeDecodeError as exc:
-        raise ValueError(f'Could not decode file as UTF-8: {exc}') from exc
+    warnings = []
+    entries = list(iter_parse(io.BytesIO(raw), project_locales=project_locales, source_locale=source_locale, warnings=warnings))
+    return ParsedImport(entries=entries, warnings=warnings)
 
-    rows = list(csv.reader(io.StringIO(text)))
-    rows = [r for r in rows if any(cell.strip() for cell in r)]
-    if not rows:
-        raise ValueError('CSV file is empty.')
 
-    header = [h.strip() for h in rows[0]]
+def iter_parse(stream, *, project_locales, source_locale, warnings):
+    rows = iter_rows(stream)
+    header = [h.strip() for h in next(rows)]
     try:
         key_idx = header.index('Key')
     except ValueError:
@@ -101,7 +101,6 @@ def parse(raw: bytes, *, project_locales, source_locale):
     locales_by_code = {loc.code: loc for loc in project_locales}
     lang_cols = []       # (idx, code) — target language columns
     source_idx = None    # index of the source-language column, if present
-    warnings = []
     for idx, h in enumerate(header):
         if idx in (key_idx, comments_idx) or h == 'Id':
             continue
@@ -118,8 +117,7 @@ def parse(raw: bytes, *, project_locales, source_locale):
         else:
             warnings.append(f'Unknown language column "{h}" — skipped.')
 
-    entries = []
-    for row_num, cols in enumerate(rows[1:], start=2):
+    for row_num, cols in enumerate(rows, start=2):
         key = (cols[key_idx] if key_idx < len(cols) else '').strip()
         if not key:
             warnings.append(f'Row {row_num}: skipped, empty key.')
@@ -147,9 +145,7 @@ def parse(raw: bytes, *, project_locales, source_locale):
             else:
                 translations[code] = {'text': cell}
 
-        entries.append(ParsedEntry(
+        yield ParsedEntry(
             key=key, namespace=namespace, base_text=base_text,
             is_plural=is_plural, base_plural=base_plural, translations=translations,
-        ))
-
-    return ParsedImport(entries=entries, warnings=warnings)
+        )
@@ -10,14 +10,14 @@ plural expressed as Unity's own opaque "Smart String" syntax (`{0:plural:form1|f
 segments in the locale's `cldr_categories` order) inside one `<target>` — exactly the same cell
 format `unity_csv.py` uses, since it's the same Unity-side consumer either way.
 
-Everything else (approval-state signalling, XML safety limits) is identical to xliff12.py.
+Everything else (approval-state signalling, XML safety, incremental reading) is identical to
+xliff12.py, through the shared _xliff.py.
 """
 
+import io
 import xml.etree.ElementTree as ET
 
-from defusedxml import ElementTree as SafeET
-from defusedxml.common import DefusedXmlException
-
+from . import _xliff
 from .canonical import ParsedEntry, ParsedImport
 from .unity_csv import _parse_smart_plural_cell
 
@@ -28,7 +28,6 @@ SUPPORTS_MULTI_LANGUAGE = False
 SUPPORTS_PLURALS = True
 
 NS = 'urn:oasis:names:tc:xliff:document:1.2'
-_MAX_BYTES = 5 * 1024 * 1024
 
 
 def export(bundle, *, language):
@@ -77,50 +76,29 @@ def export(bundle, *, language):
 
 
 def parse(raw: bytes, *, project_locales, source_locale):
-    if len(raw) > _MAX_BYTES:
-        raise ValueError('File is too large (max 5MB).')
-    # Same defence as xliff12.py: full-buffer scan for a friendly error, defusedxml as the
-    # actual protection against entity-expansion / DTD payloads.
-    if b'<!DOCTYPE' in raw or b'<!ENTITY' in raw:
-        raise ValueError('Refusing to parse an XML file containing a DOCTYPE/ENTITY declaration.')
-
-    try:
-        root = SafeET.fromstring(raw)
-    except DefusedXmlException:
-        raise ValueError('Refusing to parse an XML file containing a DOCTYPE/ENTITY declaration.')
-    except ET.ParseError as exc:
-        raise ValueError(f'Invalid XLIFF/XML file: {exc}') from exc
-
-    def local(tag):
-        return tag.split('}')[-1]
-
     warnings = []
-    target_language = None
-    for file_el in root.iter():
-        if local(file_el.tag) == 'file':
-            target_language = file_el.get('target-language')
-            break
-    locales_by_code = {loc.code: loc for loc in project_locales}
-    target_locale = locales_by_code.get(target_language)
-    if target_locale is None:
-        warnings.append(f'File target-language "{target_language}" is not configured for this project — translations were not imported, only the key catalogue.')
+    entries = list(iter_parse(io.BytesIO(raw), project_locales=project_locales, source_locale=source_locale, warnings=warnings))
+    return ParsedImport(entries=entries, warnings=warnings)
 
-    entries = []
-    for unit in root.iter():
-        if local(unit.tag) != 'trans-unit':
+
+def iter_parse(stream, *, project_locales, source_locale, warnings):
+    locales_by_code = {loc.code: loc for loc in project_locales}
+    target_locale, resolved = None, False
+
+    def resolve(language):
+        target = locales_by_code.get(language)
+        if target is None:
+            warnings.append(f'File target-language "{language}" is not configured for this project — translations were not imported, only the key catalogue.')
+        return target
+
+    for kind, item in _xliff.iter_units(stream):
+        if kind == 'file':
+            if not resolved:
+                target_locale, resolved = resolve(item.get('target-language')), True
             continue
-        key = unit.get('resname') or unit.get('id') or ''
-        approved = unit.get('approved') == 'yes'
-        state = None
-        source_text = ''
-        target_text = None
-        for child in unit:
-            if local(child.tag) == 'source':
-                source_text = child.text or ''
-            elif local(child.tag) == 'target':
-                target_text = child.text
-                state = child.get('state')
-        is_official = approved or state in ('final', 'signed-off', 'reviewed')
+        if not resolved:
+            target_locale, resolved = resolve(None), True
+        key, source_text, target_text, is_official = _xliff.read_unit(item)
 
         source_plural = _parse_smart_plural_cell(source_text, source_locale.cldr_categories) if source_text else None
         entry = ParsedEntry(key=key)
@@ -137,6 +115,7 @@ def parse(raw: bytes, *, project_locales, source_locale):
             else:
                 entry.translations[target_locale.code] = {'text': target_text}
 
-        entries.append(entry)
+        yield entry
 
-    return ParsedImport(entries=entries, warnings=warnings)
+    if not resolved:
+        resolve(None)
@@ -13,6 +13,7 @@ Two real, verified differences from gettext_po.py:
     parser reverses this. No `Plural-Forms:` header line is written — Unreal doesn't consume it.
 """
 
+import io
 import re
 
 from . import _po
@@ -82,6 +83,10 @@ def _parse_unreal_plural_arg(s: str):
 
 
 def export(bundle, *, language):
+    return b''.join(iter_export(bundle, language=language))
+
+
+def iter_export(bundle, *, language):
     loc = next((l for l in bundle.locales if l.code == language), None)
     if loc is None:
         raise ValueError(f'Project is not configured for language "{language}".')
@@ -94,39 +99,43 @@ def export(bundle, *, language):
         'Content-Transfer-Encoding': '8bit',
     }
 
-    entries = []
-    for entry in bundle.entries:
-        value = entry.translations.get(loc.code)
-        msgctxt = f'{entry.namespace},{entry.key}'
-        comments = [f'#. Key: {entry.key}', '#. SourceLocation: /Game/Gamelogd']
-
-        if entry.is_plural:
-            base_plural = entry.base_plural or {}
-            msgid = _build_unreal_plural_arg('Count', base_plural, loc.cldr_categories)
-            forms = (value.plural_forms if value else None) or {}
-            msgstr = _build_unreal_plural_arg('Count', forms, loc.cldr_categories) if forms else ''
-        else:
-            msgid = entry.base_text
-            msgstr = value.text if value else ''
+    return _po.iter_po(header_fields, (_po_entry(entry, loc) for entry in bundle.entries))
 
-        entries.append(_po.PoEntry(msgctxt=msgctxt, msgid=msgid, msgstr=msgstr, comments=comments))
 
-    return _po.write_po(header_fields, entries)
+def _po_entry(entry, loc):
+    value = entry.translations.get(loc.code)
+    msgctxt = f'{entry.namespace},{entry.key}'
+    comments = [f'#. Key: {entry.key}', '#. SourceLocation: /Game/Gamelogd']
+
+    if entry.is_plural:
+        base_plural = entry.base_plural or {}
+        msgid = _build_unreal_plural_arg('Count', base_plural, loc.cldr_categories)
+        forms = (value.plural_forms if value else None) or {}
+        msgstr = _build_unreal_plural_arg('Count', forms, loc.cldr_categories) if forms else ''
+    else:
+        msgid = entry.base_text
+        msgstr = value.text if value else ''
+
+    return _po.PoEntry(msgctxt=msgctxt, msgid=msgid, msgstr=msgstr, comments=comments)
 
 
 def parse(raw: bytes, *, project_locales, source_locale):
-    header_fields, po_entries = _po.parse_po(raw)
+    warnings = []
+    entries = list(iter_parse(io.BytesIO(raw), project_locales=project_locales, source_locale=source_locale, warnings=warnings))
+    return ParsedImport(entries=entries, warnings=warnings)
+
+
+def iter_parse(stream, *, project_locales, source_locale, warnings):
+    header_fields, po_entries = _po.iter_parse_po(stream)
     language = header_fields.get('Language')
     locales_by_code = {loc.code: loc for loc in project_locales}
     target_locale = locales_by_code.get(language)
 
-    warnings = []
     if language and target_locale is None:
         warnings.append(f'PO file declares Language "{language}", which is not configured for this project — translations were not imported, only the key catalogue.')
     elif not language:
         warnings.append('PO file has no Language header — translations were not imported, only the key catalogue.')
 
-    entries = []
     for po_entry in po_entries:
         if po_entry.msgctxt and ',' in po_entry.msgctxt:
             namespace, _, key = po_entry.msgctxt.partition(',')
@@ -152,6 +161,4 @@ def parse(raw: bytes, *, project_locales, source_locale):
             else:
                 entry.translations[target_locale.code] = {'text': po_entry.msgstr}
 
-        entries.append(entry)
-
-    return ParsedImport(entries=entries, warnings=warnings)
+        yield entry
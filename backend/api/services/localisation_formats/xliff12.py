@@ -14,11 +14,10 @@ pending -> approved="no" + state="translated". Untranslated -> state="needs-tran
 <target>.
 """
 
+import io
 import xml.etree.ElementTree as ET
 
-from defusedxml import ElementTree as SafeET
-from defusedxml.common import DefusedXmlException
-
+from . import _xliff
 from .canonical import ParsedEntry, ParsedImport
 
 LABEL = 'XLIFF 1.2'
@@ -28,7 +27,6 @@ SUPPORTS_MULTI_LANGUAGE = False
 SUPPORTS_PLURALS = True
 
 NS = 'urn:oasis:names:tc:xliff:document:1.2'
-_MAX_BYTES = 5 * 1024 * 1024
 
 
 def export(bundle, *, language):
@@ -76,52 +74,40 @@ def _write_unit(parent, unit_id, source_text, target_text, value):
 
 
 def parse(raw: bytes, *, project_locales, source_locale):
-    if len(raw) > _MAX_BYTES:
-        raise ValueError('File is too large (max 5MB).')
-    # Scan the whole buffer, not just a prefix: a long prolog comment would otherwise smuggle
-    # a DTD past the check. defusedxml below is the real defence (entity expansion / DTD are
-    # rejected by the parser itself); this scan just gives a friendlier error message.
-    if b'<!DOCTYPE' in raw or b'<!ENTITY' in raw:
-        raise ValueError('Refusing to parse an XML file containing a DOCTYPE/ENTITY declaration.')
-
-    try:
-        root = SafeET.fromstring(raw)
-    except DefusedXmlException:
-        raise ValueError('Refusing to parse an XML file containing a DOCTYPE/ENTITY declaration.')
-    except ET.ParseError as exc:
-        raise ValueError(f'Invalid XLIFF/XML file: {exc}') from exc
-
-    def local(tag):
-        return tag.split('}')[-1]
-
     warnings = []
-    target_language = None
-    for file_el in root.iter():
-        if local(file_el.tag) == 'file':
-            target_language = file_el.get('target-language')
-            break
+    entries = list(iter_parse(io.BytesIO(raw), project_locales=project_locales, source_locale=source_locale, warnings=warnings))
+    return ParsedImport(entries=entries, warnings=warnings)
+
+
+def iter_parse(stream, *, project_locales, source_locale, warnings):
+    """
+    Yields one ParsedEntry per key as the file is read (see _xliff.py). A plural key's
+    per-category units are merged while they are consecutive — as this module's own export
+    writes them; a key whose units are split up by other keys comes out as one entry per run.
+    """
     locale_codes = {loc.code for loc in project_locales}
-    if target_language not in locale_codes:
-        warnings.append(f'File target-language "{target_language}" is not configured for this project — translations were not imported, only the key catalogue.')
-        target_language = None
-
-    by_key = {}  # key -> ParsedEntry
-    plural_forms_by_key = {}  # key -> {category: text}
-    for unit in root.iter():
-        if local(unit.tag) != 'trans-unit':
+    target_language, resolved = None, False
+
+    def resolve(language):
+        if language not in locale_codes:
+            warnings.append(f'File target-language "{language}" is not configured for this project — translations were not imported, only the key catalogue.')
+            return None
+        return language
+
+    def finish(entry, forms):
+        if forms:
+            entry.translations[target_language] = {'plural_forms': forms}
+        return entry
+
+    entry, forms = None, {}
+    for kind, item in _xliff.iter_units(stream):
+        if kind == 'file':
+            if not resolved:
+                target_language, resolved = resolve(item.get('target-language')), True
             continue
-        unit_id = unit.get('resname') or unit.get('id') or ''
-        approved = unit.get('approved') == 'yes'
-        state = None
-        source_text = ''
-        target_text = None
-        for child in unit:
-            if local(child.tag) == 'source':
-                source_text = child.text or ''
-            elif local(child.tag) == 'target':
-                target_text = child.text
-                state = child.get('state')
-        is_official = approved or state in ('final', 'signed-off', 'reviewed')
+        if not resolved:
+            target_language, resolved = resolve(None), True
+        unit_id, source_text, target_text, is_official = _xliff.read_unit(item)
 
         category = None
         base_key = unit_id
@@ -129,23 +115,22 @@ def parse(raw: bytes, *, project_locales, source_locale):
             base_key, _, cat = unit_id.rpartition('[')
             category = cat[:-1]
 
-        entry = by_key.setdefault(base_key, ParsedEntry(key=base_key))
+        if entry is None or entry.key != base_key:
+            if entry is not None:
+                yield finish(entry, forms)
+            entry, forms = ParsedEntry(key=base_key), {}
         if category:
             entry.is_plural = True
             entry.base_plural = entry.base_plural or {}
             entry.base_plural[category] = source_text
             if target_text and is_official and target_language:
-                plural_forms_by_key.setdefault(base_key, {})[category] = target_text
+                forms[category] = target_text
         else:
             entry.base_text = source_text
             if target_text and is_official and target_language:
                 entry.translations[target_language] = {'text': target_text}
 
-    entries = []
-    for key, entry in by_key.items():
-        forms = plural_forms_by_key.get(key)
-        if forms:
-            entry.translations[target_language] = {'plural_forms': forms}
-        entries.append(entry)
-
-    return ParsedImport(entries=entries, warnings=warnings)
+    if not resolved:
+        resolve(None)
+    if entry is not None:
+        yield finish(entry, forms)
@@ -0,0 +1,330 @@
+"""
+Materialized localisation rollups (api.models.LocalisationProgress and
+LocalisationContribution) for the contributors leaderboard and the per-language progress
+endpoint.
+
+The leaderboard used to walk every approved CommunityTranslation row in Python (a plural
+row's character count can't be summed portably in SQL) whenever its 60-second cache expired,
+and translation progress was worked out client-side by paging through every suggestion.
+Instead:
+
+- the CommunityTranslation signals in api.models call on_saved/on_deleted, and the bulk
+  import path (localisation_formats.canonical), which writes with bulk_create and UPDATE,
+  calls apply_changes itself; both hand over (before, after) row states that are turned into
+  deltas;
+- every change first locks the project's ALL_LANGUAGES progress row, so writers serialize per
+  project — which is what keeps pending_keys a count of distinct keys: "does another
+  suggestion for this key still await review?" is asked of a table no one else is moving;
+- a project without that row yet (suggestions from before the rollup existed) is counted
+  exactly on first touch, by writers and readers alike;
+- writers that move rows between keys with a queryset update (localisation_rename_key) call
+  refresh_pending_keys(); `reconcile_localisation_rollups` recounts every project exactly.
+
+The same lock (lock_project) orders the community-translation change feed's numbering (see
+api.services.translation_sync).
+"""
+from collections import defaultdict
+from typing import NamedTuple, Optional
+
+from django.db import transaction
+
+COUNTED_STATUSES = ('approved', 'pending')
+
+
+class RowState(NamedTuple):
+    """What a CommunityTranslation row contributes to the rollups. Rejected rows contribute
+    nothing and have no state (None); the author and characters only matter once approved."""
+    pk: int
+    status: str
+    language: str
+    key: str
+    author_id: Optional[int]
+    characters: int
+
+
+def characters(text, plural_forms):
+    """Characters of translation text in a row: every plural category's text, else the flat
+    text."""
+    if plural_forms:
+        return sum(len(value) for value in plural_forms.values())
+    return len(text or '')
+
+
+def _state(pk, values):
+    if values['status'] not in COUNTED_STATUSES:
+        return None
+    if values['status'] != 'approved':
+        return RowState(pk, values['status'], values['language'], values['key'], None, 0)
+    return RowState(
+        pk, 'approved', values['language'], values['key'], values['author_id'],
+        characters(values['text'], values['plural_forms']),
+    )
+
+
+def _values(row):
+    from core.models import CommunityTranslation
+    return {name: getattr(row, name) for name in CommunityTranslation.ROLLUP_FIELDS}
+
+
+def _loaded_values(row):
+    """The ROLLUP_FIELDS values `row` was read with, or None if it wasn't read from the database
+    (or was read with some of them deferred)."""
+    values = getattr(row, '_loaded_values', None)
+    if values is None or any(values[name] is None for name in ('status', 'language', 'key', 'text')):
+        return None
+    return values
+
+
+def current_state(row):
+    return _state(row.pk, _values(row))
+
+
+def loaded_state(row):
+    """The row's state as read from the database (see CommunityTranslation.from_db)."""
+    return _state(row.pk, _loaded_values(row))
+
+
+# --- Exact counts ------------------------------------------------------------------------
+
+def compute(project_id):
+    """({(language,): [approved_keys, pending_keys]}, {(author_id, language): [characters,
+    translations]}) counted from the CommunityTranslation table, ALL_LANGUAGES rows included."""
+    from django.db.models import Count
+
+    from api.models import ALL_LANGUAGES
+    from core.models import CommunityTranslation
+
+    rows = CommunityTranslation.objects.filter(project_id=project_id).order_by()
+    progress = defaultdict(lambda: [0, 0])
+    progress[ALL_LANGUAGES,] = [0, 0]
+    approved = rows.filter(status='approved').values('language').annotate(n=Count('id'))
+    pending = rows.filter(status='pending').values('language').annotate(n=Count('key', distinct=True))
+    for index, queryset in enumerate((approved, pending)):
+        for language, n in queryset.values_list('language', 'n'):
+            progress[language,][index] += n
+            progress[ALL_LANGUAGES,][index] += n
+
+    contributions = defaultdict(lambda: [0, 0])
+    texts = (
+        rows.filter(status='approved', author__isnull=False)
+        .values_list('author_id', 'language', 'text', 'plural_forms')
+    )
+    for author_id, language, text, plural_forms in texts.iterator(chunk_size=2000):
+        count = characters(text, plural_forms)
+        for bucket in (contributions[author_id, language], contributions[author_id, ALL_LANGUAGES]):
+            bucket[0] += count
+            bucket[1] += 1
+    return dict(progress), dict(contributions)
+
+
+def _sync(model, project_id, key_fields, value_fields, exact):
+    """Makes the project's `model` rows equal `exact` ({key tuple: values}). Returns whether
+    anything had to change."""
+    existing = {
+        tuple(getattr(row, field) for field in key_fields): row
+        for row in model.objects.select_for_update().filter(project_id=project_id)
+    }
+    changed, missing = [], []
+    for key, values in exact.items():
+        row = existing.pop(key, None)
+        if row is None:
+            missing.append(model(project_id=project_id, **dict(zip(key_fields, key)), **dict(zip(value_fields, values))))
+        elif [getattr(row, field) for field in value_fields] != list(values):
+            for field, value in zip(value_fields, values):
+                setattr(row, field, value)
+            changed.append(row)
+    if changed:
+        model.objects.bulk_update(changed, value_fields)
+    if missing:
+        model.objects.bulk_create(missing)
+    if existing:
+        model.objects.filter(pk__in=[row.pk for row in existing.values()]).delete()
+    return bool(changed or missing or existing)
+
+
+def refresh(project_id):
+    """Recounts one project exactly and rewrites its rows (creating the ALL_LANGUAGES one, so
+    it's tracked from then on). Returns whether anything was missing or wrong."""
+    from api.models import LocalisationContribution, LocalisationProgress
+    from core.models import Project
+
+    with transaction.atomic():
+        # Until the project has a progress row there is nothing else to lock: this serializes
+        # two first touches of the same project.
+        if not list(Project.objects.select_for_update().filter(pk=project_id).values_list('pk', flat=True)):
+            return False
+        progress, contributions = compute(project_id)
+        changed = _sync(LocalisationProgress, project_id, ('language',), ('approved_keys', 'pending_keys'), progress)
+        changed |= _sync(
+            LocalisationContribution, project_id, ('author_id', 'language'), ('characters', 'translations'), contributions,
+        )
+    return changed
+
+
+def refresh_pending_keys(project_id):
+    """Recounts just pending_keys, after suggestions have been moved between keys in bulk."""
+    from django.db.models import Count
+
+    from api.models import ALL_LANGUAGES, LocalisationProgress
+    from core.models import CommunityTranslation
+
+    with transaction.atomic():
+        rows = {row.language: row for row in LocalisationProgress.objects.select_for_update().filter(project_id=project_id)}
+        if ALL_LANGUAGES not in rows:
+            refresh(project_id)
+            return
+        pending = dict(
+            CommunityTranslation.objects.filter(project_id=project_id, status='pending').order_by()
+            .values('language').annotate(n=Count('key', distinct=True)).values_list('language', 'n')
+        )
+        pending[ALL_LANGUAGES] = sum(pending.values())
+        deltas = {(language,): [0, n - getattr(rows.get(language), 'pending_keys', 0)] for language, n in pending.items()}
+        deltas.update({(language,): [0, -row.pending_keys] for language, row in rows.items() if language not in pending})
+        _add(LocalisationProgress, project_id, ('language',), ('approved_keys', 'pending_keys'), deltas)
+
+
+def ensure_tracked(project_id):
+    """Counts the project exactly if it has no rollup rows yet (before a read)."""
+    from api.models import ALL_LANGUAGES, LocalisationProgress
+    if not LocalisationProgress.objects.filter(project_id=project_id, language=ALL_LANGUAGES).exists():
+        refresh(project_id)
+
+
+def reconcile(on_progress=None):
+    """Recounts every project with suggestions or rollup rows. Returns how many were created or
+    corrected."""
+    from api.models import LocalisationProgress
+    from core.models import CommunityTranslation
+
+    project_ids = sorted(
+        set(CommunityTranslation.objects.order_by().values_list('project_id', flat=True).distinct())
+        | set(LocalisationProgress.objects.order_by().values_list('project_id', flat=True).distinct())
+    )
+    corrected = 0
+    for done, project_id in enumerate(project_ids, start=1):
+        corrected += refresh(project_id)
+        if on_progress and (done % 100 == 0 or done == len(project_ids)):
+            on_progress(done, len(project_ids))
+    return corrected
+
+
+# --- Incremental updates -----------------------------------------------------------------
+
+def lock_project(project_id, create_missing=True):
+    """The project's ALL_LANGUAGES LocalisationProgress row, locked until the transaction ends —
+    the per-project lock every CommunityTranslation writer takes. A project that isn't tracked
+    yet is counted first; with create_missing=False (deletions, which may be part of the
+    project's own cascade) None is returned instead."""
+    from api.models import ALL_LANGUAGES, LocalisationProgress
+
+    marker = LocalisationProgress.objects.select_for_update().filter(project_id=project_id, language=ALL_LANGUAGES)
+    row = marker.first()
+    if row is None and create_missing:
+        refresh(project_id)
+        row = marker.first()
+    return row
+
+
+def _add(model, project_id, key_fields, value_fields, deltas):
+    """Adds {key tuple: [delta per value field]} to the project's rows (never below zero).
+    Missing rows are only created for a positive delta — a decrement for a row that's already
+    gone (a cascade in progress) has nothing to take away from."""
+    deltas = {key: values for key, values in deltas.items() if any(values)}
+    if not deltas:
+        return
+    lookups = {f'{field}__in': {key[index] for key in deltas} for index, field in enumerate(key_fields)}
+    changed = []
+    for row in model.objects.filter(project_id=project_id, **lookups):
+        values = deltas.pop(tuple(getattr(row, field) for field in key_fields), None)
+        if values is None:
+            continue
+        for field, delta in zip(value_fields, values):
+            setattr(row, field, max(getattr(row, field) + delta, 0))
+        changed.append(row)
+    if changed:
+        model.objects.bulk_update(changed, value_fields)
+    missing = [
+        model(project_id=project_id, **dict(zip(key_fields, key)), **{field: max(delta, 0) for field, delta in zip(value_fields, values)})
+        for key, values in deltas.items()
+        if any(delta > 0 for delta in values)
+    ]
+    if missing:
+        model.objects.bulk_create(missing)
+
+
+def apply_changes(project_id, changes, create_missing=True):
+    """
+    Moves the project's rollup rows by a batch of CommunityTranslation row changes, given as
+    (before, after) RowState pairs (None for a row that didn't exist / no longer exists / is
+    rejected), after the rows themselves have been written in the same transaction. A project
+    that isn't tracked yet is counted exactly instead (that count already includes the batch);
+    with create_missing=False it's left untracked.
+    """
+    from api.models import ALL_LANGUAGES, LocalisationContribution, LocalisationProgress
+    from core.models import CommunityTranslation
+
+    changes = [(before, after) for before, after in changes if before != after]
+    if not changes:
+        return
+    with transaction.atomic():
+        if lock_project(project_id, create_missing=False) is None:
+            if create_missing:
+                refresh(project_id)
+            return
+
+        approved = defaultdict(int)
+        contributed = defaultdict(lambda: [0, 0])
+        pending = defaultdict(lambda: [False, False])  # (language, key) -> [pending before, after]
+        pks = set()
+        for before, after in changes:
+            for sign, state in ((-1, before), (1, after)):
+                if state is None:
+                    continue
+                pks.add(state.pk)
+                if state.status == 'pending':
+                    pending[state.language, state.key][sign > 0] = True
+                    continue
+                approved[state.language] += sign
+                if state.author_id is not None:
+                    for language in (state.language, ALL_LANGUAGES):
+                        contributed[state.author_id, language][0] += sign * state.characters
+                        contributed[state.author_id, language][1] += sign
+
+        # A key counts as pending while any of its suggestions is: it only enters or leaves the
+        # count if no suggestion outside this batch is pending for it.
+        pending_delta = defaultdict(int)
+        if pending:
+            others = set(
+                CommunityTranslation.objects.filter(
+                    project_id=project_id, status='pending',
+                    language__in={language for language, _ in pending}, key__in={key for _, key in pending},
+                ).exclude(pk__in=pks).order_by().values_list('language', 'key').distinct()
+            )
+            for (language, key), (was, now) in pending.items():
+                if was != now and (language, key) not in others:
+                    pending_delta[language] += 1 if now else -1
+
+        progress = {(language,): [approved[language], pending_delta[language]] for language in {*approved, *pending_delta}}
+        progress[ALL_LANGUAGES,] = [sum(approved.values()), sum(pending_delta.values())]
+        _add(LocalisationProgress, project_id, ('language',), ('approved_keys', 'pending_keys'), progress)
+        _add(LocalisationContribution, project_id, ('author_id', 'language'), ('characters', 'translations'), contributed)
+
+
+def on_saved(row, created):
+    values = None if created else _loaded_values(row)
+    row._loaded_values = _values(row)
+    if values is None and not created:
+        # Saved without having been read in full: there's no before state to diff against.
+        refresh(row.project_id)
+        return
+    before = None if created else _state(row.pk, values)
+    apply_changes(row.project_id, [(before, current_state(row))])
+
+
+def on_deleted(row, origin=None):
+    # A project's own deletion takes its rollup rows with it.
+    origin_model = getattr(origin, 'model', None) or type(origin)
+    if origin is not None and origin_model._meta.label == 'core.Project':
+        return
+    before = _state(row.pk, _loaded_values(row) or _values(row))
+    apply_changes(row.project_id, [(before, None)], create_missing=False)
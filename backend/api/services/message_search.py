@@ -0,0 +1,201 @@
+"""
+Ranked full-text search over a conversation's messages (the in-chat search box).
+
+`content__icontains` over a conversation's whole history is a sequential scan on every
+keystroke. This module matches whole words — the last one as a prefix, since it's typed
+as-you-go — against a real full-text index, picked by database:
+
+- PostgreSQL: a GIN index on to_tsvector('simple', content), created by api migration 0039
+  ('simple' so nothing is stemmed with the wrong language's rules), ranked with ts_rank;
+- SQLite (local development): an FTS5 external-content table kept in step by triggers,
+  ranked with bm25;
+- anything else, or SQLite built without FTS5: the same tokenizer in Python over the
+  conversation's messages.
+
+Callers pass a Message queryset already limited to what the user may see (their
+conversation); soft-deleted messages are always excluded. Results are best first (newest
+first among equal ranks), with a snippet around the first hit whose highlights are character
+offsets, and pages are chained with an opaque cursor (keyset on rank, id).
+"""
+import base64
+import json
+import math
+import re
+from dataclasses import dataclass, field
+
+from django.db import connection
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MAX_QUERY_TERMS = 8
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+SNIPPET_CHARS = 140
+FTS_TABLE = 'api_message_fts'
+TSVECTOR_CONFIG = 'simple'
+
+
+def tokenize(text):
+    return [token.casefold() for token in TOKEN_RE.findall(text or '')]
+
+
+def parse_query(query):
+    """(terms, last_is_prefix). Terms are deduplicated, in order, capped at MAX_QUERY_TERMS.
+    The last term is a prefix unless the query ends in whitespace (the word is finished)."""
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    return terms, bool(terms) and not (query or '').endswith((' ', '\t', '\n'))
+
+
+def _matches(token, term, prefix):
+    return token.startswith(term) if prefix else token == term
+
+
+def snippet(content, terms, last_is_prefix, width=SNIPPET_CHARS):
+    """{'text', 'highlights': [[start, end], ...]} — a window of `content` around the first
+    hit, with offsets (into `text`) of every matching word in it."""
+    content = content or ''
+    hits = []
+    for match in TOKEN_RE.finditer(content):
+        token = match.group().casefold()
+        for i, term in enumerate(terms):
+            if _matches(token, term, last_is_prefix and i == len(terms) - 1):
+                hits.append((match.start(), match.end()))
+                break
+    if len(content) <= width:
+        start, end = 0, len(content)
+    else:
+        first = hits[0][0] if hits else 0
+        start = max(0, min(first - width // 4, len(content) - width))
+        end = start + width
+    text = content[start:end]
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if end < len(content) else ''
+    highlights = [
+        [s - start + len(prefix), min(e, end) - start + len(prefix)]
+        for s, e in hits if s >= start and s < end
+    ]
+    return {'text': prefix + text + suffix, 'highlights': highlights}
+
+
+def encode_cursor(score, message_id):
+    raw = json.dumps([score, message_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(score, message_id) or None for a missing/garbled cursor."""
+    if not cursor:
+        return None
+    try:
+        score, message_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return float(score), int(message_id)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass
+class SearchPage:
+    hits: list = field(default_factory=list)  # [(message, score, snippet)]
+    next_cursor: str = None
+
+
+def backend_name():
+    if connection.vendor == 'postgresql':
+        return 'postgres'
+    if connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names():
+        return 'fts5'
+    return 'python'
+
+
+# --- Backends: each returns [(message_id, score)] best first, at most `limit` -----------
+
+def _after(cursor):
+    """Keyset predicate for rows strictly after the cursor in (score desc, id desc) order."""
+    from django.db.models import Q
+    score, message_id = cursor
+    return Q(score__lt=score) | Q(score=score, id__lt=message_id)
+
+
+def _postgres_ids(messages, terms, last_is_prefix, cursor, limit):
+    from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+    from django.db.models import FloatField
+    from django.db.models.functions import Cast
+    parts = [f"'{term}'" for term in terms]
+    if last_is_prefix:
+        parts[-1] += ':*'
+    query = SearchQuery(' & '.join(parts), config=TSVECTOR_CONFIG, search_type='raw')
+    vector = SearchVector('content', config=TSVECTOR_CONFIG)  # must match the index expression
+    # ts_rank is float4; as double precision the score round-trips through the cursor exactly.
+    score = Cast(SearchRank(vector, query), FloatField())
+    ranked = messages.annotate(document=vector).filter(document=query).annotate(score=score)
+    if cursor:
+        ranked = ranked.filter(_after(cursor))
+    return list(ranked.order_by('-score', '-id').values_list('id', 'score')[:limit])
+
+
+def _fts5_ids(messages, terms, last_is_prefix, cursor, limit):
+    parts = ['"' + term.replace('"', '""') + '"' for term in terms]
+    if last_is_prefix:
+        parts[-1] += '*'
+    visible_sql, visible_params = messages.values('id').query.sql_with_params()
+    sql = (
+        f'SELECT id, score FROM ('
+        f'  SELECT rowid AS id, -bm25({FTS_TABLE}) AS score FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+        f') hits WHERE id IN ({visible_sql})'
+    )
+    params = [' '.join(parts), *visible_params]
+    if cursor:
+        sql += ' AND (score < %s OR (score = %s AND id < %s))'
+        params += [cursor[0], cursor[0], cursor[1]]
+    sql += ' ORDER BY score DESC, id DESC LIMIT %s'
+    params.append(limit)
+    with connection.cursor() as db:
+        db.execute(sql, params)
+        return [(message_id, score) for message_id, score in db.fetchall()]
+
+
+def python_score(content, terms, last_is_prefix):
+    """Every term must match a word; score is term frequency damped by message length."""
+    tokens = tokenize(content)
+    if not tokens:
+        return 0.0
+    total = 0
+    for i, term in enumerate(terms):
+        prefix = last_is_prefix and i == len(terms) - 1
+        count = sum(1 for token in tokens if _matches(token, term, prefix))
+        if not count:
+            return 0.0
+        total += count
+    return round(total / (1.0 + math.log(len(tokens))), 6)
+
+
+def _python_ids(messages, terms, last_is_prefix, cursor, limit):
+    scored = []
+    for message_id, content in messages.values_list('id', 'content').iterator(chunk_size=2000):
+        score = python_score(content, terms, last_is_prefix)
+        if score and (not cursor or (score, message_id) < cursor):
+            scored.append((message_id, score))
+    scored.sort(key=lambda hit: (hit[1], hit[0]), reverse=True)
+    return scored[:limit]
+
+
+BACKENDS = {'postgres': _postgres_ids, 'fts5': _fts5_ids, 'python': _python_ids}
+
+
+def search(messages, query, cursor=None, limit=DEFAULT_PAGE_SIZE, backend=None):
+    """One page of `messages` (a Message queryset the caller has already scoped) matching
+    `query`. Returns a SearchPage; `cursor` is a previous page's next_cursor."""
+    terms, last_is_prefix = parse_query(query)
+    if not terms:
+        return SearchPage()
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    messages = messages.filter(is_deleted=False).order_by()
+    ranked = BACKENDS[backend or backend_name()](messages, terms, last_is_prefix, decode_cursor(cursor), limit + 1)
+    page, more = ranked[:limit], len(ranked) > limit
+
+    by_id = messages.select_related('sender', 'reply_to__sender').prefetch_related('reactions').in_bulk([i for i, _ in page])
+    hits = [
+        (by_id[message_id], score, snippet(by_id[message_id].content, terms, last_is_prefix))
+        for message_id, score in page if message_id in by_id
+    ]
+    next_cursor = encode_cursor(page[-1][1], page[-1][0]) if more else None
+    return SearchPage(hits=hits, next_cursor=next_cursor)
@@ -1,6 +1,6 @@
 import urllib.parse
-import requests
 from django.conf import settings
+from api.services import http_client
 
 # --- Steam OpenID ---
 
@@ -31,7 +31,7 @@ def verify_steam_openid_response(query_params):
     validation_args['openid.mode'] = 'check_authentication'
     
     # We must send the exact same parameters back to Steam via POST
-    response = requests.post('https://steamcommunity.com/openid/login', data=validation_args, timeout=10)
+    response = http_client.post('steam_community', 'https://steamcommunity.com/openid/login', data=validation_args, timeout=10)
     
     if 'is_valid:true' in response.text:
         # Extract Steam ID from claimed_id
@@ -76,7 +76,8 @@ def exchange_microsoft_code(code, callback_url):
         'redirect_uri': callback_url
     }
     
-    response = requests.post('https://login.live.com/oauth20_token.srf', data=data, timeout=10)
+    # Never retried: the authorization code is single-use, so a replay would fail as invalid_grant.
+    response = http_client.post('xbox_auth', 'https://login.live.com/oauth20_token.srf', data=data, timeout=10, retries=0)
     response.raise_for_status()
     return response.json()['access_token']
 
@@ -98,7 +99,7 @@ def authenticate_with_xbox_live(access_token):
         "RelyingParty": "http://auth.xboxlive.com",
         "TokenType": "JWT"
     }
-    response = requests.post('https://user.auth.xboxlive.com/user/authenticate', headers=headers, json=data, timeout=10)
+    response = http_client.post('xbox_auth', 'https://user.auth.xboxlive.com/user/authenticate', headers=headers, json=data, timeout=10)
     response.raise_for_status()
     return response.json()['Token']
 
@@ -119,7 +120,7 @@ def authorize_with_xsts(user_token):
         "RelyingParty": "http://xboxlive.com",
         "TokenType": "JWT"
     }
-    response = requests.post('https://xsts.auth.xboxlive.com/xsts/authorize', headers=headers, json=data, timeout=10)
+    response = http_client.post('xbox_auth', 'https://xsts.auth.xboxlive.com/xsts/authorize', headers=headers, json=data, timeout=10)
     response.raise_for_status()
     
     # Extract xsts_token and user_hash
@@ -137,7 +138,7 @@ def get_xbox_profile(xsts_token, user_hash):
         'Authorization': f'XBL3.0 x={user_hash};{xsts_token}',
         'Accept-Language': 'en-US'
     }
-    response = requests.get('https://profile.xboxlive.com/users/me/profile/settings?settings=Gamertag', headers=headers, timeout=10)
+    response = http_client.get('xbox_live', 'https://profile.xboxlive.com/users/me/profile/settings?settings=Gamertag', headers=headers, timeout=10)
     response.raise_for_status()
     
     data = response.json()
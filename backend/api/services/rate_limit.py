@@ -0,0 +1,39 @@
+"""
+Thread-safe token bucket for pacing outbound calls to third-party APIs from a worker pool.
+
+A bucket refills at `rate` tokens per second up to `capacity`; acquire() blocks until a token
+is available, so any number of threads sharing one bucket collectively stay under the
+upstream's limit — the pooled replacement for sprinkling time.sleep() between serial calls.
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """Takes `tokens` if available right now; returns how long to wait otherwise (0 on success)."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens=1):
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return
+            time.sleep(wait)
@@ -0,0 +1,269 @@
+"""
+Typo-tolerant, ranked name search over games, users, projects and organisations, served from
+an in-process trigram index (api.services.trigram_index) instead of `icontains` scans.
+
+Each kind in SOURCES lists the fields that are indexed and their weights. Every process
+keeps one index per kind in memory:
+
+- it loads the snapshot under settings.SEARCH_INDEX_DIR, written by `build_search_index`,
+  and every SNAPSHOT_CHECK_SECONDS swaps in a newer one if the command has run since;
+- saves and deletes of indexed models are journalled in the Django cache (shared by every
+  process in prod): the signals in api.models call record_change() on commit, which bumps
+  `search_index:{kind}:version` and stores the changed id under that version. Before each
+  search the process compares its index's version with the journal and re-reads just the
+  changed rows (one query), so edits are searchable everywhere within one request;
+- if the journal has been lost (cache flush, entries expired) the index can't be trusted
+  and is dropped. A journal starts at a random version, so a restarted one is told apart.
+
+Indexes are never built on a request: building reads the whole table. With no usable index
+(no snapshot yet, or the journal lost since the last one) get_index() raises
+IndexUnavailable and callers fall back to a database search until `build_search_index` —
+run it on a schedule, and after bulk imports or a cache flush — writes a fresh snapshot.
+Likewise the delta segment is only folded back into the base by a rebuild.
+
+The index only answers "which ids match, best first"; callers still filter the matching ids
+through their own querysets for visibility/permissions (see api.filters.IndexedSearchFilter).
+"""
+import logging
+import os
+import random
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+from api.services import index_snapshots
+from api.services.trigram_index import COMPACT_THRESHOLD, TrigramIndex
+
+logger = logging.getLogger(__name__)
+
+# kind -> (model label, ((field, weight), ...)). The first field is the object's name.
+SOURCES = {
+    'game': ('core.Game', (('title', 1.0),)),
+    'user': ('api.User', (('username', 1.0), ('real_name', 0.9))),
+    'project': ('core.Project', (('title', 1.0), ('tech_stack', 0.6), ('description', 0.4))),
+    'organisation': ('core.Organisation', (('name', 1.0), ('slug', 0.8), ('description', 0.4))),
+}
+KINDS = tuple(SOURCES)
+
+VERSION_KEY = 'search_index:{kind}:version'
+CHANGE_KEY = 'search_index:{kind}:change:{version}'
+JOURNAL_TTL = 24 * 60 * 60
+# Further behind than this, reloading the table is cheaper than replaying the journal.
+MAX_CATCH_UP = 5000
+# A journal entry can briefly trail its version bump (incr, then set); one still missing
+# after this long was lost, and the index is rebuilt.
+JOURNAL_GAP_SECONDS = 5.0
+BUILD_CHUNK_SIZE = 5000
+# How often a process looks for a newer snapshot on disk.
+SNAPSHOT_CHECK_SECONDS = 60
+
+
+class IndexUnavailable(Exception):
+    """No usable index for a kind in this process; `build_search_index` hasn't written one
+    since the journal was last lost."""
+
+
+def kind_for_model(model):
+    label = model._meta.label
+    for kind, (model_label, _) in SOURCES.items():
+        if model_label == label:
+            return kind
+    return None
+
+
+def _model(kind):
+    return apps.get_model(SOURCES[kind][0])
+
+
+def rows_for(kind, obj):
+    """(weight, text) pairs indexed for one object."""
+    rows = []
+    for field, weight in SOURCES[kind][1]:
+        value = getattr(obj, field, '')
+        if isinstance(value, (list, tuple)):
+            value = ' '.join(str(v) for v in value if v)
+        if value:
+            rows.append((weight, str(value)))
+    return rows
+
+
+def iter_rows(kind, ids=None):
+    """(object_id, weight, text) for every indexed row of `kind` (or only `ids`)."""
+    fields = [field for field, _ in SOURCES[kind][1]]
+    queryset = _model(kind).objects.only('pk', *fields).order_by('pk')
+    if ids is not None:
+        queryset = queryset.filter(pk__in=list(ids))
+    for obj in queryset.iterator(chunk_size=BUILD_CHUNK_SIZE):
+        for weight, text in rows_for(kind, obj):
+            yield obj.pk, weight, text
+
+
+# --- Change journal ----------------------------------------------------------------------
+
+def _start_journal(key):
+    # A new journal starts at a random version, so one restarted after a cache flush never
+    # lines up with the version an existing index reached: the gap is detected, not replayed.
+    cache.add(key, random.randrange(2 ** 40), None)
+
+
+def current_version(kind):
+    key = VERSION_KEY.format(kind=kind)
+    _start_journal(key)
+    return cache.get(key) or 0
+
+
+def record_change(kind, object_id):
+    """Journals one saved/deleted object so every process re-reads it before its next search."""
+    key = VERSION_KEY.format(kind=kind)
+    _start_journal(key)
+    version = cache.incr(key)
+    cache.set(CHANGE_KEY.format(kind=kind, version=version), object_id, JOURNAL_TTL)
+
+
+# --- Indexes -----------------------------------------------------------------------------
+
+_indexes = {}
+# kind -> (monotonic time of the last snapshot check, generation of the snapshot loaded)
+_snapshots = {}
+_locks = {kind: threading.Lock() for kind in KINDS}
+
+
+def _index_dir(kind):
+    return os.path.join(settings.SEARCH_INDEX_DIR, kind)
+
+
+def table_signature(kind):
+    """Row count and highest id — checked when a snapshot is loaded, so one written against
+    another database (or before the journal was lost) isn't trusted."""
+    from django.db.models import Count, Max
+    agg = _model(kind).objects.aggregate(n=Count('pk'), last=Max('pk'))
+    return f"{agg['n']}:{agg['last'] or 0}"
+
+
+def build_index(kind, save=True):
+    """A fresh index from the table — `build_search_index` only: this reads every row."""
+    # Read the version first: changes made while the table is scanned are replayed on top.
+    version = current_version(kind)
+    meta = {'kind': kind, 'version': version, 'signature': table_signature(kind)}
+    index = TrigramIndex.build(iter_rows(kind), meta=meta)
+    if save:
+        save_index(index)
+    return index
+
+
+def save_index(index):
+    kind = index.meta['kind']
+    try:
+        index.save(_index_dir(kind))
+    except OSError:
+        logger.warning("Could not persist %s search index to %s", kind, _index_dir(kind), exc_info=True)
+
+
+def _catch_up(index, kind):
+    """Applies journalled changes newer than the index; returns it, or None if the journal no
+    longer covers them (the index is then unusable until the next snapshot)."""
+    latest = current_version(kind)
+    applied = index.meta.get('version', 0)
+    if latest == applied:
+        return index
+    if latest < applied or latest - applied > MAX_CATCH_UP:
+        logger.warning("%s search index at version %s, journal at %s; run build_search_index", kind, applied, latest)
+        return None
+
+    versions = range(applied + 1, latest + 1)
+    entries = cache.get_many([CHANGE_KEY.format(kind=kind, version=v) for v in versions])
+    changed, reached = set(), applied
+    for version in versions:
+        key = CHANGE_KEY.format(kind=kind, version=version)
+        if key not in entries:
+            break
+        changed.add(entries[key])
+        reached = version
+    if reached < latest:
+        gap = index.meta.get('gap')
+        now = time.monotonic()
+        if gap and gap[0] == reached + 1 and now - gap[1] > JOURNAL_GAP_SECONDS:
+            logger.warning("%s search index journal entry %s is missing; run build_search_index", kind, reached + 1)
+            return None
+        if not gap or gap[0] != reached + 1:
+            index.meta['gap'] = (reached + 1, now)
+    else:
+        index.meta.pop('gap', None)
+
+    if changed:
+        fresh = {}
+        for object_id, weight, text in iter_rows(kind, ids=changed):
+            fresh.setdefault(object_id, []).append((weight, text))
+        for object_id in changed:
+            if object_id in fresh:
+                index.upsert(object_id, fresh[object_id])
+            else:
+                index.remove(object_id)
+    index.meta['version'] = reached
+    if index.delta_rows > COMPACT_THRESHOLD and not index.meta.get('delta_warned'):
+        index.meta['delta_warned'] = True
+        logger.warning("%s search index has %d delta rows; run build_search_index", kind, index.delta_rows)
+    return index
+
+
+def _newer_snapshot(kind):
+    """The snapshot on disk if it was written after the one this process last loaded (checked
+    at most every SNAPSHOT_CHECK_SECONDS), else None."""
+    now = time.monotonic()
+    checked_at, loaded = _snapshots.get(kind, (None, None))
+    if checked_at is not None and now - checked_at < SNAPSHOT_CHECK_SECONDS:
+        return None
+    _snapshots[kind] = (now, loaded)
+    # Snapshots are published whole (api.services.index_snapshots), so a new generation name
+    # means a complete, newer snapshot.
+    generation = index_snapshots.generation(_index_dir(kind))
+    if generation is None or generation == loaded:
+        return None
+    try:
+        index = TrigramIndex.load(_index_dir(kind))
+    except (OSError, ValueError):
+        return None
+    _snapshots[kind] = (now, index.snapshot)
+    if index.meta.get('version') == current_version(kind):
+        # Nothing to replay, so the table must look exactly as it did at build time.
+        if index.meta.get('signature') != table_signature(kind):
+            return None
+    return index
+
+
+def get_index(kind):
+    """This process's up-to-date index for `kind`. Never builds one: raises IndexUnavailable
+    when there's no usable index (see the module docstring)."""
+    if kind not in SOURCES:
+        raise KeyError(f'Unknown search kind {kind!r}')
+    with _locks[kind]:
+        index = _newer_snapshot(kind) or _indexes.get(kind)
+        if index is not None:
+            index = _catch_up(index, kind)
+        if index is None:
+            _indexes.pop(kind, None)
+            raise IndexUnavailable(kind)
+        _indexes[kind] = index
+        return index
+
+
+def search(kind, query, limit=20, fill=None):
+    """Up to `limit` (object_id, score) pairs for `query`, best first (all of them if limit is
+    None; see TrigramIndex.search for `fill`)."""
+    query = (query or '').strip()
+    if not query:
+        return []
+    return get_index(kind).search(query, limit=limit, fill=fill)
+
+
+def search_ids(kind, query, limit=20, fill=None):
+    return [object_id for object_id, _ in search(kind, query, limit=limit, fill=fill)]
+
+
+def reset():
+    """Drops this process's in-memory indexes (they're reloaded from the snapshot on next use)."""
+    _indexes.clear()
+    _snapshots.clear()
@@ -1,6 +1,7 @@
-import requests
 import time
 from django.conf import settings
+from api.services import game_stats, http_client
+from api.services.genre_index import sync_game_genres
 from api.models import LibraryEntry, User
 from core.models import Game
 from core.utils import is_unwanted_game
@@ -64,7 +65,13 @@ GENRE_TRANSLATION_MAP = {
     'Spor': 'Sports',
     'Yarış': 'Racing',
     'Rol Yapma': 'RPG',
+    'Basit Eğlence': 'Casual',
+    'Devasa Çok Oyunculu': 'Massively Multiplayer',
+    'Erken Erişim': 'Early Access',
+    'RVO': 'RPG',
 }
+# Case-folded view of the map, built once instead of scanned on every miss.
+_GENRE_TRANSLATION_FOLDED = {key.casefold(): value for key, value in GENRE_TRANSLATION_MAP.items()}
 
 
 def normalize_genre(genre_name):
@@ -75,15 +82,11 @@ def normalize_genre(genre_name):
     """
     if not genre_name:
         return genre_name
-    # Exact match first
+    # Exact match first, then case-insensitive
     normalized = GENRE_TRANSLATION_MAP.get(genre_name)
     if normalized:
         return normalized
-    # Case-insensitive match
-    for key, value in GENRE_TRANSLATION_MAP.items():
-        if key.lower() == genre_name.lower():
-            return value
-    return genre_name
+    return _GENRE_TRANSLATION_FOLDED.get(genre_name.casefold(), genre_name)
 
 
 def fetch_steam_genres(appid):
@@ -95,7 +98,7 @@ def fetch_steam_genres(appid):
         url = f"https://store.steampowered.com/api/appdetails?appids={appid}&l=english"
         # mature games (like Elden Ring) require age check cookies
         cookies = {'birthtime': '283993201', 'lastagecheckage': '1-January-1980', 'wants_mature_content': '1'}
-        response = requests.get(url, cookies=cookies, timeout=10)
+        response = http_client.get('steam_store', url, cookies=cookies, timeout=10)
         response.raise_for_status()
         data = response.json()
 
@@ -133,7 +136,7 @@ def get_steam_cover_url(appid):
 
     for url in urls:
         try:
-            resp = requests.head(url, timeout=5)
+            resp = http_client.head('steam_cdn', url, timeout=5, retries=0)
             if resp.status_code == 200:
                 return url
         except Exception:
@@ -144,12 +147,119 @@ def get_steam_cover_url(appid):
     return f"https://cdn.akamai.steamstatic.com/steam/apps/{appid}/header.jpg"
 
 
-def fetch_steam_library(user_id, steam_id):
+# Library sync pipeline tuning. Pacing of the Store/IGDB/CDN calls the worker threads make is
+# left to http_client's per-upstream limiters, which every process shares.
+SYNC_WORKERS = 8
+LIBRARY_WRITE_CHUNK = 500
+SYNC_PROGRESS_CACHE_KEY = 'steam_sync_progress:{user_id}'
+SYNC_PROGRESS_TTL = 60 * 60
+
+
+def _report_progress(user_id, stage, done, total, on_progress=None):
+    """Publishes sync progress to the cache (read by UserViewSet.steam_sync_progress) and to the
+    optional on_progress callback."""
+    from django.core.cache import cache
+    progress = {'stage': stage, 'done': done, 'total': total}
+    cache.set(SYNC_PROGRESS_CACHE_KEY.format(user_id=user_id), progress, SYNC_PROGRESS_TTL)
+    if on_progress:
+        on_progress(stage, done, total)
+
+
+def get_steam_sync_progress(user_id):
+    from django.core.cache import cache
+    return cache.get(SYNC_PROGRESS_CACHE_KEY.format(user_id=user_id))
+
+
+def steam_status_for(steam_game, now=None):
+    """The status Steam activity implies: 'playing' if played in the last two weeks, else
+    'unplayed'."""
+    if not steam_game.get('playtime_forever', 0):
+        return 'unplayed'
+    current_timestamp = int(now if now is not None else time.time())
+    two_weeks_ago = current_timestamp - (14 * 24 * 60 * 60)
+    if steam_game.get('playtime_2weeks', 0) > 0 or steam_game.get('rtime_last_played', 0) > two_weeks_ago:
+        return 'playing'
+    return 'unplayed'
+
+
+def merge_library_status(existing_status, new_status):
+    """
+    PERSISTENCE RULE: a sync never overwrites a status the user set by hand.
+    Completed/Replaying/Dropped are always kept; otherwise an entry only moves forward
+    (unplayed -> playing, playing/unplayed -> dropped). Anything else keeps Steam's status.
+    """
+    if existing_status is None:
+        return new_status
+    if existing_status in ['completed', 'replaying', 'dropped']:
+        return existing_status
+    if existing_status == 'unplayed' and new_status == 'playing':
+        return 'playing'
+    if existing_status == 'playing' and new_status == 'dropped':
+        return 'dropped'
+    if existing_status == 'unplayed' and new_status == 'dropped':
+        return 'dropped'
+    return new_status
+
+
+def _needs_cover(game):
+    cover_value = str(game.cover_image) if game.cover_image else ''
+    return not cover_value or not cover_value.startswith('http')
+
+
+def _fetch_game_metadata(appid, title, need_genres, need_igdb, need_cover):
+    """One worker-pool task: the network half of resolving one owned game. Never touches the
+    DB, so pool threads hold no connections."""
+    result = {}
+    if need_genres:
+        result['genres'] = fetch_steam_genres(appid)
+    if need_igdb:
+        # Resolve an igdb_id where possible — without this, Steam-created Game rows never
+        # carry an igdb_id, which silently breaks Xbox sync's cross-platform dedup (it only
+        # matches existing games by igdb_id, see xbox.py:_find_or_create_game step 3) and lets
+        # the same real title get a second Game/LibraryEntry row once it's also synced from Xbox.
+        from api.services.xbox import _search_igdb_for_game
+        result['igdb_id'] = _search_igdb_for_game(title)[0]
+    if need_cover:
+        result['cover_url'] = get_steam_cover_url(appid)
+    return result
+
+
+def _resolve_games(owned):
+    """Matches owned games to Game rows in two queries: by steam_appid, then by
+    case-insensitive exact title for whatever is left (lowest pk wins, like .first()).
+    Returns {appid: Game} for the matches."""
+    from django.db.models.functions import Lower
+
+    by_appid = {g.steam_appid: g for g in Game.objects.filter(steam_appid__in=list(owned))}
+    unresolved = {appid: game['name'] for appid, game in owned.items() if appid not in by_appid}
+    if unresolved:
+        by_title = {}
+        for game in (Game.objects.annotate(title_lower=Lower('title'))
+                     .filter(title_lower__in={t.lower() for t in unresolved.values()})
+                     .order_by('pk')):
+            by_title.setdefault(game.title_lower, game)
+        for appid, title in unresolved.items():
+            game = by_title.get(title.lower())
+            if game:
+                by_appid[appid] = game
+    return by_appid
+
+
+def fetch_steam_library(user_id, steam_id, on_progress=None, max_workers=SYNC_WORKERS):
     """
     Fetches user's owned games from Steam and updates their LibraryEntry.
     Auto-creates games if they don't exist locally.
     Returns a dict with sync statistics.
+
+    Runs as a staged pipeline rather than one game at a time: all appids are resolved against
+    Game up front, the missing Store/IGDB/CDN lookups fan out over a bounded thread pool (paced
+    by http_client's shared per-upstream limiters), and Game/LibraryEntry rows are written with
+    bulk_create/bulk_update in chunks. Progress ({'stage', 'done', 'total'}) is published per
+    stage to the cache (get_steam_sync_progress) and to `on_progress(stage, done, total)`.
     """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from django.db import IntegrityError, transaction
+
     stats = {
         'total': 0,
         'synced': 0,
@@ -158,7 +268,13 @@ def fetch_steam_library(user_id, steam_id):
         'errors': 0,
         'error_details': []
     }
-    
+
+    def record_error(name, error):
+        stats['errors'] += 1
+        error_msg = f"Error syncing {name}: {error}"
+        stats['error_details'].append(error_msg)
+        print(error_msg)
+
     # Fetch from settings
     api_key = settings.STEAM_API_KEY
     if not api_key:
@@ -170,191 +286,214 @@ def fetch_steam_library(user_id, steam_id):
         f"?key={api_key}&steamid={steam_id}&format=json&include_appinfo=1"
         f"&include_played_free_games=1"
     )
-    
+
     try:
-        response = requests.get(url, timeout=15)
-        
+        _report_progress(user_id, 'fetching', 0, 0, on_progress)
+        response = http_client.get('steam_api', url, timeout=15)
+
         if response.status_code == 403:
              print(f"Steam API 403 Forbidden. Check API Key or Profile Privacy for {steam_id}")
              raise Exception("Steam API Key invalid or Profile Private")
 
         response.raise_for_status()
         data = response.json()
-        
+
         games = data.get('response', {}).get('games', [])
         stats['total'] = len(games)
-        
+
         user = User.objects.get(id=user_id)
-        
+
+        # Stage 1: filter, then resolve every appid against Game at once.
+        owned = {}
         for steam_game in games:
+            title = steam_game.get('name')
+            appid = steam_game.get('appid')
+            if not title or not appid:
+                continue
+            if is_unwanted_game(title):
+                # Skip importing unwated editions/dlcs/bundles
+                continue
+            owned[appid] = steam_game
+        resolved = _resolve_games(owned)
+        _report_progress(user_id, 'resolving', len(owned), len(owned), on_progress)
+
+        # Stage 2: plan and fan out the metadata fetches.
+        tasks = {}
+        for appid, steam_game in owned.items():
+            game = resolved.get(appid)
+            if game is None:
+                tasks[appid] = (True, True, True)
+            else:
+                need_genres, need_cover = not game.genres, _needs_cover(game)
+                if need_genres or need_cover:
+                    tasks[appid] = (need_genres, False, need_cover)
+
+        metadata, fetch_errors = {}, {}
+        if tasks:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    pool.submit(_fetch_game_metadata, appid, owned[appid]['name'], *needs): appid
+                    for appid, needs in tasks.items()
+                }
+                for done, future in enumerate(as_completed(futures), start=1):
+                    appid = futures[future]
+                    try:
+                        metadata[appid] = future.result()
+                    except Exception as fetch_error:
+                        if appid in resolved:
+                            # The library entry still syncs; only the backfill is lost.
+                            record_error(owned[appid].get('name', 'unknown'), f"metadata fetch failed: {fetch_error}")
+                        else:
+                            fetch_errors[appid] = fetch_error
+                    if done % 25 == 0 or done == len(futures):
+                        _report_progress(user_id, 'fetching_metadata', done, len(futures), on_progress)
+
+        # Stage 3: create missing games and backfill existing ones in bulk.
+        to_create = []
+        taken_igdb_ids = set()
+        new_igdb_ids = {meta.get('igdb_id') for meta in metadata.values() if meta.get('igdb_id')}
+        if new_igdb_ids:
+            taken_igdb_ids = set(Game.objects.filter(igdb_id__in=new_igdb_ids).values_list('igdb_id', flat=True))
+        for appid, steam_game in owned.items():
+            if appid in resolved:
+                continue
+            if appid not in metadata:
+                # No Game row can be created without its metadata, so this title is left out
+                # of the library until a later sync succeeds — count it rather than drop it.
+                record_error(steam_game['name'], f"not imported, metadata fetch failed: {fetch_errors.get(appid)}")
+                continue
+            meta = metadata[appid]
+            igdb_id = meta.get('igdb_id')
+            # igdb_id is unique=True on Game — a fuzzy IGDB match could in principle resolve to
+            # an id another row (or another game in this batch) already holds; fall back to
+            # None rather than let that collision crash the sync.
+            if igdb_id in taken_igdb_ids:
+                igdb_id = None
+            if igdb_id:
+                taken_igdb_ids.add(igdb_id)
+            print(f"Creating new game from Steam: {steam_game['name']} (appid: {appid})")
+            # Store Steam CDN URL as cover image (no local download)
+            to_create.append(Game(
+                title=steam_game['name'], steam_appid=appid, igdb_id=igdb_id,
+                genres=meta.get('genres') or [], cover_image=meta.get('cover_url') or None,
+            ))
+        created_appids = set()
+        if to_create:
             try:
-                title = steam_game.get('name')
-                appid = steam_game.get('appid')
+                with transaction.atomic():
+                    Game.objects.bulk_create(to_create)
+                    sync_game_genres(to_create)
+                    game_stats.ensure_rows(to_create)
+                created_games, inserted = to_create, len(to_create)
+            except IntegrityError:
+                # A concurrent sync (or catalogue import) created one of these in the
+                # meantime — fall back to per-row get_or_create for this batch, counting only
+                # the rows this sync actually inserted.
+                created_games, inserted = [], 0
+                for game in to_create:
+                    game, was_created = Game.objects.get_or_create(steam_appid=game.steam_appid, defaults={
+                        'title': game.title, 'genres': game.genres, 'cover_image': game.cover_image,
+                    })
+                    created_games.append(game)
+                    inserted += was_created
+            for game in created_games:
+                resolved[game.steam_appid] = game
+                created_appids.add(game.steam_appid)
+            stats['created'] += inserted
+
+        to_update = {}
+        claimed_appids = set()
+        for appid, game in resolved.items():
+            if appid in created_appids:
+                continue
+            changed = False
+            meta = metadata.get(appid, {})
+            if not game.genres and meta.get('genres'):
+                game.genres = meta['genres']
+                changed = True
+                print(f"Backfilled genres for {game.title}: {meta['genres']}")
+            # Backfill steam_appid if missing (matched by title) — once per game per sync.
+            if not game.steam_appid and game.pk not in claimed_appids:
+                game.steam_appid = appid
+                claimed_appids.add(game.pk)
+                changed = True
+            if meta.get('cover_url') and _needs_cover(game):
+                game.cover_image = meta['cover_url']
+                changed = True
+                stats['cover_fixed'] += 1
+                print(f"Fixed cover for {game.title}: {meta['cover_url']}")
+            if changed:
+                to_update[game.pk] = game
+        if to_update:
+            Game.objects.bulk_update(list(to_update.values()), ['genres', 'steam_appid', 'cover_image'], batch_size=LIBRARY_WRITE_CHUNK)
+            sync_game_genres(to_update.values())
+
+        # Stage 4: write library entries in chunks.
+        by_game = {}
+        for appid, steam_game in owned.items():
+            game = resolved.get(appid)
+            if game is not None and game.pk is not None:
+                by_game[game.pk] = steam_game
+        game_ids = list(by_game)
+        now = time.time()
+        written = 0
+        for start in range(0, len(game_ids), LIBRARY_WRITE_CHUNK):
+            chunk = game_ids[start:start + LIBRARY_WRITE_CHUNK]
+            existing = {e.game_id: e for e in LibraryEntry.objects.filter(user=user, game_id__in=chunk)}
+            new_entries, changed_entries = [], []
+            for game_id in chunk:
+                steam_game = by_game[game_id]
                 playtime_forever = steam_game.get('playtime_forever', 0)  # In minutes
-                
-                if not title or not appid:
+                new_status = steam_status_for(steam_game, now)
+                entry = existing.get(game_id)
+                if entry is None:
+                    new_entries.append(LibraryEntry(
+                        user=user, game_id=game_id, steam_playtime=playtime_forever,
+                        playtime_forever=playtime_forever, platform='Steam', status=new_status,
+                    ))
                     continue
-
-                if is_unwanted_game(title):
-                    # Skip importing unwated editions/dlcs/bundles
-                    continue
-
-                # 1. Try to find existing game by steam_appid first (most reliable)
-                game = Game.objects.filter(steam_appid=appid).first()
-                
-                # 2. Fallback: try by exact title match
-                if not game:
-                    game = Game.objects.filter(title__iexact=title).first()
-                    # If found by title, set the steam_appid for future reliable matching
-                    if game and not game.steam_appid:
-                        game.steam_appid = appid
-                        game.save(update_fields=['steam_appid'])
-
-                # 3. If still not found, create it
-                if not game:
-                    print(f"Creating new game from Steam: {title} (appid: {appid})")
-                    # Fetch genres from Steam Store API
-                    genres = fetch_steam_genres(appid)
-                    time.sleep(0.3)  # Rate limit protection
-
-                    # Resolve an igdb_id where possible — without this, Steam-created Game rows
-                    # never carry an igdb_id, which silently breaks Xbox sync's cross-platform
-                    # dedup (it only matches existing games by igdb_id, see
-                    # xbox.py:_find_or_create_game step 3) and lets the same real title get a
-                    # second Game/LibraryEntry row once it's also synced from Xbox.
-                    from api.services.xbox import _search_igdb_for_game
-                    igdb_id, _igdb_name = _search_igdb_for_game(title)
-                    # igdb_id is unique=True on Game — a fuzzy IGDB match could in principle
-                    # resolve to an id another row already holds; fall back to None rather than
-                    # let that collision crash the sync.
-                    if igdb_id and Game.objects.filter(igdb_id=igdb_id).exists():
-                        igdb_id = None
-
-                    game = Game.objects.create(
-                        title=title,
-                        steam_appid=appid,
-                        igdb_id=igdb_id,
-                        genres=genres,
+                entry.steam_playtime = playtime_forever
+                entry.playtime_forever = entry.steam_playtime + entry.xbox_playtime
+                entry.status = merge_library_status(entry.status, new_status)
+                if not entry.platform:
+                    entry.platform = 'Steam'
+                elif 'Steam' not in entry.platform:
+                    entry.platform = 'Steam, ' + entry.platform
+                changed_entries.append(entry)
+            try:
+                with transaction.atomic():
+                    LibraryEntry.objects.bulk_create(new_entries, ignore_conflicts=True)
+                    LibraryEntry.objects.bulk_update(
+                        changed_entries, ['steam_playtime', 'playtime_forever', 'status', 'platform'],
                     )
-                    stats['created'] += 1
-                    
-                    # Store Steam CDN URL as cover image (no local download)
-                    cover_url = get_steam_cover_url(appid)
-                    if cover_url:
-                        game.cover_image = cover_url
-                        game.save(update_fields=['cover_image'])
-                else:
-                    # Backfill genres if the existing game has none
-                    needs_save = False
-                    update_fields = []
-                    
-                    if not game.genres:
-                        genres = fetch_steam_genres(appid)
-                        if genres:
-                            game.genres = genres
-                            update_fields.append('genres')
-                            needs_save = True
-                            print(f"Backfilled genres for {title}: {genres}")
-                        time.sleep(0.3)
-                    
-                    # Backfill steam_appid if missing
-                    if not game.steam_appid:
-                        game.steam_appid = appid
-                        update_fields.append('steam_appid')
-                        needs_save = True
-                    
-                    # Backfill cover image if missing or broken (local path)
-                    cover_value = str(game.cover_image) if game.cover_image else ''
-                    if not cover_value or (cover_value and not cover_value.startswith('http')):
-                        cover_url = get_steam_cover_url(appid)
-                        if cover_url:
-                            game.cover_image = cover_url
-                            update_fields.append('cover_image')
-                            needs_save = True
-                            stats['cover_fixed'] += 1
-                            print(f"Fixed cover for {title}: {cover_url}")
-                    
-                    if needs_save and update_fields:
-                        game.save(update_fields=update_fields)
-
-                # 4. Determine Status
-                new_status = 'unplayed'
-                
-                if playtime_forever == 0:
-                    new_status = 'unplayed'
-                else:
-                    playtime_2weeks = steam_game.get('playtime_2weeks', 0)
-                    rtime_last_played = steam_game.get('rtime_last_played', 0)
-                    
-                    current_timestamp = int(time.time())
-                    two_weeks_ago = current_timestamp - (14 * 24 * 60 * 60)
-                    
-                    if playtime_2weeks > 0 or rtime_last_played > two_weeks_ago:
-                        new_status = 'playing'
-                    else:
-                        new_status = 'unplayed'
-
-                # 5. Create or Update Library Entry
-                existing_entry = LibraryEntry.objects.filter(user=user, game=game).first()
-                
-                final_status = new_status
-                
-                if existing_entry:
-                    # PERSISTENCE RULE:
-                    # Do NOT overwrite if user manually set to Completed, Replaying, or Dropped
-                    if existing_entry.status in ['completed', 'replaying', 'dropped']:
-                        final_status = existing_entry.status
-                    elif existing_entry.status == 'unplayed' and new_status == 'playing':
-                        final_status = 'playing'
-                    elif existing_entry.status == 'playing' and new_status == 'dropped':
-                        final_status = 'dropped'
-                    elif existing_entry.status == 'unplayed' and new_status == 'dropped':
-                        final_status = 'dropped'
-
-                entry, created = LibraryEntry.objects.get_or_create(
-                    user=user,
-                    game=game,
-                    defaults={
-                        'steam_playtime': playtime_forever,
-                        'playtime_forever': playtime_forever,
-                        'platform': 'Steam',
-                        'status': final_status
-                    }
-                )
-                
-                if not created:
-                    entry.steam_playtime = playtime_forever
-                    entry.playtime_forever = entry.steam_playtime + entry.xbox_playtime
-                    if final_status != new_status:
-                        # User overrode status, keep it. But if new_status is 'playing', maybe update? 
-                        # We already calculated final_status above, so just update it.
-                        pass
-                    entry.status = final_status
-                    
-                    if not entry.platform:
-                        entry.platform = 'Steam'
-                    elif 'Steam' not in entry.platform:
-                        entry.platform = 'Steam, ' + entry.platform
-                        
-                    entry.save()
-
-                stats['synced'] += 1
-                
-            except Exception as game_error:
-                stats['errors'] += 1
-                error_msg = f"Error syncing {steam_game.get('name', 'unknown')}: {game_error}"
-                stats['error_details'].append(error_msg)
-                print(error_msg)
-                continue  # Don't let one game failure stop all others
-            
+                    # Bulk writes bypass the GameStats signals — recount the games whose log
+                    # or status counts this chunk moved.
+                    game_stats.refresh(
+                        [e.game_id for e in new_entries]
+                        + [e.game_id for e in changed_entries if e.status != getattr(e, '_loaded_status', e.status)]
+                    )
+                stats['synced'] += len(chunk)
+            except Exception as write_error:
+                for game_id in chunk:
+                    record_error(by_game[game_id].get('name', 'unknown'), write_error)
+            written += len(chunk)
+            _report_progress(user_id, 'writing_library', written, len(game_ids), on_progress)
+
+        # Bulk writes bypass LibraryEntry's post_save signal — drop the cached For You
+        # profile ourselves (see api.models.invalidate_library_feed_profile).
+        from api.services.feed_candidates import invalidate_feed_profile
+        invalidate_feed_profile(user.id)
+
     except Exception as e:
         print(f"Error fetching Steam library: {e}")
+        _report_progress(user_id, 'failed', 0, 0, on_progress)
         raise  # Re-raise so the view knows sync failed
-    
+
+    _report_progress(user_id, 'complete', stats['synced'], stats['total'], on_progress)
     print(f"Steam sync complete: {stats['synced']}/{stats['total']} games synced, "
           f"{stats['created']} created, {stats['cover_fixed']} covers fixed, "
           f"{stats['errors']} errors")
-    
+
     return stats
 
 
@@ -390,7 +529,7 @@ def fetch_steam_currently_playing(steam_id):
 
     url = f"http://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/?key={api_key}&steamids={steam_id}"
     try:
-        response = requests.get(url, timeout=5)
+        response = http_client.get('steam_api', url, timeout=5)
         response.raise_for_status()
         data = response.json()
         players = data.get('response', {}).get('players', [])
@@ -0,0 +1,150 @@
+"""
+Change feed for a project's CommunityTranslation rows (CommunityTranslationViewSet.changes).
+
+Clients used to rebuild a project's suggestions after every mutation by paging through all of
+its rows with a per-row vote Count. Instead every write is numbered, and a client holding a
+cursor asks only for what came after it:
+
+- each project has a change counter (LocalisationProgress.change_seq on its ALL_LANGUAGES row).
+  A writer takes the next number while holding that row's lock, the same per-project lock
+  the localisation rollups take (localisation_rollups.lock_project), and keeps it until
+  commit. So a project's numbers become visible in order: once a reader sees the counter at N,
+  every change numbered up to N is committed;
+- a saved row carries its number in sync_seq. The pre_save signal in api.models stamps it;
+  writers that bypass save() (the bulk import, key renames) stamp it themselves. A vote
+  re-stamps its row so the new votes_count goes out, and a deletion leaves a
+  CommunityTranslationTombstone;
+- a read returns the rows and tombstones numbered after the cursor up to the counter, in
+  (number, id) order, so a batch sharing one number can still be split across pages.
+
+updated_at isn't the cursor: a long import stamps its rows when it starts and commits minutes
+later, behind readers that have already moved past that time.
+"""
+from django.db import transaction
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 2000
+
+
+def next_seq(project_id, create_missing=True):
+    """Takes the project's next change number, locking the project until the caller's
+    transaction ends. None if the project isn't tracked and create_missing is False."""
+    from django.db import connection
+
+    from api.models import ALL_LANGUAGES, LocalisationProgress
+    from api.services import localisation_rollups
+
+    # The increment takes the row lock itself, so a tracked project costs one query; an
+    # untracked one is counted first (lock_project) and then incremented.
+    table = connection.ops.quote_name(LocalisationProgress._meta.db_table)
+    sql = f"UPDATE {table} SET change_seq = change_seq + 1 WHERE project_id = %s AND language = %s RETURNING change_seq"
+    for _ in range(2):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [project_id, ALL_LANGUAGES])
+            row = cursor.fetchone()
+        if row is not None:
+            return row[0]
+        if localisation_rollups.lock_project(project_id, create_missing=create_missing) is None:
+            return None
+    return None
+
+
+def stamp(row):
+    """pre_save: number a CommunityTranslation write (CommunityTranslation.save() makes it one
+    transaction with the row)."""
+    row.sync_seq = next_seq(row.project_id)
+
+
+def _deleted_with(origin, *labels):
+    origin_model = getattr(origin, 'model', None) or type(origin)
+    return origin is not None and origin_model._meta.label in labels
+
+
+# Neither of these starts tracking an untracked project (create_missing=False): no client can
+# hold a cursor for it yet, since reading the feed starts tracking — and a deletion may be part
+# of the project's own cascade, where creating its rows would fail.
+
+def on_deleted(row, origin=None):
+    from api.models import CommunityTranslationTombstone
+
+    if _deleted_with(origin, 'core.Project'):
+        return
+    seq = next_seq(row.project_id, create_missing=False)
+    if seq is not None:
+        CommunityTranslationTombstone.objects.create(project_id=row.project_id, translation_id=row.pk, sync_seq=seq)
+
+
+def on_voted(translation_id, origin=None):
+    """A vote on the row was added or removed: re-number it so its votes_count is re-sent."""
+    from core.models import CommunityTranslation
+
+    if _deleted_with(origin, 'core.Project', 'core.CommunityTranslation'):
+        return
+    with transaction.atomic():
+        project_id = CommunityTranslation.objects.filter(pk=translation_id).values_list('project_id', flat=True).first()
+        if project_id is None:
+            return
+        seq = next_seq(project_id, create_missing=False)
+        if seq is not None:
+            CommunityTranslation.objects.filter(pk=translation_id).update(sync_seq=seq)
+
+
+def parse_cursor(value):
+    """'<seq>' (everything up to seq seen) or '<seq>.<id>' (up to that row within seq) as
+    (seq, id or None); None for no cursor. Raises ValueError."""
+    if value in (None, ''):
+        return None
+    seq, _, row_id = value.partition('.')
+    seq, row_id = int(seq), int(row_id) if row_id else None
+    if seq < 0 or (row_id is not None and row_id < 0):
+        raise ValueError(value)
+    return seq, row_id
+
+
+def changes(project_id, cursor, *, limit=DEFAULT_LIMIT):
+    """
+    (row_ids, deleted_ids, next_cursor, has_more) for the changes after `cursor` (see
+    parse_cursor; None starts from the beginning, i.e. a full snapshot), at most `limit` of
+    them. row_ids are the rows to (re)send, in feed order; deleted_ids the tombstones.
+    """
+    from django.db.models import Q
+
+    from api.models import ALL_LANGUAGES, CommunityTranslationTombstone, LocalisationProgress
+    from api.services import localisation_rollups
+    from core.models import CommunityTranslation
+
+    # Reading starts tracking the project, so from here on its deletions leave tombstones.
+    localisation_rollups.ensure_tracked(project_id)
+    head = (
+        LocalisationProgress.objects.filter(project_id=project_id, language=ALL_LANGUAGES)
+        .values_list('change_seq', flat=True).first()
+    ) or 0
+
+    def window(seq_field, id_field):
+        if cursor is None:
+            after = Q()
+        elif cursor[1] is None:
+            after = Q(**{f'{seq_field}__gt': cursor[0]})
+        else:
+            after = Q(**{f'{seq_field}__gt': cursor[0]}) | Q(**{seq_field: cursor[0], f'{id_field}__gt': cursor[1]})
+        return after & Q(**{f'{seq_field}__lte': head})
+
+    live = list(
+        CommunityTranslation.objects.filter(window('sync_seq', 'id'), project_id=project_id)
+        .order_by('sync_seq', 'id').values_list('sync_seq', 'id')[:limit + 1]
+    )
+    gone = list(
+        CommunityTranslationTombstone.objects.filter(window('sync_seq', 'translation_id'), project_id=project_id)
+        .order_by('sync_seq', 'translation_id').values_list('sync_seq', 'translation_id')[:limit + 1]
+    )
+    merged = sorted([(seq, pk, False) for seq, pk in live] + [(seq, pk, True) for seq, pk in gone])
+    has_more = len(merged) > limit
+    merged = merged[:limit]
+
+    if has_more:
+        next_cursor = f'{merged[-1][0]}.{merged[-1][1]}'
+    else:
+        next_cursor = str(max(head, cursor[0] if cursor else 0))
+    row_ids = [pk for _, pk, deleted in merged if not deleted]
+    deleted_ids = [pk for _, pk, deleted in merged if deleted]
+    return row_ids, deleted_ids, next_cursor, has_more
@@ -0,0 +1,225 @@
+"""
+Post.trending_score (Explore's "popular" ordering), recomputed set-at-a-time.
+
+The score is the gravity-decay formula the feed has always used:
+
+    (likes + 2.5·replies + 4.5·reposts + 3.5·bookmarks + 1) · media · thread · link
+    ─────────────────────────────────────────────────────────────────────────────────
+                                 (age_hours + 2) ^ 1.5
+
+with media = 1.35 for image/GIF/video posts (1.15 for long text), thread = 1.25 when more
+than one person replied and ×1.15 when the author replied in their own thread, and link =
+0.85 for text posts that link out.
+
+It used to be computed one post at a time — five or six COUNT/EXISTS queries and an UPDATE
+per post, for every root post of the last week. recompute() instead reads every input for a
+chunk of posts with one grouped query per input, evaluates the formula over numpy arrays
+and writes only the scores that moved, with bulk_update.
+
+Likes, bookmarks, replies and reposts mark their target post dirty (signals in api.models
+→ mark_dirty(), journalled in the shared cache the same way api.services.search_index
+journals edits). `update_trending --incremental` recomputes just those posts; the full pass
+(plain `update_trending`) still has to run periodically because every score decays with
+age.
+"""
+import logging
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+WINDOW_DAYS = 7
+GRAVITY = 1.5
+LIKE_WEIGHT = 1.0
+REPLY_WEIGHT = 2.5
+REPOST_WEIGHT = 4.5
+BOOKMARK_WEIGHT = 3.5
+MEDIA_BOOST = 1.35
+LONG_TEXT_BOOST = 1.15
+LONG_TEXT_LENGTH = 280
+MULTI_REPLIER_BOOST = 1.25
+CREATOR_REPLY_BOOST = 1.15
+LINK_PENALTY = 0.85
+CHUNK_SIZE = 5000
+
+DIRTY_VERSION_KEY = 'trending:dirty:version'
+DIRTY_KEY = 'trending:dirty:{version}'
+PROCESSED_KEY = 'trending:dirty:processed'
+DIRTY_TTL = 24 * 60 * 60
+# More dirty posts than this and the full pass is cheaper per post anyway.
+MAX_DIRTY = 50000
+
+
+def trending_scores(age_hours, likes, replies, reposts, bookmarks, distinct_repliers,
+                    creator_replied, has_media, content_length, has_link):
+    """The formula over equal-length arrays (one element per post)."""
+    weighted = (
+        likes * LIKE_WEIGHT + replies * REPLY_WEIGHT + reposts * REPOST_WEIGHT + bookmarks * BOOKMARK_WEIGHT
+    )
+    media = np.where(has_media, MEDIA_BOOST, np.where(content_length > LONG_TEXT_LENGTH, LONG_TEXT_BOOST, 1.0))
+    thread = np.where(
+        replies > 0,
+        np.where(distinct_repliers > 1, MULTI_REPLIER_BOOST, 1.0) * np.where(creator_replied, CREATOR_REPLY_BOOST, 1.0),
+        1.0,
+    )
+    # has_link is already "links out and has no image/GIF" (see _window).
+    link = np.where(has_link, LINK_PENALTY, 1.0)
+    raw = (weighted + 1.0) * media * thread * link
+    return np.round(raw / (np.asarray(age_hours, dtype=float) + 2.0) ** GRAVITY, 4)
+
+
+def score_new_post(post, now=None):
+    """Score of a post that has just been created (no engagement yet) — no queries."""
+    now = now or timezone.now()
+    content = post.content or ''
+    has_visual = bool(post.image or post.gif_url)
+    score = trending_scores(
+        age_hours=np.array([max((now - post.timestamp).total_seconds(), 0) / 3600]),
+        likes=np.zeros(1), replies=np.zeros(1), reposts=np.zeros(1), bookmarks=np.zeros(1),
+        distinct_repliers=np.zeros(1), creator_replied=np.zeros(1, dtype=bool),
+        has_media=np.array([has_visual or bool(post.media_file)]),
+        content_length=np.array([len(content)]),
+        has_link=np.array(['http' in content and not has_visual]),
+    )
+    return float(score[0])
+
+
+def _window(now):
+    from django.db.models import BooleanField, Case, Q, Value, When
+    from django.db.models.functions import Length
+    from core.models import Post
+    return Post.objects.filter(
+        timestamp__gte=now - timedelta(days=WINDOW_DAYS),
+        parent__isnull=True, review_parent__isnull=True, news_parent__isnull=True,
+    ).annotate(
+        content_length=Length('content'),
+        links_out=Case(
+            When(Q(content__contains='http') & (Q(image__isnull=True) | Q(image='')) & (Q(gif_url__isnull=True) | Q(gif_url='')),
+                 then=Value(True)),
+            default=Value(False), output_field=BooleanField(),
+        ),
+    )
+
+
+def _counts(queryset, key):
+    from django.db.models import Count
+    return dict(queryset.values(key).annotate(n=Count('id')).values_list(key, 'n'))
+
+
+def _score_chunk(rows, now):
+    """rows: (id, timestamp, image, gif_url, media_file, content_length, links_out,
+    trending_score). Returns [(post_id, new_score, old_score)]."""
+    from django.db.models import Count, F
+    from core.models import Bookmark, Like, Post
+
+    ids = [row[0] for row in rows]
+    likes = _counts(Like.objects.filter(post_id__in=ids), 'post_id')
+    reposts = _counts(Post.objects.filter(repost_parent_id__in=ids), 'repost_parent_id')
+    bookmarks = _counts(Bookmark.objects.filter(post_id__in=ids), 'post_id')
+    reply_stats = {
+        parent_id: (n, users)
+        for parent_id, n, users in Post.objects.filter(parent_id__in=ids).values('parent_id').annotate(
+            n=Count('id'), users=Count('user_id', distinct=True),
+        ).values_list('parent_id', 'n', 'users')
+    }
+    creator_replied = set(
+        Post.objects.filter(parent_id__in=ids, user_id=F('parent__user_id')).values_list('parent_id', flat=True).distinct()
+    )
+
+    scores = trending_scores(
+        age_hours=np.array([(now - row[1]).total_seconds() / 3600 for row in rows]),
+        likes=np.array([likes.get(i, 0) for i in ids], dtype=float),
+        replies=np.array([reply_stats.get(i, (0, 0))[0] for i in ids], dtype=float),
+        reposts=np.array([reposts.get(i, 0) for i in ids], dtype=float),
+        bookmarks=np.array([bookmarks.get(i, 0) for i in ids], dtype=float),
+        distinct_repliers=np.array([reply_stats.get(i, (0, 0))[1] for i in ids]),
+        creator_replied=np.array([i in creator_replied for i in ids], dtype=bool),
+        has_media=np.array([bool(row[2] or row[3] or row[4]) for row in rows], dtype=bool),
+        content_length=np.array([row[5] or 0 for row in rows]),
+        has_link=np.array([bool(row[6]) for row in rows], dtype=bool),
+    )
+    return [(row[0], float(score), row[7]) for row, score in zip(rows, scores)]
+
+
+def recompute(post_ids=None, chunk_size=CHUNK_SIZE, now=None):
+    """Recomputes trending_score for every root post in the window (or only `post_ids`,
+    ignoring any outside it). Returns {'posts', 'updated', 'seconds'}."""
+    from core.models import Post
+
+    started = time.monotonic()
+    now = now or timezone.now()
+    queryset = _window(now)
+    if post_ids is not None:
+        queryset = queryset.filter(id__in=list(post_ids))
+    rows = list(queryset.order_by('id').values_list(
+        'id', 'timestamp', 'image', 'gif_url', 'media_file', 'content_length', 'links_out', 'trending_score',
+    ))
+    updated = 0
+    for start in range(0, len(rows), chunk_size):
+        changed = [
+            Post(id=post_id, trending_score=score)
+            for post_id, score, old in _score_chunk(rows[start:start + chunk_size], now)
+            if score != old
+        ]
+        if changed:
+            Post.objects.bulk_update(changed, ['trending_score'], batch_size=1000)
+            updated += len(changed)
+    return {'posts': len(rows), 'updated': updated, 'seconds': time.monotonic() - started}
+
+
+# --- Dirty-post journal ------------------------------------------------------------------
+
+def _record_dirty(post_id):
+    cache.add(DIRTY_VERSION_KEY, 0, None)
+    version = cache.incr(DIRTY_VERSION_KEY)
+    cache.set(DIRTY_KEY.format(version=version), post_id, DIRTY_TTL)
+
+
+def mark_dirty(post_id):
+    """Queues a post for the next incremental pass once the current transaction commits."""
+    if not post_id:
+        return
+    from django.db import transaction
+    transaction.on_commit(lambda: _record_dirty(post_id))
+
+
+def take_dirty():
+    """Post ids marked dirty since the last call, or None if the journal can't say (entries
+    expired or flushed, or too many to be worth it) and a full pass is needed."""
+    latest = dirty_version()
+    processed = cache.get(PROCESSED_KEY)
+    if processed is None or processed > latest or latest - processed > MAX_DIRTY:
+        cache.set(PROCESSED_KEY, latest, None)
+        return None
+    versions = range(processed + 1, latest + 1)
+    entries = cache.get_many([DIRTY_KEY.format(version=v) for v in versions])
+    cache.set(PROCESSED_KEY, latest, None)
+    if len(entries) < len(versions):
+        return None
+    return set(entries.values())
+
+
+def dirty_version():
+    return cache.get(DIRTY_VERSION_KEY) or 0
+
+
+def recompute_dirty(chunk_size=CHUNK_SIZE):
+    """The incremental pass: recomputes posts touched since the last pass (all of the window
+    if the journal has a gap). Returns recompute()'s stats plus 'full'."""
+    dirty = take_dirty()
+    stats = recompute(post_ids=dirty, chunk_size=chunk_size)
+    stats['full'] = dirty is None
+    return stats
+
+
+def recompute_all(chunk_size=CHUNK_SIZE):
+    """The full pass. Marks everything journalled before it started as handled."""
+    version = dirty_version()
+    stats = recompute(chunk_size=chunk_size)
+    cache.set(PROCESSED_KEY, version, None)
+    stats['full'] = True
+    return stats
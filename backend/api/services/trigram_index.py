@@ -0,0 +1,405 @@
+"""
+In-memory trigram inverted index for short-text search (titles, usernames, names) with
+prefix and typo-tolerant matching — no database extension, no external search service.
+
+Text is normalized (lowercased, accents folded, punctuation to spaces) and each word is
+padded pg_trgm-style ('  ' + word + ' ') before being cut into trigrams, so word starts are
+their own trigrams. A query's last word is left unpadded at the end, which is what makes
+"zel" match "zelda": prefixes share all their trigrams with the word.
+
+Every indexed string is a *row* (object id, weight, text); an object can have several rows
+(e.g. a user's username and real name), and results are per object, best row wins.
+
+Rows live in two segments:
+- the base segment: CSR postings — one sorted int32 array of row numbers per trigram, all
+  concatenated into `postings` with `offsets` per vocabulary entry — built in bulk and
+  persisted with save()/load() as .npy files (memory-mapped on load), published as one
+  atomic snapshot (api.services.index_snapshots);
+- a small delta segment of python lists for rows upserted since, plus an `alive` mask for
+  rows that were replaced or deleted. compact() folds the delta back into a new base.
+
+A query only unions the postings of its rarest trigrams (any row sharing at least `t` of the
+query's `m` trigrams must contain one of its `m - t + 1` rarest), then counts shared trigrams
+for those candidates with binary searches against the other postings, so the work tracks
+the rarest postings rather than the collection size. The first pass requires every trigram
+(t = m: exact, prefix and substring matches — candidates come from the single rarest
+posting); only if that doesn't fill the page is it relaxed to the typo-tolerant threshold.
+"""
+import json
+import math
+import os
+import threading
+import unicodedata
+from array import array
+
+import numpy as np
+
+from api.services import index_snapshots
+
+# The typo-tolerant pass accepts rows missing up to MAX_MISSING_TRIGRAMS of the query's
+# trigrams — one typo (a substitution touches three, a transposition four) — or a quarter of
+# them for long queries, but always requires at least half of them.
+MAX_MISSING_TRIGRAMS = 4
+MAX_MISSING_FRACTION = 0.25
+MIN_SHARED_FRACTION = 0.5
+# Rows re-scored with the exact/prefix bonuses, per requested result.
+RERANK_FACTOR = 4
+# search(limit=None) without a `fill`: how many results the exact pass must find before the
+# typo-tolerant pass is skipped.
+DEFAULT_FILL = 20
+# Delta rows past which the delta should be folded into a new base segment (compact(), or a
+# rebuild); search_index logs a request for one.
+COMPACT_THRESHOLD = 20000
+MAX_TEXT_LENGTH = 500
+# Above this many candidates, postings are counted in a per-row scratch array rather than by
+# sorting; and a posting is checked that way rather than by binary search when it's shorter
+# than SEARCHSORTED_COST x the candidates (the rough relative cost of one lookup).
+BITMAP_MIN_CANDIDATES = 2048
+SEARCHSORTED_COST = 8
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', str(text or '')[:MAX_TEXT_LENGTH].lower())
+    chars = []
+    for ch in text:
+        if unicodedata.combining(ch):
+            continue
+        chars.append(ch if ch.isalnum() else ' ')
+    return ' '.join(''.join(chars).split())
+
+
+def trigrams(normalized, prefix=False):
+    """Trigrams of already-normalized text; with `prefix` the last word gets no end padding."""
+    words = normalized.split()
+    grams = set()
+    for i, word in enumerate(words):
+        padded = f'  {word}' if prefix and i == len(words) - 1 else f'  {word} '
+        grams.update(padded[j:j + 3] for j in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    def __init__(self, vocab, offsets, postings, object_ids, weights, sizes, texts, meta=None):
+        self.vocab = vocab              # {trigram: i} — base postings for it are offsets[i]:offsets[i+1]
+        self.offsets = offsets          # (len(vocab) + 1,) int64
+        self.postings = postings        # int32 row numbers, sorted within each trigram
+        self.object_ids = object_ids    # (base rows,) int64, sorted (so an object's rows are adjacent)
+        self.weights = weights          # (base rows,) float32
+        self.sizes = sizes              # (base rows,) int32 — trigram count per row
+        self.texts = list(texts)        # normalized text per row, base then delta
+        self.meta = meta or {}
+        self.snapshot = None            # generation name, when loaded from disk
+        self.alive = np.ones(len(object_ids), dtype=bool)
+        self._delta_postings = {}
+        self._delta_object_ids = []
+        self._delta_weights = []
+        self._delta_sizes = []
+        self._delta_alive = []
+        self._delta_rows_by_object = {}
+        self._counts = None  # per-row scratch counters for _shared_counts (used under _lock)
+        self._lock = threading.RLock()
+
+    @property
+    def base_rows(self):
+        return len(self.object_ids)
+
+    def __len__(self):
+        """Live objects in the index."""
+        with self._lock:
+            base = set(self.object_ids[self.alive].tolist()) if self.base_rows else set()
+            delta = {oid for oid, alive in zip(self._delta_object_ids, self._delta_alive) if alive}
+            return len(base | delta)
+
+    # --- Building ------------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, rows, meta=None):
+        """`rows` is an iterable of (object_id, weight, text). Empty texts are dropped."""
+        prepared = []
+        for object_id, weight, text in rows:
+            normalized = normalize(text)
+            if normalized:
+                prepared.append((int(object_id), float(weight), normalized))
+        prepared.sort(key=lambda row: row[0])
+
+        vocab = {}
+        gram_ids, row_ids = array('i'), array('i')
+        sizes = np.empty(len(prepared), dtype=np.int32)
+        for row, (_, _, text) in enumerate(prepared):
+            grams = trigrams(text)
+            sizes[row] = len(grams)
+            gram_ids.extend(vocab.setdefault(gram, len(vocab)) for gram in grams)
+            row_ids.extend([row] * len(grams))
+
+        gram_ids = np.frombuffer(gram_ids, dtype=np.int32)
+        row_ids = np.frombuffer(row_ids, dtype=np.int32)
+        # Stable sort by trigram keeps each trigram's rows in ascending order.
+        order = np.argsort(gram_ids, kind='stable')
+        counts = np.bincount(gram_ids, minlength=len(vocab))
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return cls(
+            vocab, offsets, row_ids[order],
+            np.asarray([row[0] for row in prepared], dtype=np.int64),
+            np.asarray([row[1] for row in prepared], dtype=np.float32),
+            sizes, [row[2] for row in prepared], meta,
+        )
+
+    def live_rows(self):
+        """(object_id, weight, text) for every live row, base and delta."""
+        with self._lock:
+            rows = [
+                (int(self.object_ids[r]), float(self.weights[r]), self.texts[r])
+                for r in np.flatnonzero(self.alive)
+            ]
+            for i, alive in enumerate(self._delta_alive):
+                if alive:
+                    rows.append((self._delta_object_ids[i], self._delta_weights[i], self.texts[self.base_rows + i]))
+            return rows
+
+    def compact(self):
+        """A new index holding the same live rows in a single base segment."""
+        return type(self).build(self.live_rows(), meta=dict(self.meta))
+
+    # --- Incremental updates -------------------------------------------------------------
+
+    def _base_rows_for(self, object_id):
+        lo = np.searchsorted(self.object_ids, object_id, side='left')
+        hi = np.searchsorted(self.object_ids, object_id, side='right')
+        return range(lo, hi)
+
+    def remove(self, object_id):
+        with self._lock:
+            for row in self._base_rows_for(object_id):
+                self.alive[row] = False
+            for i in self._delta_rows_by_object.pop(object_id, ()):
+                self._delta_alive[i] = False
+
+    def upsert(self, object_id, rows):
+        """Replaces every row of `object_id` with `rows` ((weight, text) pairs)."""
+        object_id = int(object_id)
+        with self._lock:
+            self.remove(object_id)
+            for weight, text in rows:
+                normalized = normalize(text)
+                if not normalized:
+                    continue
+                i = len(self._delta_object_ids)
+                grams = trigrams(normalized)
+                self._delta_object_ids.append(object_id)
+                self._delta_weights.append(float(weight))
+                self._delta_sizes.append(len(grams))
+                self._delta_alive.append(True)
+                self.texts.append(normalized)
+                self._delta_rows_by_object.setdefault(object_id, []).append(i)
+                for gram in grams:
+                    self._delta_postings.setdefault(gram, []).append(i)
+
+    @property
+    def delta_rows(self):
+        return len(self._delta_object_ids)
+
+    # --- Search --------------------------------------------------------------------------
+
+    def _base_postings(self, gram):
+        i = self.vocab.get(gram)
+        if i is None:
+            return np.empty(0, dtype=np.int32)
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def _scratch(self, n_rows):
+        """A zeroed uint16 per-row array; callers must leave it zeroed again. It counts, per row,
+        the query trigrams it shares — at most a few hundred, since text is cut to
+        MAX_TEXT_LENGTH — so uint8 would wrap."""
+        if self._counts is None or len(self._counts) != n_rows:
+            self._counts = np.zeros(n_rows, dtype=np.uint16)
+        return self._counts
+
+    def _shared_counts(self, postings, min_shared, n_rows=None):
+        """(candidate rows, trigrams shared with the query) for rows sharing >= min_shared.
+        Candidates come from the rarest postings; the rest are checked rarest-first, dropping
+        candidates as soon as they can no longer reach min_shared. With `n_rows` (the base
+        segment), large sets are counted in a per-row scratch array instead of by sorting and
+        binary search, which is linear and cache-friendly."""
+        postings = sorted(postings, key=len)
+        n_sources = len(postings) - min_shared + 1
+        sources = [p for p in postings[:n_sources] if len(p)]
+        if not sources:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+        if len(sources) == 1:
+            candidates = np.array(sources[0])
+            shared = np.ones(len(candidates), dtype=np.int32)
+        elif n_rows is not None and sum(len(p) for p in sources) > BITMAP_MIN_CANDIDATES:
+            scratch = self._scratch(n_rows)
+            fresh = []
+            for p in sources:
+                # Rows not seen in an earlier source — a union without sorting.
+                fresh.append(p[scratch[p] == 0])
+                scratch[p] += 1
+            candidates = np.concatenate(fresh)
+            shared = scratch[candidates].astype(np.int32)
+            scratch[candidates] = 0
+        else:
+            candidates, shared = np.unique(np.concatenate(sources), return_counts=True)
+            # Same dtype as the postings, or every searchsorted below copies its posting to convert.
+            candidates = candidates.astype(sources[0].dtype, copy=False)
+            shared = shared.astype(np.int32)
+        rest = postings[n_sources:]
+        for i, p in enumerate(rest):
+            viable = shared + (len(rest) - i) >= min_shared
+            if not viable.all():
+                candidates, shared = candidates[viable], shared[viable]
+            if not len(candidates):
+                break
+            if not len(p):
+                continue
+            # Scatter/gather costs ~len(p) + len(candidates); binary search ~len(candidates) * log.
+            if n_rows is not None and len(candidates) * SEARCHSORTED_COST > len(p):
+                scratch = self._scratch(n_rows)
+                scratch[p] = 1
+                shared += scratch[candidates]
+                scratch[p] = 0
+            else:
+                pos = np.searchsorted(p, candidates)
+                np.minimum(pos, len(p) - 1, out=pos)
+                shared += np.asarray(p)[pos] == candidates
+        keep = shared >= min_shared
+        return candidates[keep], shared[keep]
+
+    def _candidates(self, m, min_shared, base_postings, delta_postings):
+        """[(rows, base scores)] per segment for live rows sharing >= min_shared trigrams;
+        delta rows are numbered after the base."""
+        scored = []
+        if base_postings is not None:
+            rows, shared = self._shared_counts(base_postings, min_shared, n_rows=self.base_rows)
+            if len(rows):
+                live = self.alive[rows]
+                rows, shared = rows[live], shared[live]
+                base = shared / m + 0.25 * shared / np.maximum(self.sizes[rows], 1)
+                scored.append((rows, base * self.weights[rows]))
+        if delta_postings is not None:
+            rows, shared = self._shared_counts(delta_postings, min_shared)
+            if len(rows):
+                live = np.asarray(self._delta_alive, dtype=bool)[rows]
+                rows, shared = rows[live], shared[live]
+                sizes = np.asarray(self._delta_sizes, dtype=np.float32)[rows]
+                weights = np.asarray(self._delta_weights, dtype=np.float32)[rows]
+                base = shared / m + 0.25 * shared / np.maximum(sizes, 1)
+                scored.append((rows + self.base_rows, base * weights))
+        return scored
+
+    def search(self, query, limit=20, fill=None):
+        """Up to `limit` (object_id, score) pairs, best first (every match if limit is None).
+        Scores favour rows covering more of the query, then exact / prefix / word-prefix /
+        substring matches, scaled by row weight. The typo-tolerant pass runs only when the
+        exact one finds fewer than `fill` rows (default: limit); only the best
+        fill * RERANK_FACTOR rows get the exact/prefix bonuses, the rest are ranked by shared
+        trigrams alone."""
+        q = normalize(query)
+        grams = list(trigrams(q, prefix=True))
+        if not grams or (limit is not None and limit <= 0):
+            return []
+        if fill is None:
+            fill = limit if limit is not None else DEFAULT_FILL
+        m = len(grams)
+
+        with self._lock:
+            base_postings = [self._base_postings(g) for g in grams] if self.base_rows else None
+            delta_postings = [
+                np.asarray(self._delta_postings.get(g, ()), dtype=np.int64) for g in grams
+            ] if self._delta_postings else None
+            missing = max(MAX_MISSING_TRIGRAMS, int(m * MAX_MISSING_FRACTION))
+            tolerant = max(1, math.ceil(m * MIN_SHARED_FRACTION), m - missing)
+            for min_shared in dict.fromkeys((m, tolerant)):
+                scored = self._candidates(m, min_shared, base_postings, delta_postings)
+                if sum(len(rows) for rows, _ in scored) >= fill:
+                    break
+            if not scored:
+                return []
+
+            rows = np.concatenate([r for r, _ in scored])
+            scores = np.concatenate([s for _, s in scored])
+            keep = min(len(rows), fill * RERANK_FACTOR + 50)
+            top = np.argpartition(-scores, keep - 1)[:keep] if keep < len(rows) else np.arange(len(rows))
+
+            best = {}
+            for i in top:
+                row = int(rows[i])
+                text = self.texts[row]
+                if row < self.base_rows:
+                    object_id, weight = int(self.object_ids[row]), float(self.weights[row])
+                else:
+                    object_id = self._delta_object_ids[row - self.base_rows]
+                    weight = self._delta_weights[row - self.base_rows]
+                if text == q:
+                    bonus = 1.0
+                elif text.startswith(q):
+                    bonus = 0.5
+                elif f' {q}' in f' {text}':
+                    bonus = 0.3
+                elif q in text:
+                    bonus = 0.15
+                else:
+                    bonus = 0.0
+                score = float(scores[i]) + bonus * weight
+                if score > best.get(object_id, -1.0):
+                    best[object_id] = score
+            if limit is None and keep < len(rows):
+                # Every other match, at its best row's score without the bonuses (objects with
+                # a re-scored row keep that score).
+                rest = np.ones(len(rows), dtype=bool)
+                rest[top] = False
+                others = {}
+                for row, score in zip(rows[rest].tolist(), scores[rest].tolist()):
+                    if row < self.base_rows:
+                        object_id = int(self.object_ids[row])
+                    else:
+                        object_id = self._delta_object_ids[row - self.base_rows]
+                    if score > others.get(object_id, -1.0):
+                        others[object_id] = score
+                for object_id, score in others.items():
+                    best.setdefault(object_id, score)
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+        return ranked if limit is None else ranked[:limit]
+
+    # --- Persistence ---------------------------------------------------------------------
+
+    def save(self, directory):
+        """Persists the base segment (compact() first to include delta rows). Returns the
+        snapshot's generation name."""
+        vocab = sorted(self.vocab, key=self.vocab.get)
+        arrays = {
+            'offsets': self.offsets, 'postings': self.postings, 'object_ids': self.object_ids,
+            'weights': self.weights, 'sizes': self.sizes,
+        }
+
+        def write_files(path):
+            for name, array in arrays.items():
+                np.save(os.path.join(path, f'{name}.npy'), array)
+            for name, value in (('vocab', vocab), ('texts', self.texts[:self.base_rows]), ('meta', self.meta)):
+                with open(os.path.join(path, f'{name}.json'), 'w') as f:
+                    json.dump(value, f)
+
+        return index_snapshots.write(directory, write_files)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """The snapshot currently published in `directory`; raises OSError if there is none."""
+        mode = 'r' if mmap else None
+        path = index_snapshots.current(directory)
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        with open(os.path.join(path, 'vocab.json')) as f:
+            vocab = {gram: i for i, gram in enumerate(json.load(f))}
+        with open(os.path.join(path, 'texts.json')) as f:
+            texts = json.load(f)
+        index = cls(
+            vocab,
+            np.load(os.path.join(path, 'offsets.npy')),
+            np.load(os.path.join(path, 'postings.npy'), mmap_mode=mode),
+            np.load(os.path.join(path, 'object_ids.npy')),
+            np.load(os.path.join(path, 'weights.npy')),
+            np.load(os.path.join(path, 'sizes.npy')),
+            texts, meta,
+        )
+        index.snapshot = os.path.basename(path)
+        return index
@@ -0,0 +1,192 @@
+"""
+Per-user unread message/notification counters for the NotificationConsumer badge.
+
+Each counter lives in the Django cache (Redis in prod) under
+`unread:{user_id}:{kind}` and is adjusted with atomic incr/decr by the code that changes the
+underlying rows — Message/Notification signals in api.models, mark_conversation_read() and
+the notifications mark_all_read action — rather than recounted on every WebSocket event.
+Adjusting pushes the new value (and the delta) straight to the user's channel group, so the
+consumer never queries.
+
+A missing key just means "not known": adjust() leaves it missing and the next get_counts()
+recounts from the DB. An adjust() that finds the key missing also bumps a `missed` marker, so a
+get_counts() that was recounting at the time knows its count may predate that change and
+drops the value it just seeded instead of caching an undercount. Anything the signals can't see precisely (bulk deletes, membership
+changes) drops the key the same way, and `reconcile_unread_counters` periodically
+compares cached values with the DB and repairs drift.
+"""
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('messages', 'notifications')
+COUNTER_KEY = 'unread:{user_id}:{kind}'
+MISSED_KEY = 'unread:{user_id}:{kind}:missed'
+COUNTER_TTL = 24 * 60 * 60
+
+
+def _key(user_id, kind):
+    return COUNTER_KEY.format(user_id=user_id, kind=kind)
+
+
+def _missed_key(user_id, kind):
+    return MISSED_KEY.format(user_id=user_id, kind=kind)
+
+
+def _note_missed(user_id, kind):
+    key = _missed_key(user_id, kind)
+    if cache.add(key, 1, COUNTER_TTL):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, COUNTER_TTL)
+
+
+def count_unread_messages(user_id):
+    from api.models import Message
+    return Message.objects.filter(
+        conversation__participants=user_id, is_read=False,
+    ).exclude(sender_id=user_id).count()
+
+
+def count_unread_notifications(user_id):
+    from api.models import Notification
+    return Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+
+
+_COUNTERS = {'messages': count_unread_messages, 'notifications': count_unread_notifications}
+
+
+def get_counts(user_id):
+    """{'messages': n, 'notifications': n} — from the cache, recounting only missing kinds."""
+    keys = {kind: _key(user_id, kind) for kind in KINDS}
+    cached = cache.get_many(list(keys.values()))
+    counts = {kind: cached[key] for kind, key in keys.items() if key in cached}
+    missing = [kind for kind in KINDS if kind not in counts]
+    if not missing:
+        return counts
+    missed_keys = {kind: _missed_key(user_id, kind) for kind in missing}
+    missed_before = cache.get_many(list(missed_keys.values()))
+    for kind in missing:
+        counts[kind] = _COUNTERS[kind](user_id)
+        # add(), not set(): a concurrent get_counts() may have seeded it meanwhile.
+        cache.add(keys[kind], counts[kind], COUNTER_TTL)
+    # An adjust() that ran between the recount and the add() found no key and was lost:
+    # drop the seeded value so the next read recounts.
+    missed_after = cache.get_many(list(missed_keys.values()))
+    stale = [keys[kind] for kind, key in missed_keys.items() if missed_after.get(key) != missed_before.get(key)]
+    if stale:
+        cache.delete_many(stale)
+    return counts
+
+
+def _push(user_id, deltas, counts):
+    from api.consumers import send_user_update
+    send_user_update(user_id, deltas=deltas, counts=counts)
+
+
+def adjust(user_id, kind, delta):
+    """Atomically moves one counter by `delta` and pushes the result to the user's sockets.
+    A counter that isn't cached stays uncached (the consumer then falls back to get_counts)."""
+    if not delta:
+        return None
+    key = _key(user_id, kind)
+    try:
+        value = cache.incr(key, delta)
+    except ValueError:
+        value = None  # not cached — nothing to keep in step
+        _note_missed(user_id, kind)
+    if value is not None and value < 0:
+        # Drifted below zero (a decrement we'd already counted out) — recount next read.
+        cache.delete(key)
+        value = None
+    _push(user_id, {kind: delta}, {kind: value} if value is not None else {})
+    return value
+
+
+def set_count(user_id, kind, value):
+    cache.set(_key(user_id, kind), value, COUNTER_TTL)
+    _push(user_id, {}, {kind: value})
+
+
+def invalidate(*user_ids, kind=None):
+    """Forgets counters that can no longer be adjusted precisely; they're recounted on next read."""
+    kinds = (kind,) if kind else KINDS
+    cache.delete_many([_key(user_id, k) for user_id in user_ids for k in kinds])
+    for user_id in user_ids:
+        _push(user_id, {}, {})
+
+
+def mark_conversation_read(conversation_id, reader_id):
+    """Marks every unread message in a conversation not sent by `reader_id` as read, and moves
+    each participant's counter by exactly the messages that stopped counting for them.
+    (Message.is_read is shared by the conversation, so in a group the other members' unread
+    counts drop too — except for the messages they sent themselves.)"""
+    from django.db.models import Count
+    from api.models import Conversation, Message
+
+    unread = Message.objects.filter(conversation_id=conversation_id, is_read=False).exclude(sender_id=reader_id)
+    by_sender = dict(unread.values('sender_id').annotate(n=Count('id')).values_list('sender_id', 'n'))
+    updated = unread.update(is_read=True)
+    if not updated:
+        return 0
+    total = sum(by_sender.values())
+    participant_ids = Conversation.participants.through.objects.filter(
+        conversation_id=conversation_id,
+    ).values_list('user_id', flat=True)
+    for participant_id in participant_ids:
+        adjust(participant_id, 'messages', -(total - by_sender.get(participant_id, 0)))
+    return updated
+
+
+def db_counts(user_ids):
+    """Exact DB counts for many users in two grouped queries: {user_id: {'messages', 'notifications'}}."""
+    from django.db.models import Count, F
+    from api.models import Message, Notification
+
+    user_ids = list(user_ids)
+    counts = {user_id: dict.fromkeys(KINDS, 0) for user_id in user_ids}
+    messages = (
+        Message.objects.annotate(reader_id=F('conversation__participants'))
+        .filter(reader_id__in=user_ids, is_read=False)
+        .exclude(sender_id=F('reader_id'))
+        .values('reader_id').annotate(n=Count('id')).values_list('reader_id', 'n')
+    )
+    for user_id, n in messages:
+        counts[user_id]['messages'] = n
+    notifications = (
+        Notification.objects.filter(recipient_id__in=user_ids, is_read=False)
+        .values('recipient_id').annotate(n=Count('id')).values_list('recipient_id', 'n')
+    )
+    for user_id, n in notifications:
+        counts[user_id]['notifications'] = n
+    return counts
+
+
+def reconcile(user_ids):
+    """Compares cached counters for `user_ids` with the DB and repairs any that drifted.
+    Users without cached counters are skipped — they'll be counted fresh on next read.
+    Returns the number of counters corrected."""
+    user_ids = list(user_ids)
+    keys = {(user_id, kind): _key(user_id, kind) for user_id in user_ids for kind in KINDS}
+    cached = cache.get_many(list(keys.values()))
+    tracked = {user_id for (user_id, _), key in keys.items() if key in cached}
+    if not tracked:
+        return 0
+    actual = db_counts(tracked)
+    corrected = 0
+    for user_id in tracked:
+        fixes = {}
+        for kind in KINDS:
+            key = keys[(user_id, kind)]
+            if key in cached and cached[key] != actual[user_id][kind]:
+                fixes[kind] = actual[user_id][kind]
+        if fixes:
+            cache.set_many({_key(user_id, kind): value for kind, value in fixes.items()}, COUNTER_TTL)
+            _push(user_id, {}, fixes)
+            corrected += len(fixes)
+            logger.info("Unread counters for user %s drifted; corrected %s", user_id, fixes)
+    return corrected
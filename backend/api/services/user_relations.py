@@ -0,0 +1,43 @@
+"""
+Per-user social relation sets (follows, follow requests, blocks, mutes) for the serializers'
+viewer-relative flags (is_following, is_blocked, private-profile redaction, ...).
+
+These sets are small next to a user's likes/bookmarks, and nearly every serialized object
+consults following_ids, so they're loaded whole — but kept in the Django cache for
+RELATIONS_TTL instead of six queries per request. The Follow/FollowRequest/Block/Mute
+signals in api.models drop the entry for both users a change touches (the *_me sets are the
+other side's view of the same row).
+"""
+from django.core.cache import cache
+
+RELATIONS_CACHE_KEY = 'user_relations:{user_id}'
+RELATIONS_TTL = 5 * 60
+
+SOCIAL_RELATIONS = (
+    'following_ids', 'requested_ids', 'requested_me_ids', 'blocked_ids', 'blocked_me_ids', 'muted_ids',
+)
+
+
+def _load(user_id):
+    from api.models import Block, Follow, FollowRequest, Mute
+    return {
+        'following_ids': set(Follow.objects.filter(follower_id=user_id).values_list('following_id', flat=True)),
+        'requested_ids': set(FollowRequest.objects.filter(sender_id=user_id).values_list('receiver_id', flat=True)),
+        'requested_me_ids': set(FollowRequest.objects.filter(receiver_id=user_id).values_list('sender_id', flat=True)),
+        'blocked_ids': set(Block.objects.filter(blocker_id=user_id).values_list('blocked_id', flat=True)),
+        'blocked_me_ids': set(Block.objects.filter(blocked_id=user_id).values_list('blocker_id', flat=True)),
+        'muted_ids': set(Mute.objects.filter(muter_id=user_id).values_list('muted_id', flat=True)),
+    }
+
+
+def get_social_relations(user_id):
+    key = RELATIONS_CACHE_KEY.format(user_id=user_id)
+    relations = cache.get(key)
+    if relations is None:
+        relations = _load(user_id)
+        cache.set(key, relations, RELATIONS_TTL)
+    return relations
+
+
+def invalidate_social_relations(*user_ids):
+    cache.delete_many([RELATIONS_CACHE_KEY.format(user_id=user_id) for user_id in user_ids if user_id])
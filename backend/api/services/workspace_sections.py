@@ -0,0 +1,258 @@
+"""
+Sectioned storage for Devs-workspace boards (core.models.WorkspaceState / WorkspaceSection).
+
+A board used to be a single JSON blob — Kanban tasks and columns, GDD docs, the asset
+registry, translation keys, glossary and a handful of settings — rewritten whole on every
+save and read whole by every server-side reader that needed one list of it. Now the six
+large lists are WorkspaceSection rows with a version each:
+
+    tasks, columns, docs (the blob's `gddDocs`), assets, translationKeys, glossary
+
+and everything else (categories, the activity feed, balancing tables, language settings)
+stays in WorkspaceState.data as the `meta` section, versioned by WorkspaceState.meta_version.
+WorkspaceState.version is still bumped by every write, whichever section it touched, so the
+full-blob API (GET/POST /workspace-state/) keeps its exact behaviour on top of the sections:
+snapshot() rebuilds the blob, write_blob() stores only the sections that actually changed.
+
+Section API (WorkspaceStateViewSet.sections):
+    GET  ?names=tasks,columns  -> {'key', 'version', 'sections': {name: {'data', 'version'}}}
+    POST {'tool', 'sections': {name: {'data', 'base_version'}}, 'ops': [...]}
+A whole-section write whose base_version is stale fails the request with a 409 (nothing is
+written), but only against that section's own version, so edits to different tools no longer
+conflict. Ops edit one item of a list section by id, against whatever is current:
+    {'section': 'tasks', 'op': 'upsert', 'value': {'id': ..., ...}}  replace in place, else append
+    {'section': 'tasks', 'op': 'remove', 'id': ...}
+    {'section': 'meta', 'op': 'set', 'field': 'activities', 'value': [...]}
+
+Writers must hold the WorkspaceState row lock (select_for_update), as every board write
+already does.
+"""
+from django.utils import timezone
+
+SECTION_FIELDS = {
+    'tasks': 'tasks',
+    'columns': 'columns',
+    'docs': 'gddDocs',
+    'assets': 'assets',
+    'translationKeys': 'translationKeys',
+    'glossary': 'glossary',
+}
+FIELD_SECTIONS = {field: name for name, field in SECTION_FIELDS.items()}
+META = 'meta'
+NAMES = (*SECTION_FIELDS, META)
+# The Devs tool whose write permission (permission_catalog.TOOL_WRITE_PERMISSIONS) a section
+# write is authorised against. `meta` mixes every tool's settings: the request's own `tool`.
+SECTION_TOOLS = {
+    'tasks': 'kanban',
+    'columns': 'kanban',
+    'docs': 'gdd',
+    'assets': 'assets',
+    'translationKeys': 'localisation',
+    'glossary': 'localisation',
+}
+
+
+class SectionError(ValueError):
+    """Unknown section name or malformed op."""
+
+
+class SectionConflict(Exception):
+    def __init__(self, names):
+        super().__init__(f'Stale sections: {", ".join(names)}')
+        self.names = names
+
+
+def check_names(names):
+    unknown = sorted(set(names) - set(NAMES))
+    if unknown:
+        raise SectionError(f'Unknown section: {", ".join(unknown)}')
+
+
+def split(blob):
+    """(meta, {section name: data}) for a full board blob."""
+    meta = {field: value for field, value in blob.items() if field not in FIELD_SECTIONS}
+    sections = {FIELD_SECTIONS[field]: value for field, value in blob.items() if field in FIELD_SECTIONS}
+    return meta, sections
+
+
+# --- Reads -------------------------------------------------------------------------------
+
+def read(state, names):
+    """{name: {'data', 'version'}} for just these sections of `state` (None or unsaved: all
+    empty). A section that was never written has data None and version 0."""
+    from core.models import WorkspaceSection
+
+    names = list(names)
+    check_names(names)
+    result = {name: {'data': None, 'version': 0} for name in names}
+    if state is None or state.pk is None:
+        return result
+    if META in result:
+        result[META] = {'data': state.data or {}, 'version': state.meta_version}
+    rows = WorkspaceSection.objects.filter(state=state, name__in=[n for n in names if n != META])
+    for name, data, version in rows.values_list('name', 'data', 'version'):
+        result[name] = {'data': data, 'version': version}
+    return result
+
+
+def versions(state, names):
+    """{name: version} for these sections, without loading their content."""
+    from core.models import WorkspaceSection
+
+    names = list(names)
+    check_names(names)
+    result = dict.fromkeys(names, 0)
+    if state is None or state.pk is None:
+        return result
+    if META in result:
+        result[META] = state.meta_version
+    rows = WorkspaceSection.objects.filter(state=state, name__in=[n for n in names if n != META])
+    result.update(rows.values_list('name', 'version'))
+    return result
+
+
+def read_data(state, name, default=None):
+    """One section's content, or `default` if it was never written."""
+    data = read(state, [name])[name]['data']
+    return default if data is None else data
+
+
+def snapshot(state):
+    """(full blob, {section name: version}) — what the full-blob API serves."""
+    from core.models import WorkspaceSection
+
+    blob = dict(state.data or {}) if state is not None else {}
+    versions = {META: state.meta_version if state is not None else 0}
+    if state is not None and state.pk is not None:
+        for name, data, version in WorkspaceSection.objects.filter(state=state).values_list('name', 'data', 'version'):
+            if name not in SECTION_FIELDS:
+                continue
+            versions[name] = version
+            if data is not None:
+                blob[SECTION_FIELDS[name]] = data
+    return blob, versions
+
+
+# --- Writes ------------------------------------------------------------------------------
+
+def _item_id(item):
+    return item.get('id') if isinstance(item, dict) else None
+
+
+def apply_op(name, value, op):
+    """`value` (a section's current content) with one op applied."""
+    kind = op.get('op')
+    if name == META:
+        field = op.get('field')
+        if kind != 'set' or not isinstance(field, str) or not field or field in FIELD_SECTIONS:
+            raise SectionError('meta only supports {"op": "set", "field", "value"} on non-section fields')
+        meta = dict(value or {})
+        meta[field] = op.get('value')
+        return meta
+
+    items = list(value or [])
+    if kind == 'upsert':
+        item = op.get('value')
+        if _item_id(item) is None:
+            raise SectionError('upsert needs a "value" object with an "id"')
+        for index, existing in enumerate(items):
+            if _item_id(existing) == item['id']:
+                items[index] = item
+                return items
+        items.append(item)
+        return items
+    if kind == 'remove':
+        if op.get('id') is None:
+            raise SectionError('remove needs an "id"')
+        kept = [existing for existing in items if _item_id(existing) != op['id']]
+        return value if len(kept) == len(items) else kept
+    raise SectionError(f'Unknown op: {kind!r}')
+
+
+def write(state, sections=None, ops=None, bump=True):
+    """
+    Applies whole-section writes ({name: (data, base_version or None)}) and then `ops` to a
+    locked, saved `state`. Raises SectionConflict (nothing written) if any base_version is
+    stale, SectionError for bad names/ops. Only sections whose content actually changes are
+    stored; each gets its version bumped, and — with `bump` — so does the board's.
+    Returns {name: new version} for the changed sections.
+    """
+    from core.models import WorkspaceSection
+
+    sections, ops = sections or {}, ops or []
+    for op in ops:
+        if not isinstance(op, dict) or not isinstance(op.get('section'), str):
+            raise SectionError('Each op must be an object with a "section"')
+    current = read(state, set(sections) | {op.get('section') for op in ops})
+
+    stale = sorted(
+        name for name, (_, base_version) in sections.items()
+        if base_version is not None and base_version != current[name]['version']
+    )
+    if stale:
+        raise SectionConflict(stale)
+
+    # A whole section written as None (a field missing from a full blob) is cleared: emptied
+    # if it holds anything, left unwritten if it never did.
+    new = {
+        name: [] if data is None and current[name]['data'] is not None else data
+        for name, (data, _) in sections.items()
+    }
+    for op in ops:
+        name = op['section']
+        new[name] = apply_op(name, new.get(name, current[name]['data']), op)
+    changed = {name: data for name, data in new.items() if data is not None and data != current[name]['data']}
+    if not changed:
+        return {}
+
+    versions = {name: current[name]['version'] + 1 for name in changed}
+    now = timezone.now()
+    created = []
+    for name, data in changed.items():
+        if name == META:
+            continue
+        if current[name]['version']:
+            WorkspaceSection.objects.filter(state=state, name=name).update(data=data, version=versions[name], updated_at=now)
+        else:
+            created.append(WorkspaceSection(state=state, name=name, data=data, version=versions[name]))
+    if created:
+        WorkspaceSection.objects.bulk_create(created)
+
+    update_fields = ['updated_at']
+    if META in changed:
+        state.data = changed[META]
+        state.meta_version = versions[META]
+        update_fields += ['data', 'meta_version']
+    if bump:
+        state.version = state.version + 1
+        update_fields.append('version')
+    state.save(update_fields=update_fields)
+    return versions
+
+
+def write_blob(state, blob, bump=True):
+    """The full-blob write: every section takes the blob's value (a field missing from the
+    blob empties its section, as overwriting the whole blob used to), without version checks.
+    Unchanged sections keep their versions."""
+    meta, sections = split(blob)
+    changes = {name: (sections.get(name), None) for name in SECTION_FIELDS}
+    changes[META] = (meta, None)
+    return write(state, changes, bump=bump)
+
+
+def absorb_blob_fields(state):
+    """
+    Moves section fields that were written straight into WorkspaceState.data (a model-level
+    save — admin, fixtures, code predating the sections) into their section rows, leaving
+    the rest as `meta`. The board version is left alone: the content hasn't changed.
+    """
+    from django.db import transaction
+    from core.models import WorkspaceState
+
+    if not isinstance(state.data, dict) or not any(field in FIELD_SECTIONS for field in state.data):
+        return
+    meta, sections = split(state.data)
+    with transaction.atomic():
+        locked = WorkspaceState.objects.select_for_update().get(pk=state.pk)
+        write(locked, {**{name: (data, None) for name, data in sections.items()}, META: (meta, None)}, bump=False)
+    state.data, state.meta_version = locked.data, locked.meta_version
@@ -1,10 +1,9 @@
-import requests
-import time
 import json
 from django.conf import settings
 from api.models import LibraryEntry
 from core.models import Game
 from core.utils import is_xbox_non_game, normalize_xbox_title, normalize_game_title
+from api.services import http_client
 
 
 def fetch_xbox_games(xuid, xsts_token, user_hash):
@@ -20,7 +19,7 @@ def fetch_xbox_games(xuid, xsts_token, user_hash):
 
     try:
         url = f"https://titlehub.xboxlive.com/users/xuid({xuid})/titles/titlehistory/decoration/detail,stat"
-        response = requests.get(url, headers=headers, timeout=15)
+        response = http_client.get('xbox_live', url, headers=headers, timeout=15)
         response.raise_for_status()
         data = response.json()
         
@@ -101,7 +100,7 @@ def _search_igdb_for_game(title):
     search_query = f'search "{safe_title}"; fields id, name, category, version_parent, parent_game; limit 10;'
     
     try:
-        resp = requests.post('https://api.igdb.com/v4/games', headers=headers, data=search_query, timeout=10)
+        resp = http_client.post('igdb', 'https://api.igdb.com/v4/games', headers=headers, data=search_query, timeout=10)
         if resp.status_code != 200 or not resp.json():
             return None, None
         
@@ -164,7 +163,7 @@ def _ensure_cover(game):
         return game
     try:
         headers = {'Client-ID': IGDB_CLIENT_ID, 'Authorization': f'Bearer {token}'}
-        resp = requests.post(
+        resp = http_client.post('igdb',
             'https://api.igdb.com/v4/games',
             headers=headers,
             data=f"fields cover.url; where id = {game.igdb_id};",
@@ -335,8 +334,6 @@ def sync_xbox_library(user, xuid, xsts_token, user_hash):
             else:
                 stats['created'] += 1
             
-            # Rate limit IGDB calls
-            time.sleep(0.25)
             
         except Exception as e:
             stats['errors'] += 1
@@ -1,9 +1,12 @@
+from unittest import skipUnless
+
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from rest_framework.test import APIClient
 from rest_framework import status
 
 from api.models import User
+from api.services import workspace_sections
 from core.models import Organisation, OrganisationMember, Review
 
 
@@ -13,6 +16,23 @@ def make_user(username, **extra):
     )
 
 
+def isolate_search_index(test):
+    """Points SEARCH_INDEX_DIR at a per-test temp dir and starts from empty in-memory indexes,
+    so a test that searches never reads or writes the working tree's snapshots."""
+    import tempfile
+    from django.core.cache import cache
+    from api.services import search_index
+    cache.clear()
+    search_index.reset()
+    index_dir = tempfile.TemporaryDirectory()
+    test.addCleanup(index_dir.cleanup)
+    test.addCleanup(search_index.reset)
+    override = test.settings(SEARCH_INDEX_DIR=index_dir.name)
+    override.enable()
+    test.addCleanup(override.disable)
+    return index_dir.name
+
+
 class OrganisationTakeoverTests(TestCase):
     """Regression tests for the org-membership/invitation self-escalation bugs (P0 #1, #2):
     previously any authenticated user could POST themselves into any organisation as admin,
@@ -73,6 +93,7 @@ class UserSerializerPrivacyTests(TestCase):
     """
 
     def setUp(self):
+        isolate_search_index(self)
         self.viewer = make_user('viewer')
         self.other = make_user('other', phone_number='+15551234567')
         self.client = APIClient()
@@ -420,6 +441,189 @@ class LocalisationContributorsTests(TestCase):
         self.assertIsNotNone(resp.data['next'])
 
 
+class LocalisationRollupTests(TestCase):
+    """Covers the incrementally maintained localisation rollups (api.services.
+    localisation_rollups): every suggestion transition leaves them equal to an exact recount,
+    and the public progress endpoint reads them."""
+
+    def setUp(self):
+        from core.models import Project
+
+        self.owner = make_user('rollupowner')
+        self.translator = make_user('rolluptranslator')
+        self.other = make_user('rollupother')
+        self.project = Project.objects.create(owner=self.owner, title='Rollup Game', description='desc')
+        self.client = APIClient()
+
+    def _rows(self):
+        from api.models import LocalisationContribution, LocalisationProgress
+        progress = {
+            (row.language,): [row.approved_keys, row.pending_keys]
+            for row in LocalisationProgress.objects.filter(project=self.project)
+        }
+        contributions = {
+            (row.author_id, row.language): [row.characters, row.translations]
+            for row in LocalisationContribution.objects.filter(project=self.project, translations__gt=0)
+        }
+        return progress, contributions
+
+    def assertMatchesRecount(self):
+        from api.services import localisation_rollups
+        progress, contributions = localisation_rollups.compute(self.project.id)
+        self.assertEqual(self._rows(), (
+            {key: values for key, values in progress.items()},
+            {key: values for key, values in contributions.items() if values[1]},
+        ))
+
+    def test_transitions_keep_rollups_equal_to_a_recount(self):
+        from api.views import _approve_community_translation
+        from core.models import CommunityTranslation
+
+        mine = CommunityTranslation.objects.create(
+            project=self.project, key='menu.play', namespace='menu', language='tr',
+            author=self.translator, text='Oyna',
+        )
+        theirs = CommunityTranslation.objects.create(
+            project=self.project, key='menu.play', namespace='menu', language='tr',
+            author=self.other, text='Başla',
+        )
+        plural = CommunityTranslation.objects.create(
+            project=self.project, key='hud.coins', namespace='hud', language='tr', author=self.translator,
+            text='altın', plural_forms={'one': 'altın', 'other': 'altınlar'}, status='approved',
+        )
+        self.assertMatchesRecount()
+        progress, contributions = self._rows()
+        # Two suggestions for one key still count as one key awaiting review.
+        self.assertEqual(progress['tr',], [1, 1])
+        self.assertEqual(contributions[self.translator.id, 'tr'], [len('altın') + len('altınlar'), 1])
+
+        _approve_community_translation(mine, self.owner)
+        self.assertMatchesRecount()
+        _approve_community_translation(theirs, self.owner)  # unapproves `mine`
+        self.assertMatchesRecount()
+        self.assertEqual(self._rows()[0]['tr',], [2, 1])
+
+        theirs.refresh_from_db()
+        theirs.text = 'Başlat'
+        theirs.save()
+        mine.refresh_from_db()
+        mine.status = 'rejected'
+        mine.save()
+        self.assertMatchesRecount()
+        self.assertEqual(self._rows()[0]['tr',], [2, 0])
+
+        self.client.force_authenticate(user=self.owner)
+        resp = self.client.post(
+            f'/api/projects/{self.project.id}/localisation/rename-key/', {'old_key': 'menu.play', 'new_key': 'menu.start'},
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        plural.delete()
+        self.assertMatchesRecount()
+        self.assertEqual(self._rows()[1][self.other.id, ''], [len('Başlat'), 1])
+
+    def test_untracked_project_is_counted_on_first_read_and_progress_endpoint(self):
+        from api.models import LocalisationProgress
+        from core.models import CommunityTranslation
+
+        CommunityTranslation.objects.create(
+            project=self.project, key='menu.play', namespace='menu', language='de',
+            author=self.translator, text='Spielen', status='approved',
+        )
+        CommunityTranslation.objects.create(
+            project=self.project, key='menu.quit', namespace='menu', language='de',
+            author=self.other, text='Beenden',
+        )
+        # As if the rows predated the rollup.
+        LocalisationProgress.objects.filter(project=self.project).delete()
+        self.assertFalse(LocalisationProgress.objects.filter(project=self.project).exists())
+
+        resp = self.client.get(f'/api/projects/{self.project.id}/localisation/progress/')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['total_keys'], 0)
+        by_code = {entry['code']: entry for entry in resp.data['languages']}
+        self.assertEqual((by_code['de']['approved_keys'], by_code['de']['pending_keys']), (1, 1))
+        self.assertEqual(by_code['tr']['approved_keys'], 0)
+        self.assertMatchesRecount()
+
+
+class CommunityTranslationChangeFeedTests(TestCase):
+    """Covers /community-translations/changes/ (api.services.translation_sync): a snapshot, then
+    only the rows written, voted on, rejected or deleted after the cursor; and paging within
+    one change number."""
+
+    def setUp(self):
+        from core.models import CommunityTranslation, Project
+
+        self.owner = make_user('feedowner')
+        self.translator = make_user('feedtranslator')
+        self.project = Project.objects.create(owner=self.owner, title='Feed Game', description='desc')
+        self.rows = [
+            CommunityTranslation.objects.create(
+                project=self.project, key=f'menu.item{i}', namespace='menu', language='tr',
+                author=self.translator, text=f'Öğe {i}',
+            )
+            for i in range(4)
+        ]
+        self.client = APIClient()
+
+    def _changes(self, **params):
+        resp = self.client.get('/api/community-translations/changes/', {'project': self.project.id, **params})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        return resp.data
+
+    def test_snapshot_then_only_changes_after_the_cursor(self):
+        from api.views import _approve_community_translation
+        from core.models import CommunityTranslation
+
+        snapshot = self._changes()
+        self.assertEqual(sorted(r['id'] for r in snapshot['results']), sorted(row.id for row in self.rows))
+        self.assertFalse(snapshot['has_more'])
+        self.assertEqual(self._changes(since=snapshot['cursor'])['results'], [])
+
+        edited, voted, rejected, deleted = self.rows
+        edited.refresh_from_db()
+        edited.text = 'Yeni öğe'
+        edited.save()
+        self.client.force_authenticate(user=self.owner)
+        self.client.post('/api/likes/', {'community_translation': voted.id})
+        self.client.post(f'/api/community-translations/{rejected.id}/reject/')
+        self.client.delete(f'/api/community-translations/{deleted.id}/')
+        added = CommunityTranslation.objects.create(
+            project=self.project, key='menu.quit', namespace='menu', language='tr', author=self.owner, text='Çık',
+        )
+        _approve_community_translation(added, self.owner)
+
+        delta = self._changes(since=snapshot['cursor'])
+        by_id = {r['id']: r for r in delta['results']}
+        self.assertEqual(set(by_id), {edited.id, voted.id, added.id})
+        self.assertEqual(by_id[edited.id]['text'], 'Yeni öğe')
+        self.assertEqual(by_id[voted.id]['votes_count'], 1)
+        self.assertEqual(by_id[added.id]['status'], 'approved')
+        self.assertEqual(sorted(delta['deleted']), sorted([rejected.id, deleted.id]))
+        self.assertEqual(self._changes(since=delta['cursor']), {
+            'cursor': delta['cursor'], 'has_more': False, 'results': [], 'deleted': [],
+        })
+        with_rejected = self._changes(since=snapshot['cursor'], include_rejected='true')
+        self.assertIn(rejected.id, {r['id'] for r in with_rejected['results']})
+
+    def test_pages_split_rows_sharing_a_change_number(self):
+        from core.models import CommunityTranslation
+
+        # Stamped together, as a bulk import batch is.
+        CommunityTranslation.objects.filter(project=self.project).update(sync_seq=1)
+        seen, cursor = [], None
+        for _ in range(10):
+            page = self._changes(limit=3, **({'since': cursor} if cursor else {}))
+            seen += [r['id'] for r in page['results']]
+            cursor = page['cursor']
+            if not page['has_more']:
+                break
+        self.assertEqual(sorted(seen), sorted(row.id for row in self.rows))
+
+        resp = self.client.get('/api/community-translations/changes/', {'project': self.project.id, 'since': 'x'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+
 def _strip_outer_parens(expr):
     expr = expr.strip()
     while expr.startswith('(') and expr.endswith(')'):
@@ -722,11 +926,77 @@ class LocalisationFormatRoundTripTests(TestCase):
         with self.assertRaises(ValueError):
             xliff12.parse(malicious, project_locales=[self.tr], source_locale=self.en)
 
-    def test_xliff_import_rejects_oversized_file(self):
-        from api.services.localisation_formats import xliff12
-        huge = b'<xliff>' + b'a' * (5 * 1024 * 1024 + 1) + b'</xliff>'
-        with self.assertRaises(ValueError):
-            xliff12.parse(huge, project_locales=[self.tr], source_locale=self.en)
+    def test_incremental_parsers_are_independent_of_chunk_boundaries(self):
+        # Every format's iter_parse reads the upload in _stream.CHUNK_SIZE pieces (XLIFF through
+        # iterparse's own buffering); tiny chunks split lines, JSON tokens and UTF-8 sequences.
+        import io
+        from unittest import mock
+        from api.services.localisation_formats import FORMATS, _stream, iter_parse_file
+
+        def parse(fmt, raw):
+            warnings = []
+            entries = list(iter_parse_file(fmt, io.BytesIO(raw), project_locales=[self.tr, self.ru], source_locale=self.en, warnings=warnings))
+            return entries, warnings
+
+        for fmt, module in FORMATS.items():
+            raw = module.export(self.bundle, language='all' if module.SUPPORTS_MULTI_LANGUAGE else 'ru')
+            with self.subTest(fmt=fmt):
+                expected = parse(fmt, raw)
+                self.assertTrue(expected[0])
+                with mock.patch.object(_stream, 'CHUNK_SIZE', 3):
+                    self.assertEqual(parse(fmt, raw), expected)
+
+        raw = '{"a": "x\\u00e7 ç", "b": {"tr": "çğ 😀", "en": "B"}, "n": 12345, "": "e", "c": [1, 2]}'.encode()
+        with mock.patch.object(_stream, 'CHUNK_SIZE', 2):
+            entries, warnings = parse('flat_json', raw)
+        self.assertEqual([(e.key, e.base_text) for e in entries], [('a', 'xç ç'), ('b', 'B')])
+        self.assertEqual(entries[1].translations, {'tr': {'text': 'çğ 😀'}})
+        self.assertEqual(warnings, ['Skipped "n": unsupported value type.', 'Skipped a row with an empty key.', 'Skipped "c": unsupported value type.'])
+        for broken in (b'{"a": "x",', b'{"a" "x"}', b'["a"]', b'{"a": "x"} trailing', b''):
+            with self.subTest(broken=broken), self.assertRaises(ValueError):
+                parse('flat_json', broken)
+
+    def test_json_reader_grows_values_geometrically_and_fails_fast(self):
+        import io
+        import json
+        from unittest import mock
+        from api.services.localisation_formats import _stream
+
+        class CountingStream(io.BytesIO):
+            reads = 0
+
+            def read(self, size=-1):
+                self.reads += 1
+                return super().read(size)
+
+        decodes = []
+        raw_decode = json.JSONDecoder.raw_decode
+
+        def counting_decode(decoder, text, idx=0):
+            decodes.append(idx)
+            return raw_decode(decoder, text, idx)
+
+        members = {f'k{i}': 'x' * 40 for i in range(6000)}  # one ~300KB member value
+        raw = json.dumps({'big': members, 'n': -0.5e-3}).encode()
+        with mock.patch.object(_stream, 'CHUNK_SIZE', 1024), \
+                mock.patch.object(json.JSONDecoder, 'raw_decode', counting_decode):
+            parsed = dict(_stream.iter_json_object(io.BytesIO(raw), not_an_object='no'))
+        self.assertEqual(parsed, {'big': members, 'n': -0.5e-3})
+        self.assertLess(len(decodes), 30)  # a chunk at a time: ~300 re-decodes of the value
+
+        # A syntax error early in a large value is reported without reading the rest.
+        broken = CountingStream(b'{"big": {"a": 1 "b": 2, ' + json.dumps(members).encode()[1:] + b'}')
+        with mock.patch.object(_stream, 'CHUNK_SIZE', 1024), self.assertRaises(ValueError):
+            list(_stream.iter_json_object(broken, not_an_object='no'))
+        self.assertLess(broken.reads, 3)
+
+        # Numbers split mid-token at a chunk edge ('-0.', '5e-') still decode whole.
+        for size in range(1, 8):
+            with mock.patch.object(_stream, 'CHUNK_SIZE', size):
+                self.assertEqual(
+                    dict(_stream.iter_json_object(io.BytesIO(b'{"a": -0.5e-3, "b": 12.25}'), not_an_object='no')),
+                    {'a': -0.5e-3, 'b': 12.25},
+                )
 
     # ── Round 2b: engine-specific formats ────────────────────────────────────
 
@@ -860,11 +1130,60 @@ class LocalisationExportImportEndpointTests(TestCase):
         )
         self.outsider = make_user('outsider')
         self.client = APIClient()
+        import tempfile
+        export_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(export_dir.cleanup)
+        override = self.settings(LOCALISATION_EXPORT_DIR=export_dir.name)
+        override.enable()
+        self.addCleanup(override.disable)
 
     def test_anonymous_can_export_approved(self):
         resp = self.client.get(f'/api/projects/{self.project.id}/localisation/export/', {'fmt': 'flat_json', 'language': 'tr'})
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
-        self.assertIn(b'Oyna', resp.content)
+        self.assertIn(b'Oyna', b''.join(resp.streaming_content))
+
+    def test_export_artifact_is_cached_per_content_version_with_etag(self):
+        from unittest import mock
+        from core.models import CommunityTranslation, WorkspaceState
+        from api.services.localisation_formats import canonical
+
+        url = f'/api/projects/{self.project.id}/localisation/export/'
+        params = {'fmt': 'gettext_po', 'language': 'tr'}
+        with mock.patch.object(canonical, 'build_bundle', wraps=canonical.build_bundle) as build:
+            first = self.client.get(url, params)
+            body = b''.join(first.streaming_content)
+            second = self.client.get(url, params)
+            self.assertEqual(b''.join(second.streaming_content), body)
+            self.assertEqual(build.call_count, 1)
+
+            etag = first['ETag']
+            self.assertEqual(second['ETag'], etag)
+            not_modified = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+            # A pending suggestion doesn't change the approved export; editing an approved one does.
+            CommunityTranslation.objects.create(
+                project=self.project, key='menu.play', namespace='menu', language='tr',
+                author=self.outsider, text='Oyna?', status='pending',
+            )
+            self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+            approved = CommunityTranslation.objects.get(author=self.owner)
+            approved.text = 'Oyna!'
+            approved.save()
+            changed = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(changed.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(changed['ETag'], etag)
+            self.assertIn('Oyna!'.encode(), b''.join(changed.streaming_content))
+            self.assertEqual(build.call_count, 2)
+
+            # So does a key edit through the board.
+            state = WorkspaceState.objects.get(pk=self.state.pk)
+            workspace_sections.write(state, ops=[{'section': 'translationKeys', 'op': 'upsert', 'value': {
+                'id': 'k2', 'key': 'menu.quit', 'namespace': 'menu', 'baseText': 'Quit',
+            }}])
+            edited = self.client.get(url, params, HTTP_IF_NONE_MATCH=changed['ETag'])
+            self.assertEqual(edited.status_code, status.HTTP_200_OK)
+            self.assertIn(b'menu.quit', b''.join(edited.streaming_content))
 
     def test_anonymous_cannot_export_pending(self):
         resp = self.client.get(f'/api/projects/{self.project.id}/localisation/export/', {'fmt': 'flat_json', 'language': 'tr', 'scope': 'approved_pending'})
@@ -888,8 +1207,7 @@ class LocalisationExportImportEndpointTests(TestCase):
         })
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertEqual(resp.data['keys_added'], 1)
-        self.state.refresh_from_db()
-        self.assertEqual(len(self.state.data['translationKeys']), 1)  # unchanged
+        self.assertEqual(len(workspace_sections.read_data(self.state, 'translationKeys')), 1)  # unchanged
 
     def test_import_commit_requires_permission(self):
         self.client.force_authenticate(user=self.outsider)
@@ -907,8 +1225,7 @@ class LocalisationExportImportEndpointTests(TestCase):
         })
         self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
         self.assertEqual(resp.data['keys_added'], 1)
-        self.state.refresh_from_db()
-        self.assertEqual(len(self.state.data['translationKeys']), 2)
+        self.assertEqual(len(workspace_sections.read_data(self.state, 'translationKeys')), 2)
 
     def test_import_commit_twice_by_same_user_updates_not_conflicts(self):
         from core.models import CommunityTranslation
@@ -947,6 +1264,128 @@ class LocalisationExportImportEndpointTests(TestCase):
         })
         self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
 
+    def test_bulk_translation_commit_counts_and_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from core.models import CommunityTranslation, WorkspaceState
+        from api.services.localisation_formats.canonical import ParsedEntry, ParsedImport, apply_import
+
+        state = WorkspaceState.objects.get(pk=self.state.pk)
+        workspace_sections.write(state, ops=[
+            {'section': 'translationKeys', 'op': 'upsert', 'value': {'id': 'k2', 'key': 'menu.quit', 'namespace': 'menu', 'baseText': 'Quit'}},
+            {'section': 'translationKeys', 'op': 'upsert', 'value': {
+                'id': 'k3', 'key': 'hud.coins', 'namespace': 'hud', 'baseText': 'coins', 'isPlural': True,
+                'basePlural': {'one': 'coin', 'other': 'coins'},
+            }},
+        ])
+        theirs = CommunityTranslation.objects.create(
+            project=self.project, key='menu.quit', namespace='menu', language='tr',
+            author=self.outsider, text='Çık', status='approved',
+        )
+        CommunityTranslation.objects.create(
+            project=self.project, key='hud.coins', namespace='hud', language='tr',
+            author=self.owner, text='altın', plural_forms={'one': 'altın', 'other': 'altın'}, status='pending',
+        )
+        parsed = ParsedImport(entries=[
+            ParsedEntry(key='hud.coins', translations={'tr': {'plural_forms': {'one': '1 altın', 'other': 'altınlar'}}}),
+            ParsedEntry(key='menu.play', translations={'tr': {'text': 'Oyna!'}}),
+            ParsedEntry(key='menu.quit', translations={'tr': {'text': 'Çıkış'}}),
+            ParsedEntry(key='hud.coins', translations={'tr': {'text': 'altın'}}),
+            ParsedEntry(key='nope.key', translations={'tr': {'text': 'x'}}),
+            ParsedEntry(key='menu.quit', translations={'tr': {'text': 'Çıkış!'}}),
+        ])
+        with CaptureQueriesContext(connection) as queries:
+            result, conflict = apply_import(
+                self.project, parsed, language='tr', user=self.owner, import_keys=False, import_translations=True,
+            )
+        self.assertFalse(conflict)
+        self.assertEqual(
+            (result.translations_created, result.translations_updated, result.skipped),
+            (1, 3, 2),
+        )
+        self.assertEqual(result.warnings, [
+            'Skipped "hud.coins": the key is pluralisable but the file only has a flat value.',
+            'Skipped translation for unknown key "nope.key".',
+        ])
+        # Board lock + section read, own rows, unapprove, update, insert, then the rollups'
+        # project lock, pending check and two read/write pairs — not per entry.
+        self.assertLessEqual(len(queries), 18)
+
+        approved = {
+            row.key: (row.text, row.author_id)
+            for row in CommunityTranslation.objects.filter(project=self.project, language='tr', status='approved')
+        }
+        self.assertEqual(approved, {
+            'menu.play': ('Oyna!', self.owner.id), 'menu.quit': ('Çıkış!', self.owner.id), 'hud.coins': ('altınlar', self.owner.id),
+        })
+        coins = CommunityTranslation.objects.get(key='hud.coins')
+        self.assertEqual(coins.plural_forms, {'one': '1 altın', 'other': 'altınlar'})
+        # One change-feed number for the whole batch, the demoted row included.
+        self.assertEqual(
+            len(set(CommunityTranslation.objects.filter(project=self.project, language='tr').values_list('sync_seq', flat=True))), 1,
+        )
+        from api.models import LocalisationContribution, LocalisationProgress
+        progress = LocalisationProgress.objects.get(project=self.project, language='tr')
+        # menu.quit's unapproved suggestion by the outsider is back in the review queue.
+        self.assertEqual((progress.approved_keys, progress.pending_keys), (3, 1))
+        characters = dict(
+            LocalisationContribution.objects.filter(project=self.project, language='tr').values_list('author_id', 'characters')
+        )
+        self.assertEqual(characters[self.owner.id], len('Oyna!') + len('Çıkış!') + len('1 altın') + len('altınlar'))
+        self.assertEqual(characters.get(self.outsider.id, 0), 0)
+        self.assertEqual(coins.approved_by, self.owner)
+        theirs.refresh_from_db()
+        self.assertEqual((theirs.status, theirs.approved_at), ('pending', None))
+
+    def test_import_parses_before_locking_and_rejects_a_file_broken_part_way(self):
+        from unittest import mock
+        from core.models import CommunityTranslation
+        from api import views
+        from api.services import localisation_formats
+        from api.services.localisation_formats import canonical
+
+        self.client.force_authenticate(user=self.owner)
+        url = f'/api/projects/{self.project.id}/localisation/import/'
+        valid = ''.join(f'"menu.k{i}": {{"en": "K{i}", "tr": "T{i}"}}, ' for i in range(30))
+        lock = mock.Mock(wraps=views._locked_project_workspace_state)
+        with mock.patch.object(canonical, 'IMPORT_BATCH_SIZE', 10), \
+                mock.patch.object(views, '_locked_project_workspace_state', lock):
+            upload = SimpleUploadedFile('strings.json', ('{' + valid + '"menu.bad": ').encode(), content_type='application/json')
+            resp = self.client.post(url, {
+                'file': upload, 'fmt': 'flat_json', 'language': 'tr', 'mode': 'commit',
+                'import_keys': 'true', 'import_translations': 'true',
+            })
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('Invalid JSON file', resp.data['error'])
+            # The parse failed before the board row was ever locked, so nothing was written.
+            lock.assert_not_called()
+            self.assertEqual(len(workspace_sections.read_data(self.state, 'translationKeys')), 1)
+            self.assertFalse(CommunityTranslation.objects.filter(key__startswith='menu.k').exists())
+
+            upload = SimpleUploadedFile('strings.json', ('{' + valid.rstrip(', ') + '}').encode(), content_type='application/json')
+            resp = self.client.post(url, {
+                'file': upload, 'fmt': 'flat_json', 'language': 'tr', 'mode': 'preview', 'import_keys': 'true',
+                'import_translations': 'true',
+            })
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertEqual((resp.data['keys_added'], resp.data['translations_created'], len(resp.data['sample'])), (30, 30, 10))
+
+            # Replayed from the spooled entries in three chunks under a single lock.
+            upload = SimpleUploadedFile('strings.json', ('{' + valid.rstrip(', ') + '}').encode(), content_type='application/json')
+            resp = self.client.post(url, {
+                'file': upload, 'fmt': 'flat_json', 'language': 'tr', 'mode': 'commit', 'import_keys': 'true',
+            })
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertEqual(resp.data['keys_added'], 30)
+            lock.assert_called_once()
+
+        with mock.patch.object(localisation_formats, 'MAX_IMPORT_BYTES', 100):
+            upload = SimpleUploadedFile('strings.json', ('{' + valid.rstrip(', ') + '}').encode(), content_type='application/json')
+            resp = self.client.post(url, {
+                'file': upload, 'fmt': 'flat_json', 'language': 'tr', 'mode': 'preview', 'import_keys': 'true',
+            })
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_import_with_no_flags_rejected(self):
         self.client.force_authenticate(user=self.owner)
         upload = SimpleUploadedFile('strings.json', b'{"menu.settings": "Settings"}', content_type='application/json')
@@ -1042,3 +1481,1553 @@ class RegistrationEnumerationTests(TestCase):
         }, format='json')
         self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
         self.assertEqual(resp.data.get('status'), 'verification_required')
+
+
+class ForYouFeedCandidateStoreTests(TestCase):
+    """Covers the incrementally-maintained FeedCandidate store behind FeedViewSet.for_you:
+    Post/Review/Like signals keep its counts exact, and the feed still surfaces (and excludes)
+    the right items when it reads from the store instead of scanning Post/Review directly."""
+
+    def setUp(self):
+        from core.models import Game
+        self.author = make_user('feedauthor')
+        self.reader = make_user('feedreader')
+        self.game = Game.objects.create(title='Feed Game')
+        self.client = APIClient()
+
+    def test_signals_keep_candidate_counts_in_sync(self):
+        from api.models import FeedCandidate
+        from core.models import Like, Post
+
+        post = Post.objects.create(user=self.author, content='hello feed')
+        reply = Post.objects.create(user=self.reader, content='a reply', parent=post)
+        like = Like.objects.create(user=self.reader, post=post)
+
+        candidate = FeedCandidate.objects.get(post=post)
+        self.assertEqual((candidate.likes_count, candidate.replies_count), (1, 1))
+        self.assertAlmostEqual(candidate.engagement_score, 1.3)
+        self.assertFalse(FeedCandidate.objects.filter(post=reply).exists())
+
+        like.delete()
+        reply.delete()
+        candidate.refresh_from_db()
+        self.assertEqual((candidate.likes_count, candidate.replies_count), (0, 0))
+        self.assertAlmostEqual(candidate.engagement_score, 0.0)
+
+    def test_for_you_reads_store_and_honours_not_interested(self):
+        from core.models import NotInterested, Post, Review
+
+        kept = Post.objects.create(user=self.author, content='keep me')
+        hidden = Post.objects.create(user=self.author, content='hide me')
+        review = Review.objects.create(user=self.author, game=self.game, rating=8, content='solid')
+        NotInterested.objects.create(user=self.reader, post=hidden)
+
+        self.client.force_authenticate(user=self.reader)
+        resp = self.client.get('/api/feed/for-you/')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        returned = {(item['type'], item['id']) for item in resp.data}
+        self.assertIn(('post', kept.id), returned)
+        self.assertIn(('review', review.id), returned)
+        self.assertNotIn(('post', hidden.id), returned)
+
+    def test_rebuild_matches_incremental_state(self):
+        from api.models import FeedCandidate
+        from api.services.feed_candidates import rebuild_candidates
+        from core.models import Like, Post
+
+        post = Post.objects.create(user=self.author, content='rebuild me')
+        Like.objects.create(user=self.reader, post=post)
+        before = FeedCandidate.objects.values_list('post_id', 'likes_count', 'replies_count').get(post=post)
+        rebuild_candidates()
+        after = FeedCandidate.objects.values_list('post_id', 'likes_count', 'replies_count').get(post=post)
+        self.assertEqual(before, after)
+
+
+class VectorizedForYouScoringTests(TestCase):
+    """score_items_for_user must reproduce the per-item For You formula bit for bit — it
+    replaced the per-item loops in FeedViewSet.for_you and Explore's mode=for_you."""
+
+    def test_batch_scores_match_per_item_formula(self):
+        from datetime import timedelta
+        from unittest import mock
+        from django.utils import timezone
+        from api.models import Follow, Interest
+        from api.serializers import count_subquery
+        from api.services import categorize
+        from core.models import Game, Like, Post
+
+        reader = make_user('scorereader')
+        followed = make_user('scorefollowed')
+        stranger = make_user('scorestranger')
+        Follow.objects.create(follower=reader, following=followed)
+        rpg = Interest.objects.create(name='RPG', slug='rpg')
+        horror = Interest.objects.create(name='Horror', slug='horror')
+        reader.interests.add(rpg)
+        game = Game.objects.create(title='Rpg Quest')
+        other_game = Game.objects.create(title='Elsewhere')
+
+        now = timezone.now()
+        tagged_post = Post.objects.create(user=followed, content='tagged')
+        tagged_post.interests.add(rpg, horror)
+        plain_post = Post.objects.create(user=stranger, content='plain')
+        Post.objects.filter(pk=plain_post.pk).update(timestamp=now - timedelta(days=3, microseconds=17))
+        Like.objects.create(user=reader, post=plain_post)
+        Post.objects.create(user=reader, content='reply', parent=plain_post)
+        untagged_review = Review.objects.create(user=stranger, game=game, rating=7, content='an rpg')
+        tagged_review = Review.objects.create(user=followed, game=other_game, rating=9, content='fine')
+        tagged_review.interests.add(horror)
+
+        posts = list(Post.objects.filter(pk__in=[tagged_post.pk, plain_post.pk]).annotate(
+            likes_count_ann=count_subquery(Like, 'post'),
+            replies_count_ann=count_subquery(Post, 'parent'),
+        ).prefetch_related('interests'))
+        reviews = list(Review.objects.filter(pk__in=[untagged_review.pk, tagged_review.pk])
+                       .select_related('game').prefetch_related('interests'))
+        items = posts + reviews
+
+        followed_ids = {followed.id}
+        interest_ids = {rpg.id}
+        keywords = categorize.expand_interest_keywords(['RPG'])
+        playtimes = {game.id: 0, other_game.id: 90}
+
+        with mock.patch.object(categorize.timezone, 'now', return_value=now + timedelta(hours=5)):
+            expected = [
+                categorize.score_review_for_user(item, reader, followed_ids, interest_ids, keywords, playtimes)
+                if isinstance(item, Review)
+                else categorize.score_post_for_user(item, reader, followed_ids, interest_ids)
+                for item in items
+            ]
+            actual = categorize.score_items_for_user(
+                items, reader, followed_ids, interest_ids,
+                interest_keywords=keywords, library_playtimes=playtimes,
+            )
+        self.assertEqual(actual, expected)
+
+
+class ClassificationWorkerTests(TestCase):
+    """Post/review embedding classification runs through one micro-batching worker
+    (api.services.classification_worker) with one encode() call per batch, instead of a
+    thread per item."""
+
+    def test_next_batch_drains_up_to_batch_size_and_full_queue_drops(self):
+        from unittest import mock
+        from api.services.classification_worker import ClassificationWorker
+
+        worker = ClassificationWorker(process_batch=lambda batch: None, maxsize=5, batch_size=3, batch_wait=0.01)
+        with mock.patch.object(worker, 'ensure_started'):
+            accepted = [worker.submit('post', i) for i in range(6)]
+        self.assertEqual(accepted, [True] * 5 + [False])
+        self.assertEqual(worker.metrics()['dropped'], 1)
+
+        first = worker.next_batch(timeout=0)
+        self.assertEqual([job[1] for job in first], [0, 1, 2])
+        worker.run_batch(first)
+        metrics = worker.metrics()
+        self.assertEqual((metrics['queue_depth'], metrics['batches'], metrics['items']), (2, 1, 3))
+        self.assertIsNotNone(metrics['p50_batch_seconds'])
+
+    def test_classify_batch_encodes_once_and_writes_results(self):
+        from unittest import mock
+        import numpy as np
+        from api.services import embeddings
+        from core.models import Game, Post
+
+        user = make_user('classifier')
+        game = Game.objects.create(title='Batch Game')
+        post = Post.objects.create(user=user, content='a deep rpg with skill trees')
+        empty_post = Post.objects.create(user=user, content='')
+        review = Review.objects.create(user=user, game=game, rating=8, content='loved the quests')
+
+        names = list(embeddings.INTEREST_DESCRIPTIONS)
+        dims = len(names)
+        interest_matrix = np.eye(dims, dtype=np.float32)
+        category_matrix = np.zeros((len(embeddings.CATEGORY_DESCRIPTIONS), dims), dtype=np.float32)
+        rpg = interest_matrix[names.index('RPG')]
+        encode = mock.Mock(side_effect=lambda texts: np.stack([rpg] * len(texts)))
+
+        with mock.patch.object(embeddings, '_encode_batch', encode), \
+                mock.patch.object(embeddings, '_get_interest_matrix', return_value=interest_matrix), \
+                mock.patch.object(embeddings, '_get_category_matrix', return_value=category_matrix):
+            processed = embeddings.classify_batch([
+                ('post', post.id, True), ('post', empty_post.id, True),
+                ('review', review.id, False), ('post', 999999, False),
+            ])
+
+        self.assertEqual(processed, 3)
+        encode.assert_called_once()
+        self.assertEqual(len(encode.call_args[0][0]), 2)
+        post.refresh_from_db()
+        empty_post.refresh_from_db()
+        self.assertEqual(post.category, embeddings.CATEGORY_FALLBACK)
+        self.assertEqual(empty_post.category, embeddings.CATEGORY_FALLBACK)
+        self.assertEqual([i.name for i in post.interests.all()], ['RPG'])
+        self.assertEqual([i.name for i in review.interests.all()], ['RPG'])
+
+    def test_external_mode_drains_pending_table(self):
+        from api.models import PendingClassification
+        from api.services.classification_worker import PendingTableWorker, enqueue
+
+        with self.settings(CLASSIFICATION_WORKER_MODE='external'):
+            enqueue('post', 1)
+            enqueue('post', 1, overwrite_category=True)
+            enqueue('review', 2)
+        self.assertEqual(PendingClassification.objects.count(), 2)
+
+        batches = []
+        worker = PendingTableWorker(process_batch=batches.append, batch_size=10, batch_wait=0, poll_interval=0)
+        worker.run(stop_when_idle=True, idle_timeout=0)
+        self.assertEqual(sorted(batches[0]), [('post', 1, True), ('review', 2, False)])
+        self.assertFalse(PendingClassification.objects.exists())
+        self.assertEqual(worker.metrics()['queue_depth'], 0)
+
+
+class EmbeddingStoreTests(TestCase):
+    """Stored float16 embeddings keyed by content hash (api.services.embedding_store), and
+    the pure-NumPy IVF index built on them."""
+
+    def _fake_encoder(self):
+        from unittest import mock
+        import hashlib
+        import numpy as np
+
+        def encode(texts):
+            # Deterministic pseudo-embeddings: same text -> same unit vector.
+            rows = []
+            for text in texts:
+                seed = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+                vector = np.random.default_rng(seed).normal(size=16).astype(np.float32)
+                rows.append(vector / np.linalg.norm(vector))
+            return np.stack(rows)
+        return mock.Mock(side_effect=encode)
+
+    def test_ivf_search_matches_brute_force_when_probing_every_list(self):
+        import numpy as np
+        from api.services.ann_index import IVFIndex
+
+        rng = np.random.default_rng(3)
+        vectors = rng.normal(size=(600, 24)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        ids = np.arange(1000, 1600)
+        index = IVFIndex.build(ids, vectors, n_lists=12)
+        query = vectors[42]
+
+        exact = ids[np.argsort(-(vectors @ query))[1:6]]
+        found = [hit_id for hit_id, _ in index.search(query, k=5, n_probe=12, exclude_ids={1042})]
+        self.assertEqual(found, list(exact))
+        approx = {hit_id for hit_id, _ in index.search(query, k=5, n_probe=3, exclude_ids={1042})}
+        self.assertGreaterEqual(len(approx & set(exact)), 3)
+
+    def test_ivf_snapshots_are_published_whole(self):
+        import os
+        import tempfile
+        from unittest import mock
+        import numpy as np
+        from api.services import index_snapshots
+        from api.services.ann_index import IVFIndex
+
+        rng = np.random.default_rng(5)
+
+        def build(n):
+            vectors = rng.normal(size=(n, 8)).astype(np.float32)
+            return IVFIndex.build(np.arange(n), vectors / np.linalg.norm(vectors, axis=1, keepdims=True), n_lists=4)
+
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(OSError):
+                IVFIndex.load(directory)
+            build(40).save(directory)
+
+            # A build that dies part-way publishes nothing and leaves no staging behind.
+            with mock.patch.object(np, 'save', side_effect=OSError('disk full')), self.assertRaises(OSError):
+                build(80).save(directory)
+            self.assertEqual(len(IVFIndex.load(directory)), 40)
+
+            for n in (50, 60, 70):
+                build(n).save(directory)
+            loaded = IVFIndex.load(directory)
+            self.assertEqual((len(loaded), int(loaded.offsets[-1])), (70, 70))
+            entries = os.listdir(directory)
+            self.assertEqual(len([e for e in entries if e.startswith(index_snapshots.GENERATION_PREFIX)]), 2)
+            self.assertFalse([e for e in entries if e.startswith(index_snapshots.STAGING_PREFIX)])
+
+    def test_embed_items_reuses_vectors_until_text_changes(self):
+        from unittest import mock
+        from api.models import ContentEmbedding
+        from api.services import embedding_store, embeddings
+
+        encode = self._fake_encoder()
+        with mock.patch.object(embeddings, '_encode_batch', encode):
+            first = embedding_store.embed_items([('post', 1, 'hello'), ('post', 2, 'world'), ('post', 3, '')])
+            again = embedding_store.embed_items([('post', 1, 'hello'), ('post', 2, 'world')])
+            embedding_store.embed_items([('post', 2, 'world, edited')])
+
+        self.assertEqual(set(first), {('post', 1), ('post', 2)})
+        self.assertEqual(encode.call_count, 2)
+        self.assertEqual(encode.call_args_list[1][0][0], ['world, edited'])
+        self.assertTrue((first[('post', 1)] == again[('post', 1)]).all())
+        self.assertEqual(ContentEmbedding.objects.filter(item_type='post').count(), 2)
+        stored = ContentEmbedding.objects.get(item_type='post', object_id=2)
+        self.assertEqual(stored.content_hash, embedding_store.content_hash('world, edited'))
+        self.assertEqual(len(bytes(stored.vector)), 16 * 2)
+
+    def test_similar_posts_endpoint_hides_blocked_authors(self):
+        import tempfile
+        from unittest import mock
+        from api.models import Block
+        from api.services import embedding_store, embeddings
+        from core.models import Post
+
+        author = make_user('simauthor')
+        blocked = make_user('simblocked')
+        viewer = make_user('simviewer')
+        Block.objects.create(blocker=viewer, blocked=blocked)
+        source = Post.objects.create(user=author, content='open world rpg with dragons')
+        near = Post.objects.create(user=author, content='open world rpg with dragons!')
+        hidden = Post.objects.create(user=blocked, content='open world rpg with dragons')
+
+        client = APIClient()
+        client.force_authenticate(user=viewer)
+        with tempfile.TemporaryDirectory() as index_dir, self.settings(EMBEDDING_INDEX_DIR=index_dir), \
+                mock.patch.object(embeddings, '_encode_batch', self._fake_encoder()), \
+                mock.patch.dict(embedding_store._indexes, clear=True):
+            embedding_store.embed_items([('post', p.id, p.content) for p in (source, near, hidden)])
+            # The request path serves the last built index and never builds or embeds.
+            self.assertEqual(client.get(f'/api/posts/{source.id}/similar/').data, [])
+            self.assertIsNotNone(embedding_store.refresh_index('post', min_interval=0))
+            self.assertIsNone(embedding_store.refresh_index('post', min_interval=0))
+            unembedded = Post.objects.create(user=author, content='never classified')
+            self.assertEqual(client.get(f'/api/posts/{unembedded.id}/similar/').data, [])
+            resp = client.get(f'/api/posts/{source.id}/similar/')
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        returned = [item['id'] for item in resp.data]
+        self.assertIn(near.id, returned)
+        self.assertNotIn(hidden.id, returned)
+        self.assertNotIn(source.id, returned)
+
+
+def _onnx_export_available():
+    import importlib.util
+    return all(
+        importlib.util.find_spec(mod)
+        for mod in ('torch', 'transformers', 'sentence_transformers', 'onnx', 'onnxruntime', 'tokenizers')
+    )
+
+
+def _onnx_parity_available():
+    import os
+    from django.conf import settings
+    return _onnx_export_available() and os.path.exists(
+        os.path.join(settings.EMBEDDING_ONNX_DIR, settings.EMBEDDING_ONNX_FILE)
+    )
+
+
+class EmbeddingBackendTests(TestCase):
+    """The ONNX inference backend (api.services.embedding_backends) must be a drop-in for the
+    PyTorch one: same pooling/normalization, and the same interest tags on real text."""
+
+    # Clearly single-topic texts in several languages, so a tag flip means a real regression
+    # rather than a borderline score.
+    PARITY_CORPUS = [
+        'Maxed out my skill tree and finished every side quest, best role-playing game this year',
+        'Headshots all night in the new first-person shooter, the gunplay feels amazing',
+        'Korku oyunu gerçekten çok korkutucuydu, her köşede bir sıçrama korkusu',
+        'Juego de carreras con coches increíbles, derrapes y circuitos de Fórmula 1',
+        'Playing old school console classics from the 90s, pure retro nostalgia',
+        'Finished the visual novel, every dialogue choice changed the branching story',
+        'Building my base and managing resources in this turn-based strategy game',
+        'Our guild cleared the raid in the massively multiplayer online world last night',
+    ]
+
+    def test_onnx_backend_mean_pools_and_normalizes(self):
+        from types import SimpleNamespace
+        import numpy as np
+        from api.services.embedding_backends import OnnxBackend
+
+        hidden = np.array([
+            [[1.0, 0.0], [3.0, 0.0], [100.0, 100.0]],   # third token is padding
+            [[0.0, 2.0], [0.0, 2.0], [0.0, 2.0]],
+        ], dtype=np.float32)
+        backend = OnnxBackend.__new__(OnnxBackend)
+        backend.input_names = {'input_ids', 'attention_mask'}
+        backend.session = SimpleNamespace(run=lambda outputs, feeds: [hidden[:len(feeds['input_ids'])]])
+        backend.tokenizer = SimpleNamespace(encode_batch=lambda texts: [
+            SimpleNamespace(ids=[5, 6, 0], attention_mask=[1, 1, 0]),
+            SimpleNamespace(ids=[7, 8, 9], attention_mask=[1, 1, 1]),
+        ][:len(texts)])
+
+        embeddings = backend.encode(['a', 'b'])
+        np.testing.assert_allclose(embeddings, [[1.0, 0.0], [0.0, 1.0]], atol=1e-6)
+        np.testing.assert_allclose(backend.encode('a'), [1.0, 0.0], atol=1e-6)
+
+    @skipUnless(_onnx_export_available(), 'needs torch, sentence-transformers, onnx and onnxruntime')
+    def test_exported_tiny_model_matches_torch(self):
+        # A randomly initialised 2-layer BERT with a word-level vocabulary over the corpus,
+        # run through the real export command: exercises the export, the tokenizer.json
+        # round trip and OnnxBackend's pooling against sentence-transformers without
+        # downloading the production model.
+        import os
+        import tempfile
+        from io import StringIO
+        import numpy as np
+        import torch
+        from django.core.management import call_command
+        from tokenizers import Tokenizer, models, pre_tokenizers, processors
+        from transformers import BertConfig, BertModel, PreTrainedTokenizerFast
+        from api.services.embedding_backends import OnnxBackend, TorchBackend
+
+        words = sorted({word for text in self.PARITY_CORPUS for word in text.lower().split()})
+        vocab = {token: i for i, token in enumerate(['[PAD]', '[UNK]', '[CLS]', '[SEP]', *words])}
+        tokenizer = Tokenizer(models.WordLevel(vocab, unk_token='[UNK]'))
+        tokenizer.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+        tokenizer.post_processor = processors.TemplateProcessing(
+            single='[CLS] $A [SEP]', special_tokens=[('[CLS]', vocab['[CLS]']), ('[SEP]', vocab['[SEP]'])],
+        )
+        torch.manual_seed(0)
+        model = BertModel(BertConfig(
+            vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+            intermediate_size=64, max_position_embeddings=160,
+        ))
+
+        corpus = [text.lower() for text in self.PARITY_CORPUS]
+        with tempfile.TemporaryDirectory() as model_dir, tempfile.TemporaryDirectory() as onnx_dir:
+            model.save_pretrained(model_dir)
+            PreTrainedTokenizerFast(
+                tokenizer_object=tokenizer, unk_token='[UNK]', pad_token='[PAD]', cls_token='[CLS]',
+                sep_token='[SEP]', model_max_length=128,
+            ).save_pretrained(model_dir)
+            call_command('export_embedding_onnx', '--model', model_dir, '--output', onnx_dir, stdout=StringIO())
+            self.assertTrue(os.path.exists(os.path.join(onnx_dir, 'model_quantized.onnx')))
+
+            expected = np.asarray(TorchBackend(model_dir).encode(corpus))
+            exported = OnnxBackend(onnx_dir, 'model.onnx').encode(corpus)
+            quantized = OnnxBackend(onnx_dir, 'model_quantized.onnx').encode(corpus)
+
+        self.assertEqual(exported.shape, (len(corpus), 32))
+        np.testing.assert_allclose(exported, expected, atol=1e-4)
+        # int8 weights drift a little but must keep each sentence pointing the same way.
+        self.assertTrue(((quantized * expected).sum(axis=1) > 0.9).all())
+
+    @skipUnless(_onnx_parity_available(), 'needs sentence-transformers, onnxruntime and an export_embedding_onnx model')
+    def test_onnx_backend_assigns_same_interest_tags_as_torch(self):
+        import numpy as np
+        from api.services import embeddings
+        from api.services.embedding_backends import load_backend
+
+        names = list(embeddings.INTEREST_DESCRIPTIONS)
+        tags = {}
+        for backend_name in ('torch', 'onnx'):
+            backend = load_backend(backend_name)
+            interest_matrix = backend.encode(list(embeddings.INTEREST_DESCRIPTIONS.values()))
+            sims = np.asarray(backend.encode(self.PARITY_CORPUS)) @ np.asarray(interest_matrix).T
+            tags[backend_name] = [
+                sorted(names[i] for i in np.flatnonzero(row >= embeddings.INTEREST_MATCH_THRESHOLD))
+                for row in sims
+            ]
+        self.assertEqual(tags['onnx'], tags['torch'])
+
+
+class SteamLibrarySyncPipelineTests(TestCase):
+    """fetch_steam_library resolves appids in bulk, fans metadata lookups out over a pool and
+    bulk-writes LibraryEntry rows — while keeping the status-persistence rules."""
+
+    def test_sync_bulk_writes_entries_and_keeps_manual_statuses(self):
+        import time
+        from unittest import mock
+        from api.models import GameStats, LibraryEntry
+        from api.services import steam
+        from core.models import Game
+
+        user = make_user('steamsyncer')
+        completed = Game.objects.create(title='Finished Game', steam_appid=10, genres=['RPG'], cover_image='https://x/10.jpg')
+        unplayed = Game.objects.create(title='Backlog Game', steam_appid=20, genres=['RPG'], cover_image='https://x/20.jpg')
+        by_title = Game.objects.create(title='Title Match', genres=[], cover_image='https://x/30.jpg')
+        LibraryEntry.objects.create(user=user, game=completed, status='completed', platform='Xbox', xbox_playtime=30)
+        LibraryEntry.objects.create(user=user, game=unplayed, status='unplayed')
+
+        recent = int(time.time())
+        owned = {'response': {'games': [
+            {'appid': 10, 'name': 'Finished Game', 'playtime_forever': 500, 'rtime_last_played': recent},
+            {'appid': 20, 'name': 'Backlog Game', 'playtime_forever': 60, 'playtime_2weeks': 60},
+            {'appid': 30, 'name': 'title match', 'playtime_forever': 0},
+            {'appid': 40, 'name': 'Brand New Game', 'playtime_forever': 0},
+        ]}}
+        response = mock.Mock(status_code=200, json=mock.Mock(return_value=owned))
+        response.raise_for_status = mock.Mock()
+
+        def fake_metadata(appid, title, need_genres, need_igdb, need_cover):
+            return {'genres': ['Indie'] if need_genres else None, 'igdb_id': None,
+                    'cover_url': f'https://cdn/{appid}.jpg' if need_cover else None}
+
+        progress = []
+        with self.settings(STEAM_API_KEY='key'), \
+                mock.patch.object(steam.http_client, 'get', return_value=response), \
+                mock.patch.object(steam, '_fetch_game_metadata', side_effect=fake_metadata):
+            stats = steam.fetch_steam_library(user.id, '7656', on_progress=lambda *p: progress.append(p))
+
+        self.assertEqual((stats['total'], stats['synced'], stats['created'], stats['errors']), (4, 4, 1, 0))
+        entries = {e.game.steam_appid: e for e in LibraryEntry.objects.filter(user=user).select_related('game')}
+        self.assertEqual(entries[10].status, 'completed')
+        self.assertEqual((entries[10].playtime_forever, entries[10].platform), (530, 'Steam, Xbox'))
+        self.assertEqual(entries[20].status, 'playing')
+        self.assertEqual(entries[30].game_id, by_title.id)
+        by_title.refresh_from_db()
+        self.assertEqual((by_title.steam_appid, by_title.genres), (30, ['Indie']))
+        new_game = Game.objects.get(steam_appid=40)
+        self.assertEqual((new_game.title, str(new_game.cover_image)), ('Brand New Game', 'https://cdn/40.jpg'))
+        self.assertEqual(GameStats.objects.get(game=new_game).log_count, 1)
+        self.assertEqual(progress[-1], ('complete', 4, 4))
+        self.assertEqual(steam.get_steam_sync_progress(user.id)['stage'], 'complete')
+
+    def test_sync_counts_only_inserted_games_and_reports_failed_fetches(self):
+        from unittest import mock
+        from api.models import LibraryEntry
+        from api.services import steam
+        from core.models import Game
+
+        user = make_user('steamracer')
+        owned = {'response': {'games': [
+            {'appid': 50, 'name': 'Raced Game', 'playtime_forever': 0},
+            {'appid': 60, 'name': 'Fresh Game', 'playtime_forever': 0},
+            {'appid': 70, 'name': 'Unreachable Game', 'playtime_forever': 0},
+        ]}}
+        response = mock.Mock(status_code=200, json=mock.Mock(return_value=owned))
+        response.raise_for_status = mock.Mock()
+
+        def fake_metadata(appid, title, need_genres, need_igdb, need_cover):
+            if appid == 70:
+                raise ConnectionError('store timed out')
+            return {'genres': ['Indie'], 'igdb_id': None, 'cover_url': None}
+
+        real_resolve = steam._resolve_games
+
+        def resolve_then_race(owned_games):
+            resolved = real_resolve(owned_games)
+            # Another sync inserts one of the missing games after this one has looked.
+            Game.objects.create(title='Raced Game', steam_appid=50)
+            return resolved
+
+        with self.settings(STEAM_API_KEY='key'), \
+                mock.patch.object(steam.http_client, 'get', return_value=response), \
+                mock.patch.object(steam, '_fetch_game_metadata', side_effect=fake_metadata), \
+                mock.patch.object(steam, '_resolve_games', side_effect=resolve_then_race):
+            stats = steam.fetch_steam_library(user.id, '7656')
+
+        self.assertEqual((stats['total'], stats['synced'], stats['created'], stats['errors']), (3, 2, 1, 1))
+        self.assertIn('Unreachable Game', stats['error_details'][0])
+        self.assertIn('store timed out', stats['error_details'][0])
+        self.assertEqual(
+            set(LibraryEntry.objects.filter(user=user).values_list('game__steam_appid', flat=True)), {50, 60},
+        )
+
+
+class SharedHttpClientTests(TestCase):
+    """api.services.http_client retries throttled upstream calls and keeps per-upstream counters."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_retries_429_honouring_retry_after_then_succeeds(self):
+        from unittest import mock
+        from api.services import http_client
+
+        throttled = mock.Mock(status_code=429, headers={'Retry-After': '1'})
+        ok = mock.Mock(status_code=200, headers={})
+        session = mock.Mock()
+        session.request.side_effect = [throttled, ok]
+        before = http_client.upstream_metrics().get('igdb', {}).get('retries', 0)
+        with mock.patch.object(http_client, 'get_session', return_value=session), \
+                mock.patch.object(http_client.time, 'sleep') as sleep:
+            response = http_client.post('igdb', 'https://api.igdb.com/v4/games', data='fields id;')
+
+        self.assertIs(response, ok)
+        self.assertEqual(session.request.call_count, 2)
+        sleep.assert_called_once_with(1.0)
+        self.assertEqual(http_client.upstream_metrics()['igdb']['retries'], before + 1)
+        shared = http_client.shared_upstream_metrics()['igdb']
+        self.assertEqual((shared['requests'], shared['rate_limited'], shared['retries']), (2, 1, 1))
+
+    def test_non_idempotent_posts_are_not_retried(self):
+        from unittest import mock
+        from api.services import http_client
+
+        session = mock.Mock()
+        session.request.return_value = mock.Mock(status_code=503, headers={})
+        with mock.patch.object(http_client, 'get_session', return_value=session), \
+                mock.patch.object(http_client.time, 'sleep'):
+            response = http_client.post('xbox_auth', 'https://login.live.com/oauth20_token.srf', data={'code': 'once'})
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(session.request.call_count, 1)
+            http_client.get('xbox_live', 'https://profile.xboxlive.com/users/me')
+        self.assertEqual(session.request.call_count, 1 + 1 + http_client.DEFAULT_RETRIES)
+
+    def test_limiter_is_a_shared_token_bucket(self):
+        from unittest import mock
+        from django.core.cache import cache
+        from api.services import http_client
+
+        cache.clear()
+        config = http_client.UPSTREAMS['igdb']  # 4/s, burst 4
+        clock = [1000.99]
+        with mock.patch.object(http_client.time, 'time', side_effect=lambda: clock[0]), \
+                mock.patch.object(http_client.time, 'sleep') as sleep:
+            for _ in range(config['burst']):
+                self.assertEqual(http_client.acquire('igdb'), 0.0)
+            # Just past a second boundary: a fixed window would hand out another full burst;
+            # the bucket has refilled by only 0.08 of a token.
+            clock[0] = 1001.01
+            waits = [http_client.acquire('igdb') for _ in range(3)]
+        self.assertEqual([round(w, 2) for w in waits], [0.23, 0.48, 0.73])
+        self.assertEqual([round(c.args[0], 2) for c in sleep.call_args_list], [0.23, 0.48, 0.73])
+        self.assertIsNone(cache.get(http_client.LIMITER_LOCK_KEY.format(upstream='igdb')))
+
+        # A lock nobody releases (a holder died) falls back to the in-process bucket.
+        cache.set(http_client.LIMITER_LOCK_KEY.format(upstream='steamspy'), 1, 60)
+        with mock.patch.object(http_client, 'LIMITER_LOCK_SECONDS', 0), \
+                mock.patch.object(http_client, '_local_bucket') as local:
+            http_client.acquire('steamspy')
+        local.return_value.acquire.assert_called_once_with()
+
+
+class GameHydrationTests(TestCase):
+    """api.services.game_hydration batches IGDB detail fetches and keeps them off the request path."""
+
+    def test_hydrate_games_uses_one_multi_id_query(self):
+        from unittest import mock
+        from api.services import game_hydration
+        from core.models import Game
+
+        known = Game.objects.create(title='Known', igdb_id=101)
+        steam_only = Game.objects.create(title='Steam Only')
+        missing = Game.objects.create(title='Gone', igdb_id=999)
+        queries = []
+
+        def fake_post(upstream, url, data=None, **kwargs):
+            queries.append(data)
+            response = mock.Mock(status_code=200)
+            if data.startswith('search'):
+                response.json.return_value = [{'id': 202, 'name': 'Steam Only', 'category': 0}]
+            else:
+                response.json.return_value = [
+                    {'id': 101, 'summary': 'A', 'genres': [{'name': 'RPG'}], 'aggregated_rating': 81.6,
+                     'involved_companies': [{'company': {'name': 'Dev Co'}, 'developer': True}]},
+                    {'id': 202, 'summary': 'B', 'platforms': [{'name': 'PC'}],
+                     'screenshots': [{'url': '//images.igdb.com/t_thumb/x.jpg'}]},
+                ]
+            return response
+
+        with mock.patch.object(game_hydration, '_igdb_headers', return_value={'Client-ID': 'test'}), \
+                mock.patch.object(game_hydration.http_client, 'post', side_effect=fake_post):
+            stats = game_hydration.hydrate_games([known.pk, steam_only.pk, missing.pk], with_hltb=False)
+
+        detail_queries = [q for q in queries if not q.startswith('search')]
+        self.assertEqual(len(detail_queries), 1)
+        self.assertIn('where id = (101,202,999)', detail_queries[0])
+        self.assertEqual((stats['hydrated'], stats['not_found'], stats['resolved']), (2, 1, 1))
+        known.refresh_from_db()
+        steam_only.refresh_from_db()
+        missing.refresh_from_db()
+        self.assertEqual((known.summary, known.genres, known.metacritic_score, known.developer),
+                         ('A', ['RPG'], 82, 'Dev Co'))
+        self.assertEqual((steam_only.igdb_id, steam_only.platforms), (202, ['PC']))
+        self.assertEqual(steam_only.screenshots, ['https://images.igdb.com/t_screenshot_huge/x.jpg'])
+        self.assertTrue(known.details_fetched and steam_only.details_fetched and missing.details_fetched)
+
+    def test_genre_backfill_writes_only_genres(self):
+        from io import StringIO
+        from unittest import mock
+        from django.core.management import call_command
+        from api.services import game_hydration
+        from core.models import Game
+
+        game = Game.objects.create(
+            title='Curated', igdb_id=303, summary='Hand-edited summary', developer='Studio',
+            details_fetched=True, genres=[],
+        )
+        response = mock.Mock(status_code=200)
+        response.json.return_value = [
+            {'id': 303, 'summary': 'IGDB summary', 'genres': [{'name': 'Puzzle'}],
+             'involved_companies': [{'company': {'name': 'Other'}, 'developer': True}]},
+        ]
+        with mock.patch.object(game_hydration, '_igdb_headers', return_value={'Client-ID': 'test'}), \
+                mock.patch.object(game_hydration.http_client, 'post', return_value=response):
+            call_command('backfill_genres', stdout=StringIO())
+
+        game.refresh_from_db()
+        self.assertEqual(game.genres, ['Puzzle'])
+        self.assertEqual((game.summary, game.developer), ('Hand-edited summary', 'Studio'))
+
+    def test_details_endpoint_enqueues_instead_of_fetching(self):
+        from unittest import mock
+        from django.core.cache import cache
+        from api.services import game_hydration
+        from core.models import Game
+
+        cache.clear()
+        game = Game.objects.create(title='Unhydrated', igdb_id=7)
+        worker = mock.Mock()
+        with mock.patch.object(game_hydration, 'get_hydration_worker', return_value=worker), \
+                mock.patch.object(game_hydration, 'hydrate_games') as hydrate:
+            first = self.client.get(f'/api/games/{game.pk}/details/')
+            second = self.client.get(f'/api/games/{game.pk}/details/')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertFalse(first.json()['details_fetched'])
+        self.assertEqual(second.status_code, 200)
+        hydrate.assert_not_called()
+        worker.submit.assert_called_once_with('game', game.pk)
+
+
+class SerializerRelationCacheQueryTests(TestCase):
+    """The feed/explore serializers look up the viewer's likes/bookmarks/reposts only for the
+    ids on the page: the query count doesn't grow with page size, and a viewer's unrelated
+    history is never fetched."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from core.models import Game, Like, Post
+        cache.clear()
+        self.author = make_user('pageauthor')
+        self.viewer = make_user('pageviewer')
+        self.game = Game.objects.create(title='Page Game')
+        self.posts = [Post.objects.create(user=self.author, content=f'post {i}') for i in range(12)]
+        # Liked replies never appear on these pages — the old cache loaded all of them anyway.
+        old = [Post.objects.create(user=self.author, content=f'old {i}', parent=self.posts[0]) for i in range(5)]
+        Like.objects.bulk_create([Like(user=self.viewer, post=p) for p in old])
+        self.liked = self.posts[-1]
+        Like.objects.create(user=self.viewer, post=self.liked)
+        Review.objects.create(user=self.author, game=self.game, rating=7, content='fine')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.viewer)
+
+    def _count(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp, ctx.captured_queries
+
+    def test_explore_query_count_is_independent_of_page_size(self):
+        self._count('/api/explore/posts/?ordering=newest&page_size=1')  # warm per-user caches
+        _, small = self._count('/api/explore/posts/?ordering=newest&page_size=3')
+        resp, large = self._count('/api/explore/posts/?ordering=newest&page_size=12')
+        self.assertEqual(len(small), len(large))
+
+        likes_sql = [q['sql'] for q in large if '"core_like"' in q['sql'] and '"core_like"."user_id"' in q['sql']]
+        self.assertTrue(likes_sql)
+        self.assertTrue(all(' IN (' in sql for sql in likes_sql), likes_sql)
+        liked = {item['id']: item['is_liked'] for item in resp.data['results']}
+        self.assertTrue(liked[self.liked.id])
+        self.assertEqual(sum(liked.values()), 1)
+
+    def test_for_you_query_count_is_bounded(self):
+        from core.models import Post
+        self._count('/api/feed/for-you/')
+        resp, before = self._count('/api/feed/for-you/')
+        for i in range(10):
+            Post.objects.create(user=self.author, content=f'more {i}')
+        resp, after = self._count('/api/feed/for-you/')
+        self.assertEqual(len(before), len(after))
+        self.assertTrue(next(i for i in resp.data if i['type'] == 'post' and i['id'] == self.liked.id)['is_liked'])
+
+
+class UnreadCounterTests(TestCase):
+    """Unread badge counts are kept in cached per-user counters moved by the Message/Notification
+    signals and the mark-read paths, so reading them (what every socket event used to do) costs
+    no query; reconcile() repairs counters that drifted from the DB."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from api.models import Conversation
+        cache.clear()
+        self.alice = make_user('unreadalice')
+        self.bob = make_user('unreadbob')
+        self.carol = make_user('unreadcarol')
+        self.conversation = Conversation.objects.create(is_group=True)
+        self.conversation.participants.add(self.alice, self.bob, self.carol)
+
+    def _counts(self, user):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from api.services import unread_counters
+        with CaptureQueriesContext(connection) as ctx:
+            counts = unread_counters.get_counts(user.id)
+        self.assertEqual(len(ctx.captured_queries), 0)
+        return counts
+
+    def test_signals_and_mark_read_keep_counters_exact(self):
+        from api.models import Message, Notification
+        from api.services import unread_counters
+        for user in (self.alice, self.bob, self.carol):
+            unread_counters.get_counts(user.id)  # seed from the DB
+
+        Message.objects.create(conversation=self.conversation, sender=self.alice, content='hi')
+        Message.objects.create(conversation=self.conversation, sender=self.bob, content='hey')
+        self.assertEqual(self._counts(self.alice)['messages'], 1)
+        self.assertEqual(self._counts(self.carol)['messages'], 2)
+
+        # is_read is shared: carol reading clears alice's copy of bob's message, not bob's own.
+        self.assertEqual(unread_counters.mark_conversation_read(self.conversation.id, self.carol.id), 2)
+        self.assertEqual(self._counts(self.alice)['messages'], 0)
+        self.assertEqual(self._counts(self.bob)['messages'], 0)
+        self.assertEqual(self._counts(self.carol)['messages'], 0)
+
+        note = Notification.objects.create(recipient=self.bob, actor=self.alice, verb='liked your post')
+        Notification.objects.create(recipient=self.bob, actor=self.carol, verb='followed you')
+        self.assertEqual(self._counts(self.bob)['notifications'], 2)
+        note = Notification.objects.get(pk=note.pk)
+        note.is_read = True
+        note.save()
+        self.assertEqual(self._counts(self.bob)['notifications'], 1)
+        note.delete()
+        self.assertEqual(self._counts(self.bob)['notifications'], 1)
+
+        client = APIClient()
+        client.force_authenticate(user=self.bob)
+        client.post('/api/notifications/mark_all_read/')
+        self.assertEqual(self._counts(self.bob)['notifications'], 0)
+        self.assertEqual(unread_counters.db_counts([self.bob.id])[self.bob.id], {'messages': 0, 'notifications': 0})
+
+    def test_reconcile_repairs_drift_and_consumer_applies_pushed_counts(self):
+        from asgiref.sync import async_to_sync
+        from django.core.cache import cache
+        from api.consumers import NotificationConsumer
+        from api.models import Message, Notification
+        from api.services import unread_counters
+
+        Message.objects.create(conversation=self.conversation, sender=self.alice, content='hi')
+        unread_counters.get_counts(self.bob.id)
+        # A bulk write bypasses the signals, so bob's counter is now stale.
+        Notification.objects.bulk_create([
+            Notification(recipient=self.bob, actor=self.alice, verb='liked your post') for _ in range(3)
+        ])
+        self.assertEqual(cache.get(unread_counters.COUNTER_KEY.format(user_id=self.bob.id, kind='notifications')), 0)
+
+        self.assertEqual(unread_counters.reconcile([self.alice.id, self.bob.id, self.carol.id]), 1)
+        self.assertEqual(self._counts(self.bob), {'messages': 1, 'notifications': 3})
+        self.assertEqual(unread_counters.reconcile([self.bob.id]), 0)
+
+        sent = []
+        consumer = NotificationConsumer()
+        consumer.user = self.bob
+        consumer.counts = {'messages': 1, 'notifications': 0}
+
+        async def send_json(content, close=False):
+            sent.append(content)
+        consumer.send_json = send_json
+        async_to_sync(consumer.update_counts)({'type': 'update_counts', 'deltas': {'messages': 2}, 'counts': {'notifications': 3}})
+        self.assertEqual(sent[-1], {'type': 'counts', 'messages': 3, 'notifications': 3})
+
+    def test_mentions_count_and_a_recount_never_caches_a_missed_change(self):
+        from unittest import mock
+        from django.core.cache import cache
+        from api.models import Notification
+        from api.services import unread_counters
+        from core.models import Post
+
+        unread_counters.get_counts(self.bob.id)
+        Post.objects.create(user=self.alice, content='hello @unreadbob and @unreadcarol')
+        self.assertEqual(self._counts(self.bob)['notifications'], 1)
+
+        # A notification lands after carol's recount but before the count is cached: the
+        # adjust finds no key, so the seeded (now short) count must not stick.
+        recount = unread_counters._COUNTERS['notifications']
+
+        def racing_recount(user_id):
+            n = recount(user_id)
+            Notification.objects.create(recipient=self.carol, actor=self.bob, verb='followed you')
+            return n
+        with mock.patch.dict(unread_counters._COUNTERS, notifications=racing_recount):
+            self.assertEqual(unread_counters.get_counts(self.carol.id)['notifications'], 1)
+        self.assertIsNone(cache.get(unread_counters.COUNTER_KEY.format(user_id=self.carol.id, kind='notifications')))
+        self.assertEqual(unread_counters.get_counts(self.carol.id)['notifications'], 2)
+
+
+class SearchIndexTests(TestCase):
+    """Name search is served from the in-process trigram index: prefix and misspelled queries
+    match, results are ranked, and saves/deletes reach the index through the cache journal."""
+
+    def setUp(self):
+        self.index_dir = isolate_search_index(self)
+
+    def test_trigram_index_prefix_typo_updates_and_persistence(self):
+        from api.services.trigram_index import TrigramIndex
+        index = TrigramIndex.build([
+            (1, 1.0, 'The Legend of Zelda: Breath of the Wild'), (2, 1.0, 'Zelda II'),
+            (3, 1.0, 'Hollow Knight'), (4, 1.0, 'Celeste'), (4, 0.5, 'Céleste Mountain'),
+        ])
+        self.assertEqual([i for i, _ in index.search('zel')], [2, 1])
+        self.assertEqual(index.search('holow knigt')[0][0], 3)
+        self.assertEqual(index.search('celeste mountain')[0][0], 4)
+        self.assertEqual(index.search('breath wild')[0][0], 1)
+
+        index.upsert(3, [(1.0, 'Hollow Knight: Silksong')])
+        index.remove(2)
+        self.assertEqual([i for i, _ in index.search('zelda')], [1])
+        self.assertEqual(index.search('silksong')[0][0], 3)
+
+        generation = index.compact().save(self.index_dir)
+        loaded = TrigramIndex.load(self.index_dir)
+        self.assertEqual(loaded.search('silksng')[0][0], 3)
+        self.assertEqual((len(loaded), loaded.snapshot), (3, generation))
+
+    def test_a_newly_published_snapshot_is_picked_up_whole(self):
+        from api.services import search_index
+        from api.services.trigram_index import TrigramIndex
+        directory = search_index._index_dir('game')
+        self.assertIsNone(search_index._newer_snapshot('game'))
+
+        first = TrigramIndex.build([(1, 1.0, 'Hades')], meta={'kind': 'game', 'version': -1}).save(directory)
+        search_index._snapshots.clear()
+        self.assertEqual(search_index._newer_snapshot('game').snapshot, first)
+        search_index._snapshots['game'] = (None, first)
+        self.assertIsNone(search_index._newer_snapshot('game'))  # same generation: nothing to load
+
+        rows = [(i, 1.0, f'Game {i}') for i in range(1, 50)]
+        second = TrigramIndex.build(rows, meta={'kind': 'game', 'version': -1}).save(directory)
+        search_index._snapshots['game'] = (None, first)
+        newer = search_index._newer_snapshot('game')
+        self.assertEqual((newer.snapshot, len(newer), int(newer.offsets[-1]) == len(newer.postings)), (second, 49, True))
+
+    def test_api_search_is_ranked_and_follows_saves_and_deletes(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from core.models import Game
+        zelda = Game.objects.create(title='The Legend of Zelda')
+        Game.objects.create(title='Zelda II: The Adventure of Link')
+        Game.objects.create(title='Hollow Knight')
+        client = APIClient()
+
+        # No snapshot yet: requests don't build one, they search the database.
+        self.assertEqual(client.get('/api/games/', {'search': 'legend of zelad'}).data, [])
+        resp = client.get('/api/games/', {'search': 'legend of zelda'})
+        self.assertEqual([g['id'] for g in resp.data], [zelda.id])
+
+        call_command('build_search_index', stdout=StringIO())
+        resp = client.get('/api/games/', {'search': 'legend of zelad'})
+        results = resp.data['results'] if isinstance(resp.data, dict) else resp.data
+        self.assertEqual(results[0]['id'], zelda.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            celeste = Game.objects.create(title='Celeste')
+        resp = client.get('/api/games/', {'search': 'celest'})
+        results = resp.data['results'] if isinstance(resp.data, dict) else resp.data
+        self.assertEqual([g['id'] for g in results], [celeste.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            celeste.delete()
+        resp = client.get('/api/games/', {'search': 'celest'})
+        results = resp.data['results'] if isinstance(resp.data, dict) else resp.data
+        self.assertEqual(results, [])
+
+        make_user('searchable_sam', real_name='Samantha Carter')
+        resp = client.get('/api/users/', {'search': '@searchable_s'})
+        results = resp.data['results'] if isinstance(resp.data, dict) else resp.data
+        self.assertEqual([u['username'] for u in results], ['searchable_sam'])
+
+    def test_every_match_is_counted_and_a_lost_journal_falls_back(self):
+        from io import StringIO
+        from unittest import mock
+        from django.core.cache import cache
+        from django.core.management import call_command
+        from api.filters import IndexedSearchFilter
+        from core.models import Game
+        exact = Game.objects.create(title='Star')
+        for i in range(4):
+            Game.objects.create(title=f'Star Voyage {i}')
+        call_command('build_search_index', '--kinds', 'game', stdout=StringIO())
+        client = APIClient()
+
+        # Only the first two are ranked; the other matches still come back, after them.
+        with mock.patch.object(IndexedSearchFilter, 'ranked_results', 2):
+            resp = client.get('/api/games/', {'search': 'star'})
+        self.assertEqual(len(resp.data), 5)
+        self.assertEqual(resp.data[0]['id'], exact.id)
+
+        # The journal is gone (cache flush): the index can't be trusted, so the database answers.
+        with self.captureOnCommitCallbacks(execute=True):
+            Game.objects.create(title='Starfield')
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            Game.objects.create(title='Stardew Valley')
+        resp = client.get('/api/games/', {'search': 'star'})
+        self.assertEqual(len(resp.data), 7)
+
+
+class GenreIndexTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from api.services import genre_index
+        cache.clear()
+        genre_index.reset()
+        self.addCleanup(genre_index.reset)
+
+    def test_genres_are_canonicalized_at_ingest_and_filterable(self):
+        from core.models import Game, GameGenre, Genre
+        action_rpg = Game.objects.create(title='Localized', genres=['Экшен', 'Role-playing (RPG)'])
+        rpg = Game.objects.create(title='English', genres=['RPG', 'Indie'])
+        Game.objects.create(title='Untagged')
+
+        self.assertEqual(Genre.objects.filter(slug='rpg').count(), 1)
+        self.assertEqual(
+            set(GameGenre.objects.filter(game=action_rpg).values_list('genre__name', flat=True)), {'Action', 'RPG'},
+        )
+
+        client = APIClient()
+        resp = client.get('/api/games/', {'genre': 'rpg'})
+        results = resp.data['results'] if isinstance(resp.data, dict) else resp.data
+        self.assertEqual({g['id'] for g in results}, {action_rpg.id, rpg.id})
+        resp = client.get('/api/games/', {'genre': 'Ролевая игра,Aksiyon'})
+        results = resp.data['results'] if isinstance(resp.data, dict) else resp.data
+        self.assertEqual([g['id'] for g in results], [action_rpg.id])
+        resp = client.get('/api/games/', {'genre': 'Nonexistent'})
+        results = resp.data['results'] if isinstance(resp.data, dict) else resp.data
+        self.assertEqual(results, [])
+
+        # Retagging replaces the links; backfill repairs rows written around the signal.
+        rpg.genres = ['Indie']
+        rpg.save(update_fields=['genres'])
+        self.assertFalse(GameGenre.objects.filter(game=rpg, genre__slug='rpg').exists())
+        from io import StringIO
+        from django.core.management import call_command
+        Game.objects.filter(pk=rpg.pk).update(genres=['Strategy'])
+        call_command('backfill_genre_ids', stdout=StringIO())
+        self.assertEqual(list(GameGenre.objects.filter(game=rpg).values_list('genre__name', flat=True)), ['Strategy'])
+
+    def test_recommendations_and_dna_use_genre_bitmaps(self):
+        from api.models import LibraryEntry
+        from api.services import genre_index
+        from core.models import Game
+        user = make_user('genre_fan')
+        played = Game.objects.create(title='Played', genres=['Стратегия'])
+        LibraryEntry.objects.create(user=user, game=played, status='playing', playtime_forever=600)
+        strategy = [Game.objects.create(title=f'Strategy {i}', genres=['Strategy']) for i in range(3)]
+        Game.objects.create(title='Racer', genres=['Racing'])
+
+        index = genre_index.get_index()
+        strategy_id = genre_index.genre_ids_for(['Strategy'], create=False)['Strategy']
+        self.assertEqual(list(index.match([strategy_id], exclude={played.id})), [g.id for g in strategy])
+
+        client = APIClient()
+        resp = client.get('/api/users/genre_fan/recommended-games/')
+        self.assertEqual({g['id'] for g in resp.data}, {g.id for g in strategy})
+        resp = client.get('/api/users/genre_fan/game-dna/')
+        self.assertEqual([(g['name'], g['percentage']) for g in resp.data['genres']], [('Strategy', 100)])
+
+
+    def test_version_counter_survives_a_cache_flush(self):
+        from django.core.cache import cache
+        from api.services import genre_index
+        genre_index.mark_changed()
+        genre_index.mark_changed()
+        built_at = genre_index.get_index().version
+        self.assertEqual(built_at, genre_index.current_version())
+
+        # After a flush the counter restarts somewhere else, so the same number of writes
+        # doesn't count it back up to the version the existing bitmaps were built at.
+        cache.clear()
+        genre_index.mark_changed()
+        genre_index.mark_changed()
+        self.assertNotEqual(genre_index.current_version(), built_at)
+
+class GameStatsTests(TestCase):
+    def test_rollup_follows_reviews_and_library_and_reconciles(self):
+        from api.models import GameStats, LibraryEntry
+        from api.services import game_stats
+        from core.models import Game
+        game = Game.objects.create(title='Rolled Up')
+        alice, bob = make_user('stats_alice'), make_user('stats_bob')
+
+        review = Review.objects.create(user=alice, game=game, rating='8.5')
+        Review.objects.create(user=bob, game=game, rating='6.0')
+        entry = LibraryEntry.objects.create(user=alice, game=game, status='playing')
+        LibraryEntry.objects.create(user=bob, game=game, status='completed')
+        review.rating = '9.0'
+        review.save()
+        entry.status = 'completed'
+        entry.save(update_fields=['status'])
+        Review.objects.filter(user=bob).delete()
+
+        stats = GameStats.objects.get(game=game)
+        self.assertEqual((stats.review_count, stats.avg_rating, stats.log_count), (1, 9.0, 2))
+        self.assertEqual(stats.rating_histogram, {'9': 1})
+        self.assertEqual(stats.status_counts, {'completed': 2})
+        self.assertEqual(stats.recent_activity_count, 4)
+
+        # Writes that bypass signals drift; reconciliation puts the row back, and the rest of
+        # the fields (including aged-out activity) match an exact recount.
+        LibraryEntry.objects.filter(user=bob).update(status='dropped')
+        self.assertEqual(game_stats.reconcile(), 1)
+        stats.refresh_from_db()
+        self.assertEqual(stats.status_counts, {'completed': 1, 'dropped': 1})
+        self.assertEqual(stats.recent_activity_count, 3)
+        self.assertEqual(game_stats.reconcile(), 0)
+
+    def test_details_trending_and_hidden_gems_read_the_rollup(self):
+        from api.models import GameStats, LibraryEntry
+        from core.models import Game
+        gem = Game.objects.create(title='Gem')
+        popular = Game.objects.create(title='Popular')
+        Game.objects.create(title='Nobody')
+        reviewer = make_user('gem_finder')
+        Review.objects.create(user=reviewer, game=gem, rating='9.5')
+        for i in range(3):
+            LibraryEntry.objects.create(user=make_user(f'gem_fan_{i}'), game=popular)
+        # A game created before the rollup existed is counted on first read.
+        GameStats.objects.filter(game=gem).delete()
+
+        client = APIClient()
+        resp = client.get(f'/api/games/{gem.id}/details/')
+        self.assertEqual((resp.data['average_rating'], resp.data['review_count']), (9.5, 1))
+        self.assertEqual(resp.data['rating_histogram'], {'9': 1})
+
+        resp = client.get('/api/games/trending/')
+        self.assertEqual([(g['id'], g['entry_count']) for g in resp.data], [(popular.id, 3)])
+        resp = client.get('/api/games/hidden-gems/')
+        self.assertEqual([(g['id'], g['avg_rating']) for g in resp.data], [(gem.id, 9.5)])
+
+
+class TrendingScoreTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_set_based_recompute_matches_the_gravity_formula(self):
+        from datetime import timedelta
+        from api.services import trending
+        from core.models import Bookmark, Like, Post
+        author, fan, other = make_user('trend_author'), make_user('trend_fan'), make_user('trend_other')
+        post = Post.objects.create(user=author, content='see https://example.com')
+        quiet = Post.objects.create(user=author, content='x' * 300)
+        Like.objects.create(user=fan, post=post)
+        Like.objects.create(user=other, post=post)
+        Bookmark.objects.create(user=fan, post=post)
+        Post.objects.create(user=fan, parent=post, content='reply')
+        Post.objects.create(user=author, parent=post, content='author reply')
+        Post.objects.create(user=other, repost_parent=post)
+
+        now = post.timestamp + timedelta(hours=10)
+        stats = trending.recompute(now=now)
+        self.assertEqual(stats['posts'], 3)  # both posts and the repost; replies aren't ranked
+        post.refresh_from_db()
+        quiet.refresh_from_db()
+        weighted = 2 * 1.0 + 2 * 2.5 + 1 * 4.5 + 1 * 3.5
+        expected = (weighted + 1) * 1.25 * 1.15 * 0.85 / (10 + 2) ** 1.5
+        self.assertAlmostEqual(post.trending_score, expected, places=4)
+        quiet_age = (now - quiet.timestamp).total_seconds() / 3600
+        self.assertAlmostEqual(quiet.trending_score, 1.15 / (quiet_age + 2) ** 1.5, places=4)
+
+    def test_engagement_marks_posts_for_the_incremental_pass(self):
+        from api.services import trending
+        from core.models import Like, Post
+        author, fan = make_user('dirty_author'), make_user('dirty_fan')
+        liked = Post.objects.create(user=author, content='liked')
+        Post.objects.create(user=author, content='untouched')
+        self.assertTrue(trending.recompute_all()['full'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(user=fan, post=liked)
+        stats = trending.recompute_dirty()
+        self.assertEqual((stats['full'], stats['posts'], stats['updated']), (False, 1, 1))
+        self.assertEqual(trending.recompute_dirty()['posts'], 0)
+
+
+class MessageSearchTests(TestCase):
+    """In-chat search goes through the full-text index: whole-word matches (the last word as a
+    prefix), best first, soft-deleted messages excluded, cursor-paginated, members only."""
+
+    def setUp(self):
+        from api.models import Conversation, Message
+        self.alice = make_user('searchalice')
+        self.bob = make_user('searchbob')
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.alice, self.bob)
+        say = lambda user, text: Message.objects.create(conversation=self.conversation, sender=user, content=text)
+        self.exact = say(self.alice, 'pizza pizza tonight?')
+        self.long = say(self.bob, 'we could get pizza after the raid, or tacos, whatever works for everyone really')
+        self.prefix = say(self.alice, 'Pizzeria on Main is open')
+        say(self.bob, 'pizzazz')
+        say(self.alice, 'no match here')
+        deleted = say(self.bob, 'secret pizza plans')
+        deleted.is_deleted = True
+        deleted.save()
+
+    def _search(self, user, query, **params):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client.get('/api/messages/', {'conversation_id': self.conversation.id, 'search': query, **params})
+
+    def test_ranked_snippets_and_cursor_pages(self):
+        response = self._search(self.bob, 'pizza ')  # trailing space: a finished word
+        self.assertEqual(response.status_code, 200)
+        ids = [result['id'] for result in response.data['results']]
+        self.assertEqual(ids[0], self.exact.id)
+        self.assertEqual(set(ids), {self.exact.id, self.long.id})
+        self.assertEqual(response.data['results'][0]['snippet'], {'text': 'pizza pizza tonight?', 'highlights': [[0, 5], [6, 11]]})
+
+        first = self._search(self.bob, 'pizz', limit=2)
+        self.assertTrue(first.data['has_more'])
+        rest = self._search(self.bob, 'pizz', limit=2, cursor=first.data['next_cursor'])
+        self.assertFalse(rest.data['has_more'])
+        paged = [r['id'] for r in first.data['results'] + rest.data['results']]
+        self.assertEqual(len(paged), 4)
+        self.assertIn(self.prefix.id, paged)
+
+        outsider = make_user('searchmallory')
+        self.assertEqual(self._search(outsider, 'pizza').data['results'], [])
+
+    def test_python_fallback_agrees_with_the_index(self):
+        from api.models import Message
+        from api.services import message_search
+        scoped = Message.objects.filter(conversation=self.conversation)
+        for query in ('pizza ', 'pizz', 'pizza tonight', 'nothing'):
+            indexed = {m.id for m, _, _ in message_search.search(scoped, query).hits}
+            scanned = {m.id for m, _, _ in message_search.search(scoped, query, backend='python').hits}
+            self.assertEqual(indexed, scanned, query)
+        page = message_search.search(scoped, 'pizz', limit=3, backend='python')
+        rest = message_search.search(scoped, 'pizz', cursor=page.next_cursor, backend='python')
+        self.assertEqual(len(page.hits) + len(rest.hits), 4)
+        self.assertIsNone(rest.next_cursor)
+
+
+class KeysetPaginationTests(TestCase):
+    """`?cursor=` switches list endpoints to keyset pages on (sort key, id): stable while rows
+    are inserted mid-scroll, page numbers still work, and pre-pagination endpoints keep
+    returning the bare list when the client asks for neither."""
+
+    def setUp(self):
+        self.user = make_user('keysetreader')
+        self.actor = make_user('keysetactor')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_notification_cursor_pages_are_stable_under_inserts(self):
+        from api.models import Notification
+        created = [
+            Notification.objects.create(recipient=self.user, actor=self.actor, verb=f'event {i}') for i in range(5)
+        ]
+        self.assertEqual(len(self.client.get('/api/notifications/').data), 5)  # old clients: bare list
+        self.assertEqual(self.client.get('/api/notifications/', {'page': 1, 'page_size': 2}).data['count'], 5)
+
+        first = self.client.get('/api/notifications/', {'cursor': '', 'page_size': 2}).data
+        self.assertEqual([n['id'] for n in first['results']], [created[4].id, created[3].id])
+        Notification.objects.create(recipient=self.user, actor=self.actor, verb='arrived mid-scroll')
+        seen = [n['id'] for n in first['results']]
+        cursor = first['next_cursor']
+        while cursor:
+            page = self.client.get('/api/notifications/', {'cursor': cursor, 'page_size': 2}).data
+            seen += [n['id'] for n in page['results']]
+            cursor = page['next_cursor']
+        self.assertEqual(seen, [n.id for n in reversed(created)])
+
+        self.assertEqual(self.client.get('/api/notifications/', {'cursor': 'garbage'}).status_code, 404)
+
+    def test_explore_newest_cursor_matches_page_numbers(self):
+        from core.models import Post
+        for i in range(7):
+            Post.objects.create(user=self.actor, content=f'post {i}')
+        params = {'mode': 'trending', 'ordering': 'newest', 'page_size': 3}
+        by_page = []
+        for number in (1, 2, 3):
+            by_page += [p['id'] for p in self.client.get('/api/explore/posts/', {**params, 'page': number}).data['results']]
+        by_cursor, cursor = [], ''
+        while cursor is not None:
+            data = self.client.get('/api/explore/posts/', {**params, 'cursor': cursor}).data
+            by_cursor += [p['id'] for p in data['results']]
+            cursor = data['next_cursor']
+        self.assertEqual(by_cursor, by_page)
+        self.assertEqual(len(by_cursor), 7)
+
+    def test_explore_popular_ties_and_for_you_cursor_validation(self):
+        from api.pagination import encode_cursor
+        from api.views import FOR_YOU_CURSOR_ORDER
+        from core.models import Post
+        # Equal scores and timestamps: the id tie-break still pages through every post once.
+        posts = [Post.objects.create(user=self.actor, content=f'tied {i}') for i in range(5)]
+        Post.objects.filter(pk__in=[p.pk for p in posts]).update(trending_score=1.0, timestamp=posts[0].timestamp)
+        seen, cursor = [], ''
+        while cursor is not None:
+            data = self.client.get('/api/explore/posts/', {'ordering': 'popular', 'page_size': 2, 'cursor': cursor}).data
+            seen += [p['id'] for p in data['results']]
+            cursor = data['next_cursor']
+        self.assertEqual(seen, sorted((p.pk for p in posts), reverse=True))
+
+        for position in (-1, 'x', 1.5, True, None):
+            resp = self.client.get('/api/explore/posts/', {
+                'mode': 'for_you', 'cursor': encode_cursor(FOR_YOU_CURSOR_ORDER, [position]),
+            })
+            self.assertEqual(resp.status_code, 400, position)
+        resp = self.client.get('/api/explore/posts/', {
+            'mode': 'for_you', 'page_size': 2, 'cursor': encode_cursor(FOR_YOU_CURSOR_ORDER, [2]),
+        })
+        self.assertEqual((resp.status_code, len(resp.data['results'])), (200, 2))
+
+
+class ChatConsumerTests(TransactionTestCase):
+    """Open chats get pushed message events over ws/chat/<id>/ (members only, viewer-neutral
+    payloads), typing events, and a resume of what they missed while disconnected.
+    (TransactionTestCase: the consumer's database_sync_to_async calls close connections that
+    are inside a TestCase transaction.)"""
+
+    def setUp(self):
+        from rest_framework.authtoken.models import Token
+        from api.models import Conversation, Message
+        self.alice = make_user('chatalice')
+        self.bob = make_user('chatbob')
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.alice, self.bob)
+        self.first = Message.objects.create(conversation=self.conversation, sender=self.alice, content='earlier')
+        self.tokens = {user.id: Token.objects.create(user=user).key for user in (self.alice, self.bob)}
+
+    def _communicator(self, user, query=''):
+        from channels.routing import URLRouter
+        from channels.testing import WebsocketCommunicator
+        from api.routing import websocket_urlpatterns
+        return WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns), f'/ws/chat/{self.conversation.id}/?token={self.tokens[user.id]}{query}',
+        )
+
+    def test_members_receive_pushes_and_resume(self):
+        from asgiref.sync import async_to_sync, sync_to_async
+        from api.models import Message
+        Message.objects.create(conversation=self.conversation, sender=self.alice, content='while away')
+        client = APIClient()
+        client.force_authenticate(user=self.alice)
+
+        async def scenario():
+            bob = self._communicator(self.bob, f'&last_id={self.first.id}')
+            self.assertTrue((await bob.connect())[0])
+            resumed = await bob.receive_json_from()
+            self.assertEqual((resumed['type'], resumed['complete']), ('resume', True))
+            self.assertEqual([m['content'] for m in resumed['messages']], ['while away'])
+
+            alice = self._communicator(self.alice)
+            self.assertTrue((await alice.connect())[0])
+            await alice.send_json_to({'action': 'typing', 'is_typing': True})
+            typing = await bob.receive_json_from()
+            self.assertEqual((typing['type'], typing['user_id']), ('typing', self.alice.id))
+            self.assertTrue(await alice.receive_nothing())
+
+            response = await sync_to_async(client.post)(
+                '/api/messages/', {'conversation': self.conversation.id, 'content': 'live'},
+            )
+            self.assertEqual(response.status_code, 201)
+            pushed = await bob.receive_json_from()
+            self.assertEqual(
+                (pushed['type'], pushed['message']['content'], pushed['message']['is_me']), ('message_new', 'live', False),
+            )
+            self.assertNotIn('email', pushed['message']['sender'])
+            self.assertTrue((await alice.receive_json_from())['message']['is_me'])
+
+            await sync_to_async(self.conversation.participants.remove)(self.bob)
+            self.assertEqual((await bob.receive_output())['type'], 'websocket.close')
+            await alice.disconnect()
+
+            # Bob is no longer a member, so he can't reconnect either.
+            self.assertEqual(await self._communicator(self.bob).connect(), (False, 4003))
+
+        async_to_sync(scenario)()
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Token auth is served from a cached user snapshot (no password hash in it) after the
+    first request, and the entry is dropped on token rotation, user changes and logout."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from rest_framework.authtoken.models import Token
+        cache.clear()
+        self.user = make_user('cachedauth')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def _auth_queries(self, path='/api/users/counts/'):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(path)
+        return response, [q['sql'] for q in ctx.captured_queries if 'authtoken_token' in q['sql']]
+
+    def test_second_request_skips_the_token_query_and_hides_the_hash(self):
+        from django.core.cache import cache
+        from api.services import auth_cache
+        self.assertEqual(len(self._auth_queries()[1]), 1)
+        response, token_queries = self._auth_queries()
+        self.assertEqual((response.status_code, token_queries), (200, []))
+        self.assertNotIn('password', cache.get(auth_cache.TOKEN_KEY.format(key=self.token.key))['user'])
+
+        user, _ = auth_cache.get(self.token.key)
+        self.assertTrue(user.check_password('testpass123'))  # deferred, loaded on demand
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/users/counts/').status_code, 401)
+
+    def test_rotation_and_logout_drop_the_entry(self):
+        from django.core.cache import cache
+        from api.services import auth_cache
+        self.client.get('/api/users/counts/')
+        response = self.client.post('/api/users/change-password/', {
+            'current_password': 'testpass123', 'new_password': 'An0ther-Secret-Phrase',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/api/users/counts/').status_code, 401)  # old token
+
+        new_key = response.data['token']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {new_key}')
+        self.assertEqual(self.client.get('/api/users/counts/').status_code, 200)
+        self.assertIsNotNone(cache.get(auth_cache.TOKEN_KEY.format(key=new_key)))
+        self.client.cookies['auth_token'] = new_key
+        self.client.post('/api/logout/')
+        self.assertIsNone(cache.get(auth_cache.TOKEN_KEY.format(key=new_key)))
+
+
+class CompiledPermissionTests(TestCase):
+    """Effective permissions are compiled once per scope, served from the cache (and a
+    per-request memo) afterwards, re-resolved after role/membership edits, and resolvable in
+    batches."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from core.models import Organisation, OrganisationMember, Project, ProjectMember, Role
+        cache.clear()
+        self.owner = make_user('permowner')
+        self.member = make_user('permmember')
+        self.outsider = make_user('permoutsider')
+        from api.permission_catalog import create_default_roles
+        self.org = Organisation.objects.create(name='Perm Studio')
+        create_default_roles(self.org)  # as organisation creation does
+        OrganisationMember.objects.create(organisation=self.org, user=self.owner, role='owner')
+        self.role = Role.objects.create(organisation=self.org, name='Tester', permissions=['feedback.pin'])
+        OrganisationMember.objects.create(organisation=self.org, user=self.member, custom_role=self.role)
+        self.project = Project.objects.create(owner=self.owner, organisation=self.org, title='Perm Game', description='d')
+        self.other = Project.objects.create(owner=self.outsider, organisation=self.org, title='Other', description='d')
+        ProjectMember.objects.create(project=self.project, user=self.member, custom_role=self.role, status='active')
+
+    def _fresh(self, user):
+        from api.models import User
+        return User.objects.get(pk=user.pk)
+
+    def test_cached_until_role_changes(self):
+        from api.permissions_service import get_effective_permissions, user_has_permission
+        self.assertEqual(get_effective_permissions(self.member, project=self.project), ['feedback.pin'])
+        with self.assertNumQueries(0):
+            self.assertTrue(user_has_permission(self.member, 'feedback.pin', project=self.project))
+        member = self._fresh(self.member)
+        with self.assertNumQueries(0):
+            self.assertFalse(user_has_permission(member, 'feedback.delete', project=self.project))
+
+        self.role.permissions = ['feedback.pin', 'feedback.delete']
+        self.role.save()
+        self.assertTrue(user_has_permission(member, 'feedback.delete', project=self.project))
+        self.assertIsNone(get_effective_permissions(self.outsider, project=self.project))
+
+    def test_batch_resolution(self):
+        from api.permissions_service import (
+            ALL_PERMISSIONS, projects_with_permission, resolve_for_projects, resolve_for_users, users_with_permission,
+        )
+        users = [self.owner, self.member, self.outsider]
+        # One query per membership kind for the whole batch, plus create_default_roles' 3
+        # lookups for the owner's seeded Owner role.
+        with self.assertNumQueries(5):
+            perms = resolve_for_users([u.pk for u in users], project=self.project)
+        self.assertEqual(perms[self.owner.pk], ALL_PERMISSIONS)
+        self.assertEqual(perms[self.member.pk], frozenset({'feedback.pin'}))
+        self.assertIsNone(perms[self.outsider.pk])
+        self.assertEqual(users_with_permission(users, 'feedback.pin', organisation=self.org), {self.owner.pk, self.member.pk})
+
+        self.assertEqual(resolve_for_projects(self.member, [self.project, self.other]), {
+            self.project.id: frozenset({'feedback.pin'}), self.other.id: None,
+        })
+        self.assertEqual(projects_with_permission(self.owner, 'settings.edit', [self.project, self.other]), [self.project, self.other])
+
+
+class WorkspaceSectionTests(TestCase):
+    """A board is stored as independently versioned sections: the full-blob API still round-trips,
+    tools read and write their own section, and only a stale write to the same section conflicts."""
+
+    def setUp(self):
+        from core.models import Project
+        self.owner = make_user('sectionowner')
+        self.project = Project.objects.create(owner=self.owner, title='Section Game', description='d')
+        self.key = f'workspace__solo_board_project_{self.project.id}'
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+        self.blob = {
+            'columns': [{'id': 'backlog'}], 'tasks': [{'id': 't1', 'title': 'A'}],
+            'gddDocs': [{'id': 'd1'}], 'categories': ['code'],
+        }
+        resp = self.client.post('/api/workspace-state/', {'key': self.key, 'data': self.blob, 'tool': 'kanban'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_full_blob_round_trips_over_sections(self):
+        from core.models import WorkspaceSection, WorkspaceState
+        resp = self.client.get(f'/api/workspace-state/{self.key}/')
+        self.assertEqual(resp.data['data'], self.blob)
+        self.assertEqual(resp.data['section_versions'], {'meta': 1, 'columns': 1, 'tasks': 1, 'docs': 1})
+        state = WorkspaceState.objects.get(key=self.key)
+        self.assertEqual(state.data, {'categories': ['code']})
+        self.assertEqual(WorkspaceSection.objects.filter(state=state).count(), 3)
+
+        # Rewriting the blob with only the tasks changed leaves the other sections' versions alone.
+        blob = {**self.blob, 'tasks': []}
+        resp = self.client.post('/api/workspace-state/', {
+            'key': self.key, 'data': blob, 'tool': 'kanban', 'base_version': 1,
+        }, format='json')
+        self.assertEqual(resp.data['version'], 2)
+        self.assertEqual(resp.data['section_versions'], {'meta': 1, 'columns': 1, 'tasks': 2, 'docs': 1})
+
+    def test_section_reads_writes_and_ops(self):
+        url = f'/api/workspace-state/{self.key}/sections/'
+        resp = self.client.get(url, {'names': 'tasks'})
+        self.assertEqual(resp.data['sections'], {'tasks': {'data': [{'id': 't1', 'title': 'A'}], 'version': 1}})
+
+        # Two tools saving from the same loaded board: different sections, no conflict.
+        resp = self.client.post(url, {'sections': {'tasks': {'data': [], 'base_version': 1}}}, format='json')
+        self.assertEqual((resp.status_code, resp.data['changed']), (200, ['tasks']))
+        resp = self.client.post(url, {'sections': {'docs': {'data': [{'id': 'd2'}], 'base_version': 1}}}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        # A second stale write to the same section does conflict, and writes nothing.
+        resp = self.client.post(url, {'sections': {'tasks': {'data': [{'id': 'x'}], 'base_version': 1}}}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(resp.data['current']['sections']['tasks'], {'data': [], 'version': 2})
+
+        resp = self.client.post(url, {'ops': [
+            {'section': 'tasks', 'op': 'upsert', 'value': {'id': 't2', 'title': 'B'}},
+            {'section': 'docs', 'op': 'remove', 'id': 'd2'},
+            {'section': 'meta', 'op': 'set', 'field': 'activities', 'value': [{'id': 'a1'}]},
+        ], 'tool': 'kanban'}, format='json')
+        self.assertEqual(resp.data['changed'], ['docs', 'meta', 'tasks'])
+        board = self.client.get(f'/api/workspace-state/{self.key}/').data['data']
+        self.assertEqual((board['tasks'], board['gddDocs'], board['activities']), ([{'id': 't2', 'title': 'B'}], [], [{'id': 'a1'}]))
+
+        resp = self.client.post(url, {'sections': {'tasks': {'data': None}}}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_partial_blob_empties_missing_sections(self):
+        # The blob omits gddDocs (and never had assets): docs is emptied, assets stays unwritten.
+        blob = {'columns': [{'id': 'backlog'}], 'tasks': [{'id': 't1', 'title': 'A'}], 'categories': ['code']}
+        resp = self.client.post('/api/workspace-state/', {'key': self.key, 'data': blob, 'tool': 'kanban'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        self.assertEqual(resp.data['section_versions'], {'meta': 1, 'columns': 1, 'tasks': 1, 'docs': 2})
+        sections = self.client.get(f'/api/workspace-state/{self.key}/sections/', {'names': 'docs,assets'}).data['sections']
+        self.assertEqual(sections, {'docs': {'data': [], 'version': 2}, 'assets': {'data': None, 'version': 0}})
+
+    def test_meta_write_needs_every_listed_tools_permission(self):
+        from unittest import mock
+        from api import permissions_service
+        from api.permission_catalog import TOOL_WRITE_PERMISSIONS
+
+        def kanban_only(user, keys, organisation=None, project=None):
+            return keys == TOOL_WRITE_PERMISSIONS['kanban']
+
+        url = f'/api/workspace-state/{self.key}/sections/'
+        meta = {'meta': {'data': {'categories': ['art']}}}
+        with mock.patch.object(permissions_service, 'user_has_any_permission', kanban_only):
+            resp = self.client.post(url, {'sections': meta, 'tools': ['kanban', 'gdd']}, format='json')
+            self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+            resp = self.client.post(url, {'sections': meta, 'tools': ['kanban']}, format='json')
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
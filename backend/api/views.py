@@ -12,7 +12,11 @@ from rest_framework import status
 from core.models import Game, Review, Post, Organisation, OrganisationMember, OrganisationFollow, OrganisationInvitation
 from api.models import User, Notification, SupportTicket, Interest, PendingRegistration, PendingEmailChange, create_notification
 from .serializers import UserSerializer, GameSerializer, ReviewSerializer, PostSerializer, RegisterSerializer, SupportTicketSerializer, OrganisationSerializer, OrganisationMemberSerializer, OrganisationInvitationSerializer
-from .pagination import LargeResultsSetPagination, StandardResultsSetPagination
+from .pagination import (
+    InvalidCursor, LargeResultsSetPagination, OptInResultsSetPagination, StandardResultsSetPagination,
+    decode_cursor, encode_cursor, keyset_page,
+)
+from .filters import GenreFilter, IndexedSearchFilter
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
 from django.core.mail import EmailMultiAlternatives
@@ -24,7 +28,7 @@ from django.conf import settings
 from api.services.email_service import send_verification_email, send_support_ticket_email, send_email_change_verification_email
 
 from api.permissions import IsOwnerOrReadOnly, ProjectAccessPermission, OrganisationAccessPermission
-from api.authentication import set_auth_cookie, clear_auth_cookie
+from api.authentication import AUTH_COOKIE_NAME, set_auth_cookie, clear_auth_cookie
 
 from rest_framework.throttling import ScopedRateThrottle
 
@@ -164,8 +168,9 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [IndexedSearchFilter]
     search_fields = ['username', 'real_name']
+    search_index_kind = 'user'
     lookup_field = 'username'
 
     def filter_queryset(self, queryset):
@@ -381,6 +386,14 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         
         return HttpResponseRedirect(f"{frontend_url}/settings?sync=steam_success")
 
+    @action(detail=False, methods=['get'], url_path='steam-sync-progress', permission_classes=[permissions.IsAuthenticated])
+    def steam_sync_progress(self, request):
+        """GET /api/users/steam-sync-progress/ — the current user's in-flight (or last) Steam
+        library sync: {'stage', 'done', 'total'}, published per stage by fetch_steam_library."""
+        from api.services.steam import get_steam_sync_progress
+        progress = get_steam_sync_progress(request.user.id)
+        return Response(progress or {'stage': 'idle', 'done': 0, 'total': 0})
+
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def xbox_auth_url(self, request):
         from django.core import signing
@@ -650,24 +663,23 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
             return Response({"error": "This account is private."}, status=status.HTTP_403_FORBIDDEN)
         from api.models import LibraryEntry
         
-        entries = LibraryEntry.objects.filter(
-            user=user
-        ).exclude(status='dropped').select_related('game')
-
-        from api.services.steam import normalize_genre
+        from core.models import GameGenre
+        playtimes = dict(
+            LibraryEntry.objects.filter(user=user).exclude(status='dropped').values_list('game_id', 'playtime_forever')
+        )
         genre_weights = {}
         genre_game_counts = {}
 
-        for entry in entries:
+        # Canonical genre links (see api.services.genre_index), so "Экшен" and "Action" are
+        # one genre without normalizing strings here.
+        links = GameGenre.objects.filter(game_id__in=playtimes).values_list('game_id', 'genre__name')
+        for game_id, genre in links:
             # No fallback for zero-playtime entries: an unplayed/plan-to-play game hasn't
             # actually told us anything about the user's genre taste, so it should contribute
             # nothing rather than a fabricated weight.
-            weight = entry.playtime_forever
-
-            for genre in (entry.game.genres or []):
-                normalized = normalize_genre(genre)
-                genre_weights[normalized] = genre_weights.get(normalized, 0) + weight
-                genre_game_counts[normalized] = genre_game_counts.get(normalized, 0) + 1
+            weight = playtimes[game_id]
+            genre_weights[genre] = genre_weights.get(genre, 0) + weight
+            genre_game_counts[genre] = genre_game_counts.get(genre, 0) + 1
 
         total_genre_weight = sum(genre_weights.values())
 
@@ -714,44 +726,22 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
                 return Response(cached)
 
         # 1. Calculate user's top genres (Game DNA) — playtime > 0 olan tüm oyunlar
-        entries = LibraryEntry.objects.filter(
-            user=user,
-            playtime_forever__gt=0
-        ).select_related('game')
-
-        from api.services.steam import normalize_genre
+        from core.models import GameGenre
+        playtimes = dict(
+            LibraryEntry.objects.filter(user=user, playtime_forever__gt=0).values_list('game_id', 'playtime_forever')
+        )
         genre_counts = {}
-        played_game_ids = set()
-        for entry in entries:
-            played_game_ids.add(entry.game.id)
-            weight = max(entry.playtime_forever, 1)
-            for genre in (entry.game.genres or []):
-                normalized = normalize_genre(genre)
-                genre_counts[normalized] = genre_counts.get(normalized, 0) + weight
+        for game_id, genre_id in GameGenre.objects.filter(game_id__in=playtimes).values_list('game_id', 'genre_id'):
+            genre_counts[genre_id] = genre_counts.get(genre_id, 0) + playtimes[game_id]
 
         # Also get all other game IDs the user has to exclude them
-        all_user_entries = LibraryEntry.objects.filter(user=user)
-        all_played_ids = set([e.game_id for e in all_user_entries])
-        
+        all_played_ids = set(LibraryEntry.objects.filter(user=user).values_list('game_id', flat=True))
+
         # Exclude reviewed games to ensure completely unlogged discovery
         from core.models import Review
         reviewed_game_ids = set(Review.objects.filter(user=user).values_list('game_id', flat=True))
         all_played_ids = all_played_ids.union(reviewed_game_ids)
 
-        translation_map = {
-            'aksiyon': 'action',
-            'macera': 'adventure',
-            'basit eğlence': 'casual',
-            'bağımsız yapım': 'indie',
-            'devasa çok oyunculu': 'massively multiplayer',
-            'yarış': 'racing',
-            'rvo': 'rpg',
-            'simülasyon': 'simulation',
-            'spor': 'sports',
-            'strateji': 'strategy',
-            'erken erişim': 'early access'
-        }
-        
         # Sampling helper: `order_by('?')` compiles to `ORDER BY RANDOM()` in Postgres, which
         # forces a full-table sort with no index usable. Pulling just the matching IDs and
         # sampling in Python avoids sorting/hydrating every matching row just to keep 20.
@@ -760,26 +750,18 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
             sample_ids = random.sample(candidate_ids, min(limit, len(candidate_ids)))
             return Game.objects.filter(id__in=sample_ids)
 
-        # If no genres found, return random popular games
+        # 2. Genre matches come from the in-memory genre bitmaps: union of the wanted genres
+        # minus everything the user already has, then a uniform sample of 20.
+        from api.services import genre_index
         if target_genre != 'all':
-            english_genre = translation_map.get(target_genre.lower(), target_genre)
-            genre_query = Q(genres__icontains=target_genre) | Q(genres__icontains=english_genre)
-            recommended = sample_games(Game.objects.filter(genre_query).exclude(id__in=all_played_ids))
-
+            genre_ids = genre_index.genre_ids_for([target_genre], create=False).values()
+            recommended = Game.objects.filter(id__in=genre_index.sample(genre_ids, 20, exclude=all_played_ids))
         elif not genre_counts:
             recommended = sample_games(Game.objects.exclude(id__in=all_played_ids))
         else:
             # Get top 3 genres
             top_genres = [g[0] for g in sorted(genre_counts.items(), key=lambda x: x[1], reverse=True)[:3]]
-
-            # 2. Query games that matching any of top genres
-            # using Postgres jsonb array filtering or Q objects
-            genre_query = Q()
-            for genre in top_genres:
-                english_genre = translation_map.get(genre.lower(), genre)
-                genre_query |= Q(genres__icontains=genre) | Q(genres__icontains=english_genre)
-
-            recommended = sample_games(Game.objects.filter(genre_query).exclude(id__in=all_played_ids))
+            recommended = Game.objects.filter(id__in=genre_index.sample(top_genres, 20, exclude=all_played_ids))
 
         # Fallback — a user who has already played/reviewed every unplayed game matching
         # their own top genres would otherwise see an empty shelf with no explanation.
@@ -1073,6 +1055,7 @@ from .serializers import NotificationSerializer
 class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptInResultsSetPagination
 
     def get_queryset(self):
         return Notification.objects.filter(recipient=self.request.user).select_related('actor').order_by('-created_at')
@@ -1095,9 +1078,9 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
-        self.get_queryset().update(is_read=True)
-        from api.consumers import send_user_update
-        send_user_update(request.user.id)
+        self.get_queryset().filter(is_read=False).update(is_read=True)
+        from api.services import unread_counters
+        unread_counters.set_count(request.user.id, 'notifications', 0)
         return Response({'status': 'marked all read'})
 
 class RegisterView(generics.CreateAPIView):
@@ -1343,6 +1326,11 @@ class LogoutView(generics.GenericAPIView):
     permission_classes = [permissions.AllowAny]
 
     def post(self, request, *args, **kwargs):
+        # The token stays valid (see above), but this browser's cached session snapshot goes.
+        token_key = request.COOKIES.get(AUTH_COOKIE_NAME)
+        if token_key:
+            from api.services import auth_cache
+            auth_cache.invalidate_token(token_key)
         response = Response({'detail': 'Logged out.'}, status=status.HTTP_200_OK)
         return clear_auth_cookie(response)
 
@@ -1353,47 +1341,41 @@ class GameViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Game.objects.all()
     serializer_class = GameSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [GenreFilter, IndexedSearchFilter]
     search_fields = ['title']
+    search_index_kind = 'game'
 
     @action(detail=True, methods=['get'], url_path='details')
     def details(self, request, pk=None):
-        from django.db.models import Avg, Count
         game = self.get_object()
         
-        # Fetch IGDB details on demand
+        # IGDB details are hydrated in the background; respond with what we have now
+        # (details_fetched=False tells the client to check back).
         if not game.details_fetched:
-            from api.services.igdb_service import fetch_game_details
-            game = fetch_game_details(game)
+            from api.services.game_hydration import enqueue_hydration
+            enqueue_hydration(game.pk)
+
+        # Ratings and counts come from the GameStats rollup (api.services.game_stats).
+        from api.services.game_stats import get_stats
+        stats = get_stats(game.pk)
+        game.average_rating = stats.avg_rating
+        game.review_count = stats.review_count
+        game.log_count = stats.log_count
+        game.rating_histogram = stats.rating_histogram
+        game.status_counts = stats.status_counts
 
-        # Calculate average rating and counts
-        stats = Review.objects.filter(game=game).aggregate(
-            avg_rating=Avg('rating'),
-            rev_count=Count('id')
-        )
-        
-        # We need log count as well, which is library entries (how many users have it in library)
-        from api.models import LibraryEntry
-        log_count = LibraryEntry.objects.filter(game=game).count()
-        
-        # Annotate model on the fly for serializer
-        game.average_rating = stats['avg_rating']
-        game.review_count = stats['rev_count']
-        game.log_count = log_count
-        
         from api.serializers import GameDetailSerializer
         serializer = GameDetailSerializer(game, context={'request': request})
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def trending(self, request):
-        from django.db.models import Count
-        trending_games = Game.objects.annotate(
-            entry_count=Count('library_entries')
-        ).filter(entry_count__gt=0).order_by('-entry_count')[:10]
-        
+        from api.models import GameStats
+        trending_stats = GameStats.objects.filter(log_count__gt=0).select_related('game').order_by('-log_count')[:10]
+
         result = []
-        for g in trending_games:
+        for stats in trending_stats:
+            g = stats.game
             image_url = None
             if g.cover_image:
                 if str(g.cover_image).startswith('http'):
@@ -1407,27 +1389,28 @@ class GameViewSet(viewsets.ReadOnlyModelViewSet):
                 "id": g.id,
                 "title": g.title,
                 "cover_image": image_url,
-                "entry_count": getattr(g, 'entry_count', 0)
+                "entry_count": stats.log_count
             })
         return Response(result)
 
     @action(detail=False, methods=['get'], url_path='hidden-gems')
     def hidden_gems(self, request):
-        from django.db.models import Avg, Count
-        # High average rating but low review count or library entries
-        gems = Game.objects.annotate(
-            avg_rating=Avg('reviews__rating'),
-            rev_count=Count('reviews')
-        ).filter(rev_count__gt=0, rev_count__lte=5, avg_rating__gte=7).order_by('-avg_rating', '?')[:10]
-        
-        if not gems.exists():
+        from api.models import GameStats
+        from api.services.game_stats import random_sample
+        # High average rating but low review count, sampled off GameStats' random-key index
+        # (the gem filter matches its partial index) instead of ORDER BY RANDOM().
+        gem_stats = random_sample(
+            GameStats.objects.filter(review_count__gte=1, review_count__lte=5, avg_rating__gte=7).select_related('game'), 10,
+        )
+        gem_stats.sort(key=lambda stats: stats.avg_rating, reverse=True)
+
+        if not gem_stats:
             # Fallback if no specific data
-            gems = Game.objects.annotate(
-                rev_count=Count('reviews')
-            ).filter(rev_count__lte=5).order_by('?')[:10]
-            
+            gem_stats = random_sample(GameStats.objects.filter(review_count__lte=5).select_related('game'), 10)
+
         result = []
-        for g in gems:
+        for stats in gem_stats:
+            g = stats.game
             image_url = None
             if g.cover_image:
                 if str(g.cover_image).startswith('http'):
@@ -1441,7 +1424,7 @@ class GameViewSet(viewsets.ReadOnlyModelViewSet):
                 "id": g.id,
                 "title": g.title,
                 "cover_image": image_url,
-                "avg_rating": getattr(g, 'avg_rating', 0)
+                "avg_rating": stats.avg_rating or 0
             })
         return Response(result)
 
@@ -1466,9 +1449,18 @@ class GameViewSet(viewsets.ReadOnlyModelViewSet):
         if not query:
             return Response([])
 
-        # 1. Search Local Games (with some fuzzy matching or icontains)
-        local_games = Game.objects.filter(Q(title__icontains=query))[:5]
+        # 1. Search Local Games (ranked, typo-tolerant title match from the search index)
         from api.serializers import GameSerializer
+        from api.services import search_index
+        try:
+            ranked = search_index.search_ids('game', query, limit=5)
+            games = Game.objects.in_bulk(ranked)
+            local_games = [games[pk] for pk in ranked if pk in games]
+        except search_index.IndexUnavailable:
+            local_games = Game.objects.filter(Q(title__icontains=query))[:5]
+        except Exception:
+            logger.exception("Game search index failed for %r; falling back to icontains", query)
+            local_games = Game.objects.filter(Q(title__icontains=query))[:5]
         games_data = GameSerializer(local_games, many=True, context={'request': request}).data
         
         # Tag them
@@ -1485,6 +1477,33 @@ class GameViewSet(viewsets.ReadOnlyModelViewSet):
         combined = list(games_data) + list(companies_data)
         return Response(combined)
 
+    @action(detail=False, methods=['get'], url_path='semantic-search')
+    def semantic_search(self, request):
+        """GET /api/games/semantic-search/?q=cozy+farming+with+friends — ranks games by meaning
+        (nearest neighbours over stored embeddings of title/summary/genres, see
+        api.services.embedding_store) rather than title substring. Falls back to the title
+        search if the embedding model isn't available."""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response([])
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), 50))
+        except ValueError:
+            limit = 10
+
+        from api.serializers import GameSerializer
+        from api.services.embedding_store import semantic_search
+        try:
+            hits = semantic_search('game', query, k=limit)
+        except Exception:
+            logger.exception("Semantic game search failed for %r; falling back to title search", query)
+            games = Game.objects.filter(title__icontains=query)[:limit]
+            return Response(GameSerializer(games, many=True, context={'request': request}).data)
+
+        games = Game.objects.in_bulk([game_id for game_id, _ in hits])
+        ordered = [games[game_id] for game_id, _ in hits if game_id in games]
+        return Response(GameSerializer(ordered, many=True, context={'request': request}).data)
+
     @action(detail=False, methods=['get'], url_path='company-games')
     def company_games(self, request):
         """GET /api/games/company-games/?name=Rockstar+Games"""
@@ -1631,7 +1650,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
         api.services.embeddings.classify_review) — same pipeline Posts get, so reviews
         can be scored by interest overlap in FeedViewSet.for_you instead of only keyword
         matching. Runs in the background (model inference is 5-10s+ on constrained CPU) —
-        on_commit so the thread never races the still-uncommitted row."""
+        on_commit so the worker never races the still-uncommitted row."""
         from django.db import transaction
         from api.services.embeddings import classify_review_async
         transaction.on_commit(lambda: classify_review_async(review.id))
@@ -1830,14 +1849,16 @@ class PostViewSet(viewsets.ModelViewSet):
             
         post = serializer.save(user=self.request.user, **post_kwargs)
 
-        from api.services.categorize import calculate_trending_score
-        post.trending_score = calculate_trending_score(post)
+        # A new post has no engagement yet, so its score needs no queries; whatever it
+        # replies to / reposts is marked for the next trending pass by the Post signal.
+        from api.services.trending import score_new_post
+        post.trending_score = score_new_post(post)
         post.save(update_fields=['trending_score'])
 
         # Auto-category + interest tags (language-agnostic embedding classification, see
         # api.services.embeddings) run in the background, not here — model inference takes
         # 5-10s+ on Railway's allocated CPU and would otherwise block the post-creation
-        # response that long. on_commit so the thread never races the still-uncommitted row.
+        # response that long. on_commit so the worker never races the still-uncommitted row.
         from django.db import transaction
         from api.services.embeddings import classify_post_async
         transaction.on_commit(lambda: classify_post_async(post.id, overwrite_category=not category))
@@ -1895,6 +1916,32 @@ class PostViewSet(viewsets.ModelViewSet):
 
         return Response({'status': 'reposted', 'reposts_count': original_post.reposts.count()}, status=status.HTTP_201_CREATED)
 
+    @action(detail=True, methods=['get'], url_path='similar')
+    def similar(self, request, pk=None):
+        """GET /api/posts/<id>/similar/ — "more like this": the nearest posts by embedding
+        (api.services.embedding_store), filtered through get_queryset() so blocked/muted/private
+        authors stay hidden exactly as they are everywhere else."""
+        post = self.get_object()
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), 50))
+        except ValueError:
+            limit = 10
+
+        from api.services.embedding_store import similar_items, text_for_post
+        try:
+            # Over-fetch: some neighbours are replies or hidden from this viewer.
+            hits = similar_items('post', post.id, text_for_post(post), k=limit * 3)
+        except Exception:
+            logger.exception("Similar-post lookup failed for post %s", post.id)
+            return Response([])
+
+        visible = self.get_queryset().filter(
+            id__in=[post_id for post_id, _ in hits], parent__isnull=True,
+        )
+        by_id = {p.id: p for p in visible}
+        ordered = [by_id[post_id] for post_id, _ in hits if post_id in by_id][:limit]
+        return Response(self.get_serializer(ordered, many=True).data)
+
     @action(detail=True, methods=['post'], url_path='not-interested', permission_classes=[permissions.IsAuthenticated])
     def not_interested(self, request, pk=None):
         post = self.get_object()
@@ -2392,13 +2439,11 @@ class ConversationViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'], url_path='search-messages')
     def search_messages(self, request, pk=None):
         conversation = self.get_object()
-        query = request.query_params.get('q', '')
-        if not query:
-            return Response([])
-        messages = conversation.messages.filter(content__icontains=query).order_by('-created_at')
         from api.serializers import MessageSerializer
-        serializer = MessageSerializer(messages, many=True, context={'request': request})
-        return Response(serializer.data)
+        return Response(_message_search_response(
+            request, conversation.messages.all(), request.query_params.get('q', ''),
+            lambda messages: MessageSerializer(messages, many=True, context={'request': request}).data,
+        ))
 
     def destroy(self, request, *args, **kwargs):
         conversation = self.get_object()
@@ -2440,6 +2485,23 @@ class ConversationViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(conversation)
         return Response(serializer.data)
 
+def _message_search_response(request, messages, query, serialize):
+    """One page of ranked message search results: {'results', 'has_more', 'next_cursor'},
+    each result a serialized message plus 'snippet' ({'text', 'highlights'}) and 'rank'.
+    `messages` must already be scoped to a conversation the user belongs to."""
+    from api.services import message_search
+    try:
+        limit = int(request.query_params.get('limit', message_search.DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        limit = message_search.DEFAULT_PAGE_SIZE
+    page = message_search.search(messages, query, cursor=request.query_params.get('cursor'), limit=limit)
+    results = serialize([message for message, _, _ in page.hits])
+    for result, (_, score, snippet) in zip(results, page.hits):
+        result['snippet'] = snippet
+        result['rank'] = score
+    return {'results': results, 'has_more': page.next_cursor is not None, 'next_cursor': page.next_cursor}
+
+
 class MessageViewSet(viewsets.ModelViewSet):
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -2476,14 +2538,14 @@ class MessageViewSet(viewsets.ModelViewSet):
 
         # Full-history search — the in-conversation search box used to filter only the
         # ~30 messages already loaded client-side (a correctness regression once the main
-        # list became paginated), so it now searches the whole conversation server-side.
+        # list became paginated), so it now searches the whole conversation server-side,
+        # ranked, against the full-text index (api.services.message_search).
         search_query = request.query_params.get('search')
         if search_query:
-            matched_qs = self.filter_queryset(self.get_queryset()).filter(
-                content__icontains=search_query
-            ).order_by('-created_at')[:50]
-            serializer = self.get_serializer(matched_qs, many=True)
-            return Response({'results': serializer.data, 'has_more': False})
+            return Response(_message_search_response(
+                request, self.filter_queryset(self.get_queryset()), search_query,
+                lambda messages: self.get_serializer(messages, many=True).data,
+            ))
 
         # Jump to an arbitrary message (e.g. from a search result) that may not be in the
         # currently-loaded page — returns a window of messages around it so the frontend
@@ -2502,11 +2564,9 @@ class MessageViewSet(viewsets.ModelViewSet):
             serializer = self.get_serializer(combined, many=True)
             return Response({'results': serializer.data, 'has_more': has_more})
 
-        # Mark unread messages from other users as read
-        Message.objects.filter(
-            conversation_id=conversation_id,
-            is_read=False
-        ).exclude(sender=request.user).update(is_read=True)
+        # Mark unread messages from other users as read (and move everyone's unread counters)
+        from api.services import unread_counters
+        unread_counters.mark_conversation_read(conversation_id, request.user.id)
 
         # Bounded pagination — a chat's full history used to be refetched on every single
         # 3-second poll (unbounded, ever-growing payload). Three modes, all ordered oldest-
@@ -2572,6 +2632,9 @@ class MessageViewSet(viewsets.ModelViewSet):
         conversation.updated_at = timezone.now()
         conversation.save(update_fields=['updated_at'])
 
+        from api.services import chat_events
+        chat_events.publish_message(message, 'message_new', self.request)
+
     @action(detail=True, methods=['post'], url_path='react')
     def react(self, request, pk=None):
         message = self.get_object()
@@ -2588,6 +2651,9 @@ class MessageViewSet(viewsets.ModelViewSet):
         else:
             MessageReaction.objects.create(message=message, user=request.user, emoji=emoji)
             action_performed = 'added'
+
+        from api.services import chat_events
+        chat_events.publish_message(message, 'message_reaction', request)
             
         serializer = self.get_serializer(message)
         return Response({
@@ -2625,6 +2691,11 @@ class MessageViewSet(viewsets.ModelViewSet):
                 oldest.pinned_at = None
                 oldest.save(update_fields=['is_pinned', 'pinned_at'])
 
+        from api.services import chat_events
+        chat_events.publish_message(message, 'message_pinned', request)
+        if evicted_message_id:
+            chat_events.publish_message(oldest, 'message_pinned', request)
+
         serializer = self.get_serializer(message)
         return Response({
             "status": "success",
@@ -2654,6 +2725,9 @@ class MessageViewSet(viewsets.ModelViewSet):
         message.is_edited = True
         message.edited_at = timezone.now()
         message.save()
+
+        from api.services import chat_events
+        chat_events.publish_message(message, 'message_edited', request)
         
         serializer = self.get_serializer(message)
         return Response(serializer.data)
@@ -2678,6 +2752,9 @@ class MessageViewSet(viewsets.ModelViewSet):
         message.is_edited = True
         message.edited_at = timezone.now()
         message.save()
+
+        from api.services import chat_events
+        chat_events.publish_message(message, 'message_edited', request)
         
         serializer = self.get_serializer(message)
         return Response(serializer.data)
@@ -2692,6 +2769,9 @@ class MessageViewSet(viewsets.ModelViewSet):
         message.is_deleted = True
         message.content = "This message was deleted"
         message.save()
+
+        from api.services import chat_events
+        chat_events.publish_message(message, 'message_deleted', request)
         return Response({"status": "success", "message": "Message deleted"})
 
 from api.models import LibraryEntry
@@ -2703,6 +2783,7 @@ class LibraryViewSet(viewsets.ModelViewSet):
     serializer_class = LibraryEntrySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    pagination_class = OptInResultsSetPagination
     filterset_fields = ['user__username', 'platform', 'status']
     ordering_fields = ['playtime_forever', 'game__title']
     ordering = ['-playtime_forever']
@@ -3097,8 +3178,9 @@ class ProjectViewSet(viewsets.ModelViewSet):
     queryset = _BASE_QUERYSET
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, ProjectAccessPermission]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, IndexedSearchFilter]
     search_fields = ['title', 'description', 'tech_stack']
+    search_index_kind = 'project'
     filterset_fields = ['status', 'organisation']
     ordering_fields = ['created_at']
     ordering = ['-created_at']
@@ -3213,11 +3295,14 @@ class ProjectViewSet(viewsets.ModelViewSet):
         from here rather than Devs having a private copy.
         """
         from api.locale_registry import resolve_project_locales, resolve_source_locale, to_public_dict
+        from api.services import workspace_sections
 
         project = self.get_object()
         state = _project_workspace_state_readonly(project)
+        # `meta` (language settings) plus two sections — never the tasks/docs/assets ones.
         blob = state.data or {} if state else {}
-        entries = blob.get('translationKeys') or []
+        sections = workspace_sections.read(state, ['translationKeys', 'glossary'])
+        entries = sections['translationKeys']['data'] or []
 
         keys = [
             {
@@ -3236,7 +3321,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 'term': term.get('term', ''),
                 'translations': term.get('translations') or {},
             }
-            for term in (blob.get('glossary') or [])
+            for term in (sections['glossary']['data'] or [])
         ]
 
         return Response({
@@ -3254,10 +3339,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
         Public leaderboard of who has contributed to this project's localisation, ranked by
         characters of APPROVED translation text (a plural row counts every category's text, not
         just one representative string — matching how much a translator actually typed). Built
-        from CommunityTranslation directly (not the WorkspaceState blob) since it's the single
-        shared source of suggestion data for both the Devs Localisation Manager and this public
-        page (see CommunityTranslation's docstring) — there is no separate "Devs contributors"
-        view, by design.
+        from CommunityTranslation (via its LocalisationContribution rollup), not the
+        WorkspaceState blob, since it's the single shared source of suggestion data for both the
+        Devs Localisation Manager and this public page (see CommunityTranslation's docstring) —
+        there is no separate "Devs contributors" view, by design.
 
         `role_badge` distinguishes a project team member/owner ('team'), someone from the same
         organisation who isn't directly on this project ('org'), and an unaffiliated public
@@ -3274,80 +3359,114 @@ class ProjectViewSet(viewsets.ModelViewSet):
         DRF-reserved-param collision as the earlier `format`/`status` renames on this endpoint
         family — see translation_keys/localisation_export nearby).
         """
-        from django.core.cache import cache
+        from django.db.models import Q
 
-        from core.models import CommunityTranslation, ProjectMember
+        from api.models import ALL_LANGUAGES, LocalisationContribution
+        from api.services import localisation_rollups
+        from core.models import ProjectMember
 
         project = self.get_object()
         language = (request.query_params.get('language') or '').strip()
-        search = (request.query_params.get('q') or '').strip().lower()
-
-        # The per-character aggregation walks every approved row (plural char counting can't be
-        # pushed into SQL portably), and this is a public endpoint hit on every page-flip and
-        # debounced search keystroke — so the filter-independent full list is cached briefly
-        # per project and the cheap search/language filtering happens per request below.
-        cache_key = f'localisation_contributors_v1_{project.id}'
-        contributors_all = cache.get(cache_key)
-        if contributors_all is None:
-            rows = (
-                CommunityTranslation.objects
-                .filter(project=project, status='approved', author__isnull=False)
-                .select_related('author')
-                .only('author_id', 'language', 'text', 'plural_forms',
-                      'author__username', 'author__real_name', 'author__avatar')
-            )
+        search = (request.query_params.get('q') or '').strip()
+
+        # Ranked straight off the LocalisationContribution rollup (api.services.
+        # localisation_rollups): one row per contributor for the chosen language, or their
+        # ALL_LANGUAGES totals row — an index scan plus the page's own rows, however many
+        # approved translations the project has.
+        localisation_rollups.ensure_tracked(project.id)
+        ranked = (
+            LocalisationContribution.objects
+            .filter(project=project, language=language or ALL_LANGUAGES, translations__gt=0)
+            .select_related('author')
+            .order_by('-characters', 'author_id')
+        )
+        if language:
+            ranked = ranked.filter(characters__gt=0)
+        if search:
+            ranked = ranked.filter(Q(author__username__icontains=search) | Q(author__real_name__icontains=search))
 
-            stats = {}
-            for row in rows:
-                chars = sum(len(v) for v in row.plural_forms.values()) if row.plural_forms else len(row.text or '')
-                bucket = stats.setdefault(row.author_id, {'user': row.author, 'by_language': {}})
-                bucket['by_language'][row.language] = bucket['by_language'].get(row.language, 0) + chars
+        paginator = StandardResultsSetPagination()
+        page = paginator.paginate_queryset(ranked, request)
+        author_ids = [row.author_id for row in page]
+
+        by_language = {author_id: {} for author_id in author_ids}
+        for author_id, code, count in (
+            LocalisationContribution.objects
+            .filter(project=project, author_id__in=author_ids, translations__gt=0)
+            .exclude(language=ALL_LANGUAGES)
+            .values_list('author_id', 'language', 'characters')
+        ):
+            by_language[author_id][code] = count
+        totals = dict(
+            LocalisationContribution.objects
+            .filter(project=project, author_id__in=author_ids, language=ALL_LANGUAGES)
+            .values_list('author_id', 'characters')
+        )
 
-            team_ids = {project.owner_id} | set(
-                ProjectMember.objects.filter(project=project, status='active').values_list('user_id', flat=True)
+        team_ids = {project.owner_id} | set(
+            ProjectMember.objects.filter(project=project, status='active', user_id__in=author_ids).values_list('user_id', flat=True)
+        )
+        org_ids = set()
+        if project.organisation_id:
+            org_ids = set(
+                OrganisationMember.objects.filter(organisation_id=project.organisation_id, user_id__in=author_ids)
+                .values_list('user_id', flat=True)
             )
-            org_ids = set()
-            if project.organisation_id:
-                org_ids = set(
-                    OrganisationMember.objects.filter(organisation_id=project.organisation_id).values_list('user_id', flat=True)
-                )
 
-            contributors_all = []
-            for author_id, bucket in stats.items():
-                user = bucket['user']
-                if author_id in team_ids:
-                    role_badge = 'team'
-                elif author_id in org_ids:
-                    role_badge = 'org'
-                else:
-                    role_badge = 'community'
-                contributors_all.append({
-                    'user': {
-                        'id': user.id, 'username': user.username, 'real_name': user.real_name,
-                        'avatar': user.avatar.url if user.avatar else None,
-                    },
-                    'role_badge': role_badge,
-                    'total_characters': sum(bucket['by_language'].values()),
-                    'by_language': bucket['by_language'],
-                })
-            cache.set(cache_key, contributors_all, 60)
+        contributors = []
+        for row in page:
+            user = row.author
+            if user.id in team_ids:
+                role_badge = 'team'
+            elif user.id in org_ids:
+                role_badge = 'org'
+            else:
+                role_badge = 'community'
+            contributors.append({
+                'user': {
+                    'id': user.id, 'username': user.username, 'real_name': user.real_name,
+                    'avatar': user.avatar.url if user.avatar else None,
+                },
+                'role_badge': role_badge,
+                'total_characters': totals.get(user.id, 0),
+                'by_language': by_language[user.id],
+            })
+        return paginator.get_paginated_response(contributors)
 
-        contributors = [
-            c for c in contributors_all
-            if not search
-            or search in c['user']['username'].lower()
-            or search in (c['user']['real_name'] or '').lower()
-        ]
+    @action(detail=True, methods=['get'], url_path='localisation/progress', permission_classes=[permissions.AllowAny])
+    def localisation_progress(self, request, pk=None):
+        """
+        Per-language translation progress for this project's configured locales: keys with an
+        approved translation and keys with suggestions awaiting review, read from the
+        LocalisationProgress rollup (api.services.localisation_rollups) rather than paging
+        through /community-translations/. Public, like the suggestions it counts. `total_keys`
+        is the size of the key catalogue (see translation_keys); counts cover every
+        suggestion's key, so a key deleted from the board without
+        localisation/delete-key-translations still counts until its rows go.
+        """
+        from api.locale_registry import resolve_project_locales
+        from api.models import ALL_LANGUAGES, LocalisationProgress
+        from api.services import localisation_rollups, workspace_sections
 
-        if language:
-            contributors = [c for c in contributors if c['by_language'].get(language, 0) > 0]
-            contributors.sort(key=lambda c: c['by_language'].get(language, 0), reverse=True)
-        else:
-            contributors.sort(key=lambda c: c['total_characters'], reverse=True)
+        project = self.get_object()
+        state = _project_workspace_state_readonly(project)
+        blob = state.data or {} if state else {}
+        total_keys = len(workspace_sections.read_data(state, 'translationKeys', []))
 
-        paginator = StandardResultsSetPagination()
-        page = paginator.paginate_queryset(contributors, request)
-        return paginator.get_paginated_response(page)
+        localisation_rollups.ensure_tracked(project.id)
+        counts = {
+            row.language: row
+            for row in LocalisationProgress.objects.filter(project=project).exclude(language=ALL_LANGUAGES)
+        }
+        languages = []
+        for locale in resolve_project_locales(blob):
+            row = counts.get(locale.code)
+            languages.append({
+                'code': locale.code,
+                'approved_keys': row.approved_keys if row else 0,
+                'pending_keys': row.pending_keys if row else 0,
+            })
+        return Response({'project': project.id, 'total_keys': total_keys, 'languages': languages})
 
     @action(detail=True, methods=['get'], url_path='localisation/export', permission_classes=[permissions.AllowAny])
     def localisation_export(self, request, pk=None):
@@ -3359,12 +3478,15 @@ class ProjectViewSet(viewsets.ModelViewSet):
         "grab the current PO to translate offline" workflow for non-members. `status=
         approved_pending` additionally includes moderation-queue (pending) suggestions, so it
         requires auth + the 'localisation.view' permission.
+
+        Served from a rendered artifact cached per content version, with an ETag
+        (api.services.localisation_exports): a matching If-None-Match gets a 304.
         """
-        from django.http import HttpResponse
+        from django.http import FileResponse, HttpResponseNotModified
+        from django.utils.http import parse_etags
 
-        from api.locale_registry import resolve_project_locales
-        from api.services.localisation_formats import export_bundle
-        from api.services.localisation_formats.canonical import build_bundle
+        from api.locale_registry import resolve_project_locales, resolve_source_locale
+        from api.services import localisation_exports
 
         project = self.get_object()
         # NOT named 'format' — that query parameter name is reserved by DRF itself
@@ -3396,14 +3518,25 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if language != 'all' and language not in {l.code for l in locales}:
             return Response({'error': f'Project is not configured for language "{language}".'}, status=status.HTTP_400_BAD_REQUEST)
 
-        bundle = build_bundle(project, locales, statuses=statuses)
         try:
-            content, filename, content_type = export_bundle(fmt, bundle, language=language)
+            artifact = localisation_exports.get_artifact(
+                project, state, fmt=fmt, language=language, scope=status_filter, statuses=statuses,
+                source=resolve_source_locale(blob), locales=locales,
+            )
         except ValueError as exc:
             return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-        response = HttpResponse(content, content_type=content_type)
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        # no-cache: clients keep the file but revalidate it (cheaply, via the ETag) every time.
+        cache_control = 'private, no-cache' if status_filter == 'approved_pending' else 'no-cache'
+        etags = parse_etags(request.headers.get('If-None-Match', ''))
+        if artifact.etag in etags or '*' in etags:
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(
+                artifact.open(), as_attachment=True, filename=artifact.filename, content_type=artifact.content_type,
+            )
+        response['ETag'] = artifact.etag
+        response['Cache-Control'] = cache_control
         return response
 
     @action(detail=True, methods=['post'], url_path='localisation/import', permission_classes=[permissions.IsAuthenticated])
@@ -3419,7 +3552,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         original decision to have manual CSV/JSON import discard translation values entirely.
         """
         from api.locale_registry import resolve_project_locales, resolve_source_locale
-        from api.services.localisation_formats import parse_file
+        from api.services.localisation_formats import MAX_IMPORT_BYTES, iter_parse_file
 
         project = self.get_object()
         fmt = request.data.get('fmt')  # not 'format' — see the export action's comment on this
@@ -3440,8 +3573,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Invalid mode.'}, status=status.HTTP_400_BAD_REQUEST)
         if uploaded is None:
             return Response({'error': 'No file uploaded.'}, status=status.HTTP_400_BAD_REQUEST)
-        if uploaded.size > 5 * 1024 * 1024:
-            return Response({'error': 'File is too large (max 5MB).'}, status=status.HTTP_400_BAD_REQUEST)
+        if uploaded.size > MAX_IMPORT_BYTES:
+            return Response({'error': f'File is too large (max {MAX_IMPORT_BYTES // (1024 * 1024)}MB).'}, status=status.HTTP_400_BAD_REQUEST)
 
         # With both flags off there is nothing to import — and rejecting it here also means
         # every request that reaches the parsers has passed at least one permission check
@@ -3461,35 +3594,49 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if import_translations and language not in {l.code for l in locales}:
             return Response({'error': f'Project is not configured for language "{language}".'}, status=status.HTTP_400_BAD_REQUEST)
 
+        # Parsed incrementally from the (spooled) upload, so a large string table never sits in
+        # memory whole; a malformed file raises ValueError from wherever the parser reaches the
+        # problem. A commit parses the whole file into spooled entries first and only then takes
+        # the board lock for the write (see apply_import).
+        from api.services.localisation_formats.canonical import (
+            ImportResult, ParsedImport, apply_import, spool_entries,
+        )
+
+        uploaded.seek(0)
+        parser_warnings = []
         try:
-            parsed = parse_file(fmt, uploaded.read(), project_locales=locales, source_locale=source_locale)
+            entries = iter_parse_file(
+                fmt, uploaded, project_locales=locales, source_locale=source_locale, warnings=parser_warnings,
+            )
+            if mode == 'preview':
+                from api.services import workspace_sections
+
+                existing_keys = {e.get('key') for e in workspace_sections.read_data(state, 'translationKeys', [])}
+                result = ImportResult(mode='preview', format=fmt, language=language or '')
+                for entry in entries:
+                    if import_keys:
+                        if entry.key not in existing_keys:
+                            result.keys_added += 1
+                        elif entry.base_text:
+                            result.keys_updated += 1
+                    if import_translations and language in entry.translations:
+                        result.translations_created += 1
+                    if len(result.sample) < 10:
+                        result.sample.append({'key': entry.key, 'base_text': entry.base_text})
+                result.warnings = parser_warnings
+                return Response(result.to_dict())
+
+            spooled = spool_entries(entries)
+            try:
+                result, conflict = apply_import(
+                    project, ParsedImport(entries=spooled, warnings=parser_warnings), language=language,
+                    user=request.user, import_keys=import_keys, import_translations=import_translations,
+                    base_version=base_version,
+                )
+            finally:
+                spooled.close()
         except ValueError as exc:
             return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
-
-        if mode == 'preview':
-            from api.services.localisation_formats.canonical import ImportResult
-
-            existing_keys = {e.get('key') for e in (blob.get('translationKeys') or [])}
-            result = ImportResult(mode='preview', format=fmt, language=language or '')
-            if import_keys:
-                for entry in parsed.entries:
-                    if entry.key not in existing_keys:
-                        result.keys_added += 1
-                    elif entry.base_text:
-                        result.keys_updated += 1
-            if import_translations:
-                for entry in parsed.entries:
-                    if language in entry.translations:
-                        result.translations_created += 1
-            result.warnings = list(parsed.warnings)
-            result.sample = [{'key': e.key, 'base_text': e.base_text} for e in parsed.entries[:10]]
-            return Response(result.to_dict())
-
-        from api.services.localisation_formats.canonical import apply_import
-        result, conflict = apply_import(
-            project, parsed, language=language, user=request.user,
-            import_keys=import_keys, import_translations=import_translations, base_version=base_version,
-        )
         result.format = fmt
         result.language = language or ''
         if conflict:
@@ -3505,6 +3652,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         """
         from django.db import IntegrityError
 
+        from api.services import localisation_rollups, translation_sync
         from core.models import CommunityTranslation
 
         project = self.get_object()
@@ -3518,7 +3666,13 @@ class ProjectViewSet(viewsets.ModelViewSet):
         namespace = new_key.split('.')[0] if '.' in new_key else 'other'
         try:
             with transaction.atomic():
-                updated = CommunityTranslation.objects.filter(project=project, key=old_key).update(key=new_key, namespace=namespace)
+                # A queryset update bypasses the signals: number the change for the feed, and
+                # recount pending keys (the move can merge two keys' suggestions into one).
+                seq = translation_sync.next_seq(project.id)
+                updated = CommunityTranslation.objects.filter(project=project, key=old_key).update(
+                    key=new_key, namespace=namespace, sync_seq=seq,
+                )
+                localisation_rollups.refresh_pending_keys(project.id)
         except IntegrityError:
             # The same author already has a non-rejected row under new_key for some language —
             # merging those histories automatically would silently discard one of the two.
@@ -3611,8 +3765,30 @@ class FeedViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'], url_path='for-you')
     def for_you(self, request):
         user = request.user
-        time_limit = timezone.now() - timedelta(days=30)
-        
+
+        followed_users_ids = set()
+        library_playtimes = {}
+        interest_keywords = set()
+        user_interest_ids = set()
+
+        if user.is_authenticated:
+            # Follows, library and interests come from the per-user cached profile (invalidated
+            # by the Follow/LibraryEntry/interest signals) instead of four queries per request.
+            from api.services.feed_candidates import get_feed_profile
+            profile = get_feed_profile(user)
+            followed_users_ids = profile['followed_ids']
+            library_playtimes = profile['library_playtimes']
+            user_interest_ids = profile['interest_ids']
+            # Reviews now get the same auto-assigned interest tags Posts do (see
+            # ReviewViewSet._tag_review_interests / api.services.embeddings.classify_review).
+            # Keyword matching stays as a fallback only for reviews created before that
+            # existed, which have no tags yet.
+            interest_keywords = set(profile['interest_keywords'])
+            if user.is_developer:
+                interest_keywords.update(['dev', 'development', 'indie', 'coding', 'engine', 'unity', 'unreal'])
+            if user.is_investor:
+                interest_keywords.update(['pitch', 'invest', 'funding', 'seed', 'startup', 'market'])
+
         exclude_ids = set()
         not_interested_post_ids = set()
         not_interested_review_ids = set()
@@ -3620,10 +3796,9 @@ class FeedViewSet(viewsets.ViewSet):
             exclude_ids = set(get_hidden_user_ids(user))
 
             # Exclude private profiles the user does not follow, unless it's their own profile
-            following_ids = list(user.following.values_list('following_id', flat=True))
             private_ids = User.objects.filter(
                 is_private=True
-            ).exclude(id__in=following_ids).exclude(id=user.id).values_list('id', flat=True)
+            ).exclude(id__in=followed_users_ids).exclude(id=user.id).values_list('id', flat=True)
             exclude_ids.update(private_ids)
 
             from core.models import NotInterested
@@ -3635,6 +3810,18 @@ class FeedViewSet(viewsets.ViewSet):
             ).values_list('id', flat=True)
             exclude_ids.update(private_ids)
 
+        # Candidate generation reads a pre-ranked window off the incrementally-maintained
+        # FeedCandidate store (see api.services.feed_candidates) rather than re-running the
+        # 30-day/all-time Post and Review scans; only the top slice is hydrated and re-scored.
+        from api.services.feed_candidates import candidate_window
+        candidate_post_ids, candidate_review_ids = candidate_window(
+            exclude_user_ids=exclude_ids,
+            not_interested_post_ids=not_interested_post_ids,
+            not_interested_review_ids=not_interested_review_ids,
+            followed_ids=followed_users_ids,
+            library_playtimes=library_playtimes,
+        )
+
         # Precompute engagement counts in the query (single subquery each) so the scoring loop
         # and the serializer don't fire a per-item .count() — the N+1 that made this endpoint
         # issue hundreds of queries per request.
@@ -3666,71 +3853,20 @@ class FeedViewSet(viewsets.ViewSet):
         )
         review_prefetch = ('user__interests', 'interests')
 
-        posts = Post.objects.filter(
-            parent__isnull=True,
-            review_parent__isnull=True,
-            news_parent__isnull=True,
-            timestamp__gte=time_limit
-        )
-        if exclude_ids:
-            posts = posts.exclude(user_id__in=exclude_ids)
-        if not_interested_post_ids:
-            posts = posts.exclude(id__in=not_interested_post_ids)
-        posts = posts.select_related('user').prefetch_related(*post_prefetch).annotate(**post_anns).order_by('-timestamp')[:80]
-        posts = list(posts)
-
-        if len(posts) < 40:
-            posts = Post.objects.filter(
-                parent__isnull=True,
-                review_parent__isnull=True,
-                news_parent__isnull=True
+        posts = []
+        if candidate_post_ids:
+            posts = list(
+                Post.objects.filter(id__in=candidate_post_ids)
+                .select_related('user').prefetch_related(*post_prefetch).annotate(**post_anns)
+                .order_by('-timestamp')
+            )
+        reviews = []
+        if candidate_review_ids:
+            reviews = list(
+                Review.objects.filter(id__in=candidate_review_ids)
+                .select_related('user', 'game').prefetch_related(*review_prefetch).annotate(**review_anns)
+                .order_by('-timestamp')
             )
-            if exclude_ids:
-                posts = posts.exclude(user_id__in=exclude_ids)
-            if not_interested_post_ids:
-                posts = posts.exclude(id__in=not_interested_post_ids)
-            posts = list(posts.select_related('user').prefetch_related(*post_prefetch).annotate(**post_anns).order_by('-timestamp')[:80])
-
-        reviews = Review.objects.filter(timestamp__gte=time_limit)
-        if exclude_ids:
-            reviews = reviews.exclude(user_id__in=exclude_ids)
-        if not_interested_review_ids:
-            reviews = reviews.exclude(id__in=not_interested_review_ids)
-        reviews = reviews.select_related('user', 'game').prefetch_related(*review_prefetch).annotate(**review_anns).order_by('-timestamp')[:80]
-        reviews = list(reviews)
-
-        if len(reviews) < 40:
-            reviews = Review.objects.all()
-            if exclude_ids:
-                reviews = reviews.exclude(user_id__in=exclude_ids)
-            if not_interested_review_ids:
-                reviews = reviews.exclude(id__in=not_interested_review_ids)
-            reviews = list(reviews.select_related('user', 'game').prefetch_related(*review_prefetch).annotate(**review_anns).order_by('-timestamp')[:80])
-
-        followed_users_ids = set()
-        library_game_ids = set()
-        library_playtimes = {}
-        interest_keywords = set()
-        user_interest_ids = set()
-
-        if user.is_authenticated:
-            from api.services.categorize import expand_interest_keywords
-            followed_users_ids = set(user.following.values_list('following_id', flat=True))
-            library_game_ids = set(user.library.values_list('game_id', flat=True))
-            library_playtimes = {entry.game_id: entry.playtime_forever for entry in user.library.all()}
-            user_interest_ids = set(user.interests.values_list('id', flat=True))
-            # Reviews now get the same auto-assigned interest tags Posts do (see
-            # ReviewViewSet._tag_review_interests / api.services.embeddings.classify_review).
-            # Keyword matching stays as a fallback only for reviews created before that
-            # existed, which have no tags yet.
-            interest_keywords = expand_interest_keywords(user.interests.values_list('name', flat=True))
-            if user.is_developer:
-                interest_keywords.update(['dev', 'development', 'indie', 'coding', 'engine', 'unity', 'unreal'])
-            if user.is_investor:
-                interest_keywords.update(['pitch', 'invest', 'funding', 'seed', 'startup', 'market'])
-
-        scored_items = []
-        now = timezone.now()
 
         merged_items = []
         for p in posts:
@@ -3738,55 +3874,28 @@ class FeedViewSet(viewsets.ViewSet):
         for r in reviews:
             merged_items.append(('review', r))
 
-        from api.services.categorize import score_post_for_user
-
-        for item_type, item in merged_items:
-            if item_type == 'post':
-                score = score_post_for_user(item, user, followed_users_ids, user_interest_ids)
-                scored_items.append((score, item_type, item))
-                continue
-
-            score = 10.0
-
-            # Recency decay
-            age_in_days = (now - item.timestamp).total_seconds() / 86400.0
-            recency_multiplier = 1.0 / (1.0 + age_in_days * 0.5)
-            score *= recency_multiplier
-
-            # Social / Engagement factor (read the annotations set above; no per-item queries)
-            likes = getattr(item, 'likes_count_ann', 0) or 0
-            replies = getattr(item, 'replies_count_ann', 0) or 0
-
-            score += likes * 0.5
-            score += replies * 0.8
-
-            # Personalization
-            if user.is_authenticated:
-                if item.user_id in followed_users_ids:
-                    score += 5.0
-
-                review_interest_ids = {i.id for i in item.interests.all()}
-                if review_interest_ids:
-                    matched_interests = len(review_interest_ids & user_interest_ids)
-                    score += min(matched_interests * 3.0, 6.0)
-                else:
-                    # Untagged (pre-migration) review — fall back to keyword matching.
-                    text_to_search_lower = ((item.content or "") + " " + (item.game.title or "")).lower()
-                    keyword_matches = sum(1 for kw in interest_keywords if kw in text_to_search_lower)
-                    score += min(keyword_matches * 2.0, 6.0)
-
-                if item.game_id in library_game_ids:
-                    score += 4.0
-                    playtime = library_playtimes.get(item.game_id, 0)
-                    if playtime > 0:
-                        score += 2.0
-
-            scored_items.append((score, item_type, item))
+        # One vectorized pass over the whole candidate set (same formula as the per-item
+        # score_post_for_user/score_review_for_user, see api.services.categorize).
+        from api.services.categorize import score_items_for_user
+        scores = score_items_for_user(
+            [item for _, item in merged_items], user, followed_users_ids, user_interest_ids,
+            interest_keywords=interest_keywords, library_playtimes=library_playtimes,
+        )
+        scored_items = [(score, item_type, item) for score, (item_type, item) in zip(scores, merged_items)]
 
         scored_items.sort(key=lambda x: x[0], reverse=True)
         from api.services.categorize import interleave_by_author
         top_items = interleave_by_author(scored_items)[:60]
 
+        # Items are serialized one by one (mixed types), so queue the page's ids for the
+        # viewer-relation lookups up front — one IN query per relation for the whole page.
+        from .serializers import prime_request_cache
+        prime_request_cache(
+            request,
+            posts=[item for _, item_type, item in top_items if item_type == 'post'],
+            reviews=[item for _, item_type, item in top_items if item_type == 'review'],
+        )
+
         results = []
         for score, item_type, item in top_items:
             if item_type == 'post':
@@ -3839,6 +3948,10 @@ class FeedViewSet(viewsets.ViewSet):
             bookmarks_count_ann=count_subquery(Bookmark, 'review'),
         ).order_by('-timestamp')[:50]
         
+        posts, reviews = list(posts), list(reviews)
+        from .serializers import prime_request_cache
+        prime_request_cache(request, posts=posts, reviews=reviews)
+
         merged_items = []
         for p in posts:
             data = PostSerializer(p, context={'request': request}).data
@@ -3858,8 +3971,9 @@ class OrganisationViewSet(viewsets.ModelViewSet):
     serializer_class = OrganisationSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, OrganisationAccessPermission]
     lookup_field = 'slug'
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [IndexedSearchFilter]
     search_fields = ['name', 'slug', 'description']
+    search_index_kind = 'organisation'
 
     def get_queryset(self):
         queryset = Organisation.objects.all().order_by('-created_at')
@@ -4496,6 +4610,38 @@ def _check_solo_project_access(project, user):
     return project.owner_id == user.id or project.members.filter(user=user, status='active').exists()
 
 
+def _resolve_workspace_key(key, user):
+    """
+    (identity, organisation, project) for a WorkspaceState key `user` may access: the row's
+    ORM identity kwargs — org boards belong to the organisation, project boards to the
+    project owner's canonical row, anything else is the user's own personal row — plus the
+    permission scope for the per-tool write checks (both None for a personal board, which has
+    none). Raises ValidationError / PermissionDenied / Http404.
+    """
+    from core.models import Organisation, Project
+    from rest_framework.exceptions import PermissionDenied, ValidationError
+
+    if key.startswith('workspace__org_'):
+        try:
+            org_id, project_id = _parse_org_workspace_key(key)
+        except ValueError:
+            raise ValidationError("Invalid workspace key format.")
+        org = get_object_or_404(Organisation, id=org_id)
+        if not _check_org_board_access(org, project_id, user):
+            raise PermissionDenied("You do not have access to this organization's workspace.")
+        project = Project.objects.filter(id=project_id).first() if project_id else None
+        return {'organisation': org, 'user': None}, org, project
+
+    solo_project_id = _parse_solo_project_key(key)
+    if solo_project_id is not None:
+        project = get_object_or_404(Project, id=solo_project_id)
+        if not _check_solo_project_access(project, user):
+            raise PermissionDenied("You do not have access to this project's workspace.")
+        return {'user_id': project.owner_id, 'organisation': None}, None, project
+
+    return {'user': user, 'organisation': None}, None, None
+
+
 def _project_board_key_and_identity(project):
     """
     The WorkspaceState key + the ORM identity kwargs (shaped for _versioned_workspace_upsert's
@@ -4524,14 +4670,16 @@ def _project_workspace_state(project):
     return obj
 
 
-def _project_workspace_state_readonly(project):
+def _project_workspace_state_readonly(project, with_meta=True):
     """Same key resolution as _project_workspace_state, but never creates a row — a public GET
     (e.g. the translation-keys catalog action) must not mutate. Returns the WorkspaceState row,
-    or None if it doesn't exist yet."""
+    or None if it doesn't exist yet. `with_meta=False` defers the board's `meta` blob, for
+    callers that only read sections (see api.services.workspace_sections)."""
     key, identity = _project_board_key_and_identity(project)
+    queryset = WorkspaceState.objects if with_meta else WorkspaceState.objects.defer('data')
     if 'user_id' in identity:
-        return WorkspaceState.objects.filter(key=key, user_id=identity['user_id'], organisation=None).first()
-    return WorkspaceState.objects.filter(key=key, organisation=identity['organisation'], user=None).first()
+        return queryset.filter(key=key, user_id=identity['user_id'], organisation=None).first()
+    return queryset.filter(key=key, organisation=identity['organisation'], user=None).first()
 
 
 def _locked_project_workspace_state(project):
@@ -4543,11 +4691,13 @@ def _locked_project_workspace_state(project):
     bump the caller performs makes any client still holding the old version get a 409.
     """
     key, identity = _project_board_key_and_identity(project)
-    if 'user_id' in identity:
-        filters = {'key': key, 'user_id': identity['user_id'], 'organisation': None}
-    else:
-        filters = {'key': key, 'organisation': identity['organisation'], 'user': None}
-    obj = WorkspaceState.objects.select_for_update().filter(**filters).first()
+    return _locked_workspace_state(key, identity)
+
+
+def _locked_workspace_state(key, identity):
+    """The board row for `key` and its ORM identity kwargs, locked (select_for_update — call
+    inside transaction.atomic()), created empty if it doesn't exist yet."""
+    obj = WorkspaceState.objects.select_for_update().filter(key=key, **identity).first()
     if obj is None:
         obj = WorkspaceState.objects.create(key=key, data={}, version=1, **identity)
     return obj
@@ -4563,6 +4713,8 @@ def _versioned_workspace_upsert(*, key, data, base_version, user=None, organisat
     last-write-wins), so older clients that don't send a version keep working. The read-modify-
     write runs under select_for_update so concurrent writers serialise rather than race.
     """
+    from api.services import workspace_sections
+
     identity = {'key': key, 'organisation': organisation}
     if user_id is not None:
         identity['user_id'] = user_id
@@ -4572,13 +4724,13 @@ def _versioned_workspace_upsert(*, key, data, base_version, user=None, organisat
     with transaction.atomic():
         obj = WorkspaceState.objects.select_for_update().filter(**identity).first()
         if obj is None:
-            obj = WorkspaceState.objects.create(data=data, version=1, **identity)
+            obj = WorkspaceState.objects.create(data={}, version=1, **identity)
+            workspace_sections.write_blob(obj, data, bump=False)
             return obj, False
         if base_version is not None and base_version != obj.version:
             return obj, True
-        obj.data = data
-        obj.version = obj.version + 1
-        obj.save()
+        # Split across the board's sections; only the ones that changed are rewritten.
+        workspace_sections.write_blob(obj, data)
         return obj, False
 
 
@@ -4604,47 +4756,13 @@ class WorkspaceStateViewSet(viewsets.ModelViewSet):
 
     def get_object(self):
         key = self.kwargs.get('key')
-        user = self.request.user
-
-        if key.startswith('workspace__org_'):
-            try:
-                org_id, project_id = _parse_org_workspace_key(key)
-                from core.models import Organisation
-                from django.shortcuts import get_object_or_404
-                from rest_framework.exceptions import PermissionDenied
-
-                org = get_object_or_404(Organisation, id=org_id)
-                if not _check_org_board_access(org, project_id, user):
-                    raise PermissionDenied("You do not have access to this organization's workspace.")
-
-                # Do not create rows on read (GET must not mutate). Return an unsaved,
-                # empty instance when the key doesn't exist yet; writes go through create().
-                obj = WorkspaceState.objects.filter(key=key, organisation=org, user=None).first()
-                if obj is None:
-                    obj = WorkspaceState(key=key, organisation=org, user=None, data={})
-                return obj
-            except ValueError:
-                from rest_framework.exceptions import ValidationError
-                raise ValidationError("Invalid workspace key format.")
-        else:
-            solo_project_id = _parse_solo_project_key(key)
-            if solo_project_id is not None:
-                from core.models import Project
-                from django.shortcuts import get_object_or_404
-                from rest_framework.exceptions import PermissionDenied
-                project = get_object_or_404(Project, id=solo_project_id)
-                if not _check_solo_project_access(project, user):
-                    raise PermissionDenied("You do not have access to this project's workspace.")
-                # Canonical owner row shared by all members (do not create on read).
-                obj = WorkspaceState.objects.filter(key=key, user_id=project.owner_id, organisation=None).first()
-                if obj is None:
-                    obj = WorkspaceState(key=key, user_id=project.owner_id, organisation=None, data={})
-                return obj
-
-            obj = WorkspaceState.objects.filter(key=key, user=user, organisation=None).first()
-            if obj is None:
-                obj = WorkspaceState(key=key, user=user, organisation=None, data={})
-            return obj
+        identity, _, _ = _resolve_workspace_key(key, self.request.user)
+        # Do not create rows on read (GET must not mutate). Return an unsaved, empty instance
+        # when the key doesn't exist yet; writes go through create() / sections.
+        obj = WorkspaceState.objects.filter(key=key, **identity).first()
+        if obj is None:
+            obj = WorkspaceState(key=key, data={}, **identity)
+        return obj
 
     def create(self, request, *args, **kwargs):
         key = request.data.get('key')
@@ -4738,6 +4856,98 @@ class WorkspaceStateViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(obj)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=['get', 'post'])
+    def sections(self, request, key=None):
+        """
+        Partial reads and per-section writes of a board (see api.services.workspace_sections).
+        GET ?names=tasks,columns returns just those sections with their versions. POST takes
+        whole sections ({name: {'data', 'base_version'}}) and/or item ops; each section written
+        is authorised against its own tool's write permission, `meta` against `tool`'s (or
+        each of `tools`').
+        """
+        from api.services import workspace_sections
+        from api.services.workspace_sections import SectionConflict, SectionError
+
+        if request.method == 'GET':
+            state = self.get_object()
+            names = request.query_params.get('names')
+            names = [name for name in names.split(',') if name] if names else workspace_sections.NAMES
+            try:
+                sections = workspace_sections.read(state, names)
+            except SectionError as exc:
+                return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"key": key, "version": state.version, "sections": sections})
+
+        identity, organisation, project = _resolve_workspace_key(key, request.user)
+        raw_sections = request.data.get('sections') or {}
+        ops = request.data.get('ops') or []
+        if not isinstance(raw_sections, dict) or not isinstance(ops, list):
+            return Response({"error": "sections must be an object and ops a list"}, status=status.HTTP_400_BAD_REQUEST)
+
+        changes = {}
+        for name, section in raw_sections.items():
+            if not isinstance(section, dict) or 'data' not in section:
+                return Response({"error": f"Section {name} needs a data field."}, status=status.HTTP_400_BAD_REQUEST)
+            data = section['data']
+            # Same guard as create()'s: a null/scalar payload must not wipe a section.
+            expected = dict if name == workspace_sections.META else list
+            if not isinstance(data, expected):
+                return Response({"error": f"Section {name} must be a JSON {expected.__name__}."}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                base_version = int(section['base_version']) if section.get('base_version') is not None else None
+            except (TypeError, ValueError):
+                base_version = None
+            changes[name] = (data, base_version)
+
+        names = set(changes) | {op.get('section') for op in ops if isinstance(op, dict)}
+        try:
+            workspace_sections.check_names(names - {None})
+        except SectionError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if not names:
+            return Response({"error": "Nothing to write."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if organisation is not None or project is not None:
+            from .permission_catalog import TOOL_WRITE_PERMISSIONS
+            from .permissions_service import user_has_any_permission
+            tools = {workspace_sections.SECTION_TOOLS.get(name) for name in names}
+            if workspace_sections.META in names:
+                tools.discard(None)
+                # `tools` lists every tool whose edits a client coalesced into this meta write;
+                # the write needs each one's permission, not just the first's.
+                meta_tools = request.data.get('tools') or [request.data.get('tool')]
+                if not isinstance(meta_tools, list) or not all(isinstance(t, str) and t for t in meta_tools):
+                    return Response({"error": "tool is required to write meta"}, status=status.HTTP_400_BAD_REQUEST)
+                tools.update(meta_tools)
+            for tool in sorted(filter(None, tools)):
+                write_perms = TOOL_WRITE_PERMISSIONS.get(tool)
+                if write_perms and not user_has_any_permission(request.user, write_perms, organisation=organisation, project=project):
+                    return Response({"error": f"You do not have permission to modify {tool}."}, status=status.HTTP_403_FORBIDDEN)
+
+        with transaction.atomic():
+            state = _locked_workspace_state(key, identity)
+            try:
+                versions = workspace_sections.write(state, changes, ops)
+            except SectionConflict as exc:
+                return Response(
+                    {
+                        "error": "conflict",
+                        "detail": "Part of this board was updated by someone else. Reload it before saving.",
+                        "sections": exc.names,
+                        "current": {"version": state.version, "sections": workspace_sections.read(state, names)},
+                    },
+                    status=status.HTTP_409_CONFLICT,
+                )
+            except SectionError as exc:
+                return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+            current = workspace_sections.read(state, names)
+        return Response({
+            "key": key,
+            "version": state.version,
+            "sections": {name: {"version": current[name]['version']} for name in names},
+            "changed": sorted(versions),
+        })
+
 
 from core.models import PlaytestFeedback
 from .serializers import PlaytestFeedbackSerializer
@@ -4811,6 +5021,8 @@ class PlaytestFeedbackViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     def _reconcile_converted_tasks(self, feedback_iterable):
+        from api.services import workspace_sections
+
         feedback_list = list(feedback_iterable)
         by_project = {}
         for fb in feedback_list:
@@ -4820,10 +5032,12 @@ class PlaytestFeedbackViewSet(viewsets.ModelViewSet):
             project = items[0].project
             # Read-only variant: this runs on public GETs (list/retrieve), which must not
             # get_or_create WorkspaceState rows. No row yet ⇒ nothing to reconcile against.
-            workspace_state = _project_workspace_state_readonly(project)
+            workspace_state = _project_workspace_state_readonly(project, with_meta=False)
             if workspace_state is None:
                 continue
-            existing_task_ids = {t.get('id') for t in (workspace_state.data or {}).get('tasks', [])}
+            # Just the tasks section — not the docs, assets and translation keys beside it.
+            tasks = workspace_sections.read_data(workspace_state, 'tasks', [])
+            existing_task_ids = {t.get('id') for t in tasks if isinstance(t, dict)}
             for fb in items:
                 if fb.converted_task_id not in existing_task_ids:
                     fb.converted_task_id = ''
@@ -4895,6 +5109,8 @@ class PlaytestFeedbackViewSet(viewsets.ModelViewSet):
         from django.utils import timezone
         import time as time_module
 
+        from api.services import workspace_sections
+
         feedback = get_object_or_404(PlaytestFeedback, pk=pk)
         self._require_permission(request, feedback, 'feedback.convert_to_task')
         if feedback.converted_task_id:
@@ -4907,14 +5123,15 @@ class PlaytestFeedbackViewSet(viewsets.ModelViewSet):
         # silently erases the task we just inserted.
         with transaction.atomic():
             workspace_state = _locked_project_workspace_state(project)
-            data = workspace_state.data or {}
-            if not data.get('columns'):
-                data['columns'] = _DEFAULT_KANBAN_COLUMNS
-            columns = data['columns']
+            board = workspace_sections.read(workspace_state, ['columns', 'tasks'])
+            columns = board['columns']['data']
+            seed_columns = not columns
+            if seed_columns:
+                columns = _DEFAULT_KANBAN_COLUMNS
             target_column = columns[0]
             target_column_id = target_column['id']
 
-            tasks = data.setdefault('tasks', [])
+            tasks = board['tasks']['data'] or []
             wip_limit = target_column.get('wipLimit')
             if wip_limit is not None:
                 current_count = sum(1 for t in tasks if t.get('columnId') == target_column_id)
@@ -4937,10 +5154,13 @@ class PlaytestFeedbackViewSet(viewsets.ModelViewSet):
                 'comments': [],
                 'createdAt': timezone.now().isoformat(),
             }
-            tasks.append(new_task)
-            workspace_state.data = data
-            workspace_state.version = workspace_state.version + 1
-            workspace_state.save(update_fields=['data', 'version'])
+            # An op rather than a whole-section write: the board version (and the tasks
+            # section's) still moves, so a client holding the pre-conversion board gets a 409.
+            workspace_sections.write(
+                workspace_state,
+                {'columns': (columns, None)} if seed_columns else None,
+                [{'section': 'tasks', 'op': 'upsert', 'value': new_task}],
+            )
 
             feedback.converted_task_id = task_id
             feedback.save(update_fields=['converted_task_id'])
@@ -4950,6 +5170,8 @@ class PlaytestFeedbackViewSet(viewsets.ModelViewSet):
     def revert_task(self, request, pk=None):
         """Pulls a feedback item back out of Kanban: deletes the linked task from the board (if
         it's still there) and clears converted_task_id so it can be converted again."""
+        from api.services import workspace_sections
+
         feedback = get_object_or_404(PlaytestFeedback, pk=pk)
         self._require_permission(request, feedback, 'feedback.convert_to_task')
         if not feedback.converted_task_id:
@@ -4959,14 +5181,10 @@ class PlaytestFeedbackViewSet(viewsets.ModelViewSet):
         # Same locking + version-bump rationale as convert_to_task above.
         with transaction.atomic():
             workspace_state = _locked_project_workspace_state(project)
-            data = workspace_state.data or {}
-            tasks = data.get('tasks', [])
-            remaining_tasks = [t for t in tasks if t.get('id') != feedback.converted_task_id]
-            if len(remaining_tasks) != len(tasks):
-                data['tasks'] = remaining_tasks
-                workspace_state.data = data
-                workspace_state.version = workspace_state.version + 1
-                workspace_state.save(update_fields=['data', 'version'])
+            # A no-op (no version bump) when the task is already gone from the board.
+            workspace_sections.write(workspace_state, ops=[
+                {'section': 'tasks', 'op': 'remove', 'id': feedback.converted_task_id},
+            ])
 
             feedback.converted_task_id = ''
             feedback.save(update_fields=['converted_task_id'])
@@ -4981,18 +5199,23 @@ def _approve_community_translation(contribution, user):
     """
     Approves a CommunityTranslation row, unapproving any sibling for the same
     (project, key, language) first so the partial unique index (uniq_approved_ct_per_key_lang)
-    stays satisfiable. Self-contained (own transaction + row locks) so it can be called
-    identically from the `approve` action and from the bulk-import path, which is exactly why
-    this was extracted out of the action body — two independent call sites writing
-    status='approved' against a partial unique index without sharing this exact sequence would
-    be a latent IntegrityError.
+    stays satisfiable. Self-contained (own transaction + row locks). The bulk-import path
+    (localisation_formats.canonical._commit_translations) runs the same sequence — unapprove
+    siblings, then approve — batched over many keys; any new call site writing
+    status='approved' against the partial unique index must follow it too, or it is a latent
+    IntegrityError. Siblings are saved one by one (there is at most one) so the localisation
+    rollup signals see them.
     """
     with transaction.atomic():
         contribution = CommunityTranslation.objects.select_for_update().select_related('project').get(pk=contribution.pk)
-        CommunityTranslation.objects.select_for_update().filter(
+        for sibling in CommunityTranslation.objects.select_for_update().filter(
             project=contribution.project, key=contribution.key, language=contribution.language,
             status='approved',
-        ).exclude(pk=contribution.pk).update(status='pending', approved_by=None, approved_at=None)
+        ).exclude(pk=contribution.pk):
+            sibling.status = 'pending'
+            sibling.approved_by = None
+            sibling.approved_at = None
+            sibling.save(update_fields=['status', 'approved_by', 'approved_at', 'updated_at'])
 
         contribution.status = 'approved'
         contribution.approved_by = user
@@ -5115,6 +5338,63 @@ class CommunityTranslationViewSet(viewsets.ModelViewSet):
 
         return Response(CommunityTranslationSerializer(contribution, context={'request': request}).data, status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Change feed for one project's suggestions (api.services.translation_sync), so a client
+        keeps its copy in sync instead of re-paging the whole list after every mutation.
+        `?project=` is required. Without `?since=` the feed starts from the beginning, which is a
+        full snapshot, paged the same way. Each response carries:
+
+        - `results`: rows created, edited, re-statused or voted on since the cursor, serialized
+          as in the list, with the current votes_count;
+        - `deleted`: ids to drop, meaning deleted rows plus, unless `include_rejected=true`,
+          rejected ones;
+        - `cursor`: the value to send as `since` next;
+        - `has_more`: whether to ask again straight away.
+
+        `limit` caps the changes per response (default 500).
+        """
+        from api.services import translation_sync
+
+        try:
+            project_id = int(request.query_params.get('project') or '')
+            cursor = translation_sync.parse_cursor(request.query_params.get('since'))
+            limit = int(request.query_params.get('limit') or translation_sync.DEFAULT_LIMIT)
+        except ValueError:
+            return Response(
+                {'error': '`project` must be a project id, `since` a cursor returned by this endpoint and `limit` a number.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        get_object_or_404(Project, pk=project_id)
+        limit = max(1, min(limit, translation_sync.MAX_LIMIT))
+        include_rejected = request.query_params.get('include_rejected') == 'true'
+
+        row_ids, deleted_ids, next_cursor, has_more = translation_sync.changes(project_id, cursor, limit=limit)
+        rows = {
+            row.id: row
+            for row in CommunityTranslation.objects.filter(pk__in=row_ids)
+            .select_related('author', 'approved_by', 'project').prefetch_related('likes')
+        }
+        results = []
+        for row_id in row_ids:
+            row = rows.get(row_id)
+            if row is None or (row.status == 'rejected' and not include_rejected):
+                # Deleted since the feed was read (its tombstone comes with a later page), or
+                # rejected: either way, gone from the client's copy.
+                deleted_ids.append(row_id)
+                continue
+            results.append(row)
+        return Response({
+            'cursor': next_cursor,
+            'has_more': has_more,
+            'results': CommunityTranslationSerializer(results, many=True, context={'request': request}).data,
+            'deleted': deleted_ids,
+        })
+
+
+FOR_YOU_CURSOR_ORDER = [('position', False)]
+
 
 class ExplorePostsViewSet(viewsets.ViewSet):
     """Explore posts with category filtering and trending sorting."""
@@ -5141,6 +5421,11 @@ class ExplorePostsViewSet(viewsets.ViewSet):
             page_size = min(max(1, int(request.query_params.get('page_size', 20))), 50)
         except (TypeError, ValueError):
             page_size = 20
+        # `?cursor=` (empty for the first page) selects keyset pages — see api.pagination.
+        # `page` stays supported for older clients.
+        from rest_framework.exceptions import NotFound
+        cursor = request.query_params.get('cursor')
+        next_cursor = None
 
         from api.serializers import count_subquery
         from core.models import Like, Bookmark
@@ -5191,7 +5476,7 @@ class ExplorePostsViewSet(viewsets.ViewSet):
             posts = posts.filter(content__iregex=rf'#{re.escape(hashtag)}{boundary}')
 
         if mode == 'for_you':
-            from api.services.categorize import score_post_for_user
+            from api.services.categorize import score_items_for_user
             user = request.user
             followed_users_ids = set()
             user_interest_ids = set()
@@ -5201,37 +5486,63 @@ class ExplorePostsViewSet(viewsets.ViewSet):
 
             # Bound the candidate pool before scoring in Python — same rationale as
             # FeedViewSet.for_you's own [:80] cap, just wider since this view is paginated.
-            candidates = posts.order_by('-timestamp')[:200]
-            scored = [(score_post_for_user(p, user, followed_users_ids, user_interest_ids), p) for p in candidates]
+            candidates = list(posts.order_by('-timestamp')[:200])
+            scores = score_items_for_user(candidates, user, followed_users_ids, user_interest_ids)
+            scored = list(zip(scores, candidates))
             scored.sort(key=lambda x: x[0], reverse=True)
             from api.services.categorize import interleave_by_author
             scored = interleave_by_author(scored)
 
             start = (page - 1) * page_size
+            if cursor is not None:
+                # The pool is re-scored per request, so a for-you cursor is just a position in it.
+                # 'position' isn't a model field, so decode_cursor hands it back unconverted.
+                try:
+                    start = decode_cursor(cursor, FOR_YOU_CURSOR_ORDER, Post)[0] if cursor else 0
+                except InvalidCursor:
+                    start = None
+                if type(start) is not int or start < 0:
+                    return Response({'error': 'Invalid cursor.'}, status=status.HTTP_400_BAD_REQUEST)
             end = start + page_size
             page_items = scored[start:end + 1]
             has_next = len(page_items) > page_size
             paginated = [p for _, p in page_items[:page_size]]
+            if cursor is not None and has_next:
+                next_cursor = encode_cursor(FOR_YOU_CURSOR_ORDER, [end])
         else:
             if ordering == 'newest':
                 posts = posts.order_by('-timestamp')
             elif ordering == 'oldest':
                 posts = posts.order_by('timestamp')
             else:  # popular / trending
-                posts = posts.order_by('-trending_score', '-timestamp')
-
-            # Pagination — fetch one extra item to check for next page without an extra COUNT query
-            start = (page - 1) * page_size
-            end = start + page_size
-            paginated = list(posts[start:end + 1])
-            has_next = len(paginated) > page_size
-            paginated = paginated[:page_size]
+                posts = posts.order_by('-trending_score', '-timestamp', '-pk')
+
+            if cursor is not None:
+                # Keyset on (sort key, id): deep pages cost the same as the first one, and
+                # posts created mid-scroll don't shift later pages. The id tie-break makes the
+                # order total, but trending_score itself is recomputed as posts get engagement
+                # (api.services.trending): a post whose score crosses the cursor mid-scroll can
+                # still be shown twice or skipped, as with page numbers. Explore tolerates that
+                # rather than pinning a per-client snapshot of the ranking.
+                try:
+                    paginated, next_cursor = keyset_page(posts, cursor, page_size)
+                except InvalidCursor:
+                    raise NotFound('Invalid cursor')
+                has_next = next_cursor is not None
+            else:
+                # Pagination — fetch one extra item to check for next page without an extra COUNT query
+                start = (page - 1) * page_size
+                end = start + page_size
+                paginated = list(posts[start:end + 1])
+                has_next = len(paginated) > page_size
+                paginated = paginated[:page_size]
 
         serializer = PostSerializer(paginated, many=True, context={'request': request})
         return Response({
             'results': serializer.data,
             'has_next': has_next,
             'page': page,
+            'next_cursor': next_cursor,
         })
 
 
@@ -163,6 +163,36 @@ if REDIS_URL:
 else:
     CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
 
+# Where post/review embedding classification runs (api.services.classification_worker):
+# 'thread' — one long-lived worker thread per web process, fed by a bounded in-memory queue;
+# 'external' — web processes only enqueue PendingClassification rows and a separate
+# `python manage.py run_classification_worker` process does the inference, so the web
+# containers never load the model at all.
+CLASSIFICATION_WORKER_MODE = os.environ.get('CLASSIFICATION_WORKER_MODE', 'thread')
+
+# Where the per-type nearest-neighbour indexes over stored embeddings are persisted
+# (api.services.embedding_store). Any process rebuilds them from the ContentEmbedding table
+# if the directory is missing or stale, so ephemeral container disk is fine.
+EMBEDDING_INDEX_DIR = os.environ.get('EMBEDDING_INDEX_DIR', os.path.join(BASE_DIR, 'embedding_index'))
+
+# Snapshots of the per-kind trigram search indexes (api.services.search_index), written by
+# `python manage.py build_search_index` (schedule it). Requests never build one: until a
+# snapshot exists, name search falls back to the database.
+SEARCH_INDEX_DIR = os.environ.get('SEARCH_INDEX_DIR', os.path.join(BASE_DIR, 'search_index'))
+
+# Rendered localisation export files (api.services.localisation_exports), keyed by content
+# version. A cache, not data: any process re-renders a missing one from the database.
+LOCALISATION_EXPORT_DIR = os.environ.get('LOCALISATION_EXPORT_DIR', os.path.join(BASE_DIR, 'localisation_exports'))
+
+# Inference backend for the classifier (api.services.embedding_backends): 'torch' loads the
+# full sentence-transformers model; 'onnx' runs the copy written by
+# `python manage.py export_embedding_onnx` with onnxruntime, without importing torch.
+# EMBEDDING_ONNX_FILE picks the fp32 export (model.onnx) or the int8 one (model_quantized.onnx).
+EMBEDDING_BACKEND = os.environ.get('EMBEDDING_BACKEND', 'torch')
+EMBEDDING_ONNX_DIR = os.environ.get('EMBEDDING_ONNX_DIR', os.path.join(BASE_DIR, 'onnx_model'))
+EMBEDDING_ONNX_FILE = os.environ.get('EMBEDDING_ONNX_FILE', 'model_quantized.onnx')
+EMBEDDING_ONNX_THREADS = int(os.environ.get('EMBEDDING_ONNX_THREADS', 0)) or None
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -1,8 +1,7 @@
-import time
 from django.core.management.base import BaseCommand
 from core.models import Game
-import requests
 from api.services.igdb_service import get_igdb_token, IGDB_CLIENT_ID
+from api.services import http_client
 
 class Command(BaseCommand):
     help = 'Cleans up games that are actually upgrade editions, ports, or have a version_parent on IGDB'
@@ -34,7 +33,7 @@ class Command(BaseCommand):
             query = f"fields id, name, category, version_parent, parent_game; where id = ({ids_str}); limit 50;"
             
             try:
-                resp = requests.post('https://api.igdb.com/v4/games', headers=headers, data=query, timeout=10)
+                resp = http_client.post('igdb', 'https://api.igdb.com/v4/games', headers=headers, data=query, timeout=10)
                 if resp.status_code == 200:
                     data = resp.json()
                     
@@ -70,6 +69,5 @@ class Command(BaseCommand):
             except Exception as e:
                 self.stdout.write(self.style.ERROR(f"Error checking batch: {e}"))
                 
-            time.sleep(0.3) # respect rate limit
             
         self.stdout.write(self.style.SUCCESS(f'Finished! Deleted {deleted_count} upgrade/unwanted editions.'))
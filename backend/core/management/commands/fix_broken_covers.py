@@ -2,6 +2,7 @@ import requests
 from django.core.management.base import BaseCommand
 from core.models import Game
 from api.services.igdb_service import get_igdb_token, IGDB_CLIENT_ID
+from api.services import http_client
 
 class Command(BaseCommand):
     help = 'Fixes missing or broken game covers by re-fetching from IGDB'
@@ -41,7 +42,7 @@ class Command(BaseCommand):
                     try:
                         # Use GET instead of HEAD as some CDNs might block HEAD or return different status
                         # Timeout 5s, only fetch headers essentially by using stream=True and reading nothing
-                        resp = requests.get(cover_url, stream=True, timeout=5)
+                        resp = http_client.get('cover_check', cover_url, stream=True, timeout=5, retries=0)
                         if resp.status_code == 404:
                             needs_fix = True
                         resp.close()
@@ -72,7 +73,7 @@ class Command(BaseCommand):
                         query = f'fields cover.image_id; search "{safe_title}"; limit 1;'
 
                     try:
-                        response = requests.post(
+                        response = http_client.post('igdb',
                             'https://api.igdb.com/v4/games',
                             headers=headers,
                             data=query,
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.12 on 2026-10-18 02:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0071_post_poll_expires_at_pollvote'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Genre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(allow_unicode=True, max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GameGenre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='genre_links', to='core.game')),
+                ('genre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_links', to='core.genre')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['genre', 'game'], name='gamegenre_genre_game_idx')],
+                'unique_together': {('game', 'genre')},
+            },
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.12 on 2026-10-18 03:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of api.services.workspace_sections.SECTION_FIELDS (section name -> blob field).
+SECTION_FIELDS = {
+    'tasks': 'tasks',
+    'columns': 'columns',
+    'docs': 'gddDocs',
+    'assets': 'assets',
+    'translationKeys': 'translationKeys',
+    'glossary': 'glossary',
+}
+
+
+def split_boards(apps, schema_editor):
+    # Moves each board's large per-tool lists out of the blob into their own section rows; what
+    # stays in WorkspaceState.data is the `meta` section. Every section starts at version 1.
+    WorkspaceState = apps.get_model('core', 'WorkspaceState')
+    WorkspaceSection = apps.get_model('core', 'WorkspaceSection')
+    for state in WorkspaceState.objects.iterator(chunk_size=200):
+        data = state.data if isinstance(state.data, dict) else {}
+        WorkspaceSection.objects.bulk_create([
+            WorkspaceSection(state=state, name=name, data=data.pop(field), version=1)
+            for name, field in SECTION_FIELDS.items() if field in data
+        ])
+        state.data = data
+        state.meta_version = 1
+        state.save(update_fields=['data', 'meta_version'])
+
+
+def join_boards(apps, schema_editor):
+    WorkspaceState = apps.get_model('core', 'WorkspaceState')
+    WorkspaceSection = apps.get_model('core', 'WorkspaceSection')
+    for state in WorkspaceState.objects.iterator(chunk_size=200):
+        data = dict(state.data or {})
+        for section in WorkspaceSection.objects.filter(state=state):
+            if section.data is not None:
+                data[SECTION_FIELDS[section.name]] = section.data
+        state.data = data
+        state.save(update_fields=['data'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0072_genre_gamegenre'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workspacestate',
+            name='meta_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='WorkspaceSection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=32)),
+                ('data', models.JSONField(default=list)),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('state', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sections', to='core.workspacestate')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('state', 'name'), name='unique_workspace_section')],
+            },
+        ),
+        migrations.RunPython(split_boards, join_boards),
+    ]
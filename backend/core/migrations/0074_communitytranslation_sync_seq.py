@@ -0,0 +1,24 @@
+# Generated by Django 5.2.12 on 2026-10-18 04:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0073_workspace_sections'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='communitytranslation',
+            name='sync_seq',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='communitytranslation',
+            index=models.Index(fields=['project', 'sync_seq', 'id'], name='ct_proj_sync_idx'),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -31,6 +31,36 @@ class Game(models.Model):
     def __str__(self):
         return self.title
 
+
+class Genre(models.Model):
+    """
+    Canonical genre. Game.genres keeps the raw names IGDB/Steam gave us (in whatever locale);
+    api.services.genre_index maps each one to a Genre once, at ingest, and stores the result in
+    GameGenre so recommendations, Game DNA and genre filters work on ids instead of
+    re-normalizing strings on every request.
+    """
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=100, unique=True, allow_unicode=True)
+
+    def __str__(self):
+        return self.name
+
+
+class GameGenre(models.Model):
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='genre_links')
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE, related_name='game_links')
+
+    class Meta:
+        unique_together = ('game', 'genre')
+        indexes = [
+            # "games in genre X" — unique_together already covers lookups by game.
+            models.Index(fields=['genre', 'game'], name='gamegenre_genre_game_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.game_id} in {self.genre_id}"
+
+
 class Review(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='reviews')
     game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='reviews')
@@ -69,6 +99,14 @@ class Review(models.Model):
             ),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so the GameStats signal can move the rating sum/histogram on edits
+        # (see api.services.game_stats).
+        instance._loaded_rating = instance.__dict__.get('rating')
+        return instance
+
     def __str__(self):
         return f"{self.user.username} - {self.game.title} ({self.rating})"
 
@@ -297,6 +335,7 @@ class CommunityTranslation(models.Model):
     payload-shape validation for the authoritative rule.
     """
     STATUS_CHOICES = [('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')]
+    ROLLUP_FIELDS = ('status', 'author_id', 'language', 'key', 'text', 'plural_forms')
 
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='community_translations')
     key = models.CharField(max_length=255)
@@ -315,12 +354,17 @@ class CommunityTranslation(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # The project-wide change number of this row's last write (or vote), stamped under the
+    # project's localisation lock — the change feed's cursor (see api.services.translation_sync).
+    # 0 for rows last written before the feed existed.
+    sync_seq = models.PositiveBigIntegerField(default=0)
 
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['project', 'language', 'key'], name='ct_proj_lang_key_idx'),
             models.Index(fields=['project', 'key', 'language'], name='ct_proj_key_lang_idx'),
+            models.Index(fields=['project', 'sync_seq', 'id'], name='ct_proj_sync_idx'),
         ]
         constraints = [
             # One official translation per (project, key, language) — the DB-level guarantee
@@ -339,6 +383,32 @@ class CommunityTranslation(models.Model):
             ),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so the localisation rollup signal can tell what a save changed (see
+        # api.services.localisation_rollups).
+        instance._loaded_values = {name: instance.__dict__.get(name) for name in cls.ROLLUP_FIELDS}
+        return instance
+
+    def save(self, *args, **kwargs):
+        # The pre_save signal stamps sync_seq under a per-project lock that has to be held until
+        # the row is written, and the post_save one moves the localisation rollups — one
+        # transaction for all three.
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'sync_seq'}
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # Reloaded values are the new baseline, as in from_db.
+        loaded = getattr(self, '_loaded_values', None) or dict.fromkeys(self.ROLLUP_FIELDS)
+        for name in self.ROLLUP_FIELDS:
+            if fields is None or name in fields or name.removesuffix('_id') in fields:
+                loaded[name] = self.__dict__.get(name)
+        self._loaded_values = loaded
+
     def __str__(self):
         return f"{self.language} suggestion for {self.key} on {self.project.title}"
 
@@ -688,11 +758,15 @@ class WorkspaceState(models.Model):
         related_name='workspace_states'
     )
     key = models.CharField(max_length=255)
+    # Everything on the board except the large per-tool lists, which live in WorkspaceSection
+    # rows (see api.services.workspace_sections) — the "meta" section.
     data = models.JSONField(default=dict)
     # Monotonically incremented on every successful write. Clients send the version they loaded
     # and the server rejects the write (409) if it has moved on — otherwise two members editing
     # the same shared board simultaneously silently clobber each other (last-write-wins).
     version = models.PositiveIntegerField(default=0)
+    # Same, for `data` alone (section writes check this instead of the board-wide `version`).
+    meta_version = models.PositiveIntegerField(default=0)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -712,3 +786,24 @@ class WorkspaceState(models.Model):
     def __str__(self):
         owner = f"User: {self.user.username}" if self.user else f"Org: {self.organisation.name}" if self.organisation else "System"
         return f"State: {self.key} ({owner})"
+
+
+class WorkspaceSection(models.Model):
+    """
+    One of a board's large per-tool lists (Kanban tasks, columns, GDD docs, assets, translation
+    keys, glossary), stored and versioned apart from the rest of its WorkspaceState so tools
+    can read and write their own slice without loading, shipping or conflicting on the others.
+    """
+    state = models.ForeignKey(WorkspaceState, on_delete=models.CASCADE, related_name='sections')
+    name = models.CharField(max_length=32)
+    data = models.JSONField(default=list)
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['state', 'name'], name='unique_workspace_section'),
+        ]
+
+    def __str__(self):
+        return f"{self.state.key}:{self.name} v{self.version}"
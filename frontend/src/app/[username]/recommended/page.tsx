@@ -30,9 +30,9 @@ interface GenreStat {
     percentage: number;
 }
 
-// Full genre taxonomy the backend's recommended-games endpoint understands (mirrors
-// backend/api/views.py's translation_map) — not limited to the user's own top-5 Game
-// DNA genres, so there's always a complete set of choices to filter by.
+// Full genre taxonomy the backend's recommended-games endpoint understands (canonical
+// genres, see backend/api/services/genre_index.py) — not limited to the user's own top-5
+// Game DNA genres, so there's always a complete set of choices to filter by.
 const GENRE_OPTIONS = [
     'Action', 'Adventure', 'RPG', 'Strategy', 'Simulation', 'Sports',
     'Racing', 'Massively Multiplayer', 'Casual', 'Indie', 'Early Access', 'Free To Play',
@@ -44,7 +44,9 @@ function ExploreContent() {
     const [activeHashtag, setActiveHashtag] = useState<string | null>(hashtagParam);
     const [posts, setPosts] = useState<Post[]>([]);
     const [isLoadingPosts, setIsLoadingPosts] = useState(false);
-    const [postsPage, setPostsPage] = useState(1);
+    // Keyset cursor for the next page (null: first page / nothing more) — deep scrolling
+    // stays as fast as the first page and new posts don't shift what's already loaded.
+    const [postsCursor, setPostsCursor] = useState<string | null>(null);
     const [hasMorePosts, setHasMorePosts] = useState(true);
     const postsObserverRef = useRef<HTMLDivElement>(null);
 
@@ -54,7 +56,7 @@ function ExploreContent() {
     }, [hashtagParam]);
 
     // Fetch posts for explore
-    const fetchExplorePosts = useCallback(async (page: number, filter: string, hashtag: string | null, reset: boolean = false) => {
+    const fetchExplorePosts = useCallback(async (cursor: string | null, filter: string, hashtag: string | null, reset: boolean = false) => {
         setIsLoadingPosts(true);
         try {
             const params = new URLSearchParams();
@@ -67,7 +69,7 @@ function ExploreContent() {
                 params.set('interest', filter);
             }
             if (hashtag) params.set('hashtag', hashtag);
-            params.set('page', page.toString());
+            params.set('cursor', cursor ?? '');
             params.set('page_size', '20');
 
             const res = await api.get(`/explore/posts/?${params.toString()}`);
@@ -78,6 +80,7 @@ function ExploreContent() {
             } else {
                 setPosts(prev => [...prev, ...(data.results || [])]);
             }
+            setPostsCursor(data.next_cursor ?? null);
             setHasMorePosts(data.has_next);
         } catch (error) {
             console.error("Failed to fetch explore posts:", error);
@@ -92,10 +95,10 @@ function ExploreContent() {
 
     // Load posts when filter or hashtag changes
     useEffect(() => {
-        setPostsPage(1);
+        setPostsCursor(null);
         setPosts([]);
         setHasMorePosts(true);
-        fetchExplorePosts(1, activeFilter, activeHashtag, true);
+        fetchExplorePosts(null, activeFilter, activeHashtag, true);
     }, [activeFilter, activeHashtag, fetchExplorePosts]);
 
     // Intersection observer for infinite scrolling on posts
@@ -104,9 +107,7 @@ function ExploreContent() {
 
         const observer = new IntersectionObserver((entries) => {
             if (entries[0].isIntersecting) {
-                const nextPage = postsPage + 1;
-                setPostsPage(nextPage);
-                fetchExplorePosts(nextPage, activeFilter, activeHashtag);
+                fetchExplorePosts(postsCursor, activeFilter, activeHashtag);
             }
         }, { threshold: 1.0 });
 
@@ -120,7 +121,7 @@ function ExploreContent() {
                 observer.unobserve(currentTarget);
             }
         };
-    }, [hasMorePosts, isLoadingPosts, postsPage, activeFilter, activeHashtag, fetchExplorePosts]);
+    }, [hasMorePosts, isLoadingPosts, postsCursor, activeFilter, activeHashtag, fetchExplorePosts]);
 
     const hashtagDisplay = activeHashtag ? `#${activeHashtag}` : '';
 
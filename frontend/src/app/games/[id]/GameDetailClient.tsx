@@ -17,6 +17,8 @@ import { useTranslation } from '@/lib/useTranslation';
 
 const STAR_SYMBOL = '★';
 const NO_LOGS_EMOJI = '🎮';
+const DETAILS_POLL_MS = 3000;
+const DETAILS_MAX_POLLS = 5;
 
 // In-memory cache so navigating back to a previously-viewed game (e.g. from a review's
 // detail page) can render instantly instead of flashing a loading spinner that collapses
@@ -50,11 +52,19 @@ export default function GameDetailClient() {
     const descRef = useRef<HTMLDivElement>(null);
 
     useEffect(() => {
+        let pollTimer: ReturnType<typeof setTimeout> | undefined;
+        let polls = 0;
         const fetchGame = async () => {
             try {
                 const response = await api.get(`/games/${gameId}/details/`);
                 setGame(response.data);
                 gameDetailCache.set(gameId, response.data);
+                // IGDB details are hydrated in the background on first view — the response
+                // is the partial record until details_fetched flips, so check back a few times.
+                if (response.data.details_fetched === false && polls < DETAILS_MAX_POLLS) {
+                    polls += 1;
+                    pollTimer = setTimeout(fetchGame, DETAILS_POLL_MS);
+                }
             } catch (err: any) {
                 // The Server Component wrapper (page.tsx) already resolved this game to a
                 // real one via notFound() before rendering us — a failure here is a
@@ -68,6 +78,7 @@ export default function GameDetailClient() {
         if (gameId) {
             fetchGame();
         }
+        return () => clearTimeout(pollTimer);
     }, [gameId]);
 
     useEffect(() => {
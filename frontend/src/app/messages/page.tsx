@@ -22,6 +22,7 @@ import { useTranslation } from '@/lib/useTranslation';
 import { useToast } from '@/context/ToastContext';
 import { useConfirm } from '@/context/ConfirmContext';
 import { useIsMobile } from '@/hooks/useIsMobile';
+import { useChatSocket, ChatSocketEvent } from '@/hooks/useChatSocket';
 import PostMediaGrid, { GridMediaItem } from '@/components/PostMediaGrid';
 
 const BACK_ARROW = '←';
@@ -393,6 +394,47 @@ function MessagesContent() {
     const groupAvatarInputRef = useRef<HTMLInputElement>(null);
     const lastMessageIdRef = useRef<number | null>(null);
     const prevLastIdRef = useRef<number | null>(null);
+    const [typingUsername, setTypingUsername] = useState<string | null>(null);
+    const typingTimeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null);
+
+    const appendMessages = (incoming: Message[]) => {
+        if (incoming.length === 0) return;
+        setMessages(prev => {
+            const existingIds = new Set(prev.map(m => m.id));
+            return [...prev, ...incoming.filter(m => !existingIds.has(m.id))];
+        });
+        const newest = incoming[incoming.length - 1].id;
+        if (lastMessageIdRef.current == null || newest > lastMessageIdRef.current) {
+            lastMessageIdRef.current = newest;
+        }
+    };
+
+    // Pushed chat events replace the 3-second poll while the socket is up (the poll below
+    // only runs while it's down).
+    const handleChatEvent = (event: ChatSocketEvent) => {
+        if (event.conversation_id !== selectedChatId) return;
+        if (event.type === 'resume') {
+            appendMessages(event.messages);
+            // Away too long for a replay — fall back to a REST delta.
+            if (!event.complete) fetchNewMessagesRef.current?.();
+        } else if (event.type === 'typing') {
+            if (typingTimeoutRef.current) clearTimeout(typingTimeoutRef.current);
+            setTypingUsername(event.is_typing ? event.username : null);
+            if (event.is_typing) {
+                typingTimeoutRef.current = setTimeout(() => setTypingUsername(null), 5000);
+            }
+        } else if (event.type === 'message_new') {
+            appendMessages([event.message]);
+            if (event.message.sender?.username === typingUsername) setTypingUsername(null);
+        } else {
+            setMessages(prev => prev.map(m => m.id === event.message.id ? event.message : m));
+            setPinnedMessages(prev => event.message.is_pinned
+                ? (prev.some(m => m.id === event.message.id) ? prev : [...prev, event.message])
+                : prev.filter(m => m.id !== event.message.id));
+        }
+    };
+    const fetchNewMessagesRef = useRef<(() => Promise<void>) | null>(null);
+    const chatSocket = useChatSocket(selectedChatId, handleChatEvent, () => lastMessageIdRef.current);
 
     // Fetch Conversations
     const fetchConversations = async () => {
@@ -487,6 +529,7 @@ function MessagesContent() {
                 setMessages(results);
                 setHasMoreMessages(res.data.has_more);
                 lastMessageIdRef.current = results.length > 0 ? results[results.length - 1].id : null;
+                if (lastMessageIdRef.current != null) chatSocket.resume(lastMessageIdRef.current);
             } catch (error) {
                 console.error("Failed to fetch messages:", error);
             } finally {
@@ -519,10 +562,16 @@ function MessagesContent() {
         };
 
         fetchInitial();
+        fetchNewMessagesRef.current = fetchNewMessages;
+        setTypingUsername(null);
 
-        const intervalId = setInterval(fetchNewMessages, 3000); // Poll every 3s
+        // Fallback only: while the chat socket is connected, new messages are pushed.
+        const intervalId = setInterval(() => {
+            if (!chatSocket.isConnected()) fetchNewMessages();
+        }, 3000);
 
         return () => clearInterval(intervalId);
+        // eslint-disable-next-line react-hooks/exhaustive-deps
     }, [selectedChatId]);
 
     const loadEarlierMessages = async () => {
@@ -1818,8 +1867,11 @@ function MessagesContent() {
                                                 <input
                                                     type="text"
                                                     value={inputText}
-                                                    onChange={(e) => setInputText(e.target.value)}
-                                                    placeholder={t('typeAMessage')}
+                                                    onChange={(e) => {
+                                                        setInputText(e.target.value);
+                                                        chatSocket.sendTyping(e.target.value.length > 0);
+                                                    }}
+                                                    placeholder={typingUsername ? t('userIsTyping').replace('{username}', typingUsername) : t('typeAMessage')}
                                                     className="flex-1 min-w-0 bg-zinc-900 border border-zinc-800 rounded-full py-2.5 px-4 text-sm focus:outline-none focus:border-emerald-500/50 focus:ring-1 focus:ring-emerald-500/50 transition-all placeholder:text-zinc-600"
                                                 />
 
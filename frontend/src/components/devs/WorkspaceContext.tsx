@@ -327,6 +327,50 @@ function migrateLegacyKanbanCategories(legacy: string[]): KanbanCategoryItem[] {
     });
 }
 
+// ─── Board sections ──────────────────────────────────────────────────────────
+// The backend stores a board as separately versioned sections (see the backend's
+// api.services.workspace_sections): these six lists, plus `meta` — every other field. A save
+// sends only the sections whose value changed since the last sync (compared by reference,
+// as every mutator replaces the list it edits), each against its own version, so edits in
+// different tools neither conflict nor ship the whole board.
+const SECTION_FIELDS = {
+    tasks: 'tasks',
+    columns: 'columns',
+    docs: 'gddDocs',
+    assets: 'assets',
+    translationKeys: 'translationKeys',
+    glossary: 'glossary',
+} as const satisfies Record<string, keyof WorkspaceData>;
+type SectionName = keyof typeof SECTION_FIELDS | 'meta';
+const SECTION_FIELD_NAMES = new Set<string>(Object.values(SECTION_FIELDS));
+
+function metaFields(data: Partial<WorkspaceData>): Record<string, unknown> {
+    return Object.fromEntries(Object.entries(data).filter(([field]) => !SECTION_FIELD_NAMES.has(field)));
+}
+
+// The board as last loaded from / saved to the backend, with each section's version.
+interface SyncedBoard {
+    key: string;
+    data: Partial<WorkspaceData>;
+    sections: Partial<Record<SectionName, number>>;
+}
+
+function dirtySections(data: WorkspaceData, synced: SyncedBoard) {
+    const sections: Partial<Record<SectionName, { data: unknown; base_version: number }>> = {};
+    for (const [name, field] of Object.entries(SECTION_FIELDS) as [keyof typeof SECTION_FIELDS, keyof WorkspaceData][]) {
+        if (data[field] !== synced.data[field]) {
+            sections[name] = { data: data[field] ?? [], base_version: synced.sections[name] ?? 0 };
+        }
+    }
+    const meta = metaFields(data);
+    const syncedMeta = metaFields(synced.data);
+    const metaKeys = new Set([...Object.keys(meta), ...Object.keys(syncedMeta)]);
+    if ([...metaKeys].some((field) => meta[field] !== syncedMeta[field])) {
+        sections.meta = { data: meta, base_version: synced.sections.meta ?? 0 };
+    }
+    return sections;
+}
+
 function ensureKanbanCategories(data: WorkspaceData): WorkspaceData {
     if (data.kanbanCategories?.length) return data;
     if (data.categories?.length) {
@@ -360,6 +404,8 @@ export function WorkspaceProvider({ children }: { children: ReactNode }) {
     // doesn't match the active board (or is null) we send no version and fall back to a plain
     // create. Kept in a ref so it survives re-renders without retriggering effects.
     const versionRef = useRef<{ key: string; version: number | null } | null>(null);
+    // Per-section counterpart of versionRef (null: unknown — saves fall back to the full blob).
+    const syncedRef = useRef<SyncedBoard | null>(null);
 
     // ── Load from URL params on first mount ──────────────────────────────────
     useEffect(() => {
@@ -449,6 +495,10 @@ export function WorkspaceProvider({ children }: { children: ReactNode }) {
                 if (seq !== fetchSeqRef.current) return;
                 // Remember the version we loaded so the next save can detect a concurrent edit.
                 versionRef.current = { key, version: typeof res.data?.version === 'number' ? res.data.version : null };
+                // Shallow copy: the defaults filled in below must count as unsaved changes.
+                syncedRef.current = res.data?.section_versions
+                    ? { key, data: { ...res.data.data }, sections: res.data.section_versions }
+                    : null;
                 let backendData = res.data?.data;
                 if (backendData && backendData.columns?.length) {
                     if (!backendData.gddCategories?.length) backendData.gddCategories = DEFAULT_GDD_CATEGORIES;
@@ -463,6 +513,7 @@ export function WorkspaceProvider({ children }: { children: ReactNode }) {
                 // No row yet (or load failed): we have no known version, so the next save creates
                 // the row unconditionally.
                 versionRef.current = { key, version: null };
+                syncedRef.current = null;
                 console.log('No backend workspace state found or failed to load. Using local state.', err);
             });
     }, []);
@@ -491,6 +542,7 @@ export function WorkspaceProvider({ children }: { children: ReactNode }) {
         try {
             const res = await api.post('/workspace-state/', { key, data: cleared, tool: 'settings', base_version: knownVersion });
             if (typeof res.data?.version === 'number') versionRef.current = { key, version: res.data.version };
+            syncedRef.current = res.data?.section_versions ? { key, data: cleared, sections: res.data.section_versions } : null;
         } catch (err) {
             const e = err as { response?: { status?: number } };
             if (e.response?.status === 409) {
@@ -579,28 +631,69 @@ export function WorkspaceProvider({ children }: { children: ReactNode }) {
             // can reject the write with 409 when a teammate saved in the meantime, instead
             // of silently overwriting their change on this shared board.
             let knownVersion = versionRef.current?.key === key ? versionRef.current.version : null;
+            const synced = syncedRef.current?.key === key ? syncedRef.current : null;
             try {
-                // One POST per tool that mutated since the last flush: the backend authorises
-                // each write against that specific tool's permission, so edits from two
-                // different tools coalesced by the debounce can't ride through under a single
-                // tool's permission.
+                if (synced) {
+                    // Only the sections that changed, each checked against its own version and
+                    // authorised by the backend against its own tool's permission (`tools` only
+                    // covers `meta`, the grab-bag of settings every tool writes to — every tool
+                    // that mutated since the last flush, since any of them may have touched it).
+                    const sections = dirtySections(data, synced);
+                    if (Object.keys(sections).length === 0) return;
+                    const res = await api.post(`/workspace-state/${key}/sections/`, { sections, tools });
+                    const written = res.data?.sections as Record<string, { version: number }> | undefined;
+                    const versions = Object.fromEntries(Object.entries(written ?? {}).map(([name, s]) => [name, s.version]));
+                    syncedRef.current = { key, data, sections: { ...synced.sections, ...versions } };
+                    if (typeof res.data?.version === 'number') versionRef.current = { key, version: res.data.version };
+                    return;
+                }
+                // No per-section versions known (row didn't exist yet, or the load failed):
+                // whole-blob writes, one POST per tool that mutated since the last flush — the
+                // backend authorises each write against that specific tool's permission, so
+                // edits from two different tools coalesced by the debounce can't ride through
+                // under a single tool's permission.
                 for (const tool of tools) {
                     const res = await api.post('/workspace-state/', { key, data, tool, base_version: knownVersion });
                     if (typeof res.data?.version === 'number') {
                         knownVersion = res.data.version;
                         versionRef.current = { key, version: res.data.version };
                     }
+                    if (res.data?.section_versions) syncedRef.current = { key, data, sections: res.data.section_versions };
                 }
             } catch (err) {
-                const e = err as { response?: { status?: number; data?: { current?: { data?: WorkspaceData; version?: number }; error?: string } } };
+                const e = err as { response?: { status?: number; data?: {
+                    current?: {
+                        data?: WorkspaceData;
+                        version?: number;
+                        section_versions?: SyncedBoard['sections'];
+                        sections?: Partial<Record<SectionName, { data: unknown; version: number }>>;
+                    };
+                    error?: string;
+                } } };
                 if (e.response?.status === 409) {
-                    // Someone else saved first. Adopt the server's current board so this
-                    // client stops diverging, rather than clobbering their work. The local
-                    // in-progress change is dropped — surfaced to the user so it isn't silent.
+                    // Someone else saved first. Adopt the server's current board (or, for a
+                    // section write, just the sections we tried to write) so this client stops
+                    // diverging, rather than clobbering their work. The local in-progress change
+                    // is dropped — surfaced to the user so it isn't silent.
                     const current = e.response.data?.current;
-                    if (current?.data) {
+                    if (current?.sections && synced) {
+                        const adopted: Partial<WorkspaceData> = {};
+                        const versions: SyncedBoard['sections'] = {};
+                        for (const [name, section] of Object.entries(current.sections) as [SectionName, { data: unknown; version: number }][]) {
+                            versions[name] = section.version;
+                            if (name === 'meta') Object.assign(adopted, section.data as object);
+                            else (adopted as Record<string, unknown>)[SECTION_FIELDS[name]] = section.data ?? [];
+                        }
+                        syncedRef.current = { key, data: { ...synced.data, ...adopted }, sections: { ...synced.sections, ...versions } };
+                        setData((d) => {
+                            const merged = { ...d, ...adopted };
+                            try { localStorage.setItem(key, JSON.stringify(merged)); } catch {}
+                            return merged;
+                        });
+                    } else if (current?.data) {
                         const merged = ensureKanbanCategories(current.data as WorkspaceData);
                         setData(merged);
+                        syncedRef.current = current.section_versions ? { key, data: { ...current.data }, sections: current.section_versions } : null;
                         try { localStorage.setItem(key, JSON.stringify(merged)); } catch {}
                     }
                     versionRef.current = { key, version: typeof current?.version === 'number' ? current.version : null };
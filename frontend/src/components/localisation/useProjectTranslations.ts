@@ -13,38 +13,73 @@ type SuggestionPayload = { text?: string; plural_forms?: Partial<Record<CldrCate
  * public project page's Localisation tab. A suggestion made or approved on either surface is
  * immediately visible on the other because both read and write through these same backend rows;
  * there is no separate per-surface copy to keep in sync.
+ *
+ * The rows are kept in sync through /community-translations/changes/: the first call is a full
+ * snapshot, and every refetch after that only asks for what changed since the last cursor
+ * (edits, new votes, rejections and deletions) and merges it into the local copy.
  */
 export function useProjectTranslations(projectId: number | null) {
     const { user } = useAuth();
     const [contributions, setContributions] = useState<CommunityTranslation[]>([]);
     const [loading, setLoading] = useState(false);
 
-    // Monotonic fetch id: rapid successive mutations each trigger a refetch, and without this
-    // the slower (older) response could land last and re-render stale data.
-    const refetchSeqRef = useRef(0);
+    // The synced copy (by id) and the feed cursor it is current to. Syncs run one at a time —
+    // each one advances the cursor the next starts from — so a refetch requested while one is in
+    // flight just schedules another pass. Bumping the generation (project change) discards
+    // whatever an in-flight sync returns.
+    const rowsRef = useRef(new Map<number, CommunityTranslation>());
+    const cursorRef = useRef<string | null>(null);
+    const syncingRef = useRef<number | null>(null);
+    const pendingRef = useRef(false);
+    const generationRef = useRef(0);
+
+    useEffect(() => {
+        generationRef.current += 1;
+        rowsRef.current = new Map();
+        cursorRef.current = null;
+        pendingRef.current = false;
+        setContributions([]);
+    }, [projectId]);
 
     const refetch = useCallback(() => {
         if (!projectId) { setContributions([]); return; }
-        const seq = ++refetchSeqRef.current;
+        const generation = generationRef.current;
+        if (syncingRef.current === generation) { pendingRef.current = true; return; }
+        syncingRef.current = generation;
         setLoading(true);
-        const fetchAllPages = async () => {
-            // The backend paginates (200/page); both surfaces filter by key/language
-            // client-side, so follow the pages — with a hard cap as a safety valve.
-            const all: CommunityTranslation[] = [];
-            let page = 1;
-            for (;;) {
-                const res = await api.get(`/community-translations/?project=${projectId}&page=${page}`);
-                const results: CommunityTranslation[] = res.data.results ?? res.data;
-                all.push(...results);
-                if (!res.data.next || page >= 25) break;
-                page += 1;
+        const sync = async () => {
+            // Follows has_more (a snapshot of a large project spans several pages), with a hard
+            // cap as a safety valve — the cursor keeps the place for the next refetch.
+            for (let page = 0; page < 25; page += 1) {
+                const since = cursorRef.current ? `&since=${encodeURIComponent(cursorRef.current)}` : '';
+                const res = await api.get(`/community-translations/changes/?project=${projectId}${since}`);
+                if (generation !== generationRef.current) return;
+                for (const row of res.data.results as CommunityTranslation[]) rowsRef.current.set(row.id, row);
+                for (const id of res.data.deleted as number[]) rowsRef.current.delete(id);
+                cursorRef.current = res.data.cursor;
+                if (!res.data.has_more) break;
             }
-            return all;
+            // Same order as the list endpoint: approved first, then by votes, then oldest first.
+            setContributions([...rowsRef.current.values()].sort((a, b) => (
+                Number(b.status === 'approved') - Number(a.status === 'approved')
+                || b.votes_count - a.votes_count
+                || a.created_at.localeCompare(b.created_at)
+            )));
         };
-        fetchAllPages()
-            .then((all) => { if (seq === refetchSeqRef.current) setContributions(all); })
-            .catch(() => { if (seq === refetchSeqRef.current) setContributions([]); })
-            .finally(() => { if (seq === refetchSeqRef.current) setLoading(false); });
+        sync()
+            .catch(() => {
+                if (generation !== generationRef.current) return;
+                // Start over from a snapshot next time rather than trust a half-applied page.
+                rowsRef.current = new Map();
+                cursorRef.current = null;
+                setContributions([]);
+            })
+            .finally(() => {
+                if (generation !== generationRef.current) return;
+                syncingRef.current = null;
+                setLoading(false);
+                if (pendingRef.current) { pendingRef.current = false; refetch(); }
+            });
     }, [projectId]);
 
     useEffect(() => { refetch(); }, [refetch]);
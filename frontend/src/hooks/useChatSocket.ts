@@ -0,0 +1,99 @@
+'use client';
+
+import { useCallback, useEffect, useRef } from 'react';
+import Cookies from 'js-cookie';
+
+// Pushed over ws/chat/<id>/ (see api.services.chat_events on the backend).
+export type ChatSocketEvent =
+    | { type: 'message_new' | 'message_edited' | 'message_deleted' | 'message_reaction' | 'message_pinned'; conversation_id: number; message: any }
+    | { type: 'typing'; conversation_id: number; user_id: number; username: string; is_typing: boolean }
+    | { type: 'resume'; conversation_id: number; messages: any[]; complete: boolean };
+
+function chatSocketUrl(conversationId: number, token: string, lastId: number | null): string {
+    const apiUrlStr = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+    const query = `token=${token}${lastId != null ? `&last_id=${lastId}` : ''}`;
+    try {
+        if (apiUrlStr.startsWith('http')) {
+            const urlObj = new URL(apiUrlStr);
+            const wsProto = urlObj.protocol === 'https:' ? 'wss:' : 'ws:';
+            return `${wsProto}//${urlObj.host}/ws/chat/${conversationId}/?${query}`;
+        }
+    } catch (e) {
+        console.error('[ChatSocket] Failed to resolve URL, falling back to localhost:8000', e);
+    }
+    return `ws://localhost:8000/ws/chat/${conversationId}/?${query}`;
+}
+
+/**
+ * Live updates for one open chat. Reconnects after a drop, passing the last message id it
+ * has so the server replays what was missed. `isConnected()` lets callers keep their REST
+ * polling as a fallback for while the socket is down.
+ */
+export function useChatSocket(
+    conversationId: number | null,
+    onEvent: (event: ChatSocketEvent) => void,
+    getLastId: () => number | null,
+) {
+    const socketRef = useRef<WebSocket | null>(null);
+    const onEventRef = useRef(onEvent);
+    const getLastIdRef = useRef(getLastId);
+    onEventRef.current = onEvent;
+    getLastIdRef.current = getLastId;
+
+    useEffect(() => {
+        if (!conversationId) return;
+
+        let reconnectTimeout: ReturnType<typeof setTimeout> | null = null;
+        let isClosedIntentionally = false;
+
+        const connect = () => {
+            const token = Cookies.get('access_token');
+            if (!token) return;
+            const socket = new WebSocket(chatSocketUrl(conversationId, token, getLastIdRef.current()));
+            socketRef.current = socket;
+
+            socket.onmessage = (event) => {
+                try {
+                    onEventRef.current(JSON.parse(event.data));
+                } catch (err) {
+                    console.error('[ChatSocket] Error handling event:', err);
+                }
+            };
+            socket.onclose = (event) => {
+                if (socketRef.current === socket) socketRef.current = null;
+                // 4003: not (or no longer) a member — retrying can't help.
+                if (!isClosedIntentionally && event.code !== 4003) {
+                    reconnectTimeout = setTimeout(connect, 5000);
+                }
+            };
+            socket.onerror = () => socket.close();
+        };
+
+        connect();
+
+        return () => {
+            isClosedIntentionally = true;
+            socketRef.current?.close();
+            socketRef.current = null;
+            if (reconnectTimeout) clearTimeout(reconnectTimeout);
+        };
+    }, [conversationId]);
+
+    const isConnected = useCallback(() => socketRef.current?.readyState === WebSocket.OPEN, []);
+
+    const sendTyping = useCallback((isTyping: boolean) => {
+        if (socketRef.current?.readyState === WebSocket.OPEN) {
+            socketRef.current.send(JSON.stringify({ action: 'typing', is_typing: isTyping }));
+        }
+    }, []);
+
+    // Replays anything after `lastId` — for a socket that connected before the caller had
+    // loaded the chat (so it couldn't pass last_id when connecting).
+    const resume = useCallback((lastId: number) => {
+        if (socketRef.current?.readyState === WebSocket.OPEN) {
+            socketRef.current.send(JSON.stringify({ action: 'resume', last_id: lastId }));
+        }
+    }, []);
+
+    return { isConnected, sendTyping, resume };
+}
@@ -277,6 +277,7 @@ const englishTranslations = {
     share: 'Share',
     discussion: 'Discussion',
     typeAMessage: 'Type a message...',
+    userIsTyping: '@{username} is typing…',
     previous: 'Previous',
     prev: 'Prev',
     next: 'Next',
@@ -1314,6 +1315,7 @@ const globalTranslations: Record<LocaleType, TranslationKeys> = {
         share: 'Paylaş',
         discussion: 'Tartışma',
         typeAMessage: 'Bir mesaj yazın...',
+        userIsTyping: '@{username} yazıyor…',
         previous: 'Önceki',
         prev: 'Önc.',
         next: 'Sonraki',
@@ -2343,6 +2345,7 @@ const globalTranslations: Record<LocaleType, TranslationKeys> = {
         share: 'Compartir',
         discussion: 'Discusión',
         typeAMessage: 'Escribe un mensaje...',
+        userIsTyping: '@{username} está escribiendo…',
         previous: 'Anterior',
         prev: 'Ant.',
         next: 'Siguiente',
@@ -3372,6 +3375,7 @@ const globalTranslations: Record<LocaleType, TranslationKeys> = {
         share: 'Partager',
         discussion: 'Discussion',
         typeAMessage: 'Tapez un message...',
+        userIsTyping: '@{username} est en train d’écrire…',
         previous: 'Précédent',
         prev: 'Préc.',
         next: 'Suivant',
@@ -4401,6 +4405,7 @@ const globalTranslations: Record<LocaleType, TranslationKeys> = {
         share: 'Teilen',
         discussion: 'Diskussion',
         typeAMessage: 'Schreibe eine Nachricht...',
+        userIsTyping: '@{username} schreibt…',
         previous: 'Zurück',
         prev: 'Zur.',
         next: 'Weiter',
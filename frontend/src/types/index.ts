@@ -53,6 +53,7 @@ export interface GameDetail extends Game {
     hltb_main?: number | null;
     hltb_main_extra?: number | null;
     hltb_completionist?: number | null;
+    details_fetched?: boolean;
 }
 
 export interface Review {